@@ -0,0 +1,85 @@
+"""Time the imports cli-gen itself pays for on purely local commands.
+
+Runs `cli-gen --help` and `cli-gen build` in fresh processes under
+`python -X importtime` and reports the median total import time of each.
+With --budget-ms, exits with status 1 when a median exceeds the budget, for
+use as a check on a quiet machine (the unit tests only check which modules
+are imported, since wall-clock budgets flake on loaded CI machines).
+
+    PYTHONPATH=src python benchmarks/bench_cli_startup.py
+    PYTHONPATH=src python benchmarks/bench_cli_startup.py --runs 10 --budget-ms 600 --json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from cli_generator.models import CLISpec
+
+
+def import_ms(args: list[str]) -> float:
+    """Run cli-gen with args under -X importtime and return the import time (ms)."""
+    code = (
+        f"import sys; sys.argv = ['cli-gen', *{args!r}]; "
+        "from cli_generator.cli import main; main()"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=os.environ.copy(),
+        check=True,
+    )
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        # Top-level imports are not indented; their cumulative times add up
+        if not name.startswith("  ", 1):
+            total_us += int(cumulative)
+    return total_us / 1000
+
+
+def main() -> None:
+    """Parse arguments and print the import times."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Processes per scenario")
+    parser.add_argument("--budget-ms", type=float, help="Fail if a median exceeds this")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        spec_file = Path(tmp) / "spec.json"
+        spec_file.write_text(CLISpec(name="bench", description="Bench").model_dump_json())
+        scenarios = {
+            "--help": ["--help"],
+            "build": ["build", str(spec_file), "--output", str(Path(tmp) / "out"), "--no-cache"],
+        }
+        # Warm-up: write the bytecode of every module the scenarios import
+        for scenario in scenarios.values():
+            import_ms(scenario)
+        results = {
+            name: statistics.median(import_ms(scenario) for _ in range(args.runs))
+            for name, scenario in scenarios.items()
+        }
+
+    over = [name for name, ms in results.items() if args.budget_ms and ms > args.budget_ms]
+    if args.json:
+        json.dump({"import_ms": results, "budget_ms": args.budget_ms}, sys.stdout, indent=2)
+        print()
+    else:
+        for name, ms in results.items():
+            print(f"cli-gen {name:<8} {ms:>8.1f} ms")
+    if over:
+        print(f"Over the {args.budget_ms:.0f}ms budget: {', '.join(over)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
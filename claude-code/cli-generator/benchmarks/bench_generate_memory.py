@@ -0,0 +1,118 @@
+"""Measure peak memory of code generation for a very large spec.
+
+Generates a synthetic spec with many commands and writes its project twice:
+materialized, the way CodeGenerator worked before streaming (each file
+rendered to one string, encoded, then written and hashed), and streamed
+through CodeGenerator.generate(), which writes template output in chunks
+while hashing it. Peak memory is traced with tracemalloc after the spec is
+built and the templates are compiled, so it covers rendering and writing
+only.
+
+    PYTHONPATH=src python benchmarks/bench_generate_memory.py
+    PYTHONPATH=src python benchmarks/bench_generate_memory.py --commands 1000 --json
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+from cli_generator.generators.code_generator import CodeGenerator, sha256_hex
+from cli_generator.models import ArgumentSpec, CLISpec, CommandSpec, OptionSpec
+
+
+def make_spec(commands: int) -> CLISpec:
+    """Return a spec with the given number of commands."""
+    return CLISpec(
+        name="bench",
+        description="Benchmark CLI",
+        commands=[
+            CommandSpec(
+                name=f"command-{index}",
+                description=f"Run step {index} of the synthetic pipeline",
+                arguments=[ArgumentSpec(name="target", type="path", help="Target file")],
+                options=[
+                    OptionSpec(name="output", short="o", type="path", help="Output file"),
+                    OptionSpec(name="force", short="f", type="bool", help="Overwrite"),
+                    OptionSpec(name="limit", type="int", default=10, help="Maximum items"),
+                ],
+                examples=[f"bench command-{index} input.txt"],
+            )
+            for index in range(commands)
+        ],
+        global_options=[OptionSpec(name="verbose", short="v", type="bool")],
+    )
+
+
+def generate_materialized(generator: CodeGenerator, spec: CLISpec, output_dir: Path) -> None:
+    """Write the project with every file held in memory as a whole."""
+    package_dir = output_dir / spec.name
+    package_dir.mkdir(parents=True, exist_ok=True)
+    outputs = [
+        (package_dir / "cli.py", generator._generate_cli),
+        (package_dir / "__init__.py", generator._generate_init),
+        (output_dir / "pyproject.toml", generator._generate_pyproject),
+        (output_dir / "README.md", generator._generate_readme),
+    ]
+    for path, render in outputs:
+        data = render(spec).encode()
+        path.write_bytes(data)
+        sha256_hex(data)
+
+
+def generate_streamed(generator: CodeGenerator, spec: CLISpec, output_dir: Path) -> None:
+    """Write the project with CodeGenerator.generate()."""
+    generator.generate(spec, output_dir)
+
+
+def measure(mode: str, spec: CLISpec, root: Path) -> dict[str, Any]:
+    """Return the peak traced memory and wall time of one generation mode."""
+    generator = CodeGenerator()
+    run = generate_streamed if mode == "streamed" else generate_materialized
+    # Compile the templates before tracing
+    generator.generate(make_spec(1), root / f"warmup_{mode}")
+
+    output_dir = root / mode
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        run(generator, spec, output_dir)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    size = sum(path.stat().st_size for path in output_dir.rglob("*") if path.is_file())
+    return {"mode": mode, "peak_bytes": peak, "seconds": elapsed, "output_bytes": size}
+
+
+def main() -> None:
+    """Parse arguments and print the peak memory of both modes."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--commands", type=int, default=10_000, help="Commands in the spec")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = parser.parse_args()
+
+    spec = make_spec(args.commands)
+    with tempfile.TemporaryDirectory() as tmp:
+        results = [measure(mode, spec, Path(tmp)) for mode in ("materialized", "streamed")]
+
+    if args.json:
+        json.dump({"commands": args.commands, "results": results}, sys.stdout, indent=2)
+        print()
+        return
+
+    print(f"Generating a spec with {args.commands} command(s):")
+    print(f"{'mode':<14} {'peak MiB':>10} {'seconds':>9} {'output MiB':>11}")
+    for row in results:
+        print(
+            f"{row['mode']:<14} {row['peak_bytes'] / 1024 / 1024:>10.2f} "
+            f"{row['seconds']:>9.2f} {row['output_bytes'] / 1024 / 1024:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
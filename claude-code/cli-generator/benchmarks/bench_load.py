@@ -0,0 +1,116 @@
+"""Compare the ways of loading a spec file.
+
+For specs with N commands, times loading the spec file's bytes into a
+CLISpec with:
+
+- current: json.loads() then CLISpec.model_validate(), as build did before
+  the loader module
+- json: loader.parse_spec(), with a cached TypeAdapter and the GC paused
+- validate_json: CLISpec.model_validate_json() on the bytes
+- binary: loader.decode_spec() on a trusted cache entry, without validation
+
+    PYTHONPATH=src python benchmarks/bench_load.py
+    PYTHONPATH=src python benchmarks/bench_load.py --commands 1 100 --runs 20 --json
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from collections.abc import Callable
+
+from cli_generator.loader import decode_spec, encode_spec, parse_spec
+from cli_generator.models import ArgumentSpec, CLISpec, CommandSpec, OptionSpec
+
+DEFAULT_COMMANDS = [1, 100, 10_000]
+
+
+def make_spec(commands: int) -> CLISpec:
+    """Return a spec with the given number of commands."""
+    return CLISpec(
+        name="bench",
+        description="Benchmark CLI",
+        commands=[
+            CommandSpec(
+                name=f"command-{index}",
+                description=f"Run step {index} of the synthetic pipeline",
+                arguments=[ArgumentSpec(name="target", type="path", help="Target file")],
+                options=[
+                    OptionSpec(name="output", short="o", type="path", help="Output file"),
+                    OptionSpec(name="force", short="f", type="bool", help="Overwrite"),
+                    OptionSpec(
+                        name="format", type="choice", choices=["json", "yaml"], help="Format"
+                    ),
+                ],
+                examples=[f"bench command-{index} input.txt"],
+            )
+            for index in range(commands)
+        ],
+        global_options=[OptionSpec(name="verbose", short="v", type="bool")],
+    )
+
+
+def median_ms(load: Callable[[], object], runs: int) -> float:
+    """Return the median wall time (ms) of a loader."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        load()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def measure(commands: int, runs: int) -> dict[str, float]:
+    """Time the loaders on one spec size."""
+    spec = make_spec(commands)
+    data = spec.model_dump_json().encode()
+    binary = encode_spec(spec)
+    loaders: dict[str, Callable[[], object]] = {
+        "current": lambda: CLISpec.model_validate(json.loads(data)),
+        "json": lambda: parse_spec(data),
+        "validate_json": lambda: CLISpec.model_validate_json(data),
+        "binary": lambda: decode_spec(binary),
+    }
+    for load in loaders.values():
+        assert load() == spec
+    row: dict[str, float] = {
+        "commands": commands,
+        "json_bytes": len(data),
+        "binary_bytes": len(binary),
+    }
+    row.update({f"{name}_ms": median_ms(load, runs) for name, load in loaders.items()})
+    return row
+
+
+def main() -> None:
+    """Parse arguments and print the load times."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--commands", type=int, nargs="+", default=DEFAULT_COMMANDS, help="Commands per spec"
+    )
+    parser.add_argument("--runs", type=int, default=5, help="Loads per measurement")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = parser.parse_args()
+
+    results = [measure(commands, args.runs) for commands in args.commands]
+
+    if args.json:
+        json.dump({"results": results}, sys.stdout, indent=2)
+        print()
+        return
+
+    print(
+        f"{'commands':>8} {'current ms':>11} {'json ms':>9} {'validate_json ms':>17} "
+        f"{'binary ms':>10} {'json KiB':>9} {'binary KiB':>11}"
+    )
+    for row in results:
+        print(
+            f"{row['commands']:>8} {row['current_ms']:>11.3f} {row['json_ms']:>9.3f} "
+            f"{row['validate_json_ms']:>17.3f} {row['binary_ms']:>10.3f} "
+            f"{row['json_bytes'] / 1024:>9.1f} {row['binary_bytes'] / 1024:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
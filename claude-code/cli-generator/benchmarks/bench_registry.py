@@ -0,0 +1,103 @@
+"""Time spec registry queries across many specs.
+
+Adds N synthetic specs to a fresh registry in one transaction, then times
+typical searches. Each spec has up to five commands with a --format option
+(a choice on some of them) and a --limit option, and every seventh spec
+depends on pyyaml.
+
+    PYTHONPATH=src python benchmarks/bench_registry.py
+    PYTHONPATH=src python benchmarks/bench_registry.py --specs 20000 --runs 20 --json
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from cli_generator.models import CLISpec, CommandSpec, OptionSpec
+from cli_generator.registry import Registry
+
+COMMANDS = ["export", "import", "list", "show", "run"]
+QUERIES: dict[str, dict[str, Any]] = {
+    "command+option+type": {"command": "export", "option": "format", "option_type": "choice"},
+    "rare command+option+type": {"command": "run", "option": "format", "option_type": "choice"},
+    "dependency": {"dependency": "pyyaml"},
+    "option type": {"option_type": "choice"},
+    "name substring": {"name": "cli_123"},
+    "description text": {"text": "number 4242"},
+}
+
+
+def make_spec(index: int) -> CLISpec:
+    """Return the index-th synthetic spec."""
+    return CLISpec(
+        name=f"cli_{index}",
+        description=f"Tool number {index}",
+        dependencies=["pyyaml>=6"] if index % 7 == 0 else ["rich"],
+        commands=[
+            CommandSpec(
+                name=name,
+                description=f"{name.title()} things",
+                options=[
+                    OptionSpec(name="format", type="choice", choices=["json", "csv"])
+                    if (index + position) % 11 == 0
+                    else OptionSpec(name="format"),
+                    OptionSpec(name="limit", type="int"),
+                ],
+            )
+            for position, name in enumerate(COMMANDS[: 1 + index % len(COMMANDS)])
+        ],
+    )
+
+
+def median_ms(registry: Registry, filters: dict[str, Any], runs: int) -> tuple[float, int]:
+    """Return the median search time (ms) and the number of results."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        results = registry.search(**filters)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), len(results)
+
+
+def main() -> None:
+    """Parse arguments and print the query times."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--specs", type=int, default=10_000, help="Specs in the registry")
+    parser.add_argument("--runs", type=int, default=10, help="Searches per query")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = parser.parse_args()
+
+    specs = [make_spec(index) for index in range(args.specs)]
+    results = []
+    with tempfile.TemporaryDirectory() as tmp, Registry(Path(tmp) / "bench.sqlite3") as registry:
+        start = time.perf_counter()
+        with registry.transaction():
+            for spec in specs:
+                registry.add(spec)
+        add_seconds = time.perf_counter() - start
+        for name, filters in QUERIES.items():
+            ms, matches = median_ms(registry, filters, args.runs)
+            results.append({"query": name, "ms": ms, "matches": matches})
+
+    if args.json:
+        json.dump(
+            {"specs": args.specs, "add_seconds": add_seconds, "results": results},
+            sys.stdout,
+            indent=2,
+        )
+        print()
+        return
+
+    print(f"Added {args.specs} specs in {add_seconds:.2f}s")
+    print(f"{'query':<26} {'ms':>8} {'matches':>8}")
+    for row in results:
+        print(f"{row['query']:<26} {row['ms']:>8.2f} {row['matches']:>8}")
+
+
+if __name__ == "__main__":
+    main()
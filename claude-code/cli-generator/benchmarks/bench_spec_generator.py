@@ -0,0 +1,318 @@
+"""Measure how much time SpecGenerator adds on top of model latency.
+
+Drives generate() and add_command() through a FunctionModel that sleeps for a
+configurable latency and returns a spec (or command) of a given size, across
+spec sizes and concurrency levels. For each scenario it reports throughput,
+the overhead per request beyond the model's own time, and peak memory.
+Overhead is split into per-stage estimates measured in isolation:
+
+- construction: building a SpecGenerator (its three agents)
+- prompt: assembling the system prompt, examples and user prompt
+- validation: parsing the model's JSON into a CLISpec, including the
+  duplicate checks in its validators
+- agent: the rest of the request (message handling, output tools, retries)
+
+Results are written as JSON; pass --compare with an earlier file to print
+the change per scenario, e.g. between two commits.
+
+    PYTHONPATH=src python benchmarks/bench_spec_generator.py -o bench.json
+    PYTHONPATH=src python benchmarks/bench_spec_generator.py --quick --compare bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+import pydantic_ai
+from pydantic_ai.messages import ModelMessage, ModelResponse, ToolCallPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+from cli_generator.examples import ExampleLibrary
+from cli_generator.generators.spec_generator import SpecGenerator
+from cli_generator.models import CLISpec
+
+DEFAULT_SIZES = [1, 10, 100, 500]
+DEFAULT_CONCURRENCY = [1, 16, 64, 256]
+QUICK_SIZES = [1, 50]
+QUICK_CONCURRENCY = [1, 32]
+
+
+def make_command(index: int) -> dict[str, Any]:
+    """Return a command with a few arguments and options, as model JSON."""
+    return {
+        "name": f"command_{index}",
+        "description": f"Run step {index}",
+        "arguments": [{"name": "target", "type": "path", "help": "Target file"}],
+        "options": [
+            {"name": "output", "short": "o", "type": "path", "help": "Output file"},
+            {"name": "force", "short": "f", "type": "bool", "default": False},
+            {"name": "limit", "type": "int", "default": 10, "help": "Maximum items"},
+        ],
+        "examples": [f"bench command_{index} input.txt"],
+    }
+
+
+def make_spec(commands: int) -> dict[str, Any]:
+    """Return a spec with the given number of commands, as model JSON."""
+    return {
+        "name": "bench",
+        "description": "Benchmark CLI",
+        "commands": [make_command(index) for index in range(commands)],
+        "global_options": [{"name": "verbose", "short": "v", "type": "bool", "default": False}],
+    }
+
+
+class LatencyModel:
+    """A FunctionModel answering with fixed JSON after a fixed delay.
+
+    The time spent inside the model (sleeping and serializing) is summed so
+    it can be subtracted from the wall time of each request.
+    """
+
+    def __init__(self, latency: float, spec_json: str, command_json: str) -> None:
+        """Initialize the model with the payloads it returns."""
+        self.latency = latency
+        self.spec_json = spec_json
+        self.command_json = command_json
+        self.model_time = 0.0
+        self.model = FunctionModel(self.respond, model_name="bench")
+
+    async def respond(self, messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        """Sleep, then return the spec or command JSON as an output tool call."""
+        start = time.perf_counter()
+        await asyncio.sleep(self.latency)
+        output_tool = info.output_tools[0]
+        # The spec agent's output has commands, the command agent's does not
+        properties = output_tool.parameters_json_schema.get("properties", {})
+        payload = self.spec_json if "commands" in properties else self.command_json
+        response = ModelResponse(parts=[ToolCallPart(output_tool.name, payload)])
+        self.model_time += time.perf_counter() - start
+        return response
+
+
+def mean_time(func: Any, repeat: int) -> float:
+    """Return the mean wall time of calling func, in seconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def measure_stages(
+    commands: int, repeat: int, library: ExampleLibrary | None
+) -> dict[str, float]:
+    """Measure construction, prompt assembly and validation in isolation (ms)."""
+    spec_json = json.dumps(make_spec(commands))
+    model = FunctionModel(lambda messages, info: ModelResponse(parts=[]), model_name="bench")
+    generator = SpecGenerator(model=model, examples=library)
+    description = "A benchmark CLI with many commands"
+
+    def assemble_prompt() -> None:
+        generator.get_system_prompt()
+        generator.get_examples(description)
+        generator._add_command_prompt(CLISpec.model_validate_json(spec_json), description)
+
+    validate_repeat = max(1, repeat // max(1, commands // 10))
+    return {
+        "construction_ms": mean_time(
+            lambda: SpecGenerator(model=model, examples=library), repeat
+        ) * 1000,
+        "prompt_ms": mean_time(assemble_prompt, validate_repeat) * 1000,
+        "validation_ms": mean_time(
+            lambda: CLISpec.model_validate_json(spec_json), validate_repeat
+        ) * 1000,
+    }
+
+
+async def drive(
+    operation: str, commands: int, concurrency: int, requests: int, latency: float
+) -> dict[str, Any]:
+    """Run requests at a fixed concurrency and return timing statistics."""
+    spec_json = json.dumps(make_spec(commands))
+    command_json = json.dumps(make_command(commands))
+    model = LatencyModel(latency, spec_json, command_json)
+    # No cache and distinct descriptions, so every request reaches the model
+    generator = SpecGenerator(model=model.model)
+    base_spec = CLISpec.model_validate_json(spec_json)
+    semaphore = asyncio.Semaphore(concurrency)
+    durations: list[float] = []
+
+    async def one(index: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            if operation == "generate":
+                await generator.generate(f"Benchmark CLI number {index}")
+            else:
+                await generator.add_command(base_spec, f"Add step number {index}")
+            durations.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(requests)))
+    wall = time.perf_counter() - start
+
+    overhead = (sum(durations) - model.model_time) / requests
+    latencies = sorted(durations)
+    return {
+        "wall_s": wall,
+        "throughput_rps": requests / wall,
+        # The best possible throughput with this latency and concurrency
+        "ideal_rps": min(requests, concurrency) / latency if latency else None,
+        "latency_p50_ms": latencies[len(latencies) // 2] * 1000,
+        "latency_p95_ms": latencies[int(len(latencies) * 0.95)] * 1000,
+        "overhead_ms": overhead * 1000,
+    }
+
+
+def peak_memory(
+    operation: str, commands: int, concurrency: int, requests: int, latency: float
+) -> int:
+    """Run a scenario under tracemalloc and return its peak traced memory."""
+    tracemalloc.start()
+    try:
+        asyncio.run(drive(operation, commands, concurrency, requests, latency))
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Run every scenario and return the report."""
+    sizes = args.sizes or (QUICK_SIZES if args.quick else DEFAULT_SIZES)
+    levels = args.concurrency or (QUICK_CONCURRENCY if args.quick else DEFAULT_CONCURRENCY)
+    library = ExampleLibrary.from_paths([Path(path) for path in args.examples])
+
+    stages = {str(size): measure_stages(size, args.repeat, library) for size in sizes}
+    scenarios = []
+    for operation in args.operations:
+        for size in sizes:
+            for concurrency in levels:
+                requests = max(args.requests, concurrency)
+                row = asyncio.run(drive(operation, size, concurrency, requests, args.latency))
+                stage = stages[str(size)]
+                if operation == "generate":
+                    row["agent_ms"] = row["overhead_ms"] - stage["validation_ms"]
+                if not args.no_memory:
+                    row["peak_memory_bytes"] = peak_memory(
+                        operation, size, concurrency, requests, args.latency
+                    )
+                scenarios.append(
+                    {
+                        "operation": operation,
+                        "commands": size,
+                        "concurrency": concurrency,
+                        "requests": requests,
+                        **row,
+                    }
+                )
+                print(format_row(scenarios[-1]), file=sys.stderr)
+
+    return {"meta": metadata(args), "stages": stages, "scenarios": scenarios}
+
+
+def metadata(args: argparse.Namespace) -> dict[str, Any]:
+    """Describe the environment, so results from different runs can be compared."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "pydantic_ai": pydantic_ai.__version__,
+        "latency_s": args.latency,
+        "requests": args.requests,
+    }
+
+
+def scenario_key(row: dict[str, Any]) -> tuple[str, int, int]:
+    """Identify a scenario across reports."""
+    return row["operation"], row["commands"], row["concurrency"]
+
+
+def format_row(row: dict[str, Any]) -> str:
+    """Format one scenario as a table row."""
+    memory = row.get("peak_memory_bytes")
+    return (
+        f"{row['operation']:<12} {row['commands']:>8} {row['concurrency']:>6} "
+        f"{row['throughput_rps']:>10.1f} {row['overhead_ms']:>12.2f} "
+        f"{memory / 1024 / 1024 if memory is not None else float('nan'):>10.1f}"
+    )
+
+
+def print_report(report: dict[str, Any], previous: dict[str, Any] | None) -> None:
+    """Print the per-stage costs and the scenario table."""
+    print(f"{'commands':>8} {'construct ms':>13} {'prompt ms':>10} {'validate ms':>12}")
+    for size, stage in report["stages"].items():
+        print(
+            f"{size:>8} {stage['construction_ms']:>13.2f} {stage['prompt_ms']:>10.3f} "
+            f"{stage['validation_ms']:>12.3f}"
+        )
+    print()
+
+    baseline = {}
+    if previous is not None:
+        baseline = {scenario_key(row): row for row in previous["scenarios"]}
+    header = (
+        f"{'operation':<12} {'commands':>8} {'conc':>6} {'req/s':>10} "
+        f"{'overhead ms':>12} {'peak MiB':>10}"
+    )
+    print(header + ("  overhead vs. baseline" if baseline else ""))
+    for row in report["scenarios"]:
+        line = format_row(row)
+        old = baseline.get(scenario_key(row))
+        if old is not None and old["overhead_ms"] > 0:
+            line += f"  {row['overhead_ms'] / old['overhead_ms']:>6.2f}x"
+        print(line)
+
+
+def main() -> None:
+    """Parse arguments, run the benchmark and write the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="Simulated model latency in seconds"
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", help="Commands per spec")
+    parser.add_argument("--concurrency", type=int, nargs="+", help="Concurrency levels")
+    parser.add_argument(
+        "--requests", type=int, default=64, help="Requests per scenario (at least the concurrency)"
+    )
+    parser.add_argument(
+        "--operations",
+        nargs="+",
+        choices=["generate", "add_command"],
+        default=["generate", "add_command"],
+    )
+    parser.add_argument("--repeat", type=int, default=20, help="Repeats for stage timings")
+    parser.add_argument(
+        "--examples", "-e", nargs="*", default=[], help="Example specs for prompt assembly"
+    )
+    parser.add_argument("--quick", action="store_true", help="Small grid for a fast check")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--output", "-o", type=Path, help="Write the JSON report here")
+    parser.add_argument("--compare", type=Path, help="Earlier JSON report to compare with")
+    args = parser.parse_args()
+
+    report = run(args)
+    previous = json.loads(args.compare.read_text()) if args.compare else None
+    print_report(report, previous)
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
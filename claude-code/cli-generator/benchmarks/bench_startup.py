@@ -0,0 +1,119 @@
+"""Compare the startup time of generated CLIs in the single and lazy layouts.
+
+Generates a CLI with N commands in each layout, then times fresh processes
+running it: the top-level --help, the --help of one command, and invoking
+that command. Bytecode is compiled by a warm-up run first, as it would be
+for an installed CLI. Times include interpreter startup; the time of a
+process that only imports click is reported as the floor.
+
+    PYTHONPATH=src python benchmarks/bench_startup.py
+    PYTHONPATH=src python benchmarks/bench_startup.py --commands 10 100 --runs 5 --json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from cli_generator.generators.code_generator import LAYOUTS, CodeGenerator
+from cli_generator.models import ArgumentSpec, CLISpec, CommandSpec, OptionSpec
+
+DEFAULT_COMMANDS = [10, 100, 1000]
+
+
+def make_spec(commands: int) -> CLISpec:
+    """Return a spec with the given number of commands."""
+    return CLISpec(
+        name="bench",
+        description="Benchmark CLI",
+        commands=[
+            CommandSpec(
+                name=f"command-{index}",
+                description=f"Run step {index}",
+                arguments=[ArgumentSpec(name="target", type="path", required=False)],
+                options=[
+                    OptionSpec(name="force", short="f", type="bool", help="Overwrite"),
+                    OptionSpec(name="limit", type="int", default=10, help="Maximum items"),
+                ],
+                examples=[f"bench command-{index} input.txt"],
+            )
+            for index in range(commands)
+        ],
+        global_options=[OptionSpec(name="verbose", short="v", type="bool")],
+    )
+
+
+def run_ms(args: list[str], env: dict[str, str], runs: int) -> float:
+    """Return the median wall time (ms) of a command in fresh processes."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(args, env=env, check=True, stdout=subprocess.DEVNULL)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def measure(commands: int, layout: str, runs: int, root: Path) -> dict[str, float]:
+    """Generate a CLI in one layout and time its startup scenarios (ms)."""
+    output_dir = root / f"{layout}_{commands}"
+    CodeGenerator().generate(make_spec(commands), output_dir, layout=layout)
+    env = {**os.environ, "PYTHONPATH": str(output_dir)}
+    cli = [sys.executable, "-m", "bench.cli"]
+    # The last command is the worst case for anything that scans the list
+    command = f"command-{commands - 1}"
+    scenarios = {
+        "help_ms": [*cli, "--help"],
+        "command_help_ms": [*cli, command, "--help"],
+        "invoke_ms": [*cli, command],
+    }
+    for args in scenarios.values():
+        # Warm-up: write the bytecode of every module the scenario imports
+        subprocess.run(args, env=env, check=True, stdout=subprocess.DEVNULL)
+    return {name: run_ms(args, env, runs) for name, args in scenarios.items()}
+
+
+def main() -> None:
+    """Parse arguments and print the startup times of both layouts."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--commands", type=int, nargs="+", default=DEFAULT_COMMANDS, help="Commands per CLI"
+    )
+    parser.add_argument("--runs", type=int, default=10, help="Processes per scenario")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = parser.parse_args()
+
+    floor = run_ms([sys.executable, "-c", "import click"], dict(os.environ), args.runs)
+    report: dict[str, object] = {"click_import_ms": floor}
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for commands in args.commands:
+            for layout in LAYOUTS:
+                row = {"commands": commands, "layout": layout}
+                row.update(measure(commands, layout, args.runs, Path(tmp)))
+                results.append(row)
+    report["results"] = results
+
+    if args.json:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+        return
+
+    print(f"Floor (python -c 'import click'): {floor:.1f} ms")
+    print(
+        f"{'commands':>8} {'layout':<7} {'--help ms':>10} {'cmd --help ms':>14} "
+        f"{'invoke ms':>10}"
+    )
+    for row in results:
+        print(
+            f"{row['commands']:>8} {row['layout']:<7} {row['help_ms']:>10.1f} "
+            f"{row['command_help_ms']:>14.1f} {row['invoke_ms']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Compare cold and warm template render costs of CodeGenerator.
+
+Cold: a fresh Python process renders cli.py once, either compiling the
+template from source, loading it from a warm bytecode cache, or loading
+templates precompiled with precompile_templates(). Import time is excluded.
+
+Warm: renders in one process, either with a new environment per spec (how
+CodeGenerator worked before the shared environment) or with the shared
+environment, whose compiled template is reused.
+
+    PYTHONPATH=src python benchmarks/bench_templates.py
+    PYTHONPATH=src python benchmarks/bench_templates.py --commands 100 --json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from cli_generator.generators import code_generator
+from cli_generator.generators.code_generator import CodeGenerator, create_environment
+from cli_generator.models import CLISpec, CommandSpec, OptionSpec
+
+# Runs in a fresh process; prints the milliseconds to the first render
+COLD_RENDER = """
+import sys, time
+from pathlib import Path
+from cli_generator.generators import code_generator
+from cli_generator.models import CLISpec
+
+mode, cache_dir, compiled_dir, spec_json = sys.argv[1:]
+code_generator.PRECOMPILED_DIR = Path(compiled_dir if mode == "precompiled" else "/nonexistent")
+spec = CLISpec.model_validate_json(spec_json)
+start = time.perf_counter()
+generator = code_generator.CodeGenerator(
+    bytecode_cache_dir=Path(cache_dir) if mode == "bytecode" else None
+)
+generator._generate_cli(spec)
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def make_spec(commands: int) -> CLISpec:
+    """Return a spec with the given number of commands."""
+    return CLISpec(
+        name="bench",
+        description="Benchmark CLI",
+        commands=[
+            CommandSpec(
+                name=f"command_{index}",
+                description=f"Run step {index}",
+                options=[OptionSpec(name="force", short="f", type="bool")],
+            )
+            for index in range(commands)
+        ],
+    )
+
+
+def cold(mode: str, spec: CLISpec, runs: int, cache_dir: Path, compiled_dir: Path) -> float:
+    """Return the median first-render time (ms) in fresh processes."""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    times = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [
+                sys.executable, "-c", COLD_RENDER, mode, str(cache_dir),
+                str(compiled_dir), spec.model_dump_json(),
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+            env=env,
+        ).stdout
+        times.append(float(output))
+    return statistics.median(times)
+
+
+def warm(shared: bool, spec: CLISpec, runs: int) -> float:
+    """Return the mean in-process render time (ms) per spec."""
+    start = time.perf_counter()
+    for _ in range(runs):
+        generator = CodeGenerator()
+        if not shared:
+            # Before the shared environment, every CodeGenerator built its own
+            generator.env = create_environment()
+        generator._generate_cli(spec)
+    return (time.perf_counter() - start) / runs * 1000
+
+
+def main() -> None:
+    """Parse arguments and print cold and warm render costs."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--commands", type=int, default=10, help="Commands per spec")
+    parser.add_argument("--cold-runs", type=int, default=5, help="Fresh processes per mode")
+    parser.add_argument("--warm-runs", type=int, default=200, help="Renders per warm mode")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = parser.parse_args()
+
+    spec = make_spec(args.commands)
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = Path(tmp) / "bytecode"
+        compiled_dir = code_generator.precompile_templates(Path(tmp) / "compiled")
+        # Fill the bytecode cache so the measured runs load from it
+        cold("bytecode", spec, 1, cache_dir, compiled_dir)
+        report = {
+            "cold_source_ms": cold("source", spec, args.cold_runs, cache_dir, compiled_dir),
+            "cold_bytecode_ms": cold("bytecode", spec, args.cold_runs, cache_dir, compiled_dir),
+            "cold_precompiled_ms": cold(
+                "precompiled", spec, args.cold_runs, cache_dir, compiled_dir
+            ),
+            "warm_per_instance_ms": warm(False, spec, args.warm_runs),
+            "warm_shared_ms": warm(True, spec, args.warm_runs),
+        }
+
+    if args.json:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+        return
+
+    print(f"Render cost of cli.py for a spec with {args.commands} command(s):")
+    labels = {
+        "cold_source_ms": "cold, compiled from source",
+        "cold_bytecode_ms": "cold, bytecode cache",
+        "cold_precompiled_ms": "cold, precompiled",
+        "warm_per_instance_ms": "warm, environment per instance",
+        "warm_shared_ms": "warm, shared environment",
+    }
+    for key, label in labels.items():
+        print(f"  {label:<32} {report[key]:>8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
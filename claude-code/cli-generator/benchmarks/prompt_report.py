@@ -0,0 +1,127 @@
+"""Compare the static system prompt with retrieved few-shot examples.
+
+For each description, generates a spec once with the static SYSTEM_PROMPT and
+once with BASE_SYSTEM_PROMPT plus examples from an ExampleLibrary, and
+reports prompt size, input tokens, latency and how often the first response
+validated (no retry prompt sent back to the model).
+
+Runs offline against pydantic-ai's TestModel by default; its token counts
+are rough word-based estimates, so compare prompt characters there. Pass
+--model to measure real token usage and validation rates.
+
+    PYTHONPATH=src python benchmarks/prompt_report.py --examples specs
+    PYTHONPATH=src python benchmarks/prompt_report.py -m openai:gpt-4o-mini -d ideas.txt
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from pydantic_ai.messages import ModelRequest, RetryPromptPart
+from pydantic_ai.models.test import TestModel
+
+from cli_generator.batch import read_descriptions
+from cli_generator.examples import ExampleLibrary
+from cli_generator.generators.spec_generator import SpecGenerator
+
+DEFAULT_DESCRIPTIONS = [
+    "A secure password generator with configurable length",
+    "Check the strength of passwords",
+    "A todo list manager with add, list and done commands",
+    "Convert markdown files to HTML",
+    "Download videos from a URL with quality options",
+    "A note taking tool with tags and search",
+]
+
+
+async def measure(generator: SpecGenerator, description: str) -> dict[str, float]:
+    """Generate one spec and return its prompt size, latency and retries."""
+    prompt = f"Create a CLI specification for: {description}"
+    instructions = generator.get_examples(description)
+    start = time.perf_counter()
+    # Repairs are disabled so retries reflect what the model got right first
+    result = await generator.agent.run(prompt, instructions=instructions)
+    latency = time.perf_counter() - start
+    retries = sum(
+        isinstance(part, RetryPromptPart)
+        for message in result.all_messages()
+        if isinstance(message, ModelRequest)
+        for part in message.parts
+    )
+    return {
+        "prompt_chars": len(generator.get_system_prompt() + (instructions or "") + prompt),
+        "input_tokens": result.usage().input_tokens,
+        "latency": latency,
+        "retries": retries,
+    }
+
+
+def summarize(rows: list[dict[str, float]]) -> dict[str, float]:
+    """Aggregate per-description measurements."""
+    return {
+        "mean_prompt_chars": statistics.mean(row["prompt_chars"] for row in rows),
+        "mean_input_tokens": statistics.mean(row["input_tokens"] for row in rows),
+        "mean_latency": statistics.mean(row["latency"] for row in rows),
+        "first_try_rate": sum(row["retries"] == 0 for row in rows) / len(rows),
+    }
+
+
+async def run(args: argparse.Namespace) -> dict[str, dict[str, float]]:
+    """Measure both prompt variants for every description."""
+    descriptions = (
+        read_descriptions(Path(args.descriptions).read_text())
+        if args.descriptions
+        else DEFAULT_DESCRIPTIONS
+    )
+    library = ExampleLibrary.from_paths([Path(path) for path in args.examples])
+    model = TestModel() if args.model == "test" else args.model
+
+    variants = {
+        "static": SpecGenerator(model=model, repair=False),
+        "retrieved": SpecGenerator(
+            model=model, repair=False, examples=library, num_examples=args.k
+        ),
+    }
+    report = {}
+    for name, generator in variants.items():
+        rows = [await measure(generator, d) for d in descriptions]
+        report[name] = summarize(rows)
+    return report
+
+
+def main() -> None:
+    """Parse arguments and print the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", "-m", default="test", help="Model, or 'test' for TestModel")
+    parser.add_argument("--descriptions", "-d", help="File of descriptions (one per line)")
+    parser.add_argument(
+        "--examples", "-e", nargs="+", default=["specs"], help="Example spec files or dirs"
+    )
+    parser.add_argument("-k", type=int, default=2, help="Examples per description")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+
+    if args.json:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+        return
+
+    print(
+        f"{'prompt':<10} {'chars':>8} {'input tokens':>13} "
+        f"{'latency (s)':>12} {'first try':>10}"
+    )
+    for name, row in report.items():
+        print(
+            f"{name:<10} {row['mean_prompt_chars']:>8.0f} {row['mean_input_tokens']:>13.1f} "
+            f"{row['mean_latency']:>12.3f} {row['first_try_rate']:>10.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Atomic file replacement shared by the caches and the code generator.
+
+Files are written to a uniquely named temporary file next to the target and
+moved into place with os.replace(), so readers never see a partial file.
+The temporary name is unique per call, not per process, so threads writing
+the same target (server handlers, fanout, builds into one directory) never
+share a temporary file.
+"""
+
+import os
+import uuid
+from pathlib import Path
+
+
+def temp_path(path: Path) -> Path:
+    """Create an empty temporary file next to path and return its name.
+
+    The file is created exclusively and with the usual permissions (subject
+    to the umask), so it can replace path as is.
+    """
+    tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    tmp_path.open("xb").close()
+    return tmp_path
+
+
+def write_atomic(path: Path, data: str | bytes) -> None:
+    """Replace path with data atomically."""
+    tmp_path = temp_path(path)
+    try:
+        if isinstance(data, bytes):
+            tmp_path.write_bytes(data)
+        else:
+            tmp_path.write_text(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
@@ -0,0 +1,147 @@
+"""Concurrent bulk spec generation."""
+
+import asyncio
+import json
+import math
+import time
+from collections.abc import Callable
+
+from pydantic import BaseModel, Field
+
+from cli_generator.generators.spec_generator import SpecGenerator
+from cli_generator.models import CLISpec
+
+
+class BatchResult(BaseModel):
+    """The outcome of generating one spec in a batch."""
+
+    index: int = Field(..., description="Position of the description in the input")
+    description: str = Field(..., description="The input description")
+    spec: CLISpec | None = Field(default=None, description="Generated spec on success")
+    error: str | None = Field(default=None, description="Error message on failure")
+    latency: float = Field(default=0.0, description="Generation time in seconds")
+
+
+class BatchStats(BaseModel):
+    """Aggregate statistics for a batch run."""
+
+    succeeded: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    latencies: list[float] = Field(
+        default_factory=list, description="Latencies of successful generations"
+    )
+
+    @property
+    def total(self) -> int:
+        """Number of processed descriptions."""
+        return self.succeeded + self.failed
+
+    @property
+    def throughput(self) -> float:
+        """Successfully generated specs per minute."""
+        if self.elapsed <= 0:
+            return 0.0
+        return self.succeeded / self.elapsed * 60
+
+    def percentile(self, pct: float) -> float:
+        """Return the given latency percentile (nearest-rank), in seconds."""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        rank = max(1, math.ceil(pct / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+
+def read_descriptions(text: str) -> list[str]:
+    """Parse batch input into descriptions.
+
+    Each non-blank line is either plain text or a JSON value: a string, or an
+    object with a "description" key. Lines that only look like JSON (they
+    start with '"' or '{' but do not parse) are plain text. Lines starting
+    with '#' are ignored.
+
+    Raises:
+        ValueError: If a JSON line has no description.
+    """
+    descriptions = []
+    for line_no, line in enumerate(text.splitlines(), start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line[0] in '{"':
+            try:
+                value = json.loads(line)
+            except json.JSONDecodeError:
+                descriptions.append(line)
+                continue
+            if isinstance(value, dict):
+                value = value.get("description")
+            if not isinstance(value, str) or not value.strip():
+                raise ValueError(f"Line {line_no}: missing description")
+            line = value
+        descriptions.append(line)
+    return descriptions
+
+
+async def generate_batch(
+    generator: SpecGenerator,
+    descriptions: list[str],
+    concurrency: int = 8,
+    on_result: Callable[[BatchResult], None] | None = None,
+) -> BatchStats:
+    """Generate specs for many descriptions concurrently.
+
+    Failures are recorded per item and never abort the batch.
+
+    Args:
+        generator: The SpecGenerator shared by all requests.
+        descriptions: Descriptions to generate specs for.
+        concurrency: Maximum number of in-flight generations.
+        on_result: Called with each result as soon as it completes.
+
+    Returns:
+        Aggregate statistics for the run.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    semaphore = asyncio.Semaphore(concurrency)
+    stats = BatchStats()
+
+    async def run_one(index: int, description: str) -> BatchResult:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                spec = await generator.generate(description)
+            except Exception as e:
+                return BatchResult(
+                    index=index,
+                    description=description,
+                    error=str(e) or type(e).__name__,
+                    latency=time.perf_counter() - start,
+                )
+            return BatchResult(
+                index=index,
+                description=description,
+                spec=spec,
+                latency=time.perf_counter() - start,
+            )
+
+    start = time.perf_counter()
+    tasks = [
+        asyncio.create_task(run_one(index, description))
+        for index, description in enumerate(descriptions)
+    ]
+    for next_done in asyncio.as_completed(tasks):
+        result = await next_done
+        if result.error is None:
+            stats.succeeded += 1
+            stats.latencies.append(result.latency)
+        else:
+            stats.failed += 1
+        if on_result is not None:
+            on_result(result)
+    stats.elapsed = time.perf_counter() - start
+
+    return stats
@@ -0,0 +1,272 @@
+"""Parallel code generation for many spec files."""
+
+import glob
+import json
+import math
+import os
+import shutil
+import tempfile
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from pydantic import BaseModel, Field, ValidationError
+
+from cli_generator.atomic import temp_path
+from cli_generator.generators.code_generator import CodeGenerator, Layout
+from cli_generator.loader import TRUSTED_CACHE_DIR, load_spec_bytes
+
+# Each worker process keeps one generator (and its compiled templates) warm
+_generator: CodeGenerator | None = None
+
+
+class BuildResult(BaseModel):
+    """The outcome of building one spec file."""
+
+    path: str = Field(..., description="The spec file")
+    name: str | None = Field(default=None, description="The CLI name, once loaded")
+    output: str | None = Field(default=None, description="Directory the CLI was written to")
+    rendered: int = Field(default=0, description="Files rendered")
+    written: int = Field(default=0, description="Files written")
+    skipped: int = Field(default=0, description="Files left untouched")
+    error: str | None = Field(default=None, description="Error message on failure")
+    elapsed: float = Field(default=0.0, description="Build time in seconds")
+
+
+class BuildStats(BaseModel):
+    """Aggregate statistics for a multi-spec build."""
+
+    succeeded: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def total(self) -> int:
+        """Number of processed spec files."""
+        return self.succeeded + self.failed
+
+    @property
+    def throughput(self) -> float:
+        """Successfully built specs per second."""
+        if self.elapsed <= 0:
+            return 0.0
+        return self.succeeded / self.elapsed
+
+
+def expand_spec_paths(patterns: Iterable[str]) -> list[Path]:
+    """Resolve spec files, directories (their *.json files) and glob patterns.
+
+    Raises:
+        FileNotFoundError: If a path does not exist or a pattern matches nothing.
+    """
+    paths: list[Path] = []
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = [Path(match) for match in sorted(glob.glob(pattern, recursive=True))]
+            if not matches:
+                raise FileNotFoundError(f"No spec files match: {pattern}")
+        elif Path(pattern).is_dir():
+            matches = sorted(Path(pattern).glob("*.json"))
+        elif Path(pattern).exists():
+            matches = [Path(pattern)]
+        else:
+            raise FileNotFoundError(f"File not found: {pattern}")
+        paths.extend(matches)
+    # The same file may be named twice, e.g. directly and through a glob
+    return list(dict.fromkeys(paths))
+
+
+def _worker_generator() -> CodeGenerator:
+    """Return this process's generator, creating it on first use."""
+    global _generator
+    if _generator is None:
+        _generator = CodeGenerator()
+    return _generator
+
+
+def _warm_worker() -> None:
+    """Compile the templates when a worker process starts."""
+    _worker_generator().warm_up()
+
+
+def _claim_name(claims_dir: Path, name: str, path: str) -> str | None:
+    """Claim a CLI name for one spec file of a build, across worker processes.
+
+    Returns:
+        None once the name is claimed, or the spec file that claimed it first.
+    """
+    claim = claims_dir / name
+    tmp_path = temp_path(claim)
+    try:
+        tmp_path.write_text(path)
+        # Linking fails if the name is taken, and never exposes a half-written claim
+        os.link(tmp_path, claim)
+    except FileExistsError:
+        return claim.read_text()
+    finally:
+        tmp_path.unlink()
+    return None
+
+
+def build_spec(
+    path: str,
+    data: bytes,
+    output_dir: Path,
+    incremental: bool,
+    layout: Layout = "single",
+    cache_dir: Path | None = TRUSTED_CACHE_DIR,
+    claims_dir: Path | None = None,
+) -> BuildResult:
+    """Validate one spec and generate its code into output_dir/<spec name>.
+
+    Runs in a worker process; specs travel as raw JSON since validating them
+    there is cheaper than pickling validated models. Specs that passed
+    before are loaded from the trusted cache in cache_dir (see loader). With
+    claims_dir, a spec whose CLI name another spec of the build claimed
+    first fails instead of writing to the same directory.
+    """
+    start = time.perf_counter()
+    try:
+        spec = load_spec_bytes(data, cache_dir)
+    except (json.JSONDecodeError, ValidationError) as e:
+        return BuildResult(
+            path=path, error=f"Invalid specification: {e}", elapsed=time.perf_counter() - start
+        )
+    if claims_dir is not None:
+        other = _claim_name(claims_dir, spec.name, path)
+        if other is not None:
+            return BuildResult(
+                path=path,
+                name=spec.name,
+                error=f"Duplicate CLI name '{spec.name}' (also in {other})",
+                elapsed=time.perf_counter() - start,
+            )
+
+    generator = _worker_generator()
+    try:
+        generator.generate(spec, output_dir / spec.name, incremental=incremental, layout=layout)
+    except OSError as e:
+        return BuildResult(
+            path=path, name=spec.name, error=str(e), elapsed=time.perf_counter() - start
+        )
+    report = generator.last_build
+    return BuildResult(
+        path=path,
+        name=spec.name,
+        output=str(output_dir / spec.name),
+        rendered=report.rendered,
+        written=report.written,
+        skipped=report.skipped,
+        elapsed=time.perf_counter() - start,
+    )
+
+
+def build_chunk(
+    items: list[tuple[str, bytes]],
+    output_dir: Path,
+    incremental: bool,
+    layout: Layout = "single",
+    cache_dir: Path | None = TRUSTED_CACHE_DIR,
+    claims_dir: Path | None = None,
+) -> list[BuildResult]:
+    """Build several specs in one worker task, to limit inter-process traffic."""
+    return [
+        build_spec(path, data, output_dir, incremental, layout, cache_dir, claims_dir)
+        for path, data in items
+    ]
+
+
+def _failed_chunk(items: list[tuple[str, bytes]], error: BaseException) -> list[BuildResult]:
+    """Report every spec of a chunk whose task raised instead of returning results."""
+    message = f"Build failed: {type(error).__name__}: {error}"
+    return [BuildResult(path=path, error=message) for path, _ in items]
+
+
+def build_specs(
+    paths: list[Path],
+    output_dir: Path,
+    jobs: int = 1,
+    incremental: bool = False,
+    on_result: Callable[[BuildResult], None] | None = None,
+    layout: Layout = "single",
+    cache_dir: Path | None = TRUSTED_CACHE_DIR,
+) -> BuildStats:
+    """Build many spec files, each into output_dir/<spec name>.
+
+    Spec files are read up front and only parsed by the workers. Workers
+    claim each CLI name before writing, so a second spec for the same CLI is
+    reported instead of writing to the same directory. With more than one
+    job, specs are validated and rendered in a process pool; failures, even
+    a crashed worker, never abort the build.
+
+    Args:
+        paths: Spec files to build.
+        output_dir: Parent directory of the generated projects.
+        jobs: Number of worker processes (1 builds in this process).
+        incremental: Skip unchanged specs and files (see CodeGenerator).
+        on_result: Called with each result as soon as it completes.
+        layout: Code layout of the generated CLIs (see CodeGenerator.generate).
+        cache_dir: Trusted spec cache (see loader), or None to validate every spec.
+
+    Returns:
+        Aggregate statistics for the run.
+    """
+    if jobs < 1:
+        raise ValueError("jobs must be at least 1")
+
+    stats = BuildStats()
+    start = time.perf_counter()
+
+    def report(result: BuildResult) -> None:
+        if result.error is None:
+            stats.succeeded += 1
+        else:
+            stats.failed += 1
+        if on_result is not None:
+            on_result(result)
+
+    pending: list[tuple[str, bytes]] = []
+    for path in paths:
+        try:
+            pending.append((str(path), path.read_bytes()))
+        except OSError as e:
+            report(BuildResult(path=str(path), error=f"Unreadable spec file: {e}"))
+
+    claims_dir = Path(tempfile.mkdtemp(prefix="cli-gen-build-"))
+    try:
+        if jobs == 1 or len(pending) <= 1:
+            for item in pending:
+                try:
+                    results = build_chunk(
+                        [item], output_dir, incremental, layout, cache_dir, claims_dir
+                    )
+                except Exception as e:
+                    results = _failed_chunk([item], e)
+                for result in results:
+                    report(result)
+        else:
+            workers = min(jobs, len(pending))
+            # A few chunks per worker balance the load without a round trip per spec
+            size = math.ceil(len(pending) / (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker) as executor:
+                chunks: dict[Future[list[BuildResult]], list[tuple[str, bytes]]] = {}
+                for index in range(0, len(pending), size):
+                    chunk = pending[index : index + size]
+                    future = executor.submit(
+                        build_chunk, chunk, output_dir, incremental, layout, cache_dir, claims_dir
+                    )
+                    chunks[future] = chunk
+                for future in as_completed(chunks):
+                    try:
+                        results = future.result()
+                    except Exception as e:
+                        # Includes BrokenProcessPool when a worker dies
+                        results = _failed_chunk(chunks[future], e)
+                    for result in results:
+                        report(result)
+    finally:
+        shutil.rmtree(claims_dir, ignore_errors=True)
+
+    stats.elapsed = time.perf_counter() - start
+    return stats
@@ -0,0 +1,162 @@
+"""Content-addressed on-disk cache for generated CLI specifications."""
+
+import hashlib
+import os
+import time
+from pathlib import Path
+
+from pydantic import ValidationError
+
+from cli_generator.atomic import write_atomic
+from cli_generator.models import CLISpec
+
+# Default location for cached specs (overridable with --cache-dir)
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "cli-gen" / "specs"
+
+
+def normalize_description(description: str) -> str:
+    """Normalize a description so trivially different inputs share a cache key."""
+    return " ".join(description.split()).casefold()
+
+
+class SpecCache:
+    """Persistent LRU cache of validated CLISpecs.
+
+    Entries are keyed on the model id, a hash of the system prompt and the
+    normalized description, and stored as CLISpec JSON so a hit costs one
+    file read plus ``model_validate_json``. Reading an entry refreshes its
+    modification time, which is used as the LRU clock for eviction.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path | str = DEFAULT_CACHE_DIR,
+        max_entries: int = 1000,
+        max_bytes: int | None = 50 * 1024 * 1024,
+        max_age: float | None = 30 * 24 * 60 * 60,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the cached spec files.
+            max_entries: Maximum number of entries kept after eviction.
+            max_bytes: Maximum total size of all entries, or None for no limit.
+            max_age: Seconds an entry may go unused before it expires,
+                     or None for no limit.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model: str, system_prompt: str, description: str) -> str:
+        """Build the content address for a generation request.
+
+        Args:
+            model: The model identifier used for generation.
+            system_prompt: The system prompt sent to the model.
+            description: The natural language CLI description.
+
+        Returns:
+            A hex digest identifying the request.
+        """
+        prompt_hash = hashlib.sha256(system_prompt.encode()).hexdigest()
+        payload = "\0".join([model, prompt_hash, normalize_description(description)])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        """Return the file path for a cache key."""
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> CLISpec | None:
+        """Look up a cached spec.
+
+        Args:
+            key: A key produced by make_key().
+
+        Returns:
+            The cached CLISpec, or None on a miss.
+        """
+        path = self._path(key)
+        try:
+            with path.open("rb") as f:
+                mtime = os.fstat(f.fileno()).st_mtime
+                data = f.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+
+        if self.max_age is not None and time.time() - mtime > self.max_age:
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+
+        try:
+            spec = CLISpec.model_validate_json(data)
+        except ValidationError:
+            # Corrupt or outdated entry - drop it and regenerate
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+
+        # Refresh the LRU clock
+        os.utime(path)
+        self.hits += 1
+        return spec
+
+    def put(self, key: str, spec: CLISpec) -> None:
+        """Store a spec and evict old entries if the cache is over its limits.
+
+        Args:
+            key: A key produced by make_key().
+            spec: The validated spec to store.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        write_atomic(path, spec.model_dump_json())
+        self.evict()
+
+    def evict(self) -> int:
+        """Remove expired entries, then least recently used ones over the limits.
+
+        Returns:
+            The number of entries removed.
+        """
+        if not self.cache_dir.exists():
+            return 0
+
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        # Oldest first
+        entries.sort(key=lambda entry: entry[0])
+        now = time.time()
+        total_bytes = sum(size for _, size, _ in entries)
+        removed = 0
+
+        for mtime, size, path in entries:
+            expired = self.max_age is not None and now - mtime > self.max_age
+            over_count = len(entries) - removed > self.max_entries
+            over_size = self.max_bytes is not None and total_bytes > self.max_bytes
+            if not (expired or over_count or over_size):
+                break
+            path.unlink(missing_ok=True)
+            total_bytes -= size
+            removed += 1
+
+        return removed
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        if not self.cache_dir.exists():
+            return
+        for path in self.cache_dir.glob("*.json"):
+            path.unlink(missing_ok=True)
@@ -0,0 +1,241 @@
+"""Record and replay model interactions for offline spec generation.
+
+A Cassette stores every model response of a run keyed on the request that
+produced it. In record mode the real model is wrapped and each response is
+appended to the cassette file as one JSON line; in replay mode a FunctionModel serves the
+recorded responses without any network access, so whole pipelines run
+deterministically in milliseconds.
+"""
+
+import hashlib
+import json
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, Literal
+
+from pydantic_ai.messages import (
+    ModelMessage,
+    ModelMessagesTypeAdapter,
+    ModelRequest,
+    ModelResponse,
+    RetryPromptPart,
+    TextPart,
+    ToolCallPart,
+    ToolReturnPart,
+    UserPromptPart,
+)
+from pydantic_ai.models import KnownModelName, Model, ModelRequestParameters, StreamedResponse
+from pydantic_ai.models.function import AgentInfo, DeltaToolCall, DeltaToolCalls, FunctionModel
+from pydantic_ai.models.wrapper import WrapperModel
+from pydantic_ai.settings import ModelSettings
+from pydantic_ai.tools import RunContext
+
+from cli_generator.atomic import write_atomic
+
+CassetteMode = Literal["auto", "record", "replay"]
+CASSETTE_MODES = ("auto", "record", "replay")
+
+# Version 2 is JSON Lines: a header, then one interaction per line
+CASSETTE_VERSION = 2
+
+
+def _part_key(part: Any) -> list[Any]:
+    """Return the stable content of a message part.
+
+    Timestamps and tool call ids change between runs, so only the kind of
+    the part and what the model sees of it are kept.
+    """
+    if isinstance(part, ToolCallPart):
+        return [part.part_kind, part.tool_name, part.args_as_dict()]
+    if isinstance(part, RetryPromptPart):
+        return [part.part_kind, part.tool_name, part.model_response()]
+    if isinstance(part, ToolReturnPart):
+        return [part.part_kind, part.tool_name, part.model_response_str()]
+    return [part.part_kind, str(getattr(part, "content", ""))]
+
+
+def request_key(messages: list[ModelMessage]) -> str:
+    """Build the cassette key for the messages sent to a model."""
+    history = []
+    for message in messages:
+        entry: dict[str, Any] = {
+            "kind": message.kind,
+            "parts": [_part_key(part) for part in message.parts],
+        }
+        if isinstance(message, ModelRequest):
+            entry["instructions"] = message.instructions
+        history.append(entry)
+    payload = json.dumps(history, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _last_prompt(messages: list[ModelMessage]) -> str:
+    """Return the last user prompt, to make cassette files readable."""
+    for message in reversed(messages):
+        if isinstance(message, ModelRequest):
+            for part in message.parts:
+                if isinstance(part, UserPromptPart):
+                    return str(part.content)
+    return ""
+
+
+def _read_interactions(text: str) -> list[dict[str, Any]]:
+    """Parse the interactions of a cassette file of any version."""
+    try:
+        records = [json.loads(line) for line in text.splitlines() if line.strip()]
+    except json.JSONDecodeError:
+        # Version 1: one indented JSON document
+        return list(json.loads(text).get("interactions", []))
+    return [record for record in records if "key" in record]
+
+
+class CassetteMissError(LookupError):
+    """Raised in replay mode when a request was never recorded."""
+
+
+class Cassette:
+    """Recorded model responses, stored as a JSON Lines file."""
+
+    def __init__(self, path: Path | str, mode: CassetteMode = "auto") -> None:
+        """Initialize the cassette, loading the file if it exists.
+
+        Args:
+            path: JSON file holding the recorded interactions.
+            mode: "record" always records (starting from an empty cassette),
+                  "replay" requires the file to exist, and "auto" replays an
+                  existing cassette and records a new one.
+
+        Raises:
+            ValueError: For an unknown mode.
+            FileNotFoundError: In replay mode, if the cassette does not exist.
+        """
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"mode must be one of {', '.join(CASSETTE_MODES)}")
+        self.path = Path(path)
+        if mode == "replay" and not self.path.exists():
+            raise FileNotFoundError(f"Cassette not found: {self.path}")
+        # Whether requests are served from the cassette instead of a model
+        self.replaying = mode == "replay" or (mode == "auto" and self.path.exists())
+        self.interactions: dict[str, dict[str, Any]] = {}
+        self.hits = 0
+        self.recorded = 0
+        # Whether the file holds this cassette, so responses can be appended
+        self._saved = False
+        if self.replaying:
+            for interaction in _read_interactions(self.path.read_text()):
+                self.interactions[interaction["key"]] = interaction
+
+    def __len__(self) -> int:
+        """Return the number of recorded interactions."""
+        return len(self.interactions)
+
+    def add(self, messages: list[ModelMessage], response: ModelResponse) -> None:
+        """Record the response to a request and append it to the cassette file."""
+        key = request_key(messages)
+        interaction = {
+            "key": key,
+            "model": response.model_name,
+            "prompt": _last_prompt(messages),
+            "response": ModelMessagesTypeAdapter.dump_python([response], mode="json")[0],
+        }
+        self.interactions[key] = interaction
+        self.recorded += 1
+        if not self._saved:
+            # The first response replaces whatever file a re-recording started from
+            self.save()
+            return
+        with self.path.open("a") as f:
+            f.write(json.dumps(interaction) + "\n")
+
+    def lookup(self, messages: list[ModelMessage]) -> ModelResponse:
+        """Return the recorded response to a request.
+
+        Raises:
+            CassetteMissError: If the request is not in the cassette.
+        """
+        interaction = self.interactions.get(request_key(messages))
+        if interaction is None:
+            prompt = _last_prompt(messages)
+            raise CassetteMissError(f"No recorded response in {self.path} for: {prompt}")
+        self.hits += 1
+        [response] = ModelMessagesTypeAdapter.validate_python([interaction["response"]])
+        assert isinstance(response, ModelResponse)
+        return response
+
+    def save(self) -> None:
+        """Write the whole cassette file: a header and every interaction."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        records = [{"version": CASSETTE_VERSION}, *self.interactions.values()]
+        write_atomic(self.path, "".join(json.dumps(record) + "\n" for record in records))
+        self._saved = True
+
+    def record(self, model: Model | KnownModelName | str) -> "RecordingModel":
+        """Wrap a model so that its responses are recorded."""
+        return RecordingModel(model, self)
+
+    def replay(self) -> FunctionModel:
+        """Return a model serving the recorded responses."""
+
+        async def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+            return self.lookup(messages)
+
+        async def stream(
+            messages: list[ModelMessage], info: AgentInfo
+        ) -> AsyncIterator[str | DeltaToolCalls]:
+            response = self.lookup(messages)
+            for index, part in enumerate(response.parts):
+                if isinstance(part, TextPart):
+                    yield part.content
+                elif isinstance(part, ToolCallPart):
+                    yield {
+                        index: DeltaToolCall(
+                            name=part.tool_name,
+                            json_args=part.args_as_json_str(),
+                            tool_call_id=part.tool_call_id,
+                        )
+                    }
+
+        return FunctionModel(respond, stream_function=stream, model_name="cassette")
+
+
+class RecordingModel(WrapperModel):
+    """A model that records every response into a cassette."""
+
+    def __init__(self, wrapped: Model | KnownModelName | str, cassette: Cassette) -> None:
+        """Initialize the wrapper.
+
+        Args:
+            wrapped: The model whose responses are recorded.
+            cassette: Where the responses are recorded.
+        """
+        super().__init__(wrapped)  # type: ignore[arg-type]
+        self.cassette = cassette
+
+    async def request(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> ModelResponse:
+        """Forward a request to the wrapped model and record the response."""
+        response = await self.wrapped.request(
+            messages, model_settings, model_request_parameters
+        )
+        self.cassette.add(messages, response)
+        return response
+
+    @asynccontextmanager
+    async def request_stream(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+        run_context: RunContext[Any] | None = None,
+    ) -> AsyncIterator[StreamedResponse]:
+        """Stream from the wrapped model and record the complete response."""
+        async with self.wrapped.request_stream(
+            messages, model_settings, model_request_parameters, run_context
+        ) as response:
+            yield response
+        self.cassette.add(messages, response.get())
@@ -1,26 +1,28 @@
 """CLI interface for the CLI generator."""
 
-import asyncio
 import json
 import os
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import click
-from dotenv import load_dotenv
 from pydantic import ValidationError
-from pydantic_ai.models.test import TestModel
 from rich.console import Console
 from rich.panel import Panel
-from rich.syntax import Syntax
 from rich.table import Table
 
-from cli_generator.generators.code_generator import CodeGenerator
-from cli_generator.generators.spec_generator import SpecGenerator
+from cli_generator.cache import DEFAULT_CACHE_DIR, SpecCache
+from cli_generator.instrumentation import Recorder, timed
 from cli_generator.models import CLISpec
 
-# Load environment variables from .env file
-load_dotenv()
+# Heavy modules (pydantic_ai, jinja2, dotenv, rich.syntax) are imported inside
+# the commands that need them, so `--help` and `build` start quickly.
+if TYPE_CHECKING:
+    from cli_generator.cassette import Cassette
+    from cli_generator.diff import SpecDiff
+    from cli_generator.registry import Registry, RegistryEntry
+    from cli_generator.generators.spec_generator import SpecGenerator
 
 # Rich console for pretty output
 console = Console()
@@ -47,13 +49,15 @@ def print_info(message: str) -> None:
 
 def print_spec_json(spec: CLISpec) -> None:
     """Pretty print a CLISpec as JSON with syntax highlighting."""
+    from rich.syntax import Syntax
+
     json_str = spec.model_dump_json(indent=2)
     syntax = Syntax(json_str, "json", theme="monokai", line_numbers=True)
     console.print(Panel(syntax, title="[bold]CLI Specification[/bold]", border_style="blue"))
 
 
-def print_spec_summary(spec: CLISpec) -> None:
-    """Print a summary table of the CLISpec."""
+def build_spec_summary(spec: CLISpec) -> Table:
+    """Build a summary table of the CLISpec."""
     table = Table(title=f"[bold]{spec.name}[/bold] - {spec.description}")
     table.add_column("Command", style="cyan")
     table.add_column("Description", style="white")
@@ -69,7 +73,420 @@ def print_spec_summary(spec: CLISpec) -> None:
         global_opts = ", ".join(f"--{opt.name}" for opt in spec.global_options)
         table.add_row("[dim]global[/dim]", "[dim]Available to all commands[/dim]", "-", f"[dim]{global_opts}[/dim]")
 
+    return table
+
+
+def print_spec_summary(spec: CLISpec) -> None:
+    """Print a summary table of the CLISpec."""
+    console.print(build_spec_summary(spec))
+
+
+def print_spec_diff(spec_diff: "SpecDiff") -> None:
+    """Print a table of the differences between two specs."""
+    if spec_diff.is_empty:
+        print_info("The specifications are equivalent")
+        return
+
+    table = Table(title="Specification Changes")
+    table.add_column("Change", style="cyan")
+    table.add_column("Item", style="white")
+    table.add_column("Details", style="yellow")
+    for field in spec_diff.fields:
+        table.add_row("changed", field, "-")
+    for change, names in (
+        ("added", spec_diff.global_options.added),
+        ("removed", spec_diff.global_options.removed),
+        ("changed", spec_diff.global_options.changed),
+    ):
+        for name in names:
+            table.add_row(change, f"--{name}", "global option")
+    for name in spec_diff.commands.added:
+        table.add_row("[green]added[/green]", name, "command")
+    for name in spec_diff.commands.removed:
+        table.add_row("[red]removed[/red]", name, "command")
+    for command in spec_diff.changed_commands:
+        table.add_row("changed", command.name, command.summary() or "-")
+    if spec_diff.reordered:
+        table.add_row("reordered", "commands", "-")
     console.print(table)
+    print_info(spec_diff.summary())
+
+
+def load_environment() -> None:
+    """Load environment variables from a .env file."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+def create_spec_cache(
+    test_mode: bool, cache_dir: str | None, no_cache: bool
+) -> SpecCache | None:
+    """Create the spec cache selected by command-line options.
+
+    In test mode the cache is only used when a cache directory is given
+    explicitly, so test runs never write to the user's cache.
+    """
+    if no_cache or (test_mode and not cache_dir):
+        return None
+    return SpecCache(cache_dir or DEFAULT_CACHE_DIR)
+
+
+def create_spec_generator(
+    model: str,
+    test_mode: bool,
+    cache_dir: str | None,
+    no_cache: bool,
+    fanout: bool = False,
+    fallback_models: tuple[str, ...] = (),
+    hedge_delay: float = 2.0,
+    example_paths: tuple[str, ...] = (),
+    recorder: Recorder | None = None,
+    engine: str = "llm",
+    local_threshold: float = 0.9,
+    cassette: "Cassette | None" = None,
+) -> "SpecGenerator":
+    """Create a SpecGenerator configured from command-line options.
+
+    Also loads environment variables (API keys) from a .env file. Fallback
+    models enable hedging against the primary model. Example paths enable
+    retrieved few-shot examples, which also include past generations from
+    the spec cache. The engine selects between the model and the local
+    rule-based synthesizer. A cassette records or replays every model call,
+    so the spec cache is bypassed while one is in use.
+    """
+    from cli_generator.generators.spec_generator import SpecGenerator
+
+    load_environment()
+    cache = None if cassette is not None else create_spec_cache(test_mode, cache_dir, no_cache)
+
+    examples = None
+    if example_paths:
+        from cli_generator.examples import ExampleLibrary
+
+        paths = [Path(path) for path in example_paths]
+        if cache is not None and cache.cache_dir.is_dir():
+            paths.append(cache.cache_dir)
+        examples = ExampleLibrary.from_paths(paths)
+    models: list = [model, *fallback_models]
+
+    if test_mode:
+        from pydantic_ai.models.test import TestModel
+
+        models = [TestModel() for _ in models]
+    if cassette is not None:
+        if cassette.replaying:
+            # Replays come from one source, so there is nothing to hedge against
+            models = [cassette.replay()]
+        else:
+            models = [cassette.record(m) for m in models]
+    return SpecGenerator(
+        model=models if len(models) > 1 else models[0],
+        cache=cache,
+        fanout=fanout,
+        hedge_delay=hedge_delay,
+        examples=examples,
+        recorder=recorder,
+        engine=engine,
+        local_threshold=local_threshold,
+    )
+
+
+def print_generator_stats(generator: "SpecGenerator") -> None:
+    """Print cache counters, repairs, hedge rates and the example library size."""
+    if generator.cache is None:
+        print_info("Spec cache: disabled")
+    else:
+        cache = generator.cache
+        print_info(
+            f"Spec cache: {cache.hits} hit(s), {cache.misses} miss(es) "
+            f"[dim]({cache.cache_dir})[/dim]"
+        )
+
+    if generator.repairer is not None:
+        print_info(f"Local repairs: {generator.repairer.count}")
+        for repair in generator.repairer.repairs:
+            console.print(f"  [dim]{repair}[/dim]")
+
+    if generator.examples is not None:
+        print_info(f"Example library: {len(generator.examples)} spec(s)")
+
+    if generator.engine != "llm":
+        counts = generator.engine_counts
+        print_info(f"Engines: {counts['local']} local, {counts['llm']} model")
+
+    stats = generator.hedge_stats
+    if stats is not None:
+        print_info(
+            f"Hedging: fired on {stats.fire_rate:.0%} of {stats.requests} request(s) "
+            f"[dim](delay {generator.hedge_delay}s)[/dim]"
+        )
+        for name in generator.model_names:
+            console.print(f"  [dim]{name}: won {stats.win_rate(name):.0%}[/dim]")
+
+
+def print_engine(generator: "SpecGenerator") -> None:
+    """Report whether the last spec came from the local engine or the model."""
+    synthesis = generator.last_synthesis
+    if generator.engine_counts["local"]:
+        print_info(
+            f"Served by the local engine (confidence {synthesis.confidence:.0%}, "
+            f"no model call)"
+        )
+    elif synthesis is not None:
+        print_info(
+            f"Served by the model (local confidence {synthesis.confidence:.0%} "
+            f"below {generator.local.threshold:.0%})"
+        )
+
+
+def open_cassette(path: str | None, mode: str) -> "Cassette | None":
+    """Open the cassette given with --cassette, if any."""
+    if path is None:
+        return None
+    from cli_generator.cassette import Cassette
+
+    return Cassette(path, mode)  # type: ignore[arg-type]
+
+
+def report_cassette(cassette: "Cassette | None") -> None:
+    """Report how many responses were replayed from or recorded to the cassette."""
+    if cassette is None:
+        return
+    if cassette.replaying:
+        print_info(f"Replayed {cassette.hits} response(s) from {cassette.path}")
+    else:
+        print_info(f"Recorded {cassette.recorded} response(s) to {cassette.path}")
+
+
+def create_recorder(stats: bool, metrics_file: str | None) -> Recorder | None:
+    """Create a recorder when --stats or --metrics-file asks for one."""
+    if not stats and not metrics_file:
+        return None
+    return Recorder()
+
+
+def report_instrumentation(
+    recorder: Recorder | None, stats: bool, metrics_file: str | None
+) -> None:
+    """Print per-call and per-stage statistics and write the metrics file."""
+    if recorder is None:
+        return
+
+    if stats:
+        console.print()
+        calls = Table(title="Model Calls")
+        calls.add_column("Operation", style="cyan")
+        calls.add_column("Model", style="white")
+        calls.add_column("Cache", style="white")
+        calls.add_column("Tokens in", justify="right", style="yellow")
+        calls.add_column("Tokens out", justify="right", style="yellow")
+        calls.add_column("Retries", justify="right", style="red")
+        calls.add_column("Time", justify="right", style="green")
+        for call in recorder.calls:
+            calls.add_row(
+                call.operation,
+                call.model,
+                call.cache or "-",
+                str(call.input_tokens),
+                str(call.output_tokens),
+                str(call.retries),
+                f"{call.wall_time:.3f}s",
+            )
+        console.print(calls)
+
+        summary = recorder.summary()
+        stages = Table(title="Stages")
+        stages.add_column("Stage", style="cyan")
+        stages.add_column("Count", justify="right", style="white")
+        stages.add_column("Time", justify="right", style="green")
+        for name, stage in summary["stages"].items():
+            stages.add_row(name, str(stage["count"]), f"{stage['seconds']:.3f}s")
+        console.print(stages)
+        print_info(
+            f"Totals: {summary['calls']} call(s), {summary['input_tokens']} input / "
+            f"{summary['output_tokens']} output tokens, {summary['retries']} retries"
+        )
+
+    if metrics_file:
+        recorder.write_json(Path(metrics_file))
+        print_success(f"Metrics written to {metrics_file}")
+
+
+def load_spec_or_exit(spec_path: Path, trusted_cache: bool = True) -> CLISpec:
+    """Load and validate a spec file, exiting with an error if it is invalid.
+
+    Files that passed validation before are loaded from the trusted spec
+    cache unless trusted_cache is False (see cli_generator.loader).
+    """
+    from cli_generator.loader import TRUSTED_CACHE_DIR, load_spec
+
+    try:
+        return load_spec(spec_path, TRUSTED_CACHE_DIR if trusted_cache else None)
+    except json.JSONDecodeError as e:
+        print_error(f"Invalid JSON in {spec_path}: {e}")
+        sys.exit(1)
+    except ValidationError as e:
+        print_error(f"Invalid specification: {e}")
+        sys.exit(1)
+
+
+def open_registry(path: str | None) -> "Registry":
+    """Open the spec registry at path, or the default one."""
+    from cli_generator.registry import DEFAULT_REGISTRY_PATH, Registry
+
+    return Registry(path or DEFAULT_REGISTRY_PATH)
+
+
+def print_registry_error(error: Exception) -> None:
+    """Print an error from a registry database that cannot be used."""
+    print_error(f"Cannot use the spec registry: {error}")
+
+
+def load_spec_reference_or_exit(
+    reference: str, registry_path: str | None, trusted_cache: bool = True
+) -> CLISpec:
+    """Load a spec file, or a "registry:name[@version]" spec from the registry."""
+    import sqlite3
+
+    from cli_generator.registry import REFERENCE_PREFIX
+
+    if not reference.startswith(REFERENCE_PREFIX):
+        return load_spec_or_exit(Path(reference), trusted_cache)
+    try:
+        with open_registry(registry_path) as registry:
+            return registry.resolve(reference)
+    except KeyError as e:
+        print_error(e.args[0])
+        sys.exit(1)
+    except ValueError as e:
+        print_error(str(e))
+        sys.exit(1)
+    except sqlite3.Error as e:
+        print_registry_error(e)
+        sys.exit(1)
+
+
+def print_registry_entries(entries: list["RegistryEntry"], title: str) -> None:
+    """Print a table of registry entries."""
+    from datetime import datetime
+
+    table = Table(title=title)
+    table.add_column("CLI", style="cyan")
+    table.add_column("Version", justify="right", style="white")
+    table.add_column("Commands", justify="right", style="white")
+    table.add_column("Description", style="white")
+    table.add_column("Added", style="green")
+    for entry in entries:
+        table.add_row(
+            entry.name,
+            str(entry.version),
+            str(entry.commands),
+            entry.description,
+            datetime.fromtimestamp(entry.added).strftime("%Y-%m-%d %H:%M"),
+        )
+    console.print(table)
+
+
+# Options shared by every command that generates a spec with the LLM
+cache_dir_option = click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False),
+    envvar="CLI_GEN_CACHE_DIR",
+    help=f"Directory for cached specs (default: {DEFAULT_CACHE_DIR})",
+)
+no_cache_option = click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Always call the model, bypassing the spec cache",
+)
+fanout_option = click.option(
+    "--fanout",
+    is_flag=True,
+    help="Generate a skeleton first, then each command in parallel (for large CLIs)",
+)
+stream_option = click.option(
+    "--stream/--no-stream",
+    default=None,
+    help="Render the summary as the spec streams in (default: on for terminals)",
+)
+fallback_model_option = click.option(
+    "--fallback-model", "-F",
+    "fallback_models",
+    multiple=True,
+    help="Model raced against the primary model when it is slow (repeatable)",
+)
+hedge_delay_option = click.option(
+    "--hedge-delay",
+    type=click.FloatRange(min=0),
+    default=2.0,
+    show_default=True,
+    help="Seconds to wait for a model before also asking the next fallback model",
+)
+examples_option = click.option(
+    "--examples", "-e",
+    "example_paths",
+    type=click.Path(exists=True),
+    multiple=True,
+    help="Spec file or directory of specs to draw few-shot examples from (repeatable)",
+)
+stats_option = click.option(
+    "--stats",
+    is_flag=True,
+    help="Print tokens, retries and timings per model call and per stage",
+)
+metrics_file_option = click.option(
+    "--metrics-file",
+    type=click.Path(dir_okay=False),
+    help="Write per-call and per-stage metrics to a JSON file",
+)
+engine_option = click.option(
+    "--engine",
+    type=click.Choice(["auto", "llm", "local"]),
+    default="auto",
+    show_default=True,
+    help="Use the model, the local rule-based synthesizer, or the synthesizer "
+    "when it is confident enough (auto)",
+)
+registry_option = click.option(
+    "--registry",
+    type=click.Path(dir_okay=False),
+    envvar="CLI_GEN_REGISTRY",
+    help="Spec registry database (default: ~/.cache/cli-gen/registry.sqlite3)",
+)
+layout_option = click.option(
+    "--layout",
+    type=click.Choice(["single", "lazy"]),
+    default="single",
+    show_default=True,
+    help="Put all commands in cli.py, or give each command a module imported "
+    "only when it runs (lazy, for CLIs with many commands)",
+)
+local_threshold_option = click.option(
+    "--local-threshold",
+    type=click.FloatRange(0, 1),
+    default=0.9,
+    show_default=True,
+    help="Minimum confidence for --engine auto to skip the model",
+)
+cassette_option = click.option(
+    "--cassette",
+    "cassette_path",
+    type=click.Path(dir_okay=False),
+    help="Record model responses to this file, or replay them if it exists",
+)
+cassette_mode_option = click.option(
+    "--cassette-mode",
+    type=click.Choice(["auto", "record", "replay"]),
+    default="auto",
+    show_default=True,
+    help="Force recording a new cassette or replaying an existing one",
+)
+verbose_option = click.option(
+    "--verbose", "-v",
+    is_flag=True,
+    help="Show cache statistics and other details",
+)
 
 
 @click.group()
@@ -101,7 +518,40 @@ def cli() -> None:
     hidden=True,
     help="Use test model (for testing)",
 )
-def spec_cmd(description: str, save: str | None, model: str, test_mode: bool) -> None:
+@cache_dir_option
+@no_cache_option
+@fanout_option
+@fallback_model_option
+@hedge_delay_option
+@examples_option
+@engine_option
+@local_threshold_option
+@stream_option
+@cassette_option
+@cassette_mode_option
+@stats_option
+@metrics_file_option
+@verbose_option
+def spec_cmd(
+    description: str,
+    save: str | None,
+    model: str,
+    test_mode: bool,
+    cache_dir: str | None,
+    no_cache: bool,
+    fanout: bool,
+    fallback_models: tuple[str, ...],
+    hedge_delay: float,
+    example_paths: tuple[str, ...],
+    engine: str,
+    local_threshold: float,
+    stream: bool | None,
+    cassette_path: str | None,
+    cassette_mode: str,
+    stats: bool,
+    metrics_file: str | None,
+    verbose: bool,
+) -> None:
     """Generate a CLI specification from a description.
 
     DESCRIPTION is a natural language description of the CLI you want to create.
@@ -111,39 +561,235 @@ def spec_cmd(description: str, save: str | None, model: str, test_mode: bool) ->
         cli-gen spec "A CLI that converts images between formats"
 
         cli-gen spec "A file manager with list, copy, and delete commands" --save spec.json
+
+        cli-gen spec "A counter tool" --no-cache
+
+        cli-gen spec "A counter tool" -F anthropic:claude-3-5-haiku-latest --hedge-delay 1.5
+
+        cli-gen spec "A counter tool" --cassette counter.json
     """
     try:
         print_info(f"Generating CLI specification...")
+        recorder = create_recorder(stats, metrics_file)
+        cassette = open_cassette(cassette_path, cassette_mode)
 
         # Create generator
-        if test_mode:
-            generator = SpecGenerator(model=TestModel())
-        else:
-            generator = SpecGenerator(model=model)
-
-        # Run async generation
-        spec = asyncio.run(_generate_spec(generator, description))
-
-        # Display the spec
-        print_spec_json(spec)
-        print_spec_summary(spec)
+        generator = create_spec_generator(
+            model,
+            test_mode,
+            cache_dir,
+            no_cache,
+            fanout=fanout,
+            fallback_models=fallback_models,
+            hedge_delay=hedge_delay,
+            example_paths=example_paths,
+            recorder=recorder,
+            engine=engine,
+            local_threshold=local_threshold,
+            cassette=cassette,
+        )
+
+        # Run async generation and display the spec
+        with timed(recorder, "spec_generation"):
+            spec = generate_spec_with_progress(generator, description, stream)
+        print_engine(generator)
+        report_cassette(cassette)
+
+        if verbose:
+            print_generator_stats(generator)
 
         # Save if requested
         if save:
             save_path = Path(save)
-            save_path.write_text(spec.model_dump_json(indent=2))
+            with timed(recorder, "write", "spec"):
+                save_path.write_text(spec.model_dump_json(indent=2))
             print_success(f"Specification saved to {save_path}")
 
+        report_instrumentation(recorder, stats, metrics_file)
+
     except Exception as e:
         print_error(str(e))
         sys.exit(1)
 
 
-async def _generate_spec(generator: SpecGenerator, description: str) -> CLISpec:
+async def _generate_spec(generator: "SpecGenerator", description: str) -> CLISpec:
     """Generate a CLISpec from description."""
     return await generator.generate(description)
 
 
+async def _stream_spec(generator: "SpecGenerator", description: str) -> CLISpec:
+    """Generate a CLISpec, rendering the summary table as commands arrive."""
+    from rich.live import Live
+
+    spec = None
+    with Live(console=console, refresh_per_second=8) as live:
+        async for spec in generator.generate_stream(description):
+            live.update(build_spec_summary(spec))
+    if spec is None:
+        raise RuntimeError("Model returned no specification")
+    return spec
+
+
+def generate_spec_with_progress(
+    generator: "SpecGenerator", description: str, stream: bool | None
+) -> CLISpec:
+    """Generate a spec, streaming the summary when requested.
+
+    Streaming defaults to on when writing to a terminal. Returns the spec
+    after printing its JSON and summary.
+    """
+    import asyncio
+
+    if stream is None:
+        stream = console.is_terminal
+
+    if stream:
+        spec = asyncio.run(_stream_spec(generator, description))
+        print_spec_json(spec)
+    else:
+        spec = asyncio.run(_generate_spec(generator, description))
+        print_spec_json(spec)
+        print_spec_summary(spec)
+
+    return spec
+
+
+@cli.command("spec-batch")
+@click.argument("input_file", type=click.File("r"))
+@click.option(
+    "--output", "-o",
+    type=click.File("w"),
+    default="specs.jsonl",
+    help="JSONL file to stream results to",
+)
+@click.option(
+    "--concurrency", "-c",
+    type=click.IntRange(min=1),
+    default=8,
+    help="Maximum number of concurrent generations",
+)
+@click.option(
+    "--model", "-m",
+    default="openai:gpt-4o-mini",
+    help="Model to use for generation",
+)
+@click.option(
+    "--test-mode",
+    is_flag=True,
+    hidden=True,
+    help="Use test model (for testing)",
+)
+@cache_dir_option
+@no_cache_option
+@fallback_model_option
+@hedge_delay_option
+@examples_option
+@engine_option
+@local_threshold_option
+@stats_option
+@metrics_file_option
+@verbose_option
+def spec_batch_cmd(
+    input_file: click.utils.LazyFile,
+    output: click.utils.LazyFile,
+    concurrency: int,
+    model: str,
+    test_mode: bool,
+    cache_dir: str | None,
+    no_cache: bool,
+    fallback_models: tuple[str, ...],
+    hedge_delay: float,
+    example_paths: tuple[str, ...],
+    engine: str,
+    local_threshold: float,
+    stats: bool,
+    metrics_file: str | None,
+    verbose: bool,
+) -> None:
+    """Generate specifications for many descriptions concurrently.
+
+    INPUT_FILE holds one description per line, either as plain text or as
+    JSON (a string or an object with a "description" key). Use '-' to read
+    from stdin. Each result is written to the output JSONL as soon as it
+    completes; failures are recorded there instead of aborting the batch.
+
+    Examples:
+
+        cli-gen spec-batch ideas.txt --output specs.jsonl
+
+        cat ideas.jsonl | cli-gen spec-batch - --concurrency 32
+    """
+    import asyncio
+
+    from cli_generator.batch import BatchResult, generate_batch, read_descriptions
+
+    try:
+        descriptions = read_descriptions(input_file.read())
+        if not descriptions:
+            print_error("No descriptions found in input")
+            sys.exit(1)
+
+        print_info(
+            f"Generating {len(descriptions)} specifications "
+            f"(concurrency {concurrency})..."
+        )
+        recorder = create_recorder(stats, metrics_file)
+        generator = create_spec_generator(
+            model,
+            test_mode,
+            cache_dir,
+            no_cache,
+            fallback_models=fallback_models,
+            hedge_delay=hedge_delay,
+            example_paths=example_paths,
+            recorder=recorder,
+            engine=engine,
+            local_threshold=local_threshold,
+        )
+
+        def write_result(result: BatchResult) -> None:
+            output.write(result.model_dump_json(exclude_none=True) + "\n")
+            output.flush()
+            if result.error is not None:
+                print_error(f"[{result.index}] {result.error}")
+            elif verbose:
+                print_success(
+                    f"[{result.index}] {result.spec.name} ({result.latency:.2f}s)"
+                )
+
+        with timed(recorder, "spec_generation"):
+            batch_stats = asyncio.run(
+                generate_batch(generator, descriptions, concurrency, write_result)
+            )
+
+        console.print()
+        table = Table(title="Batch Summary")
+        table.add_column("Metric", style="cyan")
+        table.add_column("Value", style="white")
+        table.add_row("Succeeded", str(batch_stats.succeeded))
+        table.add_row("Failed", str(batch_stats.failed))
+        table.add_row("Elapsed", f"{batch_stats.elapsed:.2f}s")
+        table.add_row("Throughput", f"{batch_stats.throughput:.1f} specs/min")
+        table.add_row("p50 latency", f"{batch_stats.percentile(50):.2f}s")
+        table.add_row("p95 latency", f"{batch_stats.percentile(95):.2f}s")
+        if generator.engine != "llm":
+            table.add_row("Served locally", str(generator.engine_counts["local"]))
+            table.add_row("Served by model", str(generator.engine_counts["llm"]))
+        console.print(table)
+
+        if verbose:
+            print_generator_stats(generator)
+
+        report_instrumentation(recorder, stats, metrics_file)
+
+        if batch_stats.failed:
+            sys.exit(1)
+
+    except Exception as e:
+        print_error(str(e))
+        sys.exit(1)
+
+
 @cli.command("generate")
 @click.argument("description")
 @click.option(
@@ -168,12 +814,42 @@ async def _generate_spec(generator: SpecGenerator, description: str) -> CLISpec:
     hidden=True,
     help="Use test model (for testing)",
 )
+@cache_dir_option
+@no_cache_option
+@fanout_option
+@fallback_model_option
+@hedge_delay_option
+@examples_option
+@engine_option
+@local_threshold_option
+@stream_option
+@cassette_option
+@cassette_mode_option
+@layout_option
+@stats_option
+@metrics_file_option
+@verbose_option
 def generate_cmd(
     description: str,
     output: str,
     dry_run: bool,
     model: str,
     test_mode: bool,
+    cache_dir: str | None,
+    no_cache: bool,
+    fanout: bool,
+    fallback_models: tuple[str, ...],
+    hedge_delay: float,
+    example_paths: tuple[str, ...],
+    engine: str,
+    local_threshold: float,
+    stream: bool | None,
+    cassette_path: str | None,
+    cassette_mode: str,
+    layout: str,
+    stats: bool,
+    metrics_file: str | None,
+    verbose: bool,
 ) -> None:
     """Generate a complete CLI from a description.
 
@@ -189,29 +865,46 @@ def generate_cmd(
     """
     try:
         print_info("Generating CLI specification...")
+        recorder = create_recorder(stats, metrics_file)
+        cassette = open_cassette(cassette_path, cassette_mode)
 
         # Create spec generator
-        if test_mode:
-            spec_generator = SpecGenerator(model=TestModel())
-        else:
-            spec_generator = SpecGenerator(model=model)
-
-        # Generate spec
-        spec = asyncio.run(_generate_spec(spec_generator, description))
-
-        # Show the spec
-        print_spec_json(spec)
-        print_spec_summary(spec)
+        spec_generator = create_spec_generator(
+            model,
+            test_mode,
+            cache_dir,
+            no_cache,
+            fanout=fanout,
+            fallback_models=fallback_models,
+            hedge_delay=hedge_delay,
+            example_paths=example_paths,
+            recorder=recorder,
+            engine=engine,
+            local_threshold=local_threshold,
+            cassette=cassette,
+        )
+
+        # Generate and show the spec
+        with timed(recorder, "spec_generation"):
+            spec = generate_spec_with_progress(spec_generator, description, stream)
+        print_engine(spec_generator)
+        report_cassette(cassette)
+
+        if verbose:
+            print_generator_stats(spec_generator)
 
         if dry_run:
             print_info("Dry run - no files generated")
+            report_instrumentation(recorder, stats, metrics_file)
             return
 
         # Generate code
         print_info("Generating code...")
-        code_generator = CodeGenerator()
+        from cli_generator.generators.code_generator import CodeGenerator
+
+        code_generator = CodeGenerator(recorder=recorder)
         output_path = Path(output)
-        result = code_generator.generate(spec, output_path)
+        result = code_generator.generate(spec, output_path, layout=layout)
 
         # Show results
         console.print()
@@ -238,58 +931,254 @@ def generate_cmd(
             border_style="green",
         ))
 
+        report_instrumentation(recorder, stats, metrics_file)
+
     except Exception as e:
         print_error(str(e))
         sys.exit(1)
 
 
+@cli.command("add")
+@click.argument("spec_file", type=click.Path(exists=True, dir_okay=False))
+@click.argument("descriptions", nargs=-1, required=True)
+@click.option(
+    "--save", "-s",
+    type=click.Path(),
+    help="Save the extended spec here instead of updating SPEC_FILE",
+)
+@click.option(
+    "--model", "-m",
+    default="openai:gpt-4o-mini",
+    help="Model to use for generation",
+)
+@click.option(
+    "--test-mode",
+    is_flag=True,
+    hidden=True,
+    help="Use test model (for testing)",
+)
+@stats_option
+@metrics_file_option
+def add_cmd(
+    spec_file: str,
+    descriptions: tuple[str, ...],
+    save: str | None,
+    model: str,
+    test_mode: bool,
+    stats: bool,
+    metrics_file: str | None,
+) -> None:
+    """Add commands to a saved specification file.
+
+    SPEC_FILE is a JSON file containing a CLI specification. Each of
+    DESCRIPTIONS describes one new command; all commands are generated
+    concurrently and merged into the spec in one step.
+
+    Examples:
+
+        cli-gen add spec.json "Export notes as JSON" "Import notes from a file"
+
+        cli-gen add spec.json "Search by tag" --save spec-v2.json
+    """
+    try:
+        spec_path = Path(spec_file)
+        spec = load_spec_or_exit(spec_path)
+
+        import asyncio
+
+        print_info(f"Generating {len(descriptions)} command(s)...")
+        recorder = create_recorder(stats, metrics_file)
+        generator = create_spec_generator(
+            model, test_mode, None, no_cache=True, recorder=recorder
+        )
+        with timed(recorder, "spec_generation"):
+            new_spec = asyncio.run(generator.add_commands(spec, list(descriptions)))
+
+        print_spec_summary(new_spec)
+
+        save_path = Path(save) if save else spec_path
+        with timed(recorder, "write", "spec"):
+            save_path.write_text(new_spec.model_dump_json(indent=2))
+        print_success(f"Specification saved to {save_path}")
+
+        report_instrumentation(recorder, stats, metrics_file)
+
+    except Exception as e:
+        print_error(str(e))
+        sys.exit(1)
+
+
+def build_many_specs(
+    patterns: tuple[str, ...],
+    output_path: Path,
+    jobs: int,
+    incremental: bool,
+    layout: str,
+    recorder: Recorder | None,
+    trusted_cache: bool = True,
+) -> None:
+    """Build several spec files and print a per-spec summary, exiting on failures."""
+    from cli_generator.builds import build_specs, expand_spec_paths
+    from cli_generator.loader import TRUSTED_CACHE_DIR
+
+    paths = expand_spec_paths(patterns)
+    if not paths:
+        print_error("No spec files found")
+        sys.exit(1)
+
+    print_info(f"Building {len(paths)} specifications ({jobs} job(s))...")
+    results = []
+    with timed(recorder, "build"):
+        build_stats = build_specs(
+            paths,
+            output_path,
+            jobs,
+            incremental,
+            results.append,
+            layout=layout,
+            cache_dir=TRUSTED_CACHE_DIR if trusted_cache else None,
+        )
+
+    console.print()
+    table = Table(title="Build Summary")
+    table.add_column("Spec", style="cyan")
+    table.add_column("CLI", style="white")
+    table.add_column("Files", style="green")
+    table.add_column("Time", justify="right", style="white")
+    for result in sorted(results, key=lambda result: result.path):
+        if result.error is not None:
+            files = f"[red]{result.error}[/red]"
+        elif incremental:
+            files = f"{result.written} written, {result.skipped} unchanged"
+        else:
+            files = f"{result.written} written"
+        table.add_row(result.path, result.name or "-", files, f"{result.elapsed:.3f}s")
+    console.print(table)
+
+    print_info(
+        f"Built {build_stats.succeeded} of {build_stats.total} CLI(s) in "
+        f"{build_stats.elapsed:.2f}s ({build_stats.throughput:.1f} specs/s)"
+    )
+    if build_stats.failed:
+        print_error(f"{build_stats.failed} spec(s) failed")
+        sys.exit(1)
+    print_success(f"CLIs generated in [bold]{output_path}[/bold]")
+
+
 @cli.command("build")
-@click.argument("spec_file", type=click.Path(exists=True))
+@click.argument("spec_files", nargs=-1, required=True)
 @click.option(
     "--output", "-o",
     type=click.Path(),
     default="./generated",
-    help="Output directory for generated CLI",
+    help="Output directory for generated CLI (one subdirectory per CLI for several specs)",
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help="Skip rendering when the spec is unchanged and leave identical files untouched",
+)
+@click.option(
+    "--jobs", "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Worker processes for building several specs",
+)
+@click.option(
+    "--previous",
+    help="Spec of the last build; only changed commands are rendered again (implies --incremental)",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Validate every spec, even if an identical one passed before",
 )
-def build_cmd(spec_file: str, output: str) -> None:
-    """Build a CLI from a saved specification file.
+@layout_option
+@registry_option
+@stats_option
+@metrics_file_option
+def build_cmd(
+    spec_files: tuple[str, ...],
+    output: str,
+    incremental: bool,
+    jobs: int,
+    previous: str | None,
+    no_cache: bool,
+    layout: str,
+    registry: str | None,
+    stats: bool,
+    metrics_file: str | None,
+) -> None:
+    """Build CLIs from saved specification files.
 
-    SPEC_FILE is a JSON file containing a CLI specification.
+    SPEC_FILES are JSON files containing CLI specifications, directories of
+    them, or glob patterns. A single spec is built into the output directory;
+    several specs are each built into a subdirectory named after the CLI.
+    A single spec can also be a registry reference, registry:NAME[@VERSION]
+    (see cli-gen specs), and so can --previous.
 
     Examples:
 
         cli-gen build spec.json
 
         cli-gen build my-cli-spec.json --output ./my-cli
+
+        cli-gen build spec.json --incremental
+
+        cli-gen build specs/ --jobs 8 --output ./clis
+
+        cli-gen build big-spec.json --layout lazy
+
+        cli-gen build spec.json --previous old-spec.json
+
+        cli-gen build registry:passgen --previous registry:passgen@2
     """
-    try:
-        spec_path = Path(spec_file)
+    from cli_generator.registry import REFERENCE_PREFIX
 
-        if not spec_path.exists():
-            print_error(f"File not found: {spec_path}")
-            sys.exit(1)
+    try:
+        recorder = create_recorder(stats, metrics_file)
+        reference = spec_files[0].startswith(REFERENCE_PREFIX)
+        if len(spec_files) > 1 or not (reference or Path(spec_files[0]).is_file()):
+            if previous:
+                print_error("--previous needs a single spec file")
+                sys.exit(1)
+            if any(spec_file.startswith(REFERENCE_PREFIX) for spec_file in spec_files):
+                print_error("Registry references can only be built one at a time")
+                sys.exit(1)
+            build_many_specs(
+                spec_files, Path(output), jobs, incremental, layout, recorder, not no_cache
+            )
+            report_instrumentation(recorder, stats, metrics_file)
+            return
 
-        print_info(f"Loading specification from {spec_path}...")
+        print_info(f"Loading specification from {spec_files[0]}...")
 
         # Load and validate spec
-        try:
-            spec_data = json.loads(spec_path.read_text())
-            spec = CLISpec.model_validate(spec_data)
-        except json.JSONDecodeError as e:
-            print_error(f"Invalid JSON in {spec_path}: {e}")
-            sys.exit(1)
-        except ValidationError as e:
-            print_error(f"Invalid specification: {e}")
-            sys.exit(1)
+        with timed(recorder, "load_spec"):
+            spec = load_spec_reference_or_exit(spec_files[0], registry, not no_cache)
 
         # Show the spec
         print_spec_summary(spec)
 
+        previous_spec = None
+        if previous:
+            from cli_generator.diff import diff_specs
+
+            previous_spec = load_spec_reference_or_exit(previous, registry, not no_cache)
+            incremental = True
+            print_spec_diff(diff_specs(previous_spec, spec))
+
         # Generate code
         print_info("Generating code...")
-        code_generator = CodeGenerator()
+        from cli_generator.generators.code_generator import CodeGenerator
+
+        code_generator = CodeGenerator(recorder=recorder)
         output_path = Path(output)
-        result = code_generator.generate(spec, output_path)
+        result = code_generator.generate(
+            spec, output_path, incremental=incremental, layout=layout, previous=previous_spec
+        )
+        build = code_generator.last_build
 
         # Show results
         console.print()
@@ -299,11 +1188,26 @@ def build_cmd(spec_file: str, output: str) -> None:
         table = Table(title="Generated Files")
         table.add_column("Type", style="cyan")
         table.add_column("Path", style="white")
+        if incremental:
+            table.add_column("Status", style="green")
 
         for file_type, file_path in result.items():
-            table.add_row(file_type, str(file_path))
+            row = [file_type, str(file_path)]
+            if incremental:
+                row.append(build.files[file_type])
+            table.add_row(*row)
 
         console.print(table)
+        if incremental:
+            print_info(
+                f"Rendered {build.rendered}, wrote {build.written}, "
+                f"skipped {build.skipped} file(s)"
+            )
+        if previous_spec is not None:
+            print_info(
+                f"Rendered {build.sections_rendered} command section(s), "
+                f"kept {build.sections_reused}, removed {build.removed} file(s)"
+            )
 
         # Print next steps
         console.print()
@@ -316,11 +1220,385 @@ def build_cmd(spec_file: str, output: str) -> None:
             border_style="green",
         ))
 
+        report_instrumentation(recorder, stats, metrics_file)
+
     except Exception as e:
         print_error(str(e))
         sys.exit(1)
 
 
+@cli.command("diff")
+@click.argument("old_spec", type=click.Path(exists=True, dir_okay=False))
+@click.argument("new_spec", type=click.Path(exists=True, dir_okay=False))
+@click.option("--json", "as_json", is_flag=True, help="Print the diff as JSON")
+def diff_cmd(old_spec: str, new_spec: str, as_json: bool) -> None:
+    """Show how NEW_SPEC differs from OLD_SPEC.
+
+    Commands, options and arguments are matched by name.
+
+    Examples:
+
+        cli-gen diff old-spec.json spec.json
+
+        cli-gen diff old-spec.json spec.json --json
+    """
+    from cli_generator.diff import diff_specs
+
+    spec_diff = diff_specs(load_spec_or_exit(Path(old_spec)), load_spec_or_exit(Path(new_spec)))
+    if as_json:
+        click.echo(spec_diff.model_dump_json(indent=2))
+    else:
+        print_spec_diff(spec_diff)
+
+
+@cli.group("specs")
+def specs_group() -> None:
+    """Manage the local registry of saved specifications.
+
+    The registry is a SQLite database indexed by CLI name, command names,
+    option names and types, and dependencies. Each CLI name keeps a history
+    of versions, and build accepts registry:NAME[@VERSION] references.
+    """
+
+
+@specs_group.command("add")
+@click.argument("spec_files", nargs=-1, required=True)
+@registry_option
+def specs_add_cmd(spec_files: tuple[str, ...], registry: str | None) -> None:
+    """Add spec files to the registry.
+
+    SPEC_FILES are JSON files, directories of them, or glob patterns. A spec
+    becomes the next version of its CLI name unless it matches the latest.
+
+    Examples:
+
+        cli-gen specs add passgen.json
+
+        cli-gen specs add specs/
+    """
+    import sqlite3
+
+    from cli_generator.builds import expand_spec_paths
+
+    try:
+        paths = expand_spec_paths(spec_files)
+        with open_registry(registry) as spec_registry:
+            results = spec_registry.add_files(paths)
+    except FileNotFoundError as e:
+        print_error(str(e))
+        sys.exit(1)
+    except ValueError as e:
+        # Nothing was added: the files are added in one transaction
+        print_error(f"Invalid specification: {e}")
+        sys.exit(1)
+    except sqlite3.Error as e:
+        print_registry_error(e)
+        sys.exit(1)
+
+    table = Table(title="Added Specifications")
+    table.add_column("File", style="cyan")
+    table.add_column("CLI", style="white")
+    table.add_column("Version", justify="right", style="white")
+    table.add_column("Status", style="green")
+    for path, entry, added in results:
+        table.add_row(str(path), entry.name, str(entry.version), "added" if added else "unchanged")
+    console.print(table)
+    added_count = sum(added for _, _, added in results)
+    print_success(f"Added {added_count} new version(s) of {len(results)} spec(s)")
+
+
+@specs_group.command("list")
+@click.option("--json", "as_json", is_flag=True, help="Print the entries as JSON")
+@registry_option
+def specs_list_cmd(as_json: bool, registry: str | None) -> None:
+    """List the latest version of every CLI in the registry."""
+    import sqlite3
+
+    try:
+        with open_registry(registry) as spec_registry:
+            entries = spec_registry.entries()
+    except sqlite3.Error as e:
+        print_registry_error(e)
+        sys.exit(1)
+    if as_json:
+        click.echo(json.dumps([entry.model_dump() for entry in entries], indent=2))
+        return
+    print_registry_entries(entries, "Registry")
+    print_info(f"{len(entries)} CLI(s)")
+
+
+@specs_group.command("search")
+@click.option("--name", help="Part of the CLI name")
+@click.option("--command", "-c", help="A command name")
+@click.option("--option", "-o", help="An option name, without dashes")
+@click.option("--type", "option_type", help="An option type, e.g. choice")
+@click.option("--dependency", "-d", help="A dependency, e.g. pyyaml")
+@click.option("--text", "-t", help="Part of the CLI description")
+@click.option("--all-versions", is_flag=True, help="Search old versions too")
+@click.option("--limit", type=click.IntRange(min=1), help="Maximum number of results")
+@click.option("--json", "as_json", is_flag=True, help="Print the results as JSON")
+@registry_option
+def specs_search_cmd(
+    name: str | None,
+    command: str | None,
+    option: str | None,
+    option_type: str | None,
+    dependency: str | None,
+    text: str | None,
+    all_versions: bool,
+    limit: int | None,
+    as_json: bool,
+    registry: str | None,
+) -> None:
+    """Find specs in the registry matching every given filter.
+
+    With --command, --option and --type only match options of that command.
+
+    Examples:
+
+        cli-gen specs search --command export --option format --type choice
+
+        cli-gen specs search --dependency pyyaml
+    """
+    import sqlite3
+    import time
+
+    try:
+        with open_registry(registry) as spec_registry:
+            start = time.perf_counter()
+            entries = spec_registry.search(
+                name=name,
+                command=command,
+                option=option.lstrip("-") if option else None,
+                option_type=option_type,
+                dependency=dependency,
+                text=text,
+                all_versions=all_versions,
+                limit=limit,
+            )
+            elapsed = time.perf_counter() - start
+    except sqlite3.Error as e:
+        print_registry_error(e)
+        sys.exit(1)
+    if as_json:
+        click.echo(json.dumps([entry.model_dump() for entry in entries], indent=2))
+        return
+    print_registry_entries(entries, "Matching Specifications")
+    print_info(f"{len(entries)} spec(s) found in {elapsed * 1000:.1f} ms")
+
+
+@specs_group.command("show")
+@click.argument("reference")
+@click.option("--history", is_flag=True, help="List every version instead")
+@click.option("--json", "as_json", is_flag=True, help="Print the spec as JSON")
+@registry_option
+def specs_show_cmd(
+    reference: str, history: bool, as_json: bool, registry: str | None
+) -> None:
+    """Show a spec from the registry.
+
+    REFERENCE is a CLI name, optionally with a version: NAME[@VERSION].
+
+    Examples:
+
+        cli-gen specs show passgen
+
+        cli-gen specs show passgen@2 --json
+
+        cli-gen specs show passgen --history
+    """
+    import sqlite3
+
+    from cli_generator.registry import parse_reference
+
+    try:
+        name, version = parse_reference(reference)
+        with open_registry(registry) as spec_registry:
+            if history:
+                entries = spec_registry.history(name)
+                if not entries:
+                    raise KeyError(f"No spec '{name}' in the registry")
+                print_registry_entries(entries, f"History of {name}")
+                return
+            entry = spec_registry.entry(name, version)
+            spec = spec_registry.get(name, entry.version)
+    except KeyError as e:
+        print_error(e.args[0])
+        sys.exit(1)
+    except ValueError as e:
+        print_error(str(e))
+        sys.exit(1)
+    except sqlite3.Error as e:
+        print_registry_error(e)
+        sys.exit(1)
+
+    if as_json:
+        click.echo(spec.model_dump_json(indent=2))
+        return
+    source = f" from {entry.source}" if entry.source else ""
+    print_info(f"{entry.name} version {entry.version}{source}")
+    print_spec_summary(spec)
+
+
+@cli.command("verify")
+@click.argument("output_dirs", nargs=-1, required=True)
+@click.option(
+    "--jobs", "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Worker processes for verifying several CLIs",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Verify every CLI, even if an identical one passed before",
+)
+def verify_cmd(output_dirs: tuple[str, ...], jobs: int, no_cache: bool) -> None:
+    """Check generated CLIs without installing them.
+
+    Compiles every module, imports the package from OUTPUT_DIRS and runs
+    --help for the CLI and each command. A directory holding several
+    generated CLIs (as written by build with several specs) checks them all.
+
+    Examples:
+
+        cli-gen verify ./generated
+
+        cli-gen verify ./clis --jobs 8
+    """
+    from cli_generator.verify import VERIFY_CACHE_DIR, expand_output_dirs, verify_outputs
+
+    try:
+        projects = expand_output_dirs(output_dirs)
+    except FileNotFoundError as e:
+        print_error(str(e))
+        sys.exit(1)
+
+    print_info(f"Verifying {len(projects)} CLI(s) ({jobs} job(s))...")
+    results = []
+    verify_stats = verify_outputs(
+        projects,
+        jobs=jobs,
+        cache_dir=None if no_cache else VERIFY_CACHE_DIR,
+        on_result=results.append,
+    )
+
+    console.print()
+    table = Table(title="Verification")
+    table.add_column("Output", style="cyan")
+    table.add_column("Package", style="white")
+    table.add_column("Modules", justify="right", style="white")
+    table.add_column("Commands", justify="right", style="white")
+    table.add_column("Result", style="green")
+    for result in sorted(results, key=lambda result: result.path):
+        if not result.ok:
+            status = "[red]" + "\n".join(result.errors) + "[/red]"
+        else:
+            status = "passed (cached)" if result.cached else f"passed in {result.elapsed:.3f}s"
+        table.add_row(
+            result.path,
+            result.package or "-",
+            str(result.modules),
+            str(result.commands),
+            status,
+        )
+    console.print(table)
+
+    print_info(
+        f"Verified {verify_stats.passed} of {verify_stats.total} CLI(s) "
+        f"({verify_stats.cached} cached) in {verify_stats.elapsed:.2f}s"
+    )
+    if verify_stats.failed:
+        print_error(f"{verify_stats.failed} CLI(s) failed verification")
+        sys.exit(1)
+    print_success("All CLIs verified")
+
+
+@cli.command("serve")
+@click.option("--host", default="127.0.0.1", help="Host to listen on")
+@click.option("--port", "-p", type=int, default=8765, help="Port to listen on")
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False),
+    help="Listen on a Unix socket instead of TCP",
+)
+@click.option(
+    "--output-root",
+    type=click.Path(file_okay=False),
+    default=".",
+    show_default=True,
+    help="Directory that /generate and /build outputs must be inside",
+)
+@click.option(
+    "--model", "-m",
+    default="openai:gpt-4o-mini",
+    help="Default model for spec generation",
+)
+@click.option(
+    "--test-mode",
+    is_flag=True,
+    hidden=True,
+    help="Use test model (for testing)",
+)
+@cache_dir_option
+@no_cache_option
+@verbose_option
+def serve_cmd(
+    host: str,
+    port: int,
+    socket_path: str | None,
+    output_root: str,
+    model: str,
+    test_mode: bool,
+    cache_dir: str | None,
+    no_cache: bool,
+    verbose: bool,
+) -> None:
+    """Run a long-lived generator service.
+
+    Keeps the spec and code generators warm and accepts JSON requests on
+    POST /spec, /generate and /build, with metrics on GET /metrics. The
+    "output" of /generate and /build is resolved under --output-root, and
+    requests for paths outside it are rejected.
+
+    Examples:
+
+        cli-gen serve --port 8765
+
+        cli-gen serve --socket /tmp/cli-gen.sock --output-root ./generated
+
+        curl -d '{"description": "A counter"}' localhost:8765/spec
+    """
+    from pydantic_ai.models.test import TestModel
+
+    from cli_generator.server import GeneratorService, make_server
+
+    load_environment()
+    cache = create_spec_cache(test_mode, cache_dir, no_cache)
+    service = GeneratorService(
+        model=TestModel() if test_mode else model, cache=cache, output_root=output_root
+    )
+    try:
+        server = make_server(service, host, port, socket_path, verbose)
+    except FileExistsError as e:
+        service.close()
+        print_error(str(e))
+        sys.exit(1)
+    where = socket_path or "http://{}:{}".format(*server.server_address[:2])
+    print_success(f"Serving cli-gen on [bold]{where}[/bold] (Ctrl+C to stop)")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print_info("Shutting down")
+    finally:
+        # Also removes the socket file, if it is still this server's
+        server.server_close()
+        service.close()
+
+
 def main() -> None:
     """Entry point for the CLI."""
     try:
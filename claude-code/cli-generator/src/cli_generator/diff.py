@@ -0,0 +1,149 @@
+"""Structural differences between two versions of a CLISpec.
+
+Commands, options and arguments are matched by name, so a diff takes time
+linear in the size of the specs however many commands they have.
+"""
+
+from collections.abc import Sequence
+from typing import Protocol
+
+from pydantic import BaseModel, Field
+
+from cli_generator.models import CLISpec, CommandSpec
+
+# Spec fields compared as a whole; commands and global options are diffed by name
+SPEC_FIELDS = ("name", "description", "python_version", "dependencies")
+COMMAND_FIELDS = ("description", "examples")
+
+
+class _Named(Protocol):
+    """Anything with a name, e.g. a command, option or argument."""
+
+    name: str
+
+
+class ItemChanges(BaseModel):
+    """Added, removed and changed items of a collection, by name."""
+
+    added: list[str] = Field(default_factory=list, description="Names only in the new spec")
+    removed: list[str] = Field(default_factory=list, description="Names only in the old spec")
+    changed: list[str] = Field(default_factory=list, description="Names in both that differ")
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether nothing was added, removed or changed."""
+        return not (self.added or self.removed or self.changed)
+
+    def summary(self) -> str:
+        """Describe the changes as +added -removed ~changed names."""
+        return " ".join(
+            [f"+{name}" for name in self.added]
+            + [f"-{name}" for name in self.removed]
+            + [f"~{name}" for name in self.changed]
+        )
+
+
+class CommandDiff(BaseModel):
+    """How a command present in both specs changed."""
+
+    name: str = Field(..., description="The command name")
+    fields: list[str] = Field(default_factory=list, description="Changed command fields")
+    arguments: ItemChanges = Field(default_factory=ItemChanges)
+    options: ItemChanges = Field(default_factory=ItemChanges)
+
+    def summary(self) -> str:
+        """Describe the changes in one line."""
+        parts = []
+        if self.fields:
+            parts.append(", ".join(self.fields))
+        if not self.arguments.is_empty:
+            parts.append(f"arguments: {self.arguments.summary()}")
+        if not self.options.is_empty:
+            parts.append(f"options: {self.options.summary()}")
+        return "; ".join(parts)
+
+
+class SpecDiff(BaseModel):
+    """The differences between two versions of a spec."""
+
+    fields: list[str] = Field(default_factory=list, description="Changed spec fields")
+    global_options: ItemChanges = Field(default_factory=ItemChanges)
+    commands: ItemChanges = Field(default_factory=ItemChanges)
+    changed_commands: list[CommandDiff] = Field(
+        default_factory=list, description="Details of each changed command"
+    )
+    reordered: bool = Field(default=False, description="Whether kept commands changed order")
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether the specs are equivalent."""
+        return (
+            not self.fields
+            and self.global_options.is_empty
+            and self.commands.is_empty
+            and not self.reordered
+        )
+
+    def summary(self) -> str:
+        """Describe the command changes in one line."""
+        commands = self.commands
+        text = (
+            f"{len(commands.added)} command(s) added, {len(commands.removed)} removed, "
+            f"{len(commands.changed)} changed"
+        )
+        if self.reordered:
+            text += "; commands reordered"
+        return text
+
+    @property
+    def affected_commands(self) -> set[str]:
+        """Names of the commands whose generated code must be rendered again."""
+        return {*self.commands.added, *self.commands.changed}
+
+
+def diff_named(old: Sequence[_Named], new: Sequence[_Named]) -> ItemChanges:
+    """Compare two collections of named models.
+
+    Added names keep the new order; removed and changed names the old one.
+    """
+    old_by_name = {item.name: item for item in old}
+    new_by_name = {item.name: item for item in new}
+    return ItemChanges(
+        added=[item.name for item in new if item.name not in old_by_name],
+        removed=[item.name for item in old if item.name not in new_by_name],
+        changed=[
+            item.name
+            for item in old
+            if item.name in new_by_name and new_by_name[item.name] != item
+        ],
+    )
+
+
+def diff_commands(old: CommandSpec, new: CommandSpec) -> CommandDiff:
+    """Compare two versions of a command."""
+    return CommandDiff(
+        name=new.name,
+        fields=[field for field in COMMAND_FIELDS if getattr(old, field) != getattr(new, field)],
+        arguments=diff_named(old.arguments, new.arguments),
+        options=diff_named(old.options, new.options),
+    )
+
+
+def diff_specs(old: CLISpec, new: CLISpec) -> SpecDiff:
+    """Compare two versions of a spec."""
+    commands = diff_named(old.commands, new.commands)
+    old_by_name = {command.name: command for command in old.commands}
+    new_by_name = {command.name: command for command in new.commands}
+
+    kept_old = [command.name for command in old.commands if command.name in new_by_name]
+    kept_new = [command.name for command in new.commands if command.name in old_by_name]
+
+    return SpecDiff(
+        fields=[field for field in SPEC_FIELDS if getattr(old, field) != getattr(new, field)],
+        global_options=diff_named(old.global_options, new.global_options),
+        commands=commands,
+        changed_commands=[
+            diff_commands(old_by_name[name], new_by_name[name]) for name in commands.changed
+        ],
+        reordered=kept_old != kept_new,
+    )
@@ -0,0 +1,186 @@
+"""Retrieval of few-shot example specs for spec generation.
+
+Saved specs (e.g. specs/passgen.json) and past generations (the spec cache
+directory) form a local example library. A small TF-IDF index picks the specs
+most similar to a description so only relevant examples are sent to the model.
+"""
+
+import math
+import re
+from collections import Counter
+from pathlib import Path
+
+from pydantic import ValidationError
+
+from cli_generator.models import CLISpec
+
+# Words too common in CLI descriptions to help ranking
+STOP_WORDS = frozenset(
+    "a an and are as at be by cli command commands for from in into is it of on "
+    "or that the this to tool with".split()
+)
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase word unigrams and bigrams, without stop words."""
+    words = [
+        word
+        for word in WORD_PATTERN.findall(text.lower().replace("_", " "))
+        if word not in STOP_WORDS
+    ]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def spec_text(spec: CLISpec) -> str:
+    """Return the searchable text of a spec."""
+    parts = [spec.name, spec.description]
+    for command in spec.commands:
+        parts.extend([command.name, command.description])
+        parts.extend(option.name for option in command.options)
+    return " ".join(parts)
+
+
+def compact_example(spec: CLISpec, max_commands: int = 2, max_options: int = 3) -> str:
+    """Render a spec as compact JSON for a prompt.
+
+    Only the first few commands and options and one usage example per
+    command are kept, which is enough to show the expected structure.
+    """
+    commands = [
+        command.model_copy(
+            update={
+                "options": command.options[:max_options],
+                "examples": command.examples[:1],
+            }
+        )
+        for command in spec.commands[:max_commands]
+    ]
+    trimmed = spec.model_copy(
+        update={"commands": commands, "global_options": spec.global_options[:max_options]}
+    )
+    return trimmed.model_dump_json(exclude_defaults=True)
+
+
+class ExampleLibrary:
+    """Example specs with a TF-IDF similarity index over their text."""
+
+    def __init__(self, specs: list[CLISpec] | None = None) -> None:
+        """Initialize the library.
+
+        Args:
+            specs: Initial example specs.
+        """
+        self.specs: list[CLISpec] = []
+        self.skipped = 0
+        self._seen: set[str] = set()
+        self._vectors: list[dict[str, float]] | None = None
+        self._idf: dict[str, float] = {}
+        for spec in specs or []:
+            self.add(spec)
+
+    def __len__(self) -> int:
+        """Return the number of examples."""
+        return len(self.specs)
+
+    @classmethod
+    def from_paths(cls, paths: list[Path]) -> "ExampleLibrary":
+        """Build a library from spec JSON files and directories of them.
+
+        Files that are not valid specs are skipped and counted in ``skipped``.
+        """
+        library = cls()
+        for path in paths:
+            library.load(path)
+        return library
+
+    def add(self, spec: CLISpec) -> bool:
+        """Add an example, returning False if it is already in the library."""
+        key = spec.model_dump_json()
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        self.specs.append(spec)
+        self._vectors = None
+        return True
+
+    def load(self, path: Path) -> int:
+        """Load a spec file, or every *.json spec in a directory.
+
+        Returns:
+            The number of examples added.
+        """
+        files = sorted(path.glob("*.json")) if path.is_dir() else [path]
+        added = 0
+        for file in files:
+            try:
+                spec = CLISpec.model_validate_json(file.read_bytes())
+            except (OSError, ValidationError):
+                self.skipped += 1
+                continue
+            added += self.add(spec)
+        return added
+
+    def _build_index(self) -> list[dict[str, float]]:
+        """Compute normalized TF-IDF vectors for all examples."""
+        counts = [Counter(tokenize(spec_text(spec))) for spec in self.specs]
+        document_frequency = Counter(term for count in counts for term in count)
+        total = len(counts)
+        self._idf = {
+            term: math.log((1 + total) / (1 + df)) + 1
+            for term, df in document_frequency.items()
+        }
+        self._vectors = [self._vectorize(count) for count in counts]
+        return self._vectors
+
+    def _vectorize(self, counts: Counter[str]) -> dict[str, float]:
+        """Turn term counts into a unit-length TF-IDF vector."""
+        vector = {
+            term: count * self._idf[term]
+            for term, count in counts.items()
+            if term in self._idf
+        }
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        if norm == 0:
+            return {}
+        return {term: weight / norm for term, weight in vector.items()}
+
+    def search(self, description: str, k: int = 2) -> list[CLISpec]:
+        """Return up to k examples most similar to a description.
+
+        Examples sharing no terms with the description are never returned.
+        """
+        vectors = self._vectors if self._vectors is not None else self._build_index()
+        query = self._vectorize(Counter(tokenize(description)))
+        if not query or k < 1:
+            return []
+
+        scored = []
+        for index, vector in enumerate(vectors):
+            score = sum(weight * vector.get(term, 0.0) for term, weight in query.items())
+            if score > 0:
+                scored.append((score, index))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [self.specs[index] for _, index in scored[:k]]
+
+    def instructions(self, description: str, k: int = 2, max_chars: int = 1600) -> str | None:
+        """Return prompt text with the most relevant examples, if any match.
+
+        Args:
+            description: The description examples are chosen for.
+            k: Maximum number of examples.
+            max_chars: Budget for the examples; the best match is always
+                       included, further ones only while within budget.
+        """
+        blocks: list[str] = []
+        used = 0
+        for spec in self.search(description, k):
+            block = f"```json\n{compact_example(spec)}\n```"
+            if blocks and used + len(block) > max_chars:
+                break
+            blocks.append(block)
+            used += len(block)
+        if not blocks:
+            return None
+        return "## Examples of Similar CLIs\n\n" + "\n\n".join(blocks)
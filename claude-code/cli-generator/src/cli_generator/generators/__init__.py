@@ -1,6 +1,31 @@
 """Generator modules for CLI specification and code generation."""
 
-from cli_generator.generators.code_generator import CodeGenerator
-from cli_generator.generators.spec_generator import SpecGenerator
+from typing import TYPE_CHECKING, Any
 
-__all__ = ["CodeGenerator", "SpecGenerator"]
+if TYPE_CHECKING:
+    from cli_generator.generators.code_generator import CodeGenerator
+    from cli_generator.generators.local_generator import LocalSpecGenerator
+    from cli_generator.generators.spec_generator import SpecGenerator
+
+__all__ = ["CodeGenerator", "LocalSpecGenerator", "SpecGenerator"]
+
+
+def __getattr__(name: str) -> Any:
+    """Import generators on first use.
+
+    Importing the code generator must not pull in pydantic_ai (loaded by the
+    spec generator), so neither is imported eagerly.
+    """
+    if name == "CodeGenerator":
+        from cli_generator.generators.code_generator import CodeGenerator
+
+        return CodeGenerator
+    if name == "LocalSpecGenerator":
+        from cli_generator.generators.local_generator import LocalSpecGenerator
+
+        return LocalSpecGenerator
+    if name == "SpecGenerator":
+        from cli_generator.generators.spec_generator import SpecGenerator
+
+        return SpecGenerator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,36 +1,242 @@
 """Generate Python/Click code from CLISpec."""
 
+import hashlib
+import json
+import keyword
+import os
+import re
+import shlex
+from collections.abc import Callable, Iterable, Iterator
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
-from jinja2 import Environment, PackageLoader, select_autoescape
+from jinja2 import (
+    BaseLoader,
+    BytecodeCache,
+    Environment,
+    FileSystemBytecodeCache,
+    ModuleLoader,
+    PackageLoader,
+    select_autoescape,
+)
+from pydantic import BaseModel, Field, ValidationError
 
-from cli_generator.models import ArgumentSpec, CLISpec, OptionSpec
+from cli_generator.atomic import temp_path, write_atomic
+from cli_generator.cache import DEFAULT_CACHE_DIR
+from cli_generator.diff import diff_specs
+from cli_generator.instrumentation import Recorder, timed
+from cli_generator.models import ArgumentSpec, CLISpec, CommandSpec, OptionSpec
+
+TEMPLATES_DIR = Path(__file__).parent.parent / "templates"
+# Templates compiled ahead of time by precompile_templates()
+PRECOMPILED_DIR = Path(__file__).parent.parent / "templates_compiled"
+# On-disk Jinja bytecode cache, next to the spec cache unless the environment moves it
+TEMPLATE_CACHE_DIR = Path(
+    os.environ.get("CLI_GEN_TEMPLATE_CACHE_DIR") or DEFAULT_CACHE_DIR.parent / "templates"
+)
+# Records which template sources the precompiled modules were built from
+SOURCES_HASH_FILE = "sources.sha256"
+# Written to the output directory by incremental builds
+MANIFEST_NAME = ".cli-gen-manifest.json"
+# Shell -> completion script file name, in <package>/completions/
+COMPLETION_FILES = {"bash": "{name}.bash", "zsh": "_{name}", "fish": "{name}.fish"}
+# Template output events joined per chunk when streaming to a file
+STREAM_BUFFER_SIZE = 64
+# Bytes read at a time when hashing existing files
+HASH_BLOCK_SIZE = 1 << 20
+
+FileStatus = Literal["written", "unchanged"]
+# "single" puts every command in cli.py; "lazy" gives each command its own
+# module, imported only when the command runs
+Layout = Literal["single", "lazy"]
+LAYOUTS = ("single", "lazy")
+
+
+# A named part of a generated file (a command's section, or None for the
+# rest) and a function rendering it
+Part = tuple[str | None, Callable[[], Iterable[str]]]
+
+
+class SectionEntry(BaseModel):
+    """Where a command's code is in a generated file."""
+
+    name: str = Field(..., description="The command name")
+    start: int = Field(..., description="Byte offset of the section")
+    end: int = Field(..., description="Byte offset just past the section")
+
+
+class ManifestEntry(BaseModel):
+    """A generated file recorded in the build manifest."""
+
+    path: str = Field(..., description="Path relative to the output directory")
+    sha256: str = Field(..., description="Hash of the file's bytes")
+    sections: list[SectionEntry] = Field(
+        default_factory=list, description="Command sections, for builds with a previous spec"
+    )
+
+
+class BuildManifest(BaseModel):
+    """What an incremental build generated, and from which inputs."""
+
+    spec_hash: str = Field(..., description="Hash of the spec the files were built from")
+    generator_hash: str = Field(..., description="Hash of the templates and generator code")
+    files: dict[str, ManifestEntry] = Field(default_factory=dict, description="Files by type")
+
+
+class BuildReport(BaseModel):
+    """Counts of the work done by the last generate() call."""
+
+    rendered: int = Field(default=0, description="Files rendered from templates")
+    written: int = Field(default=0, description="Files written to disk")
+    skipped: int = Field(default=0, description="Files left untouched")
+    removed: int = Field(default=0, description="Files of removed commands deleted")
+    sections_rendered: int = Field(default=0, description="Command sections rendered")
+    sections_reused: int = Field(default=0, description="Command sections kept from disk")
+    files: dict[str, FileStatus] = Field(default_factory=dict, description="Status by type")
+
+
+def sha256_hex(data: bytes) -> str:
+    """Return the hex SHA-256 digest of some bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def spec_hash(spec: CLISpec) -> str:
+    """Hash a spec's canonical JSON."""
+    return sha256_hex(spec.model_dump_json().encode())
+
+
+@lru_cache(maxsize=1)
+def generator_hash() -> str:
+    """Hash the templates and this module, which together define the output."""
+    return sha256_hex((_sources_hash() + sha256_hex(Path(__file__).read_bytes())).encode())
+
+
+def read_manifest(output_dir: Path) -> BuildManifest | None:
+    """Load the manifest of an output directory, if it has a valid one."""
+    try:
+        return BuildManifest.model_validate_json((output_dir / MANIFEST_NAME).read_bytes())
+    except (OSError, ValidationError):
+        return None
+
+
+def write_manifest(output_dir: Path, manifest: BuildManifest) -> None:
+    """Write the manifest of an output directory atomically."""
+    write_atomic(output_dir / MANIFEST_NAME, manifest.model_dump_json(indent=2))
+
+
+def file_sha256(path: Path) -> str | None:
+    """Hash a file in blocks, or return None if it cannot be read."""
+    digest = hashlib.sha256()
+    try:
+        with path.open("rb") as f:
+            while block := f.read(HASH_BLOCK_SIZE):
+                digest.update(block)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def _file_matches(output_dir: Path, entry: ManifestEntry) -> bool:
+    """Return whether a generated file is on disk with the recorded bytes."""
+    return file_sha256(output_dir / entry.path) == entry.sha256
+
+
+def write_stream(
+    path: Path, chunks: Iterable[str], keep_identical: bool = False
+) -> tuple[str, bool]:
+    """Write text chunks to a file, hashing them on the way.
+
+    The chunks go to a temporary file next to the target, which then
+    replaces it, so the full content is never held in memory and readers
+    never see a partial file.
+
+    Args:
+        path: The file to write.
+        chunks: The content, in order.
+        keep_identical: Leave an existing file with the same bytes untouched
+                        (and its modification time unchanged).
+
+    Returns:
+        The SHA-256 of the content, and whether the file was written.
+    """
+    tmp_path, content_hash, _ = _write_temp(path, [(None, chunks)])
+    return content_hash, _commit(tmp_path, path, content_hash, keep_identical)
+
+
+def _write_temp(
+    path: Path,
+    parts: Iterable[tuple[str | None, Iterable[str] | bytes]],
+    record_sections: bool = False,
+) -> tuple[Path, str, list[SectionEntry]]:
+    """Write parts to a temporary file next to path.
+
+    Each part is text chunks or bytes kept from an earlier build; with
+    record_sections, named parts are recorded as sections.
+
+    Returns:
+        The temporary file, the hash of its content and its sections.
+    """
+    digest = hashlib.sha256()
+    tmp_path = temp_path(path)
+    sections: list[SectionEntry] = []
+    offset = 0
+    try:
+        with tmp_path.open("wb") as f:
+            for name, content in parts:
+                start = offset
+                blocks = [content] if isinstance(content, bytes) else map(str.encode, content)
+                for data in blocks:
+                    digest.update(data)
+                    f.write(data)
+                    offset += len(data)
+                if record_sections and name is not None:
+                    sections.append(SectionEntry(name=name, start=start, end=offset))
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return tmp_path, digest.hexdigest(), sections
+
+
+def _commit(tmp_path: Path, path: Path, content_hash: str, keep_identical: bool) -> bool:
+    """Move a temporary file into place, unless an identical file is kept."""
+    try:
+        if keep_identical and file_sha256(path) == content_hash:
+            tmp_path.unlink()
+            return False
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return True
 
 
 class CodeGenerator:
     """Generate Python/Click code from CLISpec using Jinja2 templates."""
 
-    def __init__(self) -> None:
-        """Initialize the code generator with Jinja2 environment."""
-        self.env = Environment(
-            loader=PackageLoader("cli_generator", "templates"),
-            autoescape=select_autoescape(),
-            trim_blocks=True,
-            lstrip_blocks=True,
-        )
-        # Register custom filters
-        self.env.filters["to_func_name"] = self._to_func_name
-        self.env.filters["to_param_name"] = self._to_param_name
-        self.env.filters["python_type"] = self._python_type
-        # Register custom functions
-        self.env.globals["render_option"] = self._render_option
-        self.env.globals["render_argument"] = self._render_argument
+    def __init__(
+        self,
+        recorder: Recorder | None = None,
+        bytecode_cache_dir: Path | None = TEMPLATE_CACHE_DIR,
+    ) -> None:
+        """Initialize the code generator with Jinja2 environment.
+
+        Args:
+            recorder: Records render and write spans for every file.
+            bytecode_cache_dir: Directory for the Jinja bytecode cache, or None
+                                to compile templates from source.
+        """
+        self.recorder = recorder
+        self.last_build = BuildReport()
+        # Shared by every instance, so templates are compiled once per process
+        self.env = get_environment(bytecode_cache_dir)
 
     @staticmethod
     def _to_func_name(name: str) -> str:
         """Convert a command name to a valid Python function name."""
-        return name.replace("-", "_").replace(" ", "_").lower()
+        func_name = name.replace("-", "_").replace(" ", "_").lower()
+        # Commands like "import" keep their name but need another function name
+        return f"{func_name}_" if keyword.iskeyword(func_name) else func_name
 
     @staticmethod
     def _to_param_name(name: str) -> str:
@@ -58,6 +264,12 @@ class CodeGenerator:
 
         return base_type
 
+    @staticmethod
+    def _python_string(value: str) -> str:
+        """Render a string as a Python string literal."""
+        # JSON strings are valid Python literals, and keep double quotes
+        return json.dumps(value)
+
     @staticmethod
     def _render_option(option: OptionSpec) -> str:
         """Render a @click.option decorator for an option."""
@@ -123,6 +335,68 @@ class CodeGenerator:
 
         return "".join(parts)
 
+    @staticmethod
+    def _option_flags(option: OptionSpec) -> list[str]:
+        """Return an option's command-line names, e.g. ["-o", "--output"]."""
+        flags = [f"--{option.name}"]
+        if option.short:
+            flags.insert(0, f"-{option.short}")
+        return flags
+
+    @staticmethod
+    def _fish_quote(value: str) -> str:
+        """Quote a string for fish, unless it is safe as it is."""
+        if re.fullmatch(r"[\w@%+=:,./-]+", value):
+            return value
+        return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+    @staticmethod
+    def _zsh_option_specs(option: OptionSpec) -> list[str]:
+        """Return the quoted _arguments specs of an option, one per name."""
+        flags = CodeGenerator._option_flags(option)
+        exclusive = f"({' '.join(flags)})" if len(flags) > 1 else ""
+        help_text = re.sub(r"([\\\[\]])", r"\\\1", option.help)
+        if option.type == "bool":
+            value = ""
+        elif option.type == "choice":
+            choices = " ".join(re.sub(r"([\\\s()])", r"\\\1", c) for c in option.choices or [])
+            value = f":{option.name}:({choices})"
+        elif option.type == "path":
+            value = f":{option.name}:_files"
+        else:
+            value = f":{option.name}: "
+        specs = []
+        for flag in flags:
+            # "=" and "+" let the value follow in the same word or the next one
+            suffix = "" if option.type == "bool" else ("=" if flag.startswith("--") else "+")
+            specs.append(shlex.quote(f"{exclusive}{flag}{suffix}[{help_text}]{value}"))
+        return specs
+
+    @staticmethod
+    def _zsh_argument_spec(arg: ArgumentSpec) -> str:
+        """Return the quoted _arguments spec of a positional argument."""
+        action = "_files" if arg.type == "path" else " "
+        optional = "" if arg.required else ":"
+        return shlex.quote(f":{optional}{arg.name}:{action}")
+
+    @staticmethod
+    def _fish_option(option: OptionSpec) -> str:
+        """Return the complete flags describing an option to fish."""
+        parts = []
+        if option.short:
+            parts.append(f"-s {option.short}")
+        parts.append(f"-l {option.name}")
+        if option.type == "choice":
+            choices = " ".join(CodeGenerator._fish_quote(c) for c in option.choices or [])
+            parts.append(f"-x -a {CodeGenerator._fish_quote(choices)}")
+        elif option.type == "path":
+            parts.append("-r -F")
+        elif option.type != "bool":
+            parts.append("-x")
+        if option.help:
+            parts.append(f"-d {CodeGenerator._fish_quote(option.help)}")
+        return " ".join(parts)
+
     def _has_path_types(self, spec: CLISpec) -> bool:
         """Check if the spec uses any path types that require Path import."""
         # Check global options
@@ -131,26 +405,62 @@ class CodeGenerator:
                 return True
 
         # Check commands
-        for cmd in spec.commands:
-            for arg in cmd.arguments:
-                if arg.type == "path":
-                    return True
-            for opt in cmd.options:
-                if opt.type == "path":
-                    return True
-
-        return False
+        return any(self._command_has_path_types(cmd) for cmd in spec.commands)
 
-    def generate(self, spec: CLISpec, output_dir: Path) -> dict[str, Path]:
+    @staticmethod
+    def _command_has_path_types(command: CommandSpec) -> bool:
+        """Check if a command uses any path types that require Path import."""
+        for arg in command.arguments:
+            if arg.type == "path":
+                return True
+        return any(opt.type == "path" for opt in command.options)
+
+    def generate(
+        self,
+        spec: CLISpec,
+        output_dir: Path,
+        incremental: bool = False,
+        layout: Layout = "single",
+        previous: CLISpec | None = None,
+    ) -> dict[str, Path]:
         """Generate CLI code from a CLISpec.
 
+        In incremental mode, a manifest of the spec hash and per-file content
+        hashes is kept in the output directory. Rendering is skipped entirely
+        when the spec (and generator) are unchanged and every file is still
+        intact, and files whose bytes did not change are not rewritten, so
+        their modification times stay put. Files generated for commands that
+        no longer exist are deleted. last_build reports the counts.
+
+        Given the spec the output directory was last built from, only the
+        commands that diff_specs() reports as added or changed are rendered
+        again; the sections of the other commands in cli.py and README.md,
+        and their modules in the lazy layout, are kept from disk. This needs
+        the manifest of that build, and falls back to rendering everything.
+
+        The lazy layout suits CLIs with many commands: cli.py only holds a
+        table of command names and help texts, and each command lives in
+        <package>/commands/<command>.py, imported when the command runs.
+        Startup and top-level --help no longer grow with the command count.
+
         Args:
             spec: The CLI specification to generate code from.
             output_dir: Directory to write generated files to.
+            incremental: Only render and write what changed.
+            layout: "single" for one cli.py, "lazy" for one module per command.
+            previous: The spec of the last build; implies incremental.
 
         Returns:
-            Dict mapping file type to path (cli, init, pyproject, readme).
+            Dict mapping file type to path (cli, init, completion:<shell> for
+            bash, zsh and fish, pyproject, readme; the lazy layout adds
+            commands and command:<name> for each command).
+
+        Raises:
+            ValueError: For an unknown layout.
         """
+        if layout not in LAYOUTS:
+            raise ValueError(f"layout must be one of {', '.join(LAYOUTS)}")
+        incremental = incremental or previous is not None
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -158,57 +468,273 @@ class CodeGenerator:
         package_dir = output_dir / spec.name
         package_dir.mkdir(exist_ok=True)
 
-        result: dict[str, Path] = {}
-
-        # Generate cli.py
-        cli_path = package_dir / "cli.py"
-        cli_content = self._generate_cli(spec)
-        cli_path.write_text(cli_content)
-        result["cli"] = cli_path
-
-        # Generate __init__.py
-        init_path = package_dir / "__init__.py"
-        init_content = self._generate_init(spec)
-        init_path.write_text(init_content)
-        result["init"] = init_path
+        outputs: list[tuple[str, Path, Iterable[Part]]] = [
+            ("cli", package_dir / "cli.py", self._cli_parts(spec)),
+            ("init", package_dir / "__init__.py", [(None, partial(self._stream_init, spec))]),
+        ]
+        if layout == "lazy":
+            commands_dir = package_dir / "commands"
+            commands_dir.mkdir(exist_ok=True)
+            outputs = [
+                ("cli", package_dir / "cli.py", [(None, partial(self._stream_lazy_cli, spec))]),
+                outputs[1],
+                (
+                    "commands",
+                    commands_dir / "__init__.py",
+                    [(None, partial(self._stream_commands_init, spec))],
+                ),
+            ]
+            for command in spec.commands:
+                outputs.append(
+                    (
+                        f"command:{command.name}",
+                        commands_dir / f"{self._to_func_name(command.name)}.py",
+                        [(command.name, partial(self._stream_command, spec, command))],
+                    )
+                )
+        completions_dir = package_dir / "completions"
+        completions_dir.mkdir(exist_ok=True)
+        for shell, filename in COMPLETION_FILES.items():
+            outputs.append(
+                (
+                    f"completion:{shell}",
+                    completions_dir / filename.format(name=spec.name),
+                    [(None, partial(self._render_stream, f"completion.{shell}.j2", cli=spec))],
+                )
+            )
+        outputs += [
+            (
+                "pyproject",
+                output_dir / "pyproject.toml",
+                [(None, partial(self._stream_pyproject, spec))],
+            ),
+            ("readme", output_dir / "README.md", self._readme_parts(spec)),
+        ]
+        result = {file_type: path for file_type, path, _ in outputs}
+        report = BuildReport()
+        self.last_build = report
+
+        manifest = None
+        if incremental:
+            # Only incremental builds need it: the spec's JSON is as large as cli.py
+            current_hash = spec_hash(spec)
+            manifest = read_manifest(output_dir)
+            if (
+                manifest is not None
+                and manifest.spec_hash == current_hash
+                and manifest.generator_hash == generator_hash()
+                and set(manifest.files) == set(result)
+                and all(_file_matches(output_dir, entry) for entry in manifest.files.values())
+            ):
+                report.skipped = len(outputs)
+                report.files = {file_type: "unchanged" for file_type in result}
+                return result
+
+        reusable: dict[str, dict[str, SectionEntry]] = {}
+        if previous is not None and manifest is not None:
+            reusable = self._reusable_sections(spec, previous, manifest, output_dir)
+
+        entries: dict[str, ManifestEntry] = {}
+        for file_type, path, parts in outputs:
+            file_reuse = reusable.get(file_type, {})
+            if file_type.startswith("command:") and file_type[len("command:") :] in file_reuse:
+                # A command module whose command did not change
+                assert manifest is not None
+                entries[file_type] = manifest.files[file_type]
+                report.skipped += 1
+                report.sections_reused += 1
+                report.files[file_type] = "unchanged"
+                continue
+
+            # Rendering streams into a temporary file, so the write span only
+            # covers comparing with the existing file and moving the new one in
+            with timed(self.recorder, "render", file_type):
+                tmp_path, content_hash, sections = _write_temp(
+                    path, self._render_parts(path, parts, file_reuse), record_sections=incremental
+                )
+            with timed(self.recorder, "write", file_type):
+                written = _commit(tmp_path, path, content_hash, keep_identical=incremental)
+            report.rendered += 1
+            if written:
+                report.written += 1
+                report.files[file_type] = "written"
+            else:
+                report.skipped += 1
+                report.files[file_type] = "unchanged"
+            entries[file_type] = ManifestEntry(
+                path=path.relative_to(output_dir).as_posix(),
+                sha256=content_hash,
+                sections=sections,
+            )
+
+        if manifest is not None:
+            for file_type, entry in manifest.files.items():
+                # Only delete generated files that nobody edited since
+                if file_type not in result and _file_matches(output_dir, entry):
+                    (output_dir / entry.path).unlink()
+                    report.removed += 1
+
+        if incremental:
+            write_manifest(
+                output_dir,
+                BuildManifest(
+                    spec_hash=current_hash, generator_hash=generator_hash(), files=entries
+                ),
+            )
+        return result
 
-        # Generate pyproject.toml
-        pyproject_path = output_dir / "pyproject.toml"
-        pyproject_content = self._generate_pyproject(spec)
-        pyproject_path.write_text(pyproject_content)
-        result["pyproject"] = pyproject_path
+    def _reusable_sections(
+        self, spec: CLISpec, previous: CLISpec, manifest: BuildManifest, output_dir: Path
+    ) -> dict[str, dict[str, SectionEntry]]:
+        """Return the command sections on disk that a build of spec can keep.
 
-        # Generate README.md
-        readme_path = output_dir / "README.md"
-        readme_content = self._generate_readme(spec)
-        readme_path.write_text(readme_content)
-        result["readme"] = readme_path
+        Sections are only trusted when the manifest was written for the
+        previous spec by this generator and the file is unchanged since.
+        """
+        if (
+            manifest.spec_hash != spec_hash(previous)
+            or manifest.generator_hash != generator_hash()
+        ):
+            return {}
+        affected = diff_specs(previous, spec).affected_commands
+        reusable: dict[str, dict[str, SectionEntry]] = {}
+        for file_type, entry in manifest.files.items():
+            if not entry.sections:
+                continue
+            if self._section_context(previous, file_type) != self._section_context(
+                spec, file_type
+            ):
+                continue
+            if not _file_matches(output_dir, entry):
+                continue
+            reusable[file_type] = {
+                section.name: section
+                for section in entry.sections
+                if section.name not in affected
+            }
+        return reusable
 
-        return result
+    @staticmethod
+    def _section_context(spec: CLISpec, file_type: str) -> Any:
+        """Return what a file's command sections depend on besides the command."""
+        if file_type == "readme":
+            return spec.name
+        # Commands take the context when the CLI has global options
+        return bool(spec.global_options)
+
+    def _render_parts(
+        self, path: Path, parts: Iterable[Part], reuse: dict[str, SectionEntry]
+    ) -> Iterator[tuple[str | None, Iterable[str] | bytes]]:
+        """Render a file's parts, reading reusable sections from the file on disk."""
+        report = self.last_build
+        if not reuse:
+            for name, render in parts:
+                if name is not None:
+                    report.sections_rendered += 1
+                yield name, render()
+            return
+
+        with path.open("rb") as old:
+            for name, render in parts:
+                section = reuse.get(name) if name is not None else None
+                if section is not None:
+                    old.seek(section.start)
+                    report.sections_reused += 1
+                    yield name, old.read(section.end - section.start)
+                else:
+                    if name is not None:
+                        report.sections_rendered += 1
+                    yield name, render()
+
+    def _cli_parts(self, spec: CLISpec) -> Iterator[Part]:
+        """Yield the parts of cli.py: head, one section per command, tail."""
+        yield None, partial(
+            self._render_stream,
+            "_cli_head.py.j2",
+            cli=spec,
+            has_path_types=self._has_path_types(spec),
+        )
+        for command in spec.commands:
+            yield command.name, partial(self._stream_cli_section, spec, command)
+        yield None, partial(self._render_stream, "_cli_tail.py.j2", cli=spec)
+
+    def _stream_cli_section(self, spec: CLISpec, command: CommandSpec) -> Iterator[str]:
+        """Stream one command's section of cli.py: its function between blank lines."""
+        yield "\n"
+        yield from self._render_stream("_command.py.j2", cli=spec, command=command, group="cli")
+        yield "\n"
+
+    def _readme_parts(self, spec: CLISpec) -> Iterator[Part]:
+        """Yield the parts of README.md: head, one section per command, tail."""
+        yield None, partial(self._stream_readme_head, spec)
+        for command in spec.commands:
+            yield command.name, partial(self._stream_readme_section, spec, command)
+        yield None, partial(self._stream_readme_tail, spec)
+
+    def warm_up(self) -> None:
+        """Compile every package template now, instead of on first use."""
+        for path in sorted(TEMPLATES_DIR.glob("*.j2")):
+            self.env.get_template(path.name)
+
+    def _render_stream(self, template_name: str, **context: Any) -> Iterator[str]:
+        """Render a template as a stream of chunks instead of one string."""
+        stream = self.env.get_template(template_name).stream(**context)
+        stream.enable_buffering(STREAM_BUFFER_SIZE)
+        return stream
 
     def _generate_cli(self, spec: CLISpec) -> str:
         """Generate the cli.py file content."""
-        template = self.env.get_template("cli.py.j2")
-        return template.render(
+        return "".join(self._stream_cli(spec))
+
+    def _stream_cli(self, spec: CLISpec) -> Iterator[str]:
+        """Stream the cli.py file content, one section or command at a time."""
+        for _, render in self._cli_parts(spec):
+            yield from render()
+
+    def _stream_lazy_cli(self, spec: CLISpec) -> Iterator[str]:
+        """Stream cli.py for the lazy layout: the group and a command table."""
+        return self._render_stream(
+            "cli_lazy.py.j2",
             cli=spec,
-            has_path_types=self._has_path_types(spec),
+            has_path_types=any(opt.type == "path" for opt in spec.global_options),
+        )
+
+    def _stream_command(self, spec: CLISpec, command: CommandSpec) -> Iterator[str]:
+        """Stream the module of one command for the lazy layout."""
+        return self._render_stream(
+            "command.py.j2",
+            cli=spec,
+            command=command,
+            has_path_types=self._command_has_path_types(command),
         )
 
+    def _stream_commands_init(self, spec: CLISpec) -> Iterator[str]:
+        """Stream the commands package's __init__.py file content."""
+        yield f'"""Commands of {spec.name}, each imported when it is used."""\n'
+
     def _generate_init(self, spec: CLISpec) -> str:
         """Generate the __init__.py file content."""
-        return f'''"""{ spec.description }"""
+        return "".join(self._stream_init(spec))
+
+    def _stream_init(self, spec: CLISpec) -> Iterator[str]:
+        """Stream the __init__.py file content."""
+        yield f'''"""{ spec.description }"""
 
 __version__ = "0.1.0"
 '''
 
     def _generate_pyproject(self, spec: CLISpec) -> str:
         """Generate the pyproject.toml file content."""
+        return "".join(self._stream_pyproject(spec))
+
+    def _stream_pyproject(self, spec: CLISpec) -> Iterator[str]:
+        """Stream the pyproject.toml file content."""
         # Collect dependencies
         deps = ["click>=8.1"]
         deps.extend(spec.dependencies)
         deps_str = ",\n    ".join(f'"{d}"' for d in deps)
 
-        return f'''[project]
+        yield f'''[project]
 name = "{spec.name}"
 version = "0.1.0"
 description = "{spec.description}"
@@ -220,6 +746,9 @@ dependencies = [
 [project.scripts]
 {spec.name} = "{spec.name}.cli:main"
 
+[tool.setuptools.package-data]
+{spec.name} = ["completions/*"]
+
 [build-system]
 requires = ["setuptools>=61.0"]
 build-backend = "setuptools.build_meta"
@@ -227,7 +756,16 @@ build-backend = "setuptools.build_meta"
 
     def _generate_readme(self, spec: CLISpec) -> str:
         """Generate the README.md file content."""
-        readme = f"""# {spec.name}
+        return "".join(self._stream_readme(spec))
+
+    def _stream_readme(self, spec: CLISpec) -> Iterator[str]:
+        """Stream the README.md file content, one section or command at a time."""
+        for _, render in self._readme_parts(spec):
+            yield from render()
+
+    def _stream_readme_head(self, spec: CLISpec) -> Iterator[str]:
+        """Stream the README up to the first command."""
+        yield f"""# {spec.name}
 
 {spec.description}
 
@@ -242,21 +780,145 @@ pip install {spec.name}
 ```bash
 {spec.name} --help
 ```
+
+## Shell Completion
+
+Static completion scripts for bash, zsh and fish are in `{spec.name}/completions/`.
+Copy the one for your shell into place, then open a new shell:
+
+```bash
+# bash
+cp {spec.name}/completions/{spec.name}.bash ~/.local/share/bash-completion/completions/{spec.name}
+# zsh (with ~/.zfunc on $fpath, before compinit runs)
+cp {spec.name}/completions/_{spec.name} ~/.zfunc/_{spec.name}
+# fish
+cp {spec.name}/completions/{spec.name}.fish ~/.config/fish/completions/{spec.name}.fish
+```
 """
 
         if spec.commands:
-            readme += "\n## Commands\n\n"
-            for cmd in spec.commands:
-                readme += f"### {cmd.name}\n\n"
-                readme += f"{cmd.description}\n\n"
-                readme += f"```bash\n{spec.name} {cmd.name} --help\n```\n\n"
+            yield "\n## Commands\n\n"
+
+    def _stream_readme_section(self, spec: CLISpec, cmd: CommandSpec) -> Iterator[str]:
+        """Stream the README section of one command."""
+        yield (
+            f"### {cmd.name}\n\n"
+            f"{cmd.description}\n\n"
+            f"```bash\n{spec.name} {cmd.name} --help\n```\n\n"
+        )
 
+    def _stream_readme_tail(self, spec: CLISpec) -> Iterator[str]:
+        """Stream the README after the last command."""
         if spec.global_options:
-            readme += "## Global Options\n\n"
+            yield "## Global Options\n\n"
             for opt in spec.global_options:
                 opt_str = f"--{opt.name}"
                 if opt.short:
                     opt_str = f"-{opt.short}, {opt_str}"
-                readme += f"- `{opt_str}`: {opt.help}\n"
-
-        return readme
+                yield f"- `{opt_str}`: {opt.help}\n"
+
+
+def _sources_hash() -> str:
+    """Hash the template sources, to tell whether precompiled ones are stale."""
+    digest = hashlib.sha256()
+    for path in sorted(TEMPLATES_DIR.glob("*.j2")):
+        digest.update(path.name.encode() + b"\0" + path.read_bytes())
+    return digest.hexdigest()
+
+
+def _precompiled_loader() -> ModuleLoader | None:
+    """Return a loader for precompiled templates, if they match the sources."""
+    try:
+        built_from = (PRECOMPILED_DIR / SOURCES_HASH_FILE).read_text().strip()
+    except OSError:
+        return None
+    if built_from != _sources_hash():
+        return None
+    return ModuleLoader(str(PRECOMPILED_DIR))
+
+
+def _bytecode_cache(directory: Path | None) -> BytecodeCache | None:
+    """Return an on-disk bytecode cache, or None if the directory is unusable."""
+    if directory is None:
+        return None
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return None
+    return FileSystemBytecodeCache(str(directory))
+
+
+def create_environment(
+    loader: BaseLoader | None = None, bytecode_cache: BytecodeCache | None = None
+) -> Environment:
+    """Create a Jinja2 environment with the code generator's filters.
+
+    Args:
+        loader: Where templates come from (default: the package templates).
+        bytecode_cache: Cache for compiled templates across processes.
+    """
+    env = Environment(
+        loader=loader or PackageLoader("cli_generator", "templates"),
+        autoescape=select_autoescape(),
+        trim_blocks=True,
+        lstrip_blocks=True,
+        bytecode_cache=bytecode_cache,
+        # Package templates do not change while the process runs
+        auto_reload=False,
+    )
+    # Register custom filters
+    env.filters["to_func_name"] = CodeGenerator._to_func_name
+    env.filters["to_param_name"] = CodeGenerator._to_param_name
+    env.filters["python_type"] = CodeGenerator._python_type
+    env.filters["python_string"] = CodeGenerator._python_string
+    env.filters["option_flags"] = CodeGenerator._option_flags
+    env.filters["shell_quote"] = shlex.quote
+    env.filters["fish_quote"] = CodeGenerator._fish_quote
+    env.filters["zsh_option_specs"] = CodeGenerator._zsh_option_specs
+    env.filters["zsh_argument_spec"] = CodeGenerator._zsh_argument_spec
+    env.filters["fish_option"] = CodeGenerator._fish_option
+    env.tests["keyword"] = keyword.iskeyword
+    # Register custom functions
+    env.globals["render_option"] = CodeGenerator._render_option
+    env.globals["render_argument"] = CodeGenerator._render_argument
+    return env
+
+
+def get_environment(bytecode_cache_dir: Path | None = TEMPLATE_CACHE_DIR) -> Environment:
+    """Return the process-wide environment, creating it on first use.
+
+    Templates precompiled by precompile_templates() are used when they were
+    built from the current sources. Otherwise templates are compiled from
+    source, with their bytecode cached on disk for the next process. Either
+    way, the environment keeps every compiled template in memory.
+
+    Args:
+        bytecode_cache_dir: Directory for the bytecode cache, or None to
+                            compile from source in every process.
+    """
+    return _environment(bytecode_cache_dir)
+
+
+@lru_cache(maxsize=None)
+def _environment(bytecode_cache_dir: Path | None) -> Environment:
+    """Create the environment for a bytecode cache directory (see get_environment)."""
+    loader = _precompiled_loader()
+    if loader is not None:
+        return create_environment(loader)
+    return create_environment(bytecode_cache=_bytecode_cache(bytecode_cache_dir))
+
+
+def precompile_templates(target: Path = PRECOMPILED_DIR) -> Path:
+    """Compile the package templates to Python modules ahead of time.
+
+    Run this when building a distribution (the output is not checked in);
+    get_environment() loads the modules instead of parsing the templates
+    for as long as the template sources are unchanged.
+
+    Returns:
+        The directory holding the compiled templates.
+    """
+    target.mkdir(parents=True, exist_ok=True)
+    create_environment().compile_templates(str(target), zip=None)
+    (target / SOURCES_HASH_FILE).write_text(_sources_hash())
+    return target
@@ -0,0 +1,286 @@
+"""Rule-based CLISpec synthesis for formulaic descriptions.
+
+Descriptions like "A CLI with list, add and delete commands for notes" follow
+a pattern the model adds little to: a subject, a handful of verbs that become
+commands, and maybe some standard flags. LocalSpecGenerator builds those specs
+without a model call and reports how confident it is, so callers only use
+the result when (almost) every word of the description is accounted for.
+"""
+
+import keyword
+import re
+
+from pydantic import BaseModel, Field
+
+from cli_generator.models import ArgumentSpec, CLISpec, CommandSpec, OptionSpec
+
+# Standard options, following the conventions in SYSTEM_PROMPT
+STANDARD_OPTIONS = {
+    "output": OptionSpec(name="output", short="o", type="path", help="Output file or directory"),
+    "verbose": OptionSpec(
+        name="verbose", short="v", type="bool", default=False, help="Enable verbose output"
+    ),
+    "quiet": OptionSpec(name="quiet", short="q", type="bool", default=False, help="Suppress output"),
+    "force": OptionSpec(
+        name="force", short="f", type="bool", default=False, help="Force without confirmation"
+    ),
+    "dry_run": OptionSpec(
+        name="dry_run", short="n", type="bool", default=False, help="Show what would happen"
+    ),
+}
+
+# Words that ask for a standard global option
+OPTION_KEYWORDS = {
+    "verbose": "verbose",
+    "quiet": "quiet",
+    "silent": "quiet",
+    "force": "force",
+    "dry": "dry_run",
+}
+
+# verb -> (help template, arguments as (name, type) pairs, standard options).
+# "{item}" is the singular subject, "{items}" the plural; an argument named
+# "{item}" takes the subject's name.
+COMMAND_RULES: dict[str, tuple[str, list[tuple[str, str]], list[str]]] = {
+    "list": ("List all {items}", [], []),
+    "add": ("Add a new {item}", [("{item}", "str")], []),
+    "create": ("Create a new {item}", [("name", "str")], []),
+    "new": ("Create a new {item}", [("name", "str")], []),
+    "delete": ("Delete a {item}", [("{item}", "str")], ["force"]),
+    "remove": ("Remove a {item}", [("{item}", "str")], ["force"]),
+    "show": ("Show a {item}", [("{item}", "str")], []),
+    "view": ("View a {item}", [("{item}", "str")], []),
+    "get": ("Get a {item}", [("{item}", "str")], []),
+    "edit": ("Edit a {item}", [("{item}", "str")], []),
+    "update": ("Update a {item}", [("{item}", "str")], []),
+    "rename": ("Rename a {item}", [("{item}", "str")], []),
+    "search": ("Search {items}", [("query", "str")], []),
+    "find": ("Find {items}", [("query", "str")], []),
+    "done": ("Mark a {item} as done", [("{item}", "str")], []),
+    "complete": ("Mark a {item} as complete", [("{item}", "str")], []),
+    "count": ("Count {items}", [], []),
+    "clear": ("Remove all {items}", [], ["force"]),
+    "export": ("Export {items}", [], ["output"]),
+    "import": ("Import {items} from a file", [("file", "path")], []),
+    "backup": ("Back up {items}", [], ["output"]),
+    "restore": ("Restore {items} from a backup", [("file", "path")], ["force"]),
+    "sync": ("Sync {items}", [], ["dry_run"]),
+    "convert": ("Convert a {item}", [("input", "path")], ["output"]),
+    "download": ("Download a {item}", [("url", "str")], ["output"]),
+    "upload": ("Upload a {item}", [("file", "path")], []),
+    "start": ("Start a {item}", [("{item}", "str")], []),
+    "stop": ("Stop a {item}", [("{item}", "str")], []),
+    "status": ("Show the status of {items}", [], []),
+    "validate": ("Validate a {item}", [("file", "path")], []),
+    "check": ("Check {items}", [], []),
+    "init": ("Initialize a new {item} store", [], ["force"]),
+    "copy": ("Copy a {item}", [("source", "path"), ("destination", "path")], []),
+    "move": ("Move a {item}", [("source", "path"), ("destination", "path")], []),
+}
+
+# Words carrying no information beyond the command list and subject
+FILLER_WORDS = frozenset(
+    """
+    a an the and or with for of to in on that which who can could should will lets
+    let me my our your their i we you it its is are be allows allow support supports
+    supporting cli command commands subcommand subcommands tool tools app application
+    utility program simple small basic tiny little manage manages managing manager
+    tracker organizer option options flag flags mode run item items entry entries
+    record records
+    """.split()
+)
+
+# Function words that end a subject: "notes without color" is about notes
+SUBJECT_STOP_WORDS = (
+    "with", "without", "using", "that", "which", "who", "and", "or", "but", "in", "from",
+    "to", "on", "at", "by", "via", "into", "over", "per", "except", "plus", "including",
+    "so", "if", "when", "where", "while", "not", "no",
+)
+# Words after which the subject of the CLI follows ("... for notes")
+SUBJECT_PATTERN = re.compile(
+    r"\b(?:for|of|to manage|manage|managing|manages)\s+(?:my\s+|your\s+|the\s+)?"
+    r"(?P<subject>[a-z][a-z ]*?)"
+    rf"(?=\s+(?:{'|'.join(SUBJECT_STOP_WORDS)})\b|\s*[.,;:]|$)"
+)
+# "A todo list manager with ..." style subjects
+NOUN_PATTERN = re.compile(
+    r"^(?:a|an)\s+(?:simple\s+|small\s+|basic\s+)?(?P<subject>[a-z][a-z ]*?)\s+"
+    r"(?:manager|tracker|organizer|cli|tool|app|utility)\b"
+)
+# Container words that are not the item itself ("todo list" holds "todos")
+CONTAINER_WORDS = frozenset({"list", "lists", "collection", "library", "database", "store"})
+
+WORD_PATTERN = re.compile(r"[a-z]+")
+# Everything but letters and the punctuation that ends a subject
+NOISE_PATTERN = re.compile(r"[^a-z.,;:]+")
+
+
+class LocalSynthesis(BaseModel):
+    """The outcome of rule-based synthesis."""
+
+    spec: CLISpec | None = Field(default=None, description="The synthesized spec")
+    confidence: float = Field(default=0.0, description="Share of the description explained")
+    reason: str = Field(default="", description="Why synthesis failed or was unsure")
+
+
+def head_noun_phrase(subject_words: list[str]) -> list[str]:
+    """Return the head noun of a subject, with the container word after it if any."""
+    if len(subject_words) > 1 and subject_words[-1] in CONTAINER_WORDS:
+        return subject_words[-2:]
+    return subject_words[-1:]
+
+
+def lemmatize(word: str) -> str:
+    """Reduce a verb form to the base word used in COMMAND_RULES, if any."""
+    candidates = [word]
+    if word.endswith("ing"):
+        candidates += [word[:-3], word[:-3] + "e"]
+    if word.endswith("es"):
+        candidates.append(word[:-2])
+    if word.endswith("s"):
+        candidates.append(word[:-1])
+    if word.endswith("ed"):
+        candidates += [word[:-2], word[:-1]]
+    for candidate in candidates:
+        if candidate in COMMAND_RULES:
+            return candidate
+    return word
+
+
+def singularize(word: str) -> str:
+    """Return a naive singular form of an English noun."""
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith(("sses", "xes", "ches", "shes")):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def pluralize(word: str) -> str:
+    """Return a naive plural form of an English noun."""
+    if word.endswith("y") and word[-2:-1] not in "aeiou":
+        return word[:-1] + "ies"
+    if word.endswith(("s", "x", "ch", "sh")):
+        return word + "es"
+    return word + "s"
+
+
+class LocalSpecGenerator:
+    """Synthesize specs for formulaic descriptions without calling a model."""
+
+    def __init__(self, threshold: float = 0.9) -> None:
+        """Initialize the synthesizer.
+
+        Args:
+            threshold: Minimum confidence for accepts() to return True.
+        """
+        self.threshold = threshold
+
+    def accepts(self, synthesis: LocalSynthesis) -> bool:
+        """Return whether a synthesis is confident enough to be used."""
+        return synthesis.spec is not None and synthesis.confidence >= self.threshold
+
+    def synthesize(self, description: str) -> LocalSynthesis:
+        """Parse a description into a CLISpec.
+
+        Confidence is the share of the description's words accounted for by
+        the subject's head noun, the recognized verbs, standard option
+        keywords and filler words; anything else (domain details like "resize
+        options", or the "team" of "team project") lowers it.
+
+        Args:
+            description: Natural language description of the desired CLI.
+
+        Returns:
+            The synthesized spec (if any) with its confidence.
+        """
+        text = NOISE_PATTERN.sub(" ", description.lower()).strip()
+        if not WORD_PATTERN.search(text):
+            return LocalSynthesis(reason="no words in description")
+
+        match = SUBJECT_PATTERN.search(text) or NOUN_PATTERN.search(text)
+        if match is None:
+            return LocalSynthesis(reason="no subject found")
+        subject_words = WORD_PATTERN.findall(match.group("subject"))
+        # Verbs are only looked for outside the subject ("todo list manager")
+        rest = text[: match.start("subject")] + " " + text[match.end("subject") :]
+
+        verbs: list[str] = []
+        option_names: list[str] = []
+        head = head_noun_phrase(subject_words)
+        modifiers = subject_words[: len(subject_words) - len(head)]
+        explained = len(head) + sum(word in FILLER_WORDS for word in modifiers)
+        rest_words = WORD_PATTERN.findall(rest)
+        for word in rest_words:
+            verb = lemmatize(word)
+            if verb in COMMAND_RULES:
+                if verb not in verbs:
+                    verbs.append(verb)
+                explained += 1
+            elif word in OPTION_KEYWORDS:
+                if OPTION_KEYWORDS[word] not in option_names:
+                    option_names.append(OPTION_KEYWORDS[word])
+                explained += 1
+            elif word in FILLER_WORDS:
+                explained += 1
+
+        if not verbs:
+            return LocalSynthesis(reason="no command verbs found")
+
+        confidence = explained / (len(subject_words) + len(rest_words))
+        spec = self._build_spec(subject_words, verbs, option_names, description)
+        return LocalSynthesis(spec=spec, confidence=round(confidence, 3))
+
+    def _build_spec(
+        self,
+        subject_words: list[str],
+        verbs: list[str],
+        option_names: list[str],
+        description: str,
+    ) -> CLISpec:
+        """Build the spec for a parsed subject, verbs and global options."""
+        item = singularize(head_noun_phrase(subject_words)[0])
+        items = pluralize(item)
+
+        name = "_".join(subject_words)
+        if keyword.iskeyword(name) or not name.endswith("_cli"):
+            name = f"{name}_cli"
+
+        global_options = [STANDARD_OPTIONS[option].model_copy() for option in option_names]
+        global_names = set(option_names)
+        commands = []
+        for verb in verbs:
+            help_template, argument_rules, standard = COMMAND_RULES[verb]
+            arguments = []
+            usage = f"{name} {verb}"
+            for arg_template, arg_type in argument_rules:
+                arg_name = arg_template.format(item=item)
+                if keyword.iskeyword(arg_name):
+                    # "for classes" cannot take a parameter named class
+                    arg_name = f"{item}_name"
+                arguments.append(
+                    ArgumentSpec(name=arg_name, type=arg_type, help=f"The {arg_name}")
+                )
+                usage += f" <{arg_name}>"
+            commands.append(
+                CommandSpec(
+                    name=verb,
+                    description=help_template.format(item=item, items=items),
+                    arguments=arguments,
+                    options=[
+                        STANDARD_OPTIONS[option].model_copy()
+                        for option in standard
+                        if option not in global_names
+                    ],
+                    examples=[usage],
+                )
+            )
+
+        return CLISpec(
+            name=name,
+            description=description.strip().rstrip("."),
+            commands=commands,
+            global_options=global_options,
+        )
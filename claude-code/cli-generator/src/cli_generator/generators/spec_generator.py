@@ -1,15 +1,33 @@
 """Generate CLISpec from natural language descriptions using PydanticAI."""
 
-from typing import Union
+import asyncio
+import time
+from collections.abc import AsyncIterator, Sequence
+from typing import Any, Literal, TypeVar, Union
 
+import httpx
+from pydantic import BaseModel, ValidationError
 from pydantic_ai import Agent
-from pydantic_ai.models import Model
+from pydantic_ai.exceptions import UnexpectedModelBehavior
+from pydantic_ai.messages import ModelMessage, ModelResponse, ToolCallPart
+from pydantic_ai.models import Model, infer_model
+from pydantic_ai.providers import infer_provider_class
 
-from cli_generator.models import CLISpec, CommandSpec
+from cli_generator.cache import SpecCache
+from cli_generator.examples import ExampleLibrary
+from cli_generator.generators.local_generator import LocalSpecGenerator, LocalSynthesis
+from cli_generator.hedging import HedgeStats, model_name, run_hedged
+from cli_generator.instrumentation import CacheOutcome, CallRecord, Recorder
+from cli_generator.models import CLISpec, CommandSpec, SpecSkeleton
+from cli_generator.validators import SpecRepairer
 
+T = TypeVar("T")
+
+Engine = Literal["llm", "local", "auto"]
+ENGINES = ("llm", "local", "auto")
 
 # System prompt that guides the LLM to generate good CLI specifications
-SYSTEM_PROMPT = """You are an expert CLI designer. Your task is to convert natural language
+_PROMPT_RULES = """You are an expert CLI designer. Your task is to convert natural language
 descriptions into well-structured CLI specifications.
 
 ## CRITICAL: Field Format Rules
@@ -52,7 +70,10 @@ descriptions into well-structured CLI specifications.
 - "path": File path
 - "choice": Selection from list (must include `choices` field)
 
-## Example Output Structure
+"""
+
+# Static example, replaced by retrieved examples when an ExampleLibrary is used
+STATIC_EXAMPLE = """## Example Output Structure
 
 ```json
 {
@@ -77,28 +98,132 @@ descriptions into well-structured CLI specifications.
 }
 ```
 
-Keep it simple - only include options that are actually needed for the described functionality.
+"""
+
+_PROMPT_CLOSING = """Keep it simple - only include options that are actually needed for the described functionality.
+"""
+
+SYSTEM_PROMPT = _PROMPT_RULES + STATIC_EXAMPLE + _PROMPT_CLOSING
+
+# Slimmer base prompt used with an ExampleLibrary: the same rules, stated
+# tersely, with retrieved examples added per description as instructions
+BASE_SYSTEM_PROMPT = """You are an expert CLI designer. Convert natural language descriptions into
+CLI specifications.
+
+Rules:
+- Names never include dashes or brackets: option name "output" (not "--output"),
+  short "o" (not "-o"), argument name "filename" (not "<filename>").
+- Never add help or version options; they are added automatically.
+- CLI names are lowercase valid Python identifiers with underscores
+  (e.g. "word_counter"). Command names are short verbs ("count", "list").
+- Conventional shorts: output "o", verbose "v", quiet "q", force "f", dry_run "n";
+  flags use type "bool".
+- Arguments are the required positional "what" (a file, a URL); options are the
+  optional "how".
+- Types: "str" (default), "int", "float", "bool" (flag), "path", "choice"
+  (requires a `choices` list).
+- Keep it simple: only include options the described functionality needs.
 """
 
 
 class SpecGenerator:
     """Generate CLISpec from natural language descriptions using an LLM."""
 
-    def __init__(self, model: Union[str, Model] = "openai:gpt-4o-mini") -> None:
+    def __init__(
+        self,
+        model: Union[str, Model, Sequence[Union[str, Model]]] = "openai:gpt-4o-mini",
+        cache: SpecCache | None = None,
+        fanout: bool = False,
+        command_retries: int = 2,
+        repair: bool = True,
+        http_client: httpx.AsyncClient | None = None,
+        coalesce: bool = True,
+        hedge_delay: float = 2.0,
+        examples: ExampleLibrary | None = None,
+        num_examples: int = 2,
+        recorder: Recorder | None = None,
+        engine: Engine = "llm",
+        local_threshold: float = 0.9,
+    ) -> None:
         """Initialize the generator with a model.
 
         Args:
             model: The model identifier string (e.g., "openai:gpt-4o-mini",
                    "anthropic:claude-3-5-sonnet-latest") or a Model instance
-                   (e.g., TestModel for testing).
+                   (e.g., TestModel for testing). A list of models enables
+                   hedging: the first is the primary model, the others are
+                   fallbacks raced against it when it is slow.
+            cache: Optional spec cache consulted before calling the model.
+            fanout: Generate a skeleton first, then each command concurrently,
+                    instead of producing the whole spec in one request.
+            command_retries: In fan-out mode, how many times a single failing
+                             command is regenerated before giving up.
+            repair: Fix trivially invalid model output (e.g. duplicate short
+                    options) locally instead of asking the model to retry.
+            http_client: Shared HTTP client (see cli_generator.pool) used by the
+                         model provider, so connections are pooled and kept
+                         alive across generators. Only used with model strings.
+            coalesce: Share one in-flight request between concurrent
+                      generate() calls for the same description.
+            hedge_delay: With several models, seconds to wait for a response
+                         before also asking the next model.
+            examples: Library of example specs. When given, the static example
+                      in the system prompt is replaced by the specs most
+                      similar to each description.
+            num_examples: How many examples to retrieve per description.
+            recorder: Records tokens, wall time, retries and the cache
+                      outcome of every call.
+            engine: "llm" always calls the model, "local" always uses the
+                    rule-based synthesizer, and "auto" uses the synthesizer
+                    when its confidence reaches local_threshold and the model
+                    otherwise.
+            local_threshold: Minimum confidence for the "auto" engine to use
+                             a locally synthesized spec.
+
+        Raises:
+            ValueError: If no model or an unknown engine is given.
         """
+        if engine not in ENGINES:
+            raise ValueError(f"engine must be one of {', '.join(ENGINES)}")
+        if isinstance(model, Sequence) and not isinstance(model, str):
+            models = list(model)
+        else:
+            models = [model]
+        if not models:
+            raise ValueError("model cannot be empty")
+        model = models[0]
         self.model = model if isinstance(model, str) else str(type(model).__name__)
-        self._model_instance = model
+        self.model_names = [model_name(m) for m in models]
+        self._model_specs = models
+        # Built on first use by the _models property
+        self._pooled_models: list[Union[str, Model]] | None = None
+        self.hedge_delay = hedge_delay
+        self.hedge_stats = HedgeStats() if len(models) > 1 else None
+        self.http_client = http_client
+        self.coalesce = coalesce
+        self._inflight: dict[str, asyncio.Future[CLISpec]] = {}
+        self.cache = cache
+        self.fanout = fanout
+        self.command_retries = command_retries
+        self.examples = examples
+        self.recorder = recorder
+        self.engine = engine
+        self.local = LocalSpecGenerator(local_threshold) if engine != "llm" else None
+        self.last_synthesis: LocalSynthesis | None = None
+        # Requests served by each engine (cache hits count towards "llm")
+        self.engine_counts = {"llm": 0, "local": 0}
+        self.num_examples = num_examples
+        self.repairer = SpecRepairer() if repair else None
+        # A silent repairer reaches the model validators through the validation
+        # context; partial and retried outputs are validated too, so repairs are
+        # only recorded (in self.repairer) for each run's final output
+        validation_context = {"repairer": SpecRepairer(record=False)} if repair else None
         self.agent = Agent(
             model,
             output_type=CLISpec,
-            system_prompt=SYSTEM_PROMPT,
+            system_prompt=self.get_system_prompt(),
             defer_model_check=True,
+            validation_context=validation_context,
         )
         # Separate agent for generating individual commands
         self.command_agent = Agent(
@@ -106,16 +231,169 @@ class SpecGenerator:
             output_type=CommandSpec,
             system_prompt=SYSTEM_PROMPT,
             defer_model_check=True,
+            validation_context=validation_context,
         )
+        # Agent for the cheap first phase of fan-out generation
+        self.skeleton_agent = Agent(
+            model,
+            output_type=SpecSkeleton,
+            system_prompt=self.get_system_prompt(),
+            defer_model_check=True,
+            validation_context=validation_context,
+        )
+
+    @property
+    def _models(self) -> list[Union[str, Model]]:
+        """The models to run, bound to the shared HTTP client if there is one.
+
+        Building a provider checks its credentials, so with an HTTP client the
+        model strings are only turned into models when the first request
+        needs them; a generator that never calls a model never needs a key.
+        """
+        if self.http_client is None:
+            return self._model_specs
+        if self._pooled_models is None:
+            http_client = self.http_client
+            self._pooled_models = [
+                infer_model(
+                    m,
+                    provider_factory=lambda name: infer_provider_class(name)(
+                        http_client=http_client
+                    ),
+                )
+                if isinstance(m, str)
+                else m
+                for m in self._model_specs
+            ]
+        return self._pooled_models
 
     def get_system_prompt(self) -> str:
         """Return the system prompt used for generation.
 
         Returns:
-            The system prompt string.
+            The system prompt string (without examples when an example
+            library supplies them per description).
         """
+        if self.examples is not None:
+            return BASE_SYSTEM_PROMPT
         return SYSTEM_PROMPT
 
+    def get_examples(self, description: str) -> str | None:
+        """Return the example instructions for a description.
+
+        Returns:
+            Retrieved examples, the static example if none match, or None
+            without an example library.
+        """
+        if self.examples is None:
+            return None
+        return self.examples.instructions(description, self.num_examples) or STATIC_EXAMPLE
+
+    def _cache_key(self, description: str) -> str | None:
+        """Return the cache key for a description, or None without a cache."""
+        if self.cache is None:
+            return None
+        return self.cache.make_key(self.model, self.get_system_prompt(), description)
+
+    @property
+    def _cache_outcome(self) -> CacheOutcome:
+        """The cache outcome of a generation that had to call the model."""
+        return "disabled" if self.cache is None else "miss"
+
+    def _record_repairs(self, agent: Agent[Any, Any], messages: list[ModelMessage]) -> None:
+        """Record the repairs that saved a run's final output from a retry."""
+        if self.repairer is None:
+            return
+        output_type = agent.output_type
+        if not (isinstance(output_type, type) and issubclass(output_type, BaseModel)):
+            return
+        data = _output_data(messages)
+        if data is not None:
+            self.repairer.record_saved(data, output_type)
+
+    async def _run(
+        self,
+        agent: Agent[Any, T],
+        prompt: str,
+        instructions: str | None = None,
+        operation: str = "spec",
+        cache: CacheOutcome | None = None,
+    ) -> T:
+        """Run an agent, hedging across the fallback models if there are any.
+
+        The call is recorded under the given operation and cache outcome.
+        """
+        start = time.perf_counter()
+        if self.hedge_stats is None:
+            result = await agent.run(prompt, instructions=instructions, model=self._models[0])
+        else:
+            result = await run_hedged(
+                agent,
+                prompt,
+                self._models,
+                self.hedge_delay,
+                self.hedge_stats,
+                names=self.model_names,
+                instructions=instructions,
+            )
+        if self.recorder is not None:
+            self.recorder.record_result(
+                operation,
+                result,
+                time.perf_counter() - start,
+                model=result.response.model_name or self.model,
+                cache=cache,
+            )
+        self._record_repairs(agent, result.all_messages())
+        return result.output
+
+    def _generate_local(self, description: str) -> CLISpec | None:
+        """Synthesize a spec locally if the engine allows it.
+
+        Returns:
+            The local spec, or None if the model should be used instead.
+
+        Raises:
+            ValueError: With the "local" engine, if no spec can be synthesized.
+        """
+        if self.local is None:
+            return None
+
+        start = time.perf_counter()
+        synthesis = self.local.synthesize(description)
+        self.last_synthesis = synthesis
+        if self.engine == "local":
+            if synthesis.spec is None:
+                raise ValueError(
+                    f"The local engine cannot handle this description: {synthesis.reason}"
+                )
+        elif not self.local.accepts(synthesis):
+            return None
+
+        self.engine_counts["local"] += 1
+        if self.recorder is not None:
+            self.recorder.record(
+                CallRecord(
+                    operation="spec",
+                    model="local",
+                    wall_time=time.perf_counter() - start,
+                    engine="local",
+                )
+            )
+        return synthesis.spec
+
+    def _record_shortcut(self, cache: CacheOutcome, start: float) -> None:
+        """Record a generation answered without a model call of its own."""
+        if self.recorder is not None:
+            self.recorder.record(
+                CallRecord(
+                    operation="spec",
+                    model=self.model,
+                    wall_time=time.perf_counter() - start,
+                    cache=cache,
+                )
+            )
+
     async def generate(self, description: str) -> CLISpec:
         """Generate a CLISpec from a natural language description.
 
@@ -131,10 +409,229 @@ class SpecGenerator:
         if not description or not description.strip():
             raise ValueError("description cannot be empty")
 
-        result = await self.agent.run(
-            f"Create a CLI specification for: {description}"
+        local_spec = self._generate_local(description)
+        if local_spec is not None:
+            return local_spec
+        self.engine_counts["llm"] += 1
+
+        start = time.perf_counter()
+        cache_key = self._cache_key(description)
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self._record_shortcut("hit", start)
+                return cached
+
+        if not self.coalesce:
+            return await self._generate_uncached(description, cache_key)
+
+        # Single-flight: concurrent calls for the same request share one task
+        flight_key = SpecCache.make_key(self.model, self.get_system_prompt(), description)
+        task = self._inflight.get(flight_key)
+        if task is None:
+            task = asyncio.ensure_future(self._generate_uncached(description, cache_key))
+            self._inflight[flight_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(flight_key, None))
+            # Shield so one cancelled caller does not cancel the shared request
+            return await asyncio.shield(task)
+
+        spec = await asyncio.shield(task)
+        self._record_shortcut("coalesced", start)
+        return spec
+
+    async def _generate_uncached(self, description: str, cache_key: str | None) -> CLISpec:
+        """Call the model for a spec and store it in the cache."""
+        if self.fanout:
+            spec = await self._generate_fanout(description)
+        else:
+            spec = await self._run(
+                self.agent,
+                f"Create a CLI specification for: {description}",
+                self.get_examples(description),
+                cache=self._cache_outcome,
+            )
+
+        if cache_key is not None:
+            self.cache.put(cache_key, spec)
+
+        return spec
+
+    async def generate_stream(
+        self, description: str, debounce_by: float | None = 0.1
+    ) -> AsyncIterator[CLISpec]:
+        """Generate a CLISpec, yielding partially validated specs as they arrive.
+
+        Partial specs contain only the commands received so far. The last
+        spec yielded is the complete, fully validated result. In fan-out
+        mode a new spec is yielded each time a command finishes. When hedging
+        across several models, or when the local engine serves the request,
+        only the final spec is yielded.
+
+        Args:
+            description: Natural language description of the desired CLI.
+            debounce_by: Seconds to group streamed chunks by before
+                         re-validating, or None to validate every chunk.
+
+        Yields:
+            Progressively more complete CLISpec objects.
+
+        Raises:
+            ValueError: If description is empty or whitespace only.
+        """
+        if not description or not description.strip():
+            raise ValueError("description cannot be empty")
+
+        local_spec = self._generate_local(description)
+        if local_spec is not None:
+            yield local_spec
+            return
+        self.engine_counts["llm"] += 1
+
+        start = time.perf_counter()
+        cache_key = self._cache_key(description)
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self._record_shortcut("hit", start)
+                yield cached
+                return
+
+        spec = None
+        if self.fanout:
+            async for spec in self._stream_fanout(description):
+                yield spec
+        elif self.hedge_stats is not None:
+            # A hedged race cannot be streamed, only its winner is yielded
+            spec = await self._run(
+                self.agent,
+                f"Create a CLI specification for: {description}",
+                self.get_examples(description),
+                cache=self._cache_outcome,
+            )
+            yield spec
+        else:
+            async with self.agent.run_stream(
+                f"Create a CLI specification for: {description}",
+                instructions=self.get_examples(description),
+                model=self._models[0],
+            ) as result:
+                async for spec in result.stream_output(debounce_by=debounce_by):
+                    yield spec
+            self._record_repairs(self.agent, result.all_messages())
+            if self.recorder is not None:
+                self.recorder.record_result(
+                    "spec",
+                    result,
+                    time.perf_counter() - start,
+                    model=result.response.model_name or self.model,
+                    cache=self._cache_outcome,
+                )
+
+        if cache_key is not None and spec is not None:
+            self.cache.put(cache_key, spec)
+
+    async def _generate_skeleton(self, description: str) -> SpecSkeleton:
+        """Generate the skeleton for fan-out generation."""
+        return await self._run(
+            self.skeleton_agent,
+            f"""Outline a CLI specification for: {description}
+
+Only decide the CLI name, description, global options, dependencies and the
+names of the commands. The commands themselves are generated separately.""",
+            self.get_examples(description),
+            operation="skeleton",
+            cache=self._cache_outcome,
         )
-        return result.output
+
+    @staticmethod
+    def _merge_skeleton(
+        skeleton: SpecSkeleton, commands: list[CommandSpec]
+    ) -> CLISpec:
+        """Combine a skeleton with its generated commands."""
+        return CLISpec(
+            name=skeleton.name,
+            description=skeleton.description,
+            commands=commands,
+            global_options=skeleton.global_options,
+            python_version=skeleton.python_version,
+            dependencies=skeleton.dependencies,
+        )
+
+    async def _generate_fanout(self, description: str) -> CLISpec:
+        """Generate a spec as a skeleton plus concurrent per-command requests."""
+        skeleton = await self._generate_skeleton(description)
+
+        commands = await asyncio.gather(
+            *(
+                self._generate_skeleton_command(skeleton, description, name)
+                for name in skeleton.command_names
+            )
+        )
+
+        return self._merge_skeleton(skeleton, list(commands))
+
+    async def _stream_fanout(self, description: str) -> AsyncIterator[CLISpec]:
+        """Fan-out generation yielding the spec again as each command completes."""
+        skeleton = await self._generate_skeleton(description)
+        yield self._merge_skeleton(skeleton, [])
+
+        tasks = [
+            asyncio.create_task(
+                self._generate_skeleton_command(skeleton, description, name)
+            )
+            for name in skeleton.command_names
+        ]
+        done: dict[str, CommandSpec] = {}
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                command = await next_done
+                done[command.name] = command
+                # Keep the skeleton's command order regardless of completion order
+                yield self._merge_skeleton(
+                    skeleton,
+                    [done[name] for name in skeleton.command_names if name in done],
+                )
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _generate_skeleton_command(
+        self, skeleton: SpecSkeleton, description: str, name: str
+    ) -> CommandSpec:
+        """Generate one command of a skeleton, retrying only this command."""
+        prompt = f"""Generate the "{name}" command for the CLI "{skeleton.name}" ({skeleton.description}).
+
+Original request: {description}
+
+All commands in this CLI: {skeleton.command_names}
+
+Generate a CommandSpec for the "{name}" command only."""
+
+        failures = 0
+        while True:
+            try:
+                command = await self._run(
+                    self.command_agent,
+                    prompt,
+                    operation="command",
+                    cache=self._cache_outcome,
+                )
+                # The skeleton owns command naming, which keeps names unique
+                return CommandSpec.model_validate({**command.model_dump(), "name": name})
+            except (UnexpectedModelBehavior, ValidationError):
+                failures += 1
+                if failures > self.command_retries:
+                    raise
+
+    def _add_command_prompt(self, spec: CLISpec, description: str) -> str:
+        """Build the prompt asking for one new command for an existing spec."""
+        return f"""Add a command to the CLI "{spec.name}" ({spec.description}).
+
+Existing commands: {[cmd.name for cmd in spec.commands]}
+
+New command request: {description}
+
+Generate a CommandSpec for this new command that fits well with the existing CLI."""
 
     async def add_command(self, spec: CLISpec, description: str) -> CLISpec:
         """Add a new command to an existing CLISpec.
@@ -153,18 +650,14 @@ class SpecGenerator:
             raise ValueError("description cannot be empty")
 
         # Generate the new command using the command agent
-        result = await self.command_agent.run(
-            f"""Add a command to the CLI "{spec.name}" ({spec.description}).
-
-Existing commands: {[cmd.name for cmd in spec.commands]}
-
-New command request: {description}
-
-Generate a CommandSpec for this new command that fits well with the existing CLI."""
+        command = await self._run(
+            self.command_agent,
+            self._add_command_prompt(spec, description),
+            operation="add_command",
         )
 
         # Create a new CLISpec with the command added
-        new_commands = list(spec.commands) + [result.output]
+        new_commands = list(spec.commands) + [command]
 
         return CLISpec(
             name=spec.name,
@@ -174,3 +667,93 @@ Generate a CommandSpec for this new command that fits well with the existing CLI
             python_version=spec.python_version,
             dependencies=spec.dependencies,
         )
+
+    async def add_commands(self, spec: CLISpec, descriptions: list[str]) -> CLISpec:
+        """Add several commands to an existing CLISpec concurrently.
+
+        All commands are requested in parallel and merged into a single new
+        CLISpec, which is validated once. Since the requests cannot see each
+        other, name and short option conflicts are resolved locally.
+
+        Args:
+            spec: The existing CLISpec to add commands to.
+            descriptions: Natural language descriptions of the new commands.
+
+        Returns:
+            A new CLISpec with all commands added, in the order given.
+
+        Raises:
+            ValueError: If no descriptions are given or any is empty.
+        """
+        if not descriptions:
+            raise ValueError("descriptions cannot be empty")
+        if any(not d or not d.strip() for d in descriptions):
+            raise ValueError("description cannot be empty")
+
+        commands = await asyncio.gather(
+            *(
+                self._run(
+                    self.command_agent,
+                    self._add_command_prompt(spec, description),
+                    operation="add_command",
+                )
+                for description in descriptions
+            )
+        )
+        new_commands = resolve_command_conflicts(spec, list(commands))
+
+        return CLISpec(
+            name=spec.name,
+            description=spec.description,
+            commands=list(spec.commands) + new_commands,
+            global_options=spec.global_options,
+            python_version=spec.python_version,
+            dependencies=spec.dependencies,
+        )
+
+
+def _output_data(messages: list[ModelMessage]) -> dict[str, Any] | None:
+    """Return the raw output of a run: the arguments of its last tool call."""
+    for message in reversed(messages):
+        if isinstance(message, ModelResponse):
+            for part in reversed(message.parts):
+                if isinstance(part, ToolCallPart):
+                    try:
+                        return part.args_as_dict()
+                    except ValueError:
+                        return None
+            return None
+    return None
+
+
+def resolve_command_conflicts(
+    spec: CLISpec, commands: list[CommandSpec]
+) -> list[CommandSpec]:
+    """Make new commands fit into an existing spec without model calls.
+
+    Command names that clash with existing or earlier new commands get a
+    numeric suffix (e.g. "list_2"). Short options are left alone: click
+    scopes them per command, so a command's "-v" does not clash with a
+    global "-v", and CommandSpec already rejects duplicates within one
+    command (whose --help has no short name).
+
+    Args:
+        spec: The spec the commands will be added to.
+        commands: The newly generated commands.
+
+    Returns:
+        The adjusted commands.
+    """
+    taken_names = {cmd.name for cmd in spec.commands}
+    resolved = []
+
+    for cmd in commands:
+        name = cmd.name
+        suffix = 2
+        while name in taken_names:
+            name = f"{cmd.name}_{suffix}"
+            suffix += 1
+        taken_names.add(name)
+        resolved.append(cmd.model_copy(update={"name": name}))
+
+    return resolved
@@ -0,0 +1,135 @@
+"""Hedged requests: race fallback models against a slow primary model."""
+
+import asyncio
+from typing import Any, TypeVar, Union
+
+from pydantic import BaseModel, Field
+from pydantic_ai import Agent, AgentRunResult
+from pydantic_ai.models import Model
+
+T = TypeVar("T")
+
+
+def model_name(model: Union[str, Model]) -> str:
+    """Return a readable name for a model string or instance."""
+    if isinstance(model, str):
+        return model
+    return model.model_name
+
+
+class HedgeStats(BaseModel):
+    """Counters for tuning the hedge delay."""
+
+    requests: int = Field(default=0, description="Hedged requests made")
+    fired: int = Field(default=0, description="Requests that started at least one hedge")
+    hedges: int = Field(default=0, description="Total hedge requests started")
+    failed: int = Field(default=0, description="Requests where every model failed")
+    wins: dict[str, int] = Field(
+        default_factory=dict, description="Winning request count per model"
+    )
+
+    @property
+    def fire_rate(self) -> float:
+        """Fraction of requests that started a hedge."""
+        if not self.requests:
+            return 0.0
+        return self.fired / self.requests
+
+    def win_rate(self, model: str) -> float:
+        """Fraction of requests won by a model."""
+        if not self.requests:
+            return 0.0
+        return self.wins.get(model, 0) / self.requests
+
+
+async def run_hedged(
+    agent: Agent[Any, T],
+    prompt: str,
+    models: list[Union[str, Model]],
+    delay: float,
+    stats: HedgeStats | None = None,
+    names: list[str] | None = None,
+    **run_kwargs: Any,
+) -> AgentRunResult[T]:
+    """Run an agent, starting the next model whenever the current ones are slow.
+
+    The first model is started immediately. Each time `delay` seconds pass
+    without a result, or all running requests have failed, the next model is
+    started. The first valid output wins and the remaining requests are
+    cancelled.
+
+    Args:
+        agent: The agent to run; its output type is validated as usual.
+        prompt: The user prompt.
+        models: Models in order of preference.
+        delay: Seconds to wait before starting each hedge.
+        stats: Counters updated with the outcome.
+        names: Names to record wins under (default: derived from the models).
+        **run_kwargs: Extra arguments for Agent.run (e.g. instructions).
+
+    Returns:
+        The winning agent run, whose output is already validated.
+
+    Raises:
+        ValueError: If no models are given.
+        Exception: The first error raised if every model failed.
+    """
+    if not models:
+        raise ValueError("models cannot be empty")
+    if stats is None:
+        stats = HedgeStats()
+    if names is None:
+        names = [model_name(model) for model in models]
+
+    stats.requests += 1
+    running: dict[asyncio.Task[Any], int] = {}
+    errors: list[BaseException] = []
+
+    def start(index: int) -> None:
+        """Start a request to the model at the given index."""
+        if index == 1:
+            stats.fired += 1
+        if index > 0:
+            stats.hedges += 1
+        task = asyncio.ensure_future(
+            agent.run(prompt, model=models[index], **run_kwargs)
+        )
+        running[task] = index
+
+    start(0)
+    started = 1
+    try:
+        while running:
+            more = started < len(models)
+            done, _ = await asyncio.wait(
+                running,
+                timeout=delay if more else None,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if not done:
+                # Timed out: the running requests are slow, hedge
+                start(started)
+                started += 1
+                continue
+
+            for task in done:
+                index = running.pop(task)
+                error = task.exception()
+                if error is None:
+                    name = names[index]
+                    stats.wins[name] = stats.wins.get(name, 0) + 1
+                    return task.result()
+                errors.append(error)
+
+            if not running and more:
+                # Everything in flight failed, hedge immediately
+                start(started)
+                started += 1
+    finally:
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+
+    stats.failed += 1
+    raise errors[0]
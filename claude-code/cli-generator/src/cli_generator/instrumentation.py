@@ -0,0 +1,182 @@
+"""Per-call usage, latency and retry instrumentation.
+
+A Recorder collects one CallRecord per model call (or cache hit) made by a
+SpecGenerator, and timing spans for the other stages of a run, such as
+template rendering and file writes in CodeGenerator.
+"""
+
+import json
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, ContextManager, Literal, Union
+
+from pydantic import BaseModel, Field
+
+# pydantic_ai is only needed for model calls; CodeGenerator imports this
+# module too, so keep it out of the import path of `cli-gen build`
+if TYPE_CHECKING:
+    from pydantic_ai import AgentRunResult
+    from pydantic_ai.result import StreamedRunResult
+
+RunResult = Union["AgentRunResult[Any]", "StreamedRunResult[Any, Any]"]
+
+# Whether the spec cache answered the call: "hit", "miss", "disabled" (no
+# cache configured), "coalesced" (shared another caller's request) or None
+# for calls that are never cached, like adding commands
+CacheOutcome = Literal["hit", "miss", "disabled", "coalesced"]
+
+
+class CallRecord(BaseModel):
+    """Usage and timing of one spec generation call."""
+
+    operation: str = Field(..., description="What was generated: spec, skeleton, command...")
+    model: str = Field(..., description="Model that produced the output")
+    input_tokens: int = Field(default=0, description="Prompt tokens")
+    output_tokens: int = Field(default=0, description="Completion tokens")
+    requests: int = Field(default=0, description="Model requests, including retries")
+    retries: int = Field(default=0, description="Output validation retries")
+    wall_time: float = Field(default=0.0, description="Wall time in seconds")
+    cache: CacheOutcome | None = Field(default=None, description="Spec cache outcome")
+    engine: Literal["llm", "local"] = Field(
+        default="llm", description="Whether the model or the local synthesizer served it"
+    )
+
+
+class Span(BaseModel):
+    """A timed stage of a run."""
+
+    name: str = Field(..., description="Stage name, e.g. render or write")
+    detail: str | None = Field(default=None, description="What the stage worked on")
+    start: float = Field(..., description="Seconds since the recorder was created")
+    duration: float = Field(..., description="Duration in seconds")
+
+
+def count_retries(result: RunResult) -> int:
+    """Count the retry prompts sent back to the model during a run."""
+    from pydantic_ai.messages import ModelRequest, RetryPromptPart
+
+    return sum(
+        isinstance(part, RetryPromptPart)
+        for message in result.new_messages()
+        if isinstance(message, ModelRequest)
+        for part in message.parts
+    )
+
+
+class Recorder:
+    """Thread-safe collector of call records and spans."""
+
+    def __init__(self, hook: Callable[[CallRecord | Span], None] | None = None) -> None:
+        """Initialize an empty recorder.
+
+        Args:
+            hook: Called with every CallRecord and Span as it is recorded.
+        """
+        self.hook = hook
+        self.calls: list[CallRecord] = []
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+
+    def record(self, call: CallRecord) -> None:
+        """Record a finished call."""
+        with self._lock:
+            self.calls.append(call)
+        if self.hook is not None:
+            self.hook(call)
+
+    def record_result(
+        self,
+        operation: str,
+        result: RunResult,
+        wall_time: float,
+        model: str,
+        cache: CacheOutcome | None = None,
+    ) -> CallRecord:
+        """Record a finished (or fully streamed) agent run."""
+        usage = result.usage()
+        call = CallRecord(
+            operation=operation,
+            model=model,
+            input_tokens=usage.input_tokens,
+            output_tokens=usage.output_tokens,
+            requests=usage.requests,
+            retries=count_retries(result),
+            wall_time=wall_time,
+            cache=cache,
+        )
+        self.record(call)
+        return call
+
+    @contextmanager
+    def span(self, name: str, detail: str | None = None) -> Iterator[None]:
+        """Time the enclosed block as a span."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            span = Span(
+                name=name,
+                detail=detail,
+                start=start - self._started,
+                duration=end - start,
+            )
+            with self._lock:
+                self.spans.append(span)
+            if self.hook is not None:
+                self.hook(span)
+
+    def summary(self) -> dict[str, Any]:
+        """Return totals for calls and per-stage span durations."""
+        with self._lock:
+            calls = list(self.calls)
+            spans = list(self.spans)
+
+        stages: dict[str, dict[str, float]] = {}
+        for span in spans:
+            stage = stages.setdefault(span.name, {"count": 0, "seconds": 0.0})
+            stage["count"] += 1
+            stage["seconds"] += span.duration
+
+        cache: dict[str, int] = {}
+        engines: dict[str, int] = {}
+        for call in calls:
+            if call.cache is not None:
+                cache[call.cache] = cache.get(call.cache, 0) + 1
+            engines[call.engine] = engines.get(call.engine, 0) + 1
+
+        return {
+            "calls": len(calls),
+            "input_tokens": sum(call.input_tokens for call in calls),
+            "output_tokens": sum(call.output_tokens for call in calls),
+            "requests": sum(call.requests for call in calls),
+            "retries": sum(call.retries for call in calls),
+            "model_time": sum(call.wall_time for call in calls),
+            "cache": cache,
+            "engines": engines,
+            "stages": stages,
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return all records and the summary as a JSON-serializable dict."""
+        with self._lock:
+            calls = [call.model_dump() for call in self.calls]
+            spans = [span.model_dump() for span in self.spans]
+        return {"summary": self.summary(), "calls": calls, "spans": spans}
+
+    def write_json(self, path: Path) -> None:
+        """Write all records and the summary to a JSON file."""
+        Path(path).write_text(json.dumps(self.to_dict(), indent=2))
+
+
+def timed(
+    recorder: Recorder | None, name: str, detail: str | None = None
+) -> ContextManager[None]:
+    """Time a block on a recorder, or do nothing without one."""
+    if recorder is None:
+        return nullcontext()
+    return recorder.span(name, detail)
@@ -0,0 +1,206 @@
+"""Fast loading of spec files, with a cache of specs that passed validation.
+
+Spec files are parsed with json.loads() and validated by a cached
+TypeAdapter; validating the bytes directly with validate_json() measured
+about a third slower on large specs (see benchmarks/bench_load.py). Once a
+file has passed validation, a compact binary copy of the validated spec
+(field values as nested tuples, serialized with marshal) is kept under the
+hash of the file's bytes. Loading the same file again rebuilds the models
+from that copy without running any validator. Either way the garbage
+collector is paused while the models are built: a large spec creates tens of
+thousands of objects, and the collections they would trigger find nothing to
+free.
+
+The cache directory is trusted: its entries are not validated again, so it
+must only be writable by the user running cli-gen.
+"""
+
+import gc
+import hashlib
+import json
+import marshal
+import os
+import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import lru_cache
+from importlib.metadata import version
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel, TypeAdapter
+
+from cli_generator import models
+from cli_generator.atomic import write_atomic
+from cli_generator.cache import DEFAULT_CACHE_DIR
+from cli_generator.models import ArgumentSpec, CLISpec, CommandSpec, OptionSpec
+
+# Binary copies of validated specs, keyed by spec file hash, unless the environment moves them
+TRUSTED_CACHE_DIR = Path(
+    os.environ.get("CLI_GEN_TRUSTED_CACHE_DIR") or DEFAULT_CACHE_DIR.parent / "trusted"
+)
+# Bump when the binary format changes
+LOADER_VERSION = 1
+
+# Fields holding lists of models, by model class
+_NESTED: dict[type[BaseModel], dict[str, type[BaseModel]]] = {
+    CLISpec: {"commands": CommandSpec, "global_options": OptionSpec},
+    CommandSpec: {"arguments": ArgumentSpec, "options": OptionSpec},
+}
+# Field names in declaration order, the order of packed values
+_FIELDS: dict[type[BaseModel], tuple[str, ...]] = {
+    cls: tuple(cls.model_fields) for cls in (CLISpec, CommandSpec, ArgumentSpec, OptionSpec)
+}
+# BaseModel's slots, set directly as pydantic itself does when unpickling
+_set_fields_set = BaseModel.__dict__["__pydantic_fields_set__"].__set__
+_set_extra = BaseModel.__dict__["__pydantic_extra__"].__set__
+_set_private = BaseModel.__dict__["__pydantic_private__"].__set__
+
+
+@lru_cache(maxsize=None)
+def type_adapter(tp: Any) -> TypeAdapter[Any]:
+    """Return a TypeAdapter for a type, building it only once."""
+    return TypeAdapter(tp)
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """Disable the garbage collector while many objects are created."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def parse_spec(data: bytes | str) -> CLISpec:
+    """Validate a spec from JSON.
+
+    Raises:
+        json.JSONDecodeError: If the data is not valid JSON.
+        ValidationError: If it is not a valid spec.
+    """
+    with _gc_paused():
+        return type_adapter(CLISpec).validate_python(json.loads(data))
+
+
+@lru_cache(maxsize=1)
+def _format_key() -> bytes:
+    """Describe what besides the spec file decides a cached copy's contents.
+
+    Covers the marshal format (the Python version), pydantic, and the models
+    module, so changed fields or validation rules invalidate every entry.
+    """
+    models_hash = hashlib.sha256(Path(models.__file__).read_bytes()).hexdigest()
+    key = f"{LOADER_VERSION}\0{sys.version_info[:2]}\0{version('pydantic')}\0{models_hash}\0"
+    return key.encode()
+
+
+def cache_key(data: bytes) -> str:
+    """Return the trusted cache key of a spec file's bytes."""
+    return hashlib.sha256(_format_key() + data).hexdigest()
+
+
+def _pack(model: BaseModel) -> tuple[Any, ...]:
+    """Return a model's field values as a tuple, nested models included."""
+    nested = _NESTED.get(type(model), {})
+    return tuple(
+        [_pack(item) for item in getattr(model, name)]
+        if name in nested
+        else getattr(model, name)
+        for name in _FIELDS[type(model)]
+    )
+
+
+def _unpack(cls: type[BaseModel], values: tuple[Any, ...]) -> BaseModel:
+    """Rebuild a model packed by _pack() without validating it."""
+    fields = _FIELDS[cls]
+    # What model_construct() does, minus defaults and alias handling
+    model = object.__new__(cls)
+    data = model.__dict__
+    data.update(zip(fields, values, strict=True))
+    for name, item_cls in _NESTED.get(cls, {}).items():
+        data[name] = [_unpack(item_cls, item) for item in data[name]]
+    _set_fields_set(model, set(fields))
+    _set_extra(model, None)
+    _set_private(model, None)
+    return model
+
+
+def encode_spec(spec: CLISpec) -> bytes:
+    """Serialize a validated spec to the trusted cache's binary format.
+
+    Raises:
+        ValueError: If an option default cannot be serialized.
+    """
+    return marshal.dumps(_pack(spec))
+
+
+def decode_spec(data: bytes) -> CLISpec:
+    """Rebuild a spec serialized by encode_spec(), without validating it.
+
+    Raises:
+        ValueError: If the data is not a serialized spec.
+    """
+    with _gc_paused():
+        try:
+            spec = _unpack(CLISpec, marshal.loads(data))
+        except (EOFError, TypeError, ValueError) as e:
+            raise ValueError(f"Not a serialized spec: {e}") from e
+    return spec  # type: ignore[return-value]
+
+
+def _read_trusted(cache_dir: Path, key: str) -> CLISpec | None:
+    """Return a cached spec, if there is a usable one."""
+    try:
+        return decode_spec((cache_dir / f"{key}.bin").read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_trusted(cache_dir: Path, key: str, spec: CLISpec) -> None:
+    """Cache a validated spec; an unusable cache directory is ignored."""
+    path = cache_dir / f"{key}.bin"
+    try:
+        data = encode_spec(spec)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        write_atomic(path, data)
+    except (OSError, ValueError):
+        pass
+
+
+def load_spec_bytes(data: bytes, cache_dir: Path | None = TRUSTED_CACHE_DIR) -> CLISpec:
+    """Load a spec from the bytes of a spec file.
+
+    Args:
+        data: The JSON spec.
+        cache_dir: The trusted cache, or None to always validate.
+
+    Returns:
+        The spec, from the trusted cache when these bytes passed before.
+
+    Raises:
+        json.JSONDecodeError: If the data is not valid JSON.
+        ValidationError: If it is not a valid spec.
+    """
+    if cache_dir is None:
+        return parse_spec(data)
+    key = cache_key(data)
+    spec = _read_trusted(cache_dir, key)
+    if spec is None:
+        spec = parse_spec(data)
+        _write_trusted(cache_dir, key, spec)
+    return spec
+
+
+def load_spec(path: Path, cache_dir: Path | None = TRUSTED_CACHE_DIR) -> CLISpec:
+    """Load a spec file (see load_spec_bytes).
+
+    Raises:
+        OSError: If the file cannot be read.
+        json.JSONDecodeError: If it is not valid JSON.
+        ValidationError: If it is not a valid spec.
+    """
+    return load_spec_bytes(Path(path).read_bytes(), cache_dir)
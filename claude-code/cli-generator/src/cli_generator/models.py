@@ -4,7 +4,20 @@ import keyword
 import re
 from typing import Any
 
-from pydantic import BaseModel, Field, field_validator, model_validator
+from pydantic import (
+    BaseModel,
+    Field,
+    ValidationInfo,
+    field_validator,
+    model_validator,
+)
+
+
+def _context_repairer(info: ValidationInfo) -> Any:
+    """Return the SpecRepairer passed in the validation context, if any."""
+    if isinstance(info.context, dict):
+        return info.context.get("repairer")
+    return None
 
 
 def sanitize_name(name: str) -> str:
@@ -100,6 +113,15 @@ class CommandSpec(BaseModel):
         default_factory=list, description="Usage examples for help text"
     )
 
+    @model_validator(mode="before")
+    @classmethod
+    def apply_repairs(cls, data: Any, info: ValidationInfo) -> Any:
+        """Repair raw model output when a repairer is in the validation context."""
+        repairer = _context_repairer(info)
+        if repairer is not None:
+            return repairer.repair_command(data)
+        return data
+
     @model_validator(mode="after")
     def validate_no_duplicates(self) -> "CommandSpec":
         """Validate no duplicate option names, short names, or argument names."""
@@ -147,6 +169,15 @@ class CLISpec(BaseModel):
         default_factory=list, description="Required pip packages"
     )
 
+    @model_validator(mode="before")
+    @classmethod
+    def apply_repairs(cls, data: Any, info: ValidationInfo) -> Any:
+        """Repair raw model output when a repairer is in the validation context."""
+        repairer = _context_repairer(info)
+        if repairer is not None:
+            return repairer.repair_spec(data)
+        return data
+
     @model_validator(mode="after")
     def validate_cli_spec(self) -> "CLISpec":
         """Validate CLI name is valid package name and no duplicate commands."""
@@ -189,3 +220,39 @@ class CLISpec(BaseModel):
             raise ValueError(f"Duplicate global short option names: {duplicates}")
 
         return self
+
+
+class SpecSkeleton(BaseModel):
+    """Outline of a CLI, used as the first phase of fan-out generation.
+
+    Contains everything in a CLISpec except the command bodies, which are
+    generated separately (one request per command) and merged afterwards.
+    """
+
+    name: str = Field(..., description="CLI name (e.g., 'imgconvert')")
+    description: str = Field(..., description="What the CLI does")
+    command_names: list[str] = Field(
+        default_factory=list, description="Names of the commands to generate"
+    )
+    global_options: list[OptionSpec] = Field(
+        default_factory=list, description="Options available to all commands"
+    )
+    python_version: str = Field(default="3.11", description="Target Python version")
+    dependencies: list[str] = Field(
+        default_factory=list, description="Required pip packages"
+    )
+
+    @model_validator(mode="after")
+    def validate_skeleton(self) -> "SpecSkeleton":
+        """Validate the CLI name and command names before fanning out."""
+        if not PYTHON_IDENTIFIER_PATTERN.match(self.name) or keyword.iskeyword(
+            self.name
+        ):
+            raise ValueError(f"'{self.name}' is not a valid Python package name.")
+
+        if len(self.command_names) != len(set(self.command_names)):
+            seen = set()
+            duplicates = [n for n in self.command_names if n in seen or seen.add(n)]  # type: ignore[func-returns-value]
+            raise ValueError(f"Duplicate command names: {duplicates}")
+
+        return self
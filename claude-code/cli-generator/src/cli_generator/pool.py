@@ -0,0 +1,43 @@
+"""Shared, pooled HTTP client for model providers."""
+
+import importlib.util
+
+import httpx
+
+
+def http2_available() -> bool:
+    """Return whether httpx can speak HTTP/2 (requires the 'h2' package)."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def create_http_client(
+    max_connections: int = 100,
+    max_keepalive_connections: int = 20,
+    keepalive_expiry: float = 30.0,
+    timeout: float = 600.0,
+    http2: bool | None = None,
+) -> httpx.AsyncClient:
+    """Create an async HTTP client to share between SpecGenerators.
+
+    Args:
+        max_connections: Maximum number of open connections.
+        max_keepalive_connections: Maximum number of idle connections kept alive.
+        keepalive_expiry: Seconds an idle connection is kept alive.
+        timeout: Request timeout in seconds (model responses can be slow).
+        http2: Enable HTTP/2; None enables it when 'h2' is installed.
+
+    Returns:
+        A configured httpx.AsyncClient. The caller is responsible for closing it.
+    """
+    if http2 is None:
+        http2 = http2_available()
+
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(timeout, connect=10.0),
+        http2=http2,
+    )
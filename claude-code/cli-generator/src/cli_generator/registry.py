@@ -0,0 +1,410 @@
+"""A local, indexed registry of saved CLI specifications.
+
+Specs are stored in a SQLite database together with index tables of their
+command names, option names and types, and dependencies, so questions like
+"which CLI has an export command with a --format choice" are answered from
+indexes instead of by reading every spec. Each CLI name keeps a history of
+versions; adding a spec whose content matches the latest version of that
+name keeps the existing version. Databases of an older schema are migrated
+in place; other SQLite databases are refused, never modified.
+"""
+
+import hashlib
+import re
+import sqlite3
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from cli_generator.cache import DEFAULT_CACHE_DIR
+from cli_generator.loader import parse_spec
+from cli_generator.models import CLISpec
+
+DEFAULT_REGISTRY_PATH = DEFAULT_CACHE_DIR.parent / "registry.sqlite3"
+# Bump when the schema changes, adding the migration from the previous version
+SCHEMA_VERSION = 1
+# _MIGRATIONS[n - 1] upgrades a database of schema version n to n + 1
+_MIGRATIONS: tuple[str, ...] = ()
+# References to registry specs, e.g. "registry:passgen" or "registry:passgen@3"
+REFERENCE_PREFIX = "registry:"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS specs (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    latest INTEGER NOT NULL DEFAULT 1,
+    description TEXT NOT NULL,
+    commands INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    source TEXT,
+    added REAL NOT NULL,
+    data TEXT NOT NULL,
+    UNIQUE (name, version)
+);
+CREATE INDEX IF NOT EXISTS specs_latest ON specs (latest, name);
+CREATE TABLE IF NOT EXISTS commands (
+    spec_id INTEGER NOT NULL REFERENCES specs (id) ON DELETE CASCADE,
+    name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS commands_name ON commands (name, spec_id);
+CREATE TABLE IF NOT EXISTS options (
+    spec_id INTEGER NOT NULL REFERENCES specs (id) ON DELETE CASCADE,
+    command TEXT,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS options_name ON options (name, type, spec_id);
+CREATE INDEX IF NOT EXISTS options_type ON options (type, spec_id);
+CREATE TABLE IF NOT EXISTS dependencies (
+    spec_id INTEGER NOT NULL REFERENCES specs (id) ON DELETE CASCADE,
+    name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS dependencies_name ON dependencies (name, spec_id);
+"""
+_ENTRY_COLUMNS = "name, version, description, commands, sha256, source, added"
+
+# Where a requirement's project name ends, e.g. "pyyaml>=6" or "rich[jupyter]"
+_REQUIREMENT_END = re.compile(r"[\s<>=!~;\[(@]")
+
+
+class RegistryError(sqlite3.DatabaseError):
+    """Raised for a database that is not a registry this cli-gen can use."""
+
+
+class RegistryEntry(BaseModel):
+    """One version of a spec in the registry."""
+
+    name: str = Field(..., description="The CLI name")
+    version: int = Field(..., description="Version number, counting from 1 per name")
+    description: str = Field(..., description="What the CLI does")
+    commands: int = Field(default=0, description="Number of commands")
+    sha256: str = Field(..., description="Hash of the stored spec JSON")
+    source: str | None = Field(default=None, description="File the spec was added from")
+    added: float = Field(..., description="When the version was added (Unix time)")
+
+
+def dependency_name(requirement: str) -> str:
+    """Return the normalized project name of a requirement string."""
+    name = _REQUIREMENT_END.split(requirement.strip(), maxsplit=1)[0]
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def parse_reference(reference: str) -> tuple[str, int | None]:
+    """Split "name[@version]" (optionally prefixed with "registry:").
+
+    Raises:
+        ValueError: If the version is not a positive integer.
+    """
+    name, _, version = reference.removeprefix(REFERENCE_PREFIX).partition("@")
+    if not version:
+        return name, None
+    if not version.isdigit() or int(version) < 1:
+        raise ValueError(f"Invalid version in registry reference: {reference}")
+    return name, int(version)
+
+
+class Registry:
+    """A SQLite database of versioned specs with indexes for searching them."""
+
+    def __init__(self, path: Path | str = DEFAULT_REGISTRY_PATH) -> None:
+        """Initialize the registry.
+
+        Args:
+            path: The database file; created with its directory on first use.
+        """
+        self.path = Path(path)
+        self._connection: sqlite3.Connection | None = None
+        self._depth = 0
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Open the database, creating or migrating its schema if needed.
+
+        Raises:
+            RegistryError: If the database is not a registry, or is one of a
+                newer schema version.
+            sqlite3.DatabaseError: If the file is not a SQLite database.
+        """
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path)
+            try:
+                self._upgrade(connection)
+                connection.execute("PRAGMA foreign_keys = ON")
+                connection.execute("PRAGMA journal_mode = WAL")
+            except sqlite3.Error:
+                connection.close()
+                raise
+            self._connection = connection
+        return self._connection
+
+    def _upgrade(self, connection: sqlite3.Connection) -> None:
+        """Create the schema of a new database, or migrate an older one.
+
+        Runs before anything else touches the database, so one that is
+        refused is left as it was.
+        """
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version == SCHEMA_VERSION:
+            return
+        if version > SCHEMA_VERSION:
+            raise RegistryError(
+                f"{self.path} has registry schema version {version}; "
+                f"this version of cli-gen supports up to {SCHEMA_VERSION}"
+            )
+        if version == 0:
+            # Version 0 is a new database, unless something else created tables in it
+            if connection.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchone():
+                raise RegistryError(f"{self.path} is not a cli-gen spec registry")
+            scripts = [_SCHEMA]
+        else:
+            scripts = list(_MIGRATIONS[version - 1 : SCHEMA_VERSION - 1])
+        # One transaction: an interrupted migration leaves the old version
+        connection.executescript(
+            "BEGIN;\n"
+            + "\n".join(scripts)
+            + f"\nPRAGMA user_version = {SCHEMA_VERSION};\nCOMMIT;"
+        )
+
+    def close(self) -> None:
+        """Close the database."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def __enter__(self) -> "Registry":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run several changes in one transaction, e.g. to add many specs.
+
+        Nested transactions join the outermost one, which commits, or rolls
+        back on an exception.
+        """
+        if self._depth:
+            yield self.connection
+            return
+        self._depth += 1
+        try:
+            with self.connection as connection:
+                yield connection
+        finally:
+            self._depth -= 1
+
+    def add(self, spec: CLISpec, source: str | None = None) -> tuple[RegistryEntry, bool]:
+        """Add a spec as the next version of its CLI name.
+
+        Args:
+            spec: The spec to add.
+            source: Where the spec came from, e.g. its file.
+
+        Returns:
+            The entry, and whether a new version was added (False when the
+            spec matches the latest version of its name).
+        """
+        data = spec.model_dump_json()
+        sha256 = hashlib.sha256(data.encode()).hexdigest()
+        with self.transaction() as connection:
+            latest = connection.execute(
+                "SELECT id, version, sha256 FROM specs WHERE name = ? AND latest = 1",
+                (spec.name,),
+            ).fetchone()
+            if latest is not None and latest[2] == sha256:
+                return self.entry(spec.name, latest[1]), False
+
+            version = 1
+            if latest is not None:
+                version = latest[1] + 1
+                connection.execute("UPDATE specs SET latest = 0 WHERE id = ?", (latest[0],))
+            spec_id = connection.execute(
+                "INSERT INTO specs (name, version, description, commands, sha256, source,"
+                " added, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    spec.name,
+                    version,
+                    spec.description,
+                    len(spec.commands),
+                    sha256,
+                    source,
+                    time.time(),
+                    data,
+                ),
+            ).lastrowid
+            connection.executemany(
+                "INSERT INTO commands (spec_id, name) VALUES (?, ?)",
+                [(spec_id, command.name) for command in spec.commands],
+            )
+            connection.executemany(
+                "INSERT INTO options (spec_id, command, name, type) VALUES (?, ?, ?, ?)",
+                [(spec_id, None, option.name, option.type) for option in spec.global_options]
+                + [
+                    (spec_id, command.name, option.name, option.type)
+                    for command in spec.commands
+                    for option in command.options
+                ],
+            )
+            dependencies = dict.fromkeys(map(dependency_name, spec.dependencies))
+            connection.executemany(
+                "INSERT INTO dependencies (spec_id, name) VALUES (?, ?)",
+                [(spec_id, name) for name in dependencies],
+            )
+        return self.entry(spec.name, version), True
+
+    def _row(self, name: str, version: int | None, columns: str) -> tuple[Any, ...]:
+        """Fetch columns of one version of a spec (the latest by default).
+
+        Raises:
+            KeyError: If the registry has no such spec.
+        """
+        if version is None:
+            query = f"SELECT {columns} FROM specs WHERE name = ? AND latest = 1"
+            row = self.connection.execute(query, (name,)).fetchone()
+        else:
+            query = f"SELECT {columns} FROM specs WHERE name = ? AND version = ?"
+            row = self.connection.execute(query, (name, version)).fetchone()
+        if row is None:
+            suffix = "" if version is None else f"@{version}"
+            raise KeyError(f"No spec '{name}{suffix}' in the registry")
+        return row
+
+    @staticmethod
+    def _entry(row: tuple[Any, ...]) -> RegistryEntry:
+        """Build an entry from a row of _ENTRY_COLUMNS."""
+        return RegistryEntry(**dict(zip(_ENTRY_COLUMNS.split(", "), row, strict=True)))
+
+    def entry(self, name: str, version: int | None = None) -> RegistryEntry:
+        """Describe one version of a spec (the latest by default).
+
+        Raises:
+            KeyError: If the registry has no such spec.
+        """
+        return self._entry(self._row(name, version, _ENTRY_COLUMNS))
+
+    def get(self, name: str, version: int | None = None) -> CLISpec:
+        """Return one version of a spec (the latest by default).
+
+        Raises:
+            KeyError: If the registry has no such spec.
+        """
+        return parse_spec(self._row(name, version, "data")[0])
+
+    def resolve(self, reference: str) -> CLISpec:
+        """Return the spec for a "name[@version]" reference.
+
+        Raises:
+            KeyError: If the registry has no such spec.
+            ValueError: If the reference is malformed.
+        """
+        return self.get(*parse_reference(reference))
+
+    def history(self, name: str) -> list[RegistryEntry]:
+        """Return every version of a CLI name, oldest first."""
+        rows = self.connection.execute(
+            f"SELECT {_ENTRY_COLUMNS} FROM specs WHERE name = ? ORDER BY version", (name,)
+        )
+        return [self._entry(row) for row in rows]
+
+    def entries(self) -> list[RegistryEntry]:
+        """Return the latest version of every CLI name, by name."""
+        rows = self.connection.execute(
+            f"SELECT {_ENTRY_COLUMNS} FROM specs WHERE latest = 1 ORDER BY name"
+        )
+        return [self._entry(row) for row in rows]
+
+    def search(
+        self,
+        name: str | None = None,
+        command: str | None = None,
+        option: str | None = None,
+        option_type: str | None = None,
+        dependency: str | None = None,
+        text: str | None = None,
+        all_versions: bool = False,
+        limit: int | None = None,
+    ) -> list[RegistryEntry]:
+        """Find specs matching every given filter.
+
+        Command, option, type and dependency filters are exact and answered
+        from indexes. An option filter combined with a command filter only
+        matches options of that command; on its own it also matches global
+        options.
+
+        Args:
+            name: Substring of the CLI name.
+            command: A command name.
+            option: An option name (without dashes).
+            option_type: An option type, e.g. "choice".
+            dependency: A dependency's project name, e.g. "pyyaml".
+            text: Substring of the CLI's description.
+            all_versions: Search every version, not only the latest ones.
+            limit: Maximum number of results.
+
+        Returns:
+            The matching entries, by name and version.
+        """
+        conditions = []
+        params: list[object] = []
+        if name is not None:
+            conditions.append("instr(name, ?) > 0")
+            params.append(name)
+        if text is not None:
+            conditions.append("instr(lower(description), lower(?)) > 0")
+            params.append(text)
+        if command is not None:
+            conditions.append("id IN (SELECT spec_id FROM commands WHERE name = ?)")
+            params.append(command)
+        if option is not None or option_type is not None:
+            option_conditions = []
+            for column, value in (
+                ("name", option),
+                ("type", option_type),
+                ("command", command),
+            ):
+                if value is not None:
+                    option_conditions.append(f"{column} = ?")
+                    params.append(value)
+            conditions.append(
+                f"id IN (SELECT spec_id FROM options WHERE {' AND '.join(option_conditions)})"
+            )
+        if dependency is not None:
+            conditions.append("id IN (SELECT spec_id FROM dependencies WHERE name = ?)")
+            params.append(dependency_name(dependency))
+        if not all_versions:
+            # With an indexed filter, "+" keeps SQLite from scanning specs_latest
+            # instead of looking up the few ids the filter yields
+            indexed = any(value is not None for value in (command, option, option_type, dependency))
+            conditions.append("+latest = 1" if indexed else "latest = 1")
+
+        query = f"SELECT {_ENTRY_COLUMNS} FROM specs"
+        if conditions:
+            query += f" WHERE {' AND '.join(conditions)}"
+        query += " ORDER BY name, version"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return [self._entry(row) for row in self.connection.execute(query, params)]
+
+    def add_files(self, paths: Iterable[Path]) -> list[tuple[Path, RegistryEntry, bool]]:
+        """Add spec files in one transaction (see add).
+
+        Raises:
+            OSError: If a file cannot be read.
+            ValueError: If a file is not a valid spec (JSONDecodeError and
+                ValidationError are both ValueErrors); nothing is added then.
+        """
+        results = []
+        with self.transaction():
+            for path in paths:
+                spec = parse_spec(Path(path).read_bytes())
+                entry, added = self.add(spec, source=str(path))
+                results.append((Path(path), entry, added))
+        return results
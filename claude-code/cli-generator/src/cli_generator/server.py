@@ -0,0 +1,416 @@
+"""Long-lived generator service for `cli-gen serve`.
+
+Keeps the SpecGenerator agents and the CodeGenerator Jinja environment warm
+between requests and exposes them over a small JSON-over-HTTP API, served on
+TCP or on a local Unix socket:
+
+- POST /spec      {"description", "model"?} -> {"spec"}
+- POST /generate  {"description", "output", "model"?} -> {"spec", "files"}
+- POST /build     {"spec", "output"} -> {"files"}
+- GET  /metrics   request counts, latency histograms and cache hits
+- GET  /health
+
+Outputs are resolved under the service's output root; requests writing
+anywhere else are rejected.
+"""
+
+import asyncio
+import copy
+import json
+import os
+import socket
+import socketserver
+import stat
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Coroutine
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, TypeVar, Union
+
+from pydantic import ValidationError
+from pydantic_ai.models import Model
+
+from cli_generator.cache import SpecCache
+from cli_generator.generators.code_generator import CodeGenerator
+from cli_generator.generators.spec_generator import SpecGenerator
+from cli_generator.models import CLISpec
+from cli_generator.pool import create_http_client
+
+T = TypeVar("T")
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0)
+# Largest request body accepted, in bytes
+MAX_BODY_BYTES = 16 * 1024 * 1024
+# Warm generators kept for client-chosen models; the least recently used go first
+MAX_GENERATORS = 8
+
+
+class UnknownEndpointError(LookupError):
+    """Raised by GeneratorService.handle() for an endpoint it does not serve."""
+
+
+class PayloadTooLargeError(ValueError):
+    """Raised for a request body over MAX_BODY_BYTES."""
+
+
+def remove_stale_socket(socket_path: str | Path) -> None:
+    """Remove a Unix socket left behind by an earlier server.
+
+    A socket is stale when nothing accepts connections on it any more.
+
+    Raises:
+        FileExistsError: If the path exists but is not a socket, or is the
+            socket of a running server.
+    """
+    path = Path(socket_path)
+    try:
+        mode = path.lstat().st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{path} exists and is not a socket")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(path))
+        except OSError:
+            path.unlink(missing_ok=True)
+            return
+    raise FileExistsError(f"{path} is in use by a running server")
+
+
+class Metrics:
+    """Thread-safe request counters and latency histograms per endpoint."""
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.requests: dict[str, dict[str, int]] = {}
+        self.latency: dict[str, dict[str, Any]] = {}
+
+    def observe(self, endpoint: str, status: int, seconds: float) -> None:
+        """Record one finished request."""
+        with self._lock:
+            counts = self.requests.setdefault(endpoint, {})
+            counts[str(status)] = counts.get(str(status), 0) + 1
+
+            histogram = self.latency.setdefault(
+                endpoint,
+                {
+                    "buckets": {str(bound): 0 for bound in LATENCY_BUCKETS} | {"+Inf": 0},
+                    "count": 0,
+                    "sum": 0.0,
+                },
+            )
+            # Cumulative buckets, Prometheus style
+            for bound in LATENCY_BUCKETS:
+                if seconds <= bound:
+                    histogram["buckets"][str(bound)] += 1
+            histogram["buckets"]["+Inf"] += 1
+            histogram["count"] += 1
+            histogram["sum"] += seconds
+
+    def snapshot(self, cache: SpecCache | None = None) -> dict[str, Any]:
+        """Return all metrics as a JSON-serializable dict."""
+        with self._lock:
+            data: dict[str, Any] = {
+                "uptime": time.time() - self.started,
+                "requests": copy.deepcopy(self.requests),
+                "latency": copy.deepcopy(self.latency),
+            }
+        if cache is not None:
+            data["cache"] = {"hits": cache.hits, "misses": cache.misses}
+        return data
+
+
+class GeneratorService:
+    """Warm spec and code generators shared by all requests.
+
+    Spec generation runs on a dedicated event loop thread so request handler
+    threads can share the same agents.
+    """
+
+    def __init__(
+        self,
+        model: Union[str, Model] = "openai:gpt-4o-mini",
+        cache: SpecCache | None = None,
+        output_root: Path | str = ".",
+    ) -> None:
+        """Initialize the service.
+
+        Args:
+            model: Default model, or a Model instance used for every request.
+            cache: Optional spec cache shared by all generators.
+            output_root: Directory every generate and build output must be in.
+        """
+        self.model = model
+        self.cache = cache
+        self.output_root = Path(output_root).resolve()
+        self.metrics = Metrics()
+        self.code_generator = CodeGenerator()
+        self._generators: OrderedDict[str, SpecGenerator] = OrderedDict()
+        # One pooled client keeps provider connections alive across generators
+        self.http_client = create_http_client()
+        self._lock = threading.Lock()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        # Build the default generator up front so the first request is warm
+        self.spec_generator()
+
+    def spec_generator(self, model: str | None = None) -> SpecGenerator:
+        """Return the warm SpecGenerator for a model, creating it on first use.
+
+        At most MAX_GENERATORS are kept; the least recently used one is
+        dropped to make room for a new model.
+        """
+        if not isinstance(self.model, str):
+            model = None
+        key = model or str(self.model)
+        with self._lock:
+            if key in self._generators:
+                self._generators.move_to_end(key)
+                return self._generators[key]
+            generator = SpecGenerator(
+                model=model or self.model,
+                cache=self.cache,
+                http_client=self.http_client,
+            )
+            self._generators[key] = generator
+            if len(self._generators) > MAX_GENERATORS:
+                self._generators.popitem(last=False)
+            return generator
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run a coroutine on the service event loop and wait for the result."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def close(self) -> None:
+        """Close the HTTP client and stop the event loop thread."""
+        self.run(self.http_client.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def handle(self, endpoint: str, payload: dict[str, Any]) -> dict[str, Any]:
+        """Dispatch a POST request.
+
+        Raises:
+            UnknownEndpointError: For an unknown endpoint.
+            ValueError: For an invalid payload.
+        """
+        if endpoint == "spec":
+            spec = self._generate_spec(payload)
+            return {"spec": spec.model_dump(mode="json")}
+
+        if endpoint == "generate":
+            spec = self._generate_spec(payload)
+            files = self._build(spec, payload)
+            return {"spec": spec.model_dump(mode="json"), "files": files}
+
+        if endpoint == "build":
+            if "spec" not in payload:
+                raise ValueError("'spec' is required")
+            spec = CLISpec.model_validate(payload["spec"])
+            return {"files": self._build(spec, payload)}
+
+        raise UnknownEndpointError(endpoint)
+
+    def _generate_spec(self, payload: dict[str, Any]) -> CLISpec:
+        """Generate a spec for the request's description."""
+        description = payload.get("description")
+        if not isinstance(description, str):
+            raise ValueError("'description' is required")
+        model = payload.get("model")
+        if model is not None and not isinstance(model, str):
+            raise ValueError("'model' must be a string")
+        generator = self.spec_generator(model)
+        return self.run(generator.generate(description))
+
+    def output_dir(self, output: str) -> Path:
+        """Resolve a request's output directory under the output root.
+
+        Relative paths are taken from the root; symlinks are followed.
+
+        Raises:
+            ValueError: If the directory is outside the output root.
+        """
+        path = (self.output_root / output).resolve()
+        if not path.is_relative_to(self.output_root):
+            raise ValueError(f"'output' must be inside {self.output_root}")
+        return path
+
+    def _build(self, spec: CLISpec, payload: dict[str, Any]) -> dict[str, str]:
+        """Render a spec into the request's output directory."""
+        output = payload.get("output")
+        if not isinstance(output, str):
+            raise ValueError("'output' is required")
+        result = self.code_generator.generate(spec, self.output_dir(output))
+        return {file_type: str(path) for file_type, path in result.items()}
+
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler translating requests into GeneratorService calls."""
+
+    server: "ServiceHTTPServer"
+    protocol_version = "HTTP/1.1"
+
+    def address_string(self) -> str:
+        """Return the client address (Unix socket clients have none)."""
+        if isinstance(self.client_address, tuple):
+            return str(self.client_address[0])
+        return "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Only log requests when the server is verbose."""
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status: int, data: dict[str, Any]) -> None:
+        """Send a JSON response."""
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        """Serve /health and /metrics."""
+        service = self.server.service
+        endpoint = self.path.strip("/")
+        start = time.perf_counter()
+        if endpoint == "health":
+            status, data = 200, {"status": "ok"}
+        elif endpoint == "metrics":
+            status, data = 200, service.metrics.snapshot(service.cache)
+        else:
+            endpoint = "unknown"
+            status, data = 404, {"error": f"Unknown endpoint: {self.path}"}
+        self._send_json(status, data)
+        service.metrics.observe(endpoint, status, time.perf_counter() - start)
+
+    def _content_length(self) -> int:
+        """Return the request body's length, checked before anything is read.
+
+        Raises:
+            PayloadTooLargeError: If the body is over MAX_BODY_BYTES.
+            ValueError: If the header is not a length.
+        """
+        header = self.headers.get("Content-Length", "0")
+        try:
+            length = int(header)
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise ValueError(f"Invalid Content-Length: {header}")
+        if length > MAX_BODY_BYTES:
+            raise PayloadTooLargeError(f"Request body over {MAX_BODY_BYTES} bytes")
+        return length
+
+    def do_POST(self) -> None:
+        """Serve /spec, /generate and /build."""
+        service = self.server.service
+        endpoint = self.path.strip("/")
+        start = time.perf_counter()
+        try:
+            try:
+                length = self._content_length()
+            except ValueError:
+                # The body was not read, so the connection cannot be reused
+                self.close_connection = True
+                raise
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(payload, dict):
+                raise ValueError("Request body must be a JSON object")
+            status, data = 200, service.handle(endpoint, payload)
+        except UnknownEndpointError:
+            endpoint = "unknown"
+            status, data = 404, {"error": f"Unknown endpoint: {self.path}"}
+        except PayloadTooLargeError as e:
+            status, data = 413, {"error": str(e)}
+        except (ValueError, ValidationError) as e:
+            # json.JSONDecodeError is a ValueError
+            status, data = 400, {"error": str(e)}
+        except Exception as e:
+            status, data = 500, {"error": str(e)}
+        self._send_json(status, data)
+        service.metrics.observe(endpoint, status, time.perf_counter() - start)
+
+
+class ServiceHTTPServer(ThreadingHTTPServer):
+    """Threaded HTTP server bound to a GeneratorService."""
+
+    daemon_threads = True
+
+    def __init__(
+        self, address: tuple[str, int], service: GeneratorService, verbose: bool = False
+    ) -> None:
+        """Bind the server to a TCP address."""
+        self.service = service
+        self.verbose = verbose
+        super().__init__(address, ServiceRequestHandler)
+
+
+class UnixServiceHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded HTTP server listening on a Unix socket."""
+
+    daemon_threads = True
+
+    def __init__(
+        self, socket_path: str, service: GeneratorService, verbose: bool = False
+    ) -> None:
+        """Bind the server to a Unix socket path, replacing a stale socket.
+
+        Raises:
+            FileExistsError: If the path exists but is not a stale socket.
+        """
+        self.service = service
+        self.verbose = verbose
+        # (device, inode) of the socket this server bound
+        self._socket_id: tuple[int, int] | None = None
+        remove_stale_socket(socket_path)
+        super().__init__(socket_path, ServiceRequestHandler)
+
+    def server_bind(self) -> None:
+        """Bind the socket and remember which file it created."""
+        super().server_bind()
+        info = os.stat(self.server_address)
+        self._socket_id = (info.st_dev, info.st_ino)
+
+    def server_close(self) -> None:
+        """Close the socket and remove its file, unless another server replaced it."""
+        super().server_close()
+        try:
+            info = os.lstat(self.server_address)
+        except FileNotFoundError:
+            return
+        if (info.st_dev, info.st_ino) == self._socket_id:
+            os.unlink(self.server_address)
+
+
+def make_server(
+    service: GeneratorService,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket_path: str | None = None,
+    verbose: bool = False,
+) -> ServiceHTTPServer | UnixServiceHTTPServer:
+    """Create the HTTP server for a service.
+
+    Args:
+        service: The warm generator service.
+        host: TCP host to bind when no socket path is given.
+        port: TCP port to bind (0 picks a free port).
+        socket_path: Listen on this Unix socket instead of TCP.
+        verbose: Log every request.
+
+    Raises:
+        FileExistsError: If socket_path exists but is not a stale socket.
+    """
+    if socket_path:
+        return UnixServiceHTTPServer(socket_path, service, verbose)
+    return ServiceHTTPServer((host, port), service, verbose)
@@ -0,0 +1,5 @@
+"""Validation helpers for generated CLI specifications."""
+
+from cli_generator.validators.repair import SpecRepairer
+
+__all__ = ["SpecRepairer"]
@@ -0,0 +1,222 @@
+"""Deterministic repairs for raw model output before spec validation."""
+
+import keyword
+import logging
+import re
+from collections import deque
+from typing import Any
+
+from pydantic import BaseModel, ValidationError
+
+from cli_generator.models import PYTHON_IDENTIFIER_PATTERN
+
+logger = logging.getLogger(__name__)
+
+# Characters not allowed in a CLI (package) name
+INVALID_NAME_CHARS = re.compile(r"[^a-zA-Z0-9_]+")
+# Most recent repairs kept in SpecRepairer.repairs
+REPAIR_LOG_SIZE = 100
+
+
+class SpecRepairer:
+    """Fix trivially broken specs so they pass validation without a retry.
+
+    The repairer works on the raw (dict) model output and handles the cases
+    the validators in models.py would otherwise reject:
+
+    - short option names longer than one character are dropped
+    - duplicate short option names are reassigned to a free letter
+    - choice options without choices become plain string options
+    - CLI names are normalized into valid Python package names
+    - duplicate command names get a numeric suffix
+
+    Every repair is logged, counted in ``count`` and kept in ``repairs``
+    (the most recent REPAIR_LOG_SIZE of them). A repairer created with
+    record=False repairs silently; SpecGenerator puts one in the validation
+    context, where partial and retried outputs are validated too, and
+    records only the repairs that saved a final output with record_saved().
+    """
+
+    def __init__(self, record: bool = True) -> None:
+        """Initialize the repairer with an empty repair log.
+
+        Args:
+            record: Log and count repairs; False only repairs.
+        """
+        self.record = record
+        self.count = 0
+        self.repairs: deque[str] = deque(maxlen=REPAIR_LOG_SIZE)
+
+    def _record(self, where: str, message: str) -> None:
+        """Log a repair."""
+        if not self.record:
+            return
+        entry = f"{where}: {message}"
+        self.count += 1
+        self.repairs.append(entry)
+        logger.info("Repaired %s", entry)
+
+    def record_saved(self, data: Any, model: type[BaseModel]) -> int:
+        """Record the repairs that let raw output pass validation as model.
+
+        Nothing is recorded when the data is valid as it is, or still
+        invalid after repairing: only repairs that saved a retry count.
+
+        Args:
+            data: The unvalidated model output.
+            model: The model the output is validated as.
+
+        Returns:
+            The number of repairs recorded.
+        """
+        try:
+            model.model_validate(data)
+            return 0
+        except ValidationError:
+            pass
+        audit = SpecRepairer()
+        try:
+            model.model_validate(data, context={"repairer": audit})
+        except ValidationError:
+            return 0
+        self.count += audit.count
+        self.repairs.extend(audit.repairs)
+        return audit.count
+
+    def repair_spec(self, data: Any) -> Any:
+        """Repair a raw CLISpec payload.
+
+        Args:
+            data: The unvalidated model output.
+
+        Returns:
+            The repaired payload (non-dict input is returned unchanged).
+        """
+        if not isinstance(data, dict):
+            return data
+        data = dict(data)
+
+        name = data.get("name")
+        if isinstance(name, str):
+            fixed = self._normalize_cli_name(name)
+            if fixed and fixed != name:
+                self._record("cli", f"renamed '{name}' to '{fixed}'")
+                data["name"] = fixed
+
+        if isinstance(data.get("global_options"), list):
+            data["global_options"] = self._repair_options(
+                data["global_options"], "global options"
+            )
+
+        commands = data.get("commands")
+        if isinstance(commands, list):
+            repaired = []
+            seen: set[str] = set()
+            for command in commands:
+                command = self.repair_command(command)
+                if isinstance(command, dict) and isinstance(command.get("name"), str):
+                    command_name = command["name"]
+                    unique = command_name
+                    suffix = 2
+                    while unique in seen:
+                        unique = f"{command_name}_{suffix}"
+                        suffix += 1
+                    if unique != command_name:
+                        self._record(
+                            "commands", f"renamed duplicate '{command_name}' to '{unique}'"
+                        )
+                        command = {**command, "name": unique}
+                    seen.add(unique)
+                repaired.append(command)
+            data["commands"] = repaired
+
+        return data
+
+    def repair_command(self, data: Any) -> Any:
+        """Repair a raw CommandSpec payload.
+
+        Args:
+            data: The unvalidated command output.
+
+        Returns:
+            The repaired payload (non-dict input is returned unchanged).
+        """
+        if not isinstance(data, dict):
+            return data
+        if not isinstance(data.get("options"), list):
+            return data
+
+        where = f"command '{data.get('name', '?')}'"
+        return {**data, "options": self._repair_options(data["options"], where)}
+
+    def _repair_options(self, options: list[Any], where: str) -> list[Any]:
+        """Repair short names and choice types across a list of options.
+
+        The first option declaring a short keeps it; later duplicates get a
+        letter no option in the list declares.
+        """
+        repaired = []
+        used_shorts = set()
+        for option in options:
+            short = option.get("short") if isinstance(option, dict) else None
+            if isinstance(short, str) and len(short.lstrip("-")) == 1:
+                used_shorts.add(short.lstrip("-"))
+        assigned: set[str] = set()
+
+        for option in options:
+            if not isinstance(option, dict):
+                repaired.append(option)
+                continue
+            option = dict(option)
+            name = option.get("name", "?")
+
+            short = option.get("short")
+            if isinstance(short, str):
+                short = short.lstrip("-") or None
+                if short is not None and len(short) != 1:
+                    self._record(where, f"dropped invalid short '{short}' of '{name}'")
+                    short = None
+                if short is not None and short in assigned:
+                    new_short = self._free_short(str(name), used_shorts)
+                    if new_short:
+                        self._record(
+                            where, f"reassigned short '{short}' of '{name}' to '{new_short}'"
+                        )
+                    else:
+                        self._record(where, f"dropped duplicate short '{short}' of '{name}'")
+                    short = new_short
+                if short is not None:
+                    used_shorts.add(short)
+                    assigned.add(short)
+                option["short"] = short
+
+            if option.get("type") == "choice" and not option.get("choices"):
+                self._record(where, f"changed '{name}' from choice without choices to str")
+                option["type"] = "str"
+                option["choices"] = None
+
+            repaired.append(option)
+
+        return repaired
+
+    @staticmethod
+    def _free_short(name: str, used: set[str]) -> str | None:
+        """Pick an unused single-letter short name from the option name."""
+        for char in name.lower() + name.upper():
+            if char.isalpha() and char not in used:
+                return char
+        return None
+
+    @staticmethod
+    def _normalize_cli_name(name: str) -> str:
+        """Turn an arbitrary string into a valid Python package name."""
+        if PYTHON_IDENTIFIER_PATTERN.match(name) and not keyword.iskeyword(name):
+            return name
+        fixed = INVALID_NAME_CHARS.sub("_", name.strip()).strip("_").lower()
+        if not fixed:
+            return fixed
+        if fixed[0].isdigit():
+            fixed = f"cli_{fixed}"
+        if keyword.iskeyword(fixed):
+            fixed = f"{fixed}_cli"
+        return fixed
@@ -0,0 +1,323 @@
+"""Verify generated CLIs in-process, without installing them.
+
+For every output directory (a generated project with a pyproject.toml), the
+verifier compiles each Python module, imports the package straight from the
+directory, and runs the group's --help and every command's --help through
+click's CliRunner. Passing results are cached by the content hash of the
+project's files, so unchanged projects are skipped on the next run, and many
+projects can be checked in a process pool.
+"""
+
+import hashlib
+import importlib
+import math
+import os
+import sys
+import time
+import tomllib
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from functools import lru_cache
+from importlib.metadata import version
+from pathlib import Path
+
+import click
+from click.testing import CliRunner
+from pydantic import BaseModel, Field, ValidationError
+
+from cli_generator.atomic import write_atomic
+from cli_generator.cache import DEFAULT_CACHE_DIR
+from cli_generator.generators.code_generator import file_sha256
+
+# Passing results, keyed by project content hash
+VERIFY_CACHE_DIR = DEFAULT_CACHE_DIR.parent / "verify"
+# Bump when the checks change, so earlier passes are not trusted
+VERIFY_VERSION = 1
+# Directories that are never part of a generated project
+IGNORED_DIRS = {"__pycache__", ".venv", "venv", ".git", "build", "dist"}
+
+
+class VerifyResult(BaseModel):
+    """The outcome of verifying one generated project."""
+
+    path: str = Field(..., description="The output directory")
+    package: str | None = Field(default=None, description="The CLI package, once found")
+    modules: int = Field(default=0, description="Python modules compiled")
+    commands: int = Field(default=0, description="Commands whose --help was run")
+    errors: list[str] = Field(default_factory=list, description="What failed")
+    cached: bool = Field(default=False, description="Whether a cached pass was reused")
+    elapsed: float = Field(default=0.0, description="Verification time in seconds")
+
+    @property
+    def ok(self) -> bool:
+        """Whether every check passed."""
+        return not self.errors
+
+
+class VerifyStats(BaseModel):
+    """Aggregate statistics for verifying several projects."""
+
+    passed: int = 0
+    failed: int = 0
+    cached: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def total(self) -> int:
+        """Number of verified projects."""
+        return self.passed + self.failed
+
+
+def _project_files(output_dir: Path) -> list[Path]:
+    """Return the project's Python files and pyproject.toml, sorted."""
+    files = []
+    for root, dirs, names in os.walk(output_dir):
+        dirs[:] = sorted(d for d in dirs if d not in IGNORED_DIRS and not d.startswith("."))
+        for name in sorted(names):
+            if name.endswith(".py") or name == "pyproject.toml":
+                files.append(Path(root) / name)
+    return files
+
+
+@lru_cache(maxsize=1)
+def _environment_key() -> str:
+    """Describe what besides the files decides whether a project passes."""
+    return f"{VERIFY_VERSION}\0{sys.version_info[:2]}\0{version('click')}\0"
+
+
+def content_hash(output_dir: Path) -> str:
+    """Hash a project's files, together with what the checks depend on."""
+    digest = hashlib.sha256()
+    digest.update(_environment_key().encode())
+    for path in _project_files(output_dir):
+        relative = path.relative_to(output_dir).as_posix()
+        digest.update(f"{relative}\0{file_sha256(path)}\0".encode())
+    return digest.hexdigest()
+
+
+def find_entry_point(output_dir: Path) -> tuple[str, str]:
+    """Return the package and CLI module of a generated project.
+
+    The first [project.scripts] entry of pyproject.toml names the module
+    (e.g. "mytool.cli:main").
+
+    Raises:
+        ValueError: If the project has no usable pyproject.toml.
+    """
+    try:
+        project = tomllib.loads((output_dir / "pyproject.toml").read_text())["project"]
+        target = next(iter(project["scripts"].values()))
+    except (OSError, tomllib.TOMLDecodeError, KeyError, StopIteration) as e:
+        raise ValueError(f"No console script in {output_dir / 'pyproject.toml'}: {e}") from e
+    module = target.split(":")[0]
+    return module.split(".")[0], module
+
+
+@contextmanager
+def _imported_from(output_dir: Path, package: str) -> Iterator[None]:
+    """Make a package importable from a directory, and forget it afterwards.
+
+    Modules of the same name that were imported before are set aside and
+    restored, so projects that share a package name do not see each other.
+    No bytecode is written into the output directory.
+    """
+
+    def owned(name: str) -> bool:
+        return name == package or name.startswith(f"{package}.")
+
+    saved = {name: module for name, module in sys.modules.items() if owned(name)}
+    for name in saved:
+        del sys.modules[name]
+    dont_write_bytecode = sys.dont_write_bytecode
+    sys.dont_write_bytecode = True
+    sys.path.insert(0, str(output_dir))
+    importlib.invalidate_caches()
+    try:
+        yield
+    finally:
+        sys.path.remove(str(output_dir))
+        sys.dont_write_bytecode = dont_write_bytecode
+        for name in [name for name in sys.modules if owned(name)]:
+            del sys.modules[name]
+        sys.modules.update(saved)
+
+
+def _compile_modules(output_dir: Path, result: VerifyResult) -> None:
+    """Compile every Python file of a project, recording syntax errors."""
+    for path in _project_files(output_dir):
+        if path.suffix != ".py":
+            continue
+        result.modules += 1
+        try:
+            compile(path.read_bytes(), str(path), "exec", dont_inherit=True)
+        except (SyntaxError, ValueError) as e:
+            location = path.relative_to(output_dir).as_posix()
+            line = getattr(e, "lineno", None)
+            result.errors.append(f"{location}:{line}: {e}" if line else f"{location}: {e}")
+
+
+def _check_help(
+    runner: CliRunner, group: click.Command, args: list[str], result: VerifyResult
+) -> None:
+    """Run --help for the group or one command, recording failures."""
+    outcome = runner.invoke(group, [*args, "--help"])
+    if outcome.exit_code != 0:
+        reason = repr(outcome.exception) if outcome.exception else outcome.output.strip()
+        command = " ".join([result.package or "cli", *args, "--help"])
+        result.errors.append(f"'{command}' exited with {outcome.exit_code}: {reason}")
+
+
+def verify_output(output_dir: Path) -> VerifyResult:
+    """Verify one generated project (see the module docstring).
+
+    Never raises for problems in the project; they are reported in the
+    result's errors.
+    """
+    start = time.perf_counter()
+    result = VerifyResult(path=str(output_dir))
+    try:
+        result.package, module_name = find_entry_point(output_dir)
+    except ValueError as e:
+        result.errors.append(str(e))
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    _compile_modules(output_dir, result)
+    if not result.errors:
+        with _imported_from(output_dir, result.package):
+            try:
+                module = importlib.import_module(module_name)
+            except Exception as e:
+                result.errors.append(f"Importing {module_name} failed: {e!r}")
+            else:
+                group = getattr(module, "cli", None)
+                if not isinstance(group, click.Command):
+                    result.errors.append(f"{module_name} has no click command named 'cli'")
+                else:
+                    runner = CliRunner()
+                    _check_help(runner, group, [], result)
+                    if isinstance(group, click.Group):
+                        for name in group.list_commands(click.Context(group)):
+                            result.commands += 1
+                            _check_help(runner, group, [name], result)
+
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def verify_chunk(output_dirs: list[Path]) -> list[VerifyResult]:
+    """Verify several projects in one worker task."""
+    return [verify_output(output_dir) for output_dir in output_dirs]
+
+
+def expand_output_dirs(paths: Iterable[str]) -> list[Path]:
+    """Resolve output directories to generated projects.
+
+    A directory with a pyproject.toml is a project; otherwise each of its
+    subdirectories that has one is (as written by build with several specs).
+
+    Raises:
+        FileNotFoundError: If a directory does not exist or holds no project.
+    """
+    projects: list[Path] = []
+    for path in map(Path, paths):
+        if not path.is_dir():
+            raise FileNotFoundError(f"Directory not found: {path}")
+        if (path / "pyproject.toml").exists():
+            projects.append(path)
+            continue
+        children = sorted(child.parent for child in path.glob("*/pyproject.toml"))
+        if not children:
+            raise FileNotFoundError(f"No generated project in {path}")
+        projects.extend(children)
+    return list(dict.fromkeys(projects))
+
+
+def _read_cached(cache_dir: Path, key: str) -> VerifyResult | None:
+    """Return a cached passing result, if there is one."""
+    try:
+        result = VerifyResult.model_validate_json((cache_dir / f"{key}.json").read_bytes())
+    except (OSError, ValidationError):
+        return None
+    return result if result.ok else None
+
+
+def _write_cached(cache_dir: Path, key: str, result: VerifyResult) -> None:
+    """Cache a passing result; an unusable cache directory is ignored."""
+    path = cache_dir / f"{key}.json"
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        write_atomic(path, result.model_dump_json())
+    except OSError:
+        pass
+
+
+def verify_outputs(
+    output_dirs: list[Path],
+    jobs: int = 1,
+    cache_dir: Path | None = VERIFY_CACHE_DIR,
+    on_result: Callable[[VerifyResult], None] | None = None,
+) -> VerifyStats:
+    """Verify many generated projects.
+
+    Projects whose content hash has a cached pass are reported without
+    being checked again. The rest are checked in this process, or in a
+    process pool with more than one job.
+
+    Args:
+        output_dirs: Generated projects (see expand_output_dirs).
+        jobs: Number of worker processes (1 verifies in this process).
+        cache_dir: Where passing results are cached, or None to always verify.
+        on_result: Called with each result as soon as it completes.
+
+    Returns:
+        Aggregate statistics for the run.
+    """
+    if jobs < 1:
+        raise ValueError("jobs must be at least 1")
+
+    stats = VerifyStats()
+    start = time.perf_counter()
+    keys: dict[str, str] = {}
+
+    def report(result: VerifyResult) -> None:
+        if result.ok:
+            stats.passed += 1
+            if result.cached:
+                stats.cached += 1
+            elif cache_dir is not None:
+                _write_cached(cache_dir, keys[result.path], result)
+        else:
+            stats.failed += 1
+        if on_result is not None:
+            on_result(result)
+
+    pending: list[Path] = []
+    for output_dir in output_dirs:
+        if cache_dir is not None:
+            keys[str(output_dir)] = key = content_hash(output_dir)
+            cached = _read_cached(cache_dir, key)
+            if cached is not None:
+                report(cached.model_copy(update={"path": str(output_dir), "cached": True}))
+                continue
+        pending.append(output_dir)
+
+    if jobs == 1 or len(pending) <= 1:
+        for result in verify_chunk(pending):
+            report(result)
+    else:
+        workers = min(jobs, len(pending))
+        size = math.ceil(len(pending) / (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures: list[Future[list[VerifyResult]]] = [
+                executor.submit(verify_chunk, pending[index : index + size])
+                for index in range(0, len(pending), size)
+            ]
+            for future in as_completed(futures):
+                for result in future.result():
+                    report(result)
+
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
@@ -0,0 +1,28 @@
+"""Shared pytest configuration."""
+
+import os
+import shutil
+import tempfile
+
+import pytest
+
+# Caches the package writes to outside the directories a test passes in.
+# They are read when cli_generator is imported, so they are set here, before
+# any test module imports it; subprocesses started by tests inherit them.
+CACHE_ENV_VARS = ("CLI_GEN_TEMPLATE_CACHE_DIR", "CLI_GEN_TRUSTED_CACHE_DIR")
+
+_cache_root: str | None = None
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Point the package's default caches at a directory of this session."""
+    global _cache_root
+    _cache_root = tempfile.mkdtemp(prefix="cli-gen-tests-")
+    for name in CACHE_ENV_VARS:
+        os.environ[name] = os.path.join(_cache_root, name.lower())
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    """Remove the session's caches."""
+    if _cache_root is not None:
+        shutil.rmtree(_cache_root, ignore_errors=True)
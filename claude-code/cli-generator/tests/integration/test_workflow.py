@@ -25,6 +25,7 @@ from cli_generator.models import (
     CommandSpec,
     OptionSpec,
 )
+from cli_generator.verify import verify_output
 
 
 class TestWorkflowWithMockedLLM:
@@ -254,6 +255,19 @@ class TestWorkflowWithFixedSpec:
             assert (output_dir / "pyproject.toml").exists()
             assert (output_dir / "README.md").exists()
 
+    @pytest.mark.parametrize("layout", ["single", "lazy"])
+    def test_generated_cli_verifies_in_process(
+        self, code_generator: CodeGenerator, realistic_spec: CLISpec, layout: str
+    ) -> None:
+        """The generated CLI should import and show --help without installing it."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            code_generator.generate(realistic_spec, Path(tmpdir), layout=layout)
+
+            result = verify_output(Path(tmpdir))
+
+            assert result.ok, result.errors
+            assert result.commands == len(realistic_spec.commands)
+
 
 @pytest.mark.slow
 class TestWorkflowWithRealLLM:
@@ -0,0 +1,61 @@
+"""Unit tests for atomic file replacement."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from cli_generator.atomic import temp_path, write_atomic
+
+
+class TestTempPath:
+    """Tests for temp_path()."""
+
+    def test_unique_per_call(self, tmp_path: Path) -> None:
+        """Each call should create its own file next to the target."""
+        target = tmp_path / "out.txt"
+        first, second = temp_path(target), temp_path(target)
+
+        assert first != second
+        assert first.parent == second.parent == tmp_path
+        assert first.exists() and second.exists()
+        assert not target.exists()
+
+    def test_usual_permissions(self, tmp_path: Path) -> None:
+        """The file should get the permissions of a normally created file."""
+        umask = os.umask(0o022)
+        try:
+            path = temp_path(tmp_path / "cli.py")
+        finally:
+            os.umask(umask)
+        assert path.stat().st_mode & 0o777 == 0o644
+
+
+class TestWriteAtomic:
+    """Tests for write_atomic()."""
+
+    def test_replaces_file(self, tmp_path: Path) -> None:
+        """Text and bytes should replace the target and leave no temporary file."""
+        target = tmp_path / "out.txt"
+        write_atomic(target, "old")
+        write_atomic(target, b"new")
+
+        assert target.read_bytes() == b"new"
+        assert list(tmp_path.iterdir()) == [target]
+
+    def test_failure_leaves_target(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A failed replace should keep the old file and remove the temporary one."""
+        target = tmp_path / "out.txt"
+        target.write_text("old")
+
+        def fail(src: object, dst: object) -> None:
+            raise OSError("disk full")
+
+        monkeypatch.setattr(os, "replace", fail)
+        with pytest.raises(OSError, match="disk full"):
+            write_atomic(target, "new")
+
+        assert target.read_text() == "old"
+        assert list(tmp_path.iterdir()) == [target]
@@ -0,0 +1,129 @@
+"""Unit tests for concurrent bulk spec generation."""
+
+import asyncio
+
+import pytest
+from pydantic_ai.messages import ModelMessage, ModelResponse, ToolCallPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_ai.models.test import TestModel
+
+from cli_generator.batch import BatchResult, BatchStats, generate_batch, read_descriptions
+from cli_generator.generators.spec_generator import SpecGenerator
+
+
+class TestReadDescriptions:
+    """Tests for parsing batch input."""
+
+    def test_plain_text_lines(self) -> None:
+        """Each non-blank line should be a description."""
+        text = "A counter tool\n\n  A todo manager  \n"
+        assert read_descriptions(text) == ["A counter tool", "A todo manager"]
+
+    def test_skips_comments(self) -> None:
+        """Lines starting with '#' should be ignored."""
+        assert read_descriptions("# header\nA tool") == ["A tool"]
+
+    def test_jsonl_objects(self) -> None:
+        """JSON objects should provide a description key."""
+        text = '{"description": "A counter"}\n{"id": 2, "description": "A timer"}'
+        assert read_descriptions(text) == ["A counter", "A timer"]
+
+    def test_json_strings(self) -> None:
+        """JSON strings should be decoded."""
+        assert read_descriptions('"A counter"') == ["A counter"]
+
+    def test_lines_that_only_look_like_json(self) -> None:
+        """Lines starting with a quote or brace that are not JSON should be plain text."""
+        text = '"Quoted" tools are fine\n{braces} too\nA timer'
+        assert read_descriptions(text) == ['"Quoted" tools are fine', "{braces} too", "A timer"]
+
+    def test_json_without_description_raises(self) -> None:
+        """JSON objects without a description should be rejected."""
+        with pytest.raises(ValueError, match="Line 1"):
+            read_descriptions('{"id": 1}')
+
+
+class TestBatchStats:
+    """Tests for batch statistics."""
+
+    def test_percentiles(self) -> None:
+        """Percentiles should use the nearest-rank method."""
+        stats = BatchStats(latencies=[float(n) for n in range(1, 101)])
+        assert stats.percentile(50) == 50.0
+        assert stats.percentile(95) == 95.0
+
+    def test_empty_percentile(self) -> None:
+        """Percentiles of an empty batch should be zero."""
+        assert BatchStats().percentile(95) == 0.0
+
+    def test_throughput(self) -> None:
+        """Throughput should be successful specs per minute."""
+        stats = BatchStats(succeeded=10, failed=5, elapsed=30.0)
+        assert stats.throughput == 20.0
+        assert stats.total == 15
+
+
+class TestGenerateBatch:
+    """Tests for generate_batch()."""
+
+    @pytest.mark.asyncio
+    async def test_generates_all(self) -> None:
+        """Every description should produce a result."""
+        generator = SpecGenerator(model=TestModel())
+        results: list[BatchResult] = []
+
+        stats = await generate_batch(
+            generator, ["A counter", "A timer", "A todo list"], 2, results.append
+        )
+
+        assert stats.succeeded == 3
+        assert stats.failed == 0
+        assert sorted(r.index for r in results) == [0, 1, 2]
+        assert all(r.spec is not None for r in results)
+
+    @pytest.mark.asyncio
+    async def test_errors_do_not_abort(self) -> None:
+        """A failing item should be recorded without stopping the batch."""
+        generator = SpecGenerator(model=TestModel())
+        results: list[BatchResult] = []
+
+        stats = await generate_batch(generator, ["A counter", "   "], 2, results.append)
+
+        assert stats.succeeded == 1
+        assert stats.failed == 1
+        failed = next(r for r in results if r.error)
+        assert failed.index == 1
+        assert "description" in failed.error
+
+    @pytest.mark.asyncio
+    async def test_respects_concurrency(self) -> None:
+        """No more than `concurrency` generations should run at once."""
+        active = 0
+        peak = 0
+
+        async def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return ModelResponse(
+                parts=[
+                    ToolCallPart(
+                        info.output_tools[0].name,
+                        {"name": "tool", "description": "A tool"},
+                    )
+                ]
+            )
+
+        generator = SpecGenerator(model=FunctionModel(respond))
+        stats = await generate_batch(generator, [f"Tool {n}" for n in range(10)], 3)
+
+        assert stats.succeeded == 10
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_invalid_concurrency(self) -> None:
+        """Concurrency below one should be rejected."""
+        with pytest.raises(ValueError, match="concurrency"):
+            await generate_batch(SpecGenerator(model=TestModel()), ["A tool"], 0)
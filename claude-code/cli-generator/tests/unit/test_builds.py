@@ -0,0 +1,214 @@
+"""Unit tests for multi-spec builds."""
+
+import multiprocessing
+import os
+from pathlib import Path
+
+import pytest
+
+from cli_generator import builds
+from cli_generator.builds import BuildResult, BuildStats, build_specs, expand_spec_paths
+from cli_generator.models import CLISpec, CommandSpec
+
+
+def _write_spec(directory: Path, name: str, file_name: str | None = None) -> Path:
+    """Write a small spec file and return its path."""
+    spec = CLISpec(
+        name=name,
+        description=f"The {name} CLI",
+        commands=[CommandSpec(name="run", description="Run it")],
+    )
+    path = directory / (file_name or f"{name}.json")
+    path.write_text(spec.model_dump_json())
+    return path
+
+
+class TestExpandSpecPaths:
+    """Tests for resolving spec arguments."""
+
+    def test_files_directories_and_globs(self, tmp_path: Path) -> None:
+        """Files, directories and glob patterns should all be expanded."""
+        first = _write_spec(tmp_path, "first")
+        second = _write_spec(tmp_path, "second")
+        nested = tmp_path / "nested"
+        nested.mkdir()
+        third = _write_spec(nested, "third")
+
+        assert expand_spec_paths([str(first)]) == [first]
+        assert expand_spec_paths([str(tmp_path)]) == [first, second]
+        assert expand_spec_paths([str(tmp_path / "**" / "t*.json")]) == [third]
+
+    def test_duplicates_are_removed(self, tmp_path: Path) -> None:
+        """A file named twice should be built once."""
+        first = _write_spec(tmp_path, "first")
+        assert expand_spec_paths([str(first), str(tmp_path / "*.json")]) == [first]
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        """Missing files should raise FileNotFoundError."""
+        with pytest.raises(FileNotFoundError, match="File not found"):
+            expand_spec_paths([str(tmp_path / "missing.json")])
+
+    def test_unmatched_glob(self, tmp_path: Path) -> None:
+        """Patterns matching nothing should raise FileNotFoundError."""
+        with pytest.raises(FileNotFoundError, match="No spec files match"):
+            expand_spec_paths([str(tmp_path / "*.json")])
+
+
+class TestBuildSpecs:
+    """Tests for build_specs()."""
+
+    def test_builds_each_spec_into_its_own_directory(self, tmp_path: Path) -> None:
+        """Every spec should get a project directory named after the CLI."""
+        paths = [_write_spec(tmp_path, name) for name in ("alpha", "beta", "gamma")]
+        results: list[BuildResult] = []
+
+        stats = build_specs(paths, tmp_path / "out", on_result=results.append)
+
+        assert (stats.succeeded, stats.failed) == (3, 0)
+        assert stats.throughput > 0
+        for name in ("alpha", "beta", "gamma"):
+            assert (tmp_path / "out" / name / name / "cli.py").exists()
+            assert (tmp_path / "out" / name / "pyproject.toml").exists()
+        assert {result.written for result in results} == {7}
+
+    def test_process_pool(self, tmp_path: Path) -> None:
+        """Building with several jobs should produce the same files."""
+        paths = [_write_spec(tmp_path, f"cli_{index}") for index in range(6)]
+
+        stats = build_specs(paths, tmp_path / "pool", jobs=2)
+        build_specs(paths, tmp_path / "serial", jobs=1)
+
+        assert stats.succeeded == 6
+        for index in range(6):
+            relative = Path(f"cli_{index}") / f"cli_{index}" / "cli.py"
+            assert (tmp_path / "pool" / relative).read_text() == (
+                tmp_path / "serial" / relative
+            ).read_text()
+
+    def test_failures_do_not_abort_the_build(self, tmp_path: Path) -> None:
+        """Invalid and unparseable specs should be reported per file."""
+        good = _write_spec(tmp_path, "good")
+        invalid = tmp_path / "invalid.json"
+        invalid.write_text('{"name": "Bad Name", "description": "x"}')
+        broken = tmp_path / "broken.json"
+        broken.write_text("{")
+        results: list[BuildResult] = []
+
+        stats = build_specs([good, invalid, broken], tmp_path / "out", on_result=results.append)
+
+        assert (stats.succeeded, stats.failed) == (1, 2)
+        errors = {Path(result.path).name: result.error for result in results}
+        assert errors["good.json"] is None
+        assert "Invalid specification" in errors["invalid.json"]
+        assert "Invalid specification" in errors["broken.json"]
+
+    def test_unexpected_errors_fail_only_their_spec(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """An exception other than a spec error should fail that spec, not the build."""
+        paths = [_write_spec(tmp_path, name) for name in ("alpha", "beta")]
+        build_spec = builds.build_spec
+
+        def flaky(path: str, *args: object) -> BuildResult:
+            if path.endswith("alpha.json"):
+                raise RuntimeError("template exploded")
+            return build_spec(path, *args)  # type: ignore[arg-type]
+
+        monkeypatch.setattr(builds, "build_spec", flaky)
+        results: list[BuildResult] = []
+
+        stats = build_specs(paths, tmp_path / "out", on_result=results.append)
+
+        assert (stats.succeeded, stats.failed) == (1, 1)
+        errors = {Path(result.path).name: result.error for result in results}
+        assert errors["alpha.json"] == "Build failed: RuntimeError: template exploded"
+        assert errors["beta.json"] is None
+
+    @pytest.mark.skipif(
+        multiprocessing.get_start_method() != "fork",
+        reason="workers must inherit the patched build_spec",
+    )
+    def test_crashed_worker_does_not_abort_the_build(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A worker dying should fail its specs and still report every spec."""
+        paths = [_write_spec(tmp_path, f"cli_{index}") for index in range(4)]
+        build_spec = builds.build_spec
+
+        def crash(path: str, *args: object) -> BuildResult:
+            if path.endswith("cli_0.json"):
+                os._exit(1)
+            return build_spec(path, *args)  # type: ignore[arg-type]
+
+        monkeypatch.setattr(builds, "build_spec", crash)
+        results: list[BuildResult] = []
+
+        stats = build_specs(paths, tmp_path / "out", jobs=2, on_result=results.append)
+
+        assert stats.total == 4
+        assert stats.failed >= 1
+        assert sorted(result.path for result in results) == sorted(map(str, paths))
+        crashed = next(result for result in results if result.path.endswith("cli_0.json"))
+        assert "BrokenProcessPool" in crashed.error
+
+    def test_duplicate_names(self, tmp_path: Path) -> None:
+        """Two specs for the same CLI should not write to the same directory."""
+        first = _write_spec(tmp_path, "same", "first.json")
+        second = _write_spec(tmp_path, "same", "second.json")
+        results: list[BuildResult] = []
+
+        stats = build_specs([first, second], tmp_path / "out", on_result=results.append)
+
+        assert (stats.succeeded, stats.failed) == (1, 1)
+        [failure] = [result for result in results if result.error]
+        assert failure.path == str(second)
+        assert failure.error == f"Duplicate CLI name 'same' (also in {first})"
+
+    def test_duplicate_names_in_process_pool(self, tmp_path: Path) -> None:
+        """Workers should not both write a CLI that two specs name."""
+        paths = [_write_spec(tmp_path, "same", f"{index}.json") for index in range(4)]
+        results: list[BuildResult] = []
+
+        stats = build_specs(paths, tmp_path / "out", jobs=4, on_result=results.append)
+
+        assert (stats.succeeded, stats.failed) == (1, 3)
+        [success] = [result for result in results if result.error is None]
+        for result in results:
+            if result.error is not None:
+                assert result.error == f"Duplicate CLI name 'same' (also in {success.path})"
+
+    def test_incremental(self, tmp_path: Path) -> None:
+        """Incremental rebuilds should skip unchanged specs."""
+        paths = [_write_spec(tmp_path, name) for name in ("alpha", "beta")]
+        build_specs(paths, tmp_path / "out", incremental=True)
+        results: list[BuildResult] = []
+
+        build_specs(paths, tmp_path / "out", incremental=True, on_result=results.append)
+
+        assert [(result.rendered, result.skipped) for result in results] == [(0, 7), (0, 7)]
+
+    def test_trusted_cache(self, tmp_path: Path) -> None:
+        """Validated specs should be cached, and loaded from the cache again."""
+        paths = [_write_spec(tmp_path, name) for name in ("alpha", "beta")]
+
+        build_specs(paths, tmp_path / "out", cache_dir=tmp_path / "trusted")
+        stats = build_specs(paths, tmp_path / "again", cache_dir=tmp_path / "trusted")
+
+        assert len(list((tmp_path / "trusted").glob("*.bin"))) == 2
+        assert stats.succeeded == 2
+        assert (tmp_path / "again" / "beta" / "beta" / "cli.py").exists()
+
+    def test_invalid_jobs(self, tmp_path: Path) -> None:
+        """jobs must be positive."""
+        with pytest.raises(ValueError, match="jobs must be at least 1"):
+            build_specs([], tmp_path, jobs=0)
+
+
+class TestBuildStats:
+    """Tests for BuildStats."""
+
+    def test_throughput(self) -> None:
+        """Throughput should be successful specs per second."""
+        assert BuildStats(succeeded=10, failed=2, elapsed=2.0).throughput == 5.0
+        assert BuildStats().throughput == 0.0
+        assert BuildStats(succeeded=3, failed=1).total == 4
@@ -0,0 +1,162 @@
+"""Unit tests for SpecCache."""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from cli_generator.cache import SpecCache, normalize_description
+from cli_generator.models import CLISpec, CommandSpec
+
+
+@pytest.fixture
+def spec() -> CLISpec:
+    """Create a CLISpec for caching."""
+    return CLISpec(
+        name="mytool",
+        description="A test tool",
+        commands=[CommandSpec(name="run", description="Run it")],
+    )
+
+
+class TestNormalizeDescription:
+    """Tests for description normalization."""
+
+    def test_collapses_whitespace(self) -> None:
+        """Runs of whitespace should collapse to single spaces."""
+        assert normalize_description("  a   CLI\n tool ") == "a cli tool"
+
+    def test_case_insensitive(self) -> None:
+        """Normalization should ignore case."""
+        assert normalize_description("A CLI") == normalize_description("a cli")
+
+
+class TestSpecCacheKey:
+    """Tests for SpecCache.make_key()."""
+
+    def test_same_inputs_same_key(self) -> None:
+        """Equivalent descriptions should share a key."""
+        key1 = SpecCache.make_key("m", "prompt", "A counter  tool")
+        key2 = SpecCache.make_key("m", "prompt", "a counter tool")
+        assert key1 == key2
+
+    def test_model_changes_key(self) -> None:
+        """Different models should not share entries."""
+        assert SpecCache.make_key("a", "p", "d") != SpecCache.make_key("b", "p", "d")
+
+    def test_prompt_changes_key(self) -> None:
+        """Changing the system prompt should invalidate entries."""
+        assert SpecCache.make_key("m", "p1", "d") != SpecCache.make_key("m", "p2", "d")
+
+
+class TestSpecCacheGetPut:
+    """Tests for storing and retrieving specs."""
+
+    def test_miss_on_empty_cache(self, tmp_path: Path) -> None:
+        """get() should return None and count a miss."""
+        cache = SpecCache(tmp_path)
+        assert cache.get("missing") is None
+        assert cache.misses == 1
+        assert cache.hits == 0
+
+    def test_round_trip(self, tmp_path: Path, spec: CLISpec) -> None:
+        """A stored spec should come back equal and count a hit."""
+        cache = SpecCache(tmp_path)
+        cache.put("key", spec)
+
+        assert cache.get("key") == spec
+        assert cache.hits == 1
+
+    def test_persists_across_instances(self, tmp_path: Path, spec: CLISpec) -> None:
+        """Entries should survive a new cache instance."""
+        SpecCache(tmp_path).put("key", spec)
+        assert SpecCache(tmp_path).get("key") == spec
+
+    def test_concurrent_puts(self, tmp_path: Path, spec: CLISpec) -> None:
+        """Threads storing the same key should not race on a temporary file."""
+        cache = SpecCache(tmp_path)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: cache.put("key", spec), range(32)))
+
+        assert cache.get("key") == spec
+        assert [path.name for path in tmp_path.iterdir()] == ["key.json"]
+
+    def test_corrupt_entry_is_a_miss(self, tmp_path: Path) -> None:
+        """Invalid JSON should be dropped and treated as a miss."""
+        cache = SpecCache(tmp_path)
+        (tmp_path / "bad.json").write_text('{"name": "not valid!"}')
+
+        assert cache.get("bad") is None
+        assert not (tmp_path / "bad.json").exists()
+
+    def test_expired_entry_is_a_miss(self, tmp_path: Path, spec: CLISpec) -> None:
+        """Entries older than max_age should not be served."""
+        cache = SpecCache(tmp_path, max_age=60)
+        cache.put("key", spec)
+        old = time.time() - 120
+        os.utime(tmp_path / "key.json", (old, old))
+
+        assert cache.get("key") is None
+        assert cache.misses == 1
+
+
+class TestSpecCacheEviction:
+    """Tests for LRU eviction."""
+
+    def _age(self, path: Path, seconds: float) -> None:
+        """Set a file's mtime to the given number of seconds ago."""
+        stamp = time.time() - seconds
+        os.utime(path, (stamp, stamp))
+
+    def test_evicts_least_recently_used(self, tmp_path: Path, spec: CLISpec) -> None:
+        """Exceeding max_entries should drop the oldest entries."""
+        cache = SpecCache(tmp_path, max_entries=2)
+        cache.put("a", spec)
+        self._age(tmp_path / "a.json", 30)
+        cache.put("b", spec)
+        self._age(tmp_path / "b.json", 20)
+        cache.put("c", spec)
+
+        assert not (tmp_path / "a.json").exists()
+        assert (tmp_path / "b.json").exists()
+        assert (tmp_path / "c.json").exists()
+
+    def test_get_refreshes_lru(self, tmp_path: Path, spec: CLISpec) -> None:
+        """Reading an entry should protect it from eviction."""
+        cache = SpecCache(tmp_path, max_entries=2)
+        cache.put("a", spec)
+        self._age(tmp_path / "a.json", 30)
+        cache.put("b", spec)
+        self._age(tmp_path / "b.json", 20)
+        cache.get("a")
+        cache.put("c", spec)
+
+        assert (tmp_path / "a.json").exists()
+        assert not (tmp_path / "b.json").exists()
+
+    def test_evicts_over_max_bytes(self, tmp_path: Path, spec: CLISpec) -> None:
+        """Exceeding max_bytes should drop entries until under the limit."""
+        size = len(spec.model_dump_json())
+        cache = SpecCache(tmp_path, max_bytes=size * 2)
+        for key in ["a", "b", "c"]:
+            cache.put(key, spec)
+
+        assert len(list(tmp_path.glob("*.json"))) == 2
+
+    def test_evicts_expired(self, tmp_path: Path, spec: CLISpec) -> None:
+        """evict() should remove entries older than max_age."""
+        cache = SpecCache(tmp_path, max_age=60)
+        cache.put("a", spec)
+        self._age(tmp_path / "a.json", 120)
+
+        assert cache.evict() == 1
+        assert not (tmp_path / "a.json").exists()
+
+    def test_clear(self, tmp_path: Path, spec: CLISpec) -> None:
+        """clear() should remove every entry."""
+        cache = SpecCache(tmp_path)
+        cache.put("a", spec)
+        cache.clear()
+        assert list(tmp_path.glob("*.json")) == []
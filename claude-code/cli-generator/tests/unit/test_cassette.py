@@ -0,0 +1,221 @@
+"""Unit tests for model record/replay cassettes."""
+
+import json
+from pathlib import Path
+
+import pytest
+from pydantic_ai.messages import ModelMessage, ModelResponse, ToolCallPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_ai.models.test import TestModel
+
+from cli_generator.cassette import (
+    CASSETTE_VERSION,
+    Cassette,
+    CassetteMissError,
+    request_key,
+)
+from cli_generator.generators.spec_generator import SpecGenerator
+from cli_generator.models import CLISpec
+
+
+def _spec_model(calls: list[int]) -> FunctionModel:
+    """A model returning a fixed spec and counting its calls."""
+
+    async def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        calls.append(1)
+        args = {
+            "name": "counter",
+            "description": "Count things",
+            "commands": [{"name": "add", "description": "Add one"}],
+        }
+        return ModelResponse(parts=[ToolCallPart(info.output_tools[0].name, args)])
+
+    return FunctionModel(respond, model_name="recorded-model")
+
+
+async def _stream(generator: SpecGenerator, description: str) -> CLISpec | None:
+    """Consume a streamed generation and return the final spec."""
+    spec = None
+    async for spec in generator.generate_stream(description):
+        pass
+    return spec
+
+
+class TestCassetteModes:
+    """Tests for choosing between recording and replaying."""
+
+    def test_auto_records_new_cassette(self, tmp_path: Path) -> None:
+        """A missing cassette should be recorded."""
+        assert not Cassette(tmp_path / "new.json").replaying
+
+    def test_auto_replays_existing_cassette(self, tmp_path: Path) -> None:
+        """An existing cassette should be replayed."""
+        path = tmp_path / "cassette.json"
+        Cassette(path).save()
+        assert Cassette(path).replaying
+
+    def test_record_mode_starts_empty(self, tmp_path: Path) -> None:
+        """Record mode should overwrite an existing cassette."""
+        path = tmp_path / "cassette.json"
+        path.write_text(json.dumps({"version": 1, "interactions": [{"key": "k"}]}))
+
+        cassette = Cassette(path, mode="record")
+
+        assert not cassette.replaying
+        assert len(cassette) == 0
+
+    def test_replay_requires_file(self, tmp_path: Path) -> None:
+        """Replay mode should fail without a cassette file."""
+        with pytest.raises(FileNotFoundError):
+            Cassette(tmp_path / "missing.json", mode="replay")
+
+    def test_invalid_mode(self, tmp_path: Path) -> None:
+        """Unknown modes should be rejected."""
+        with pytest.raises(ValueError, match="mode must be one of"):
+            Cassette(tmp_path / "c.json", mode="rewind")  # type: ignore[arg-type]
+
+    def test_reads_version_1_files(self, tmp_path: Path) -> None:
+        """Cassettes recorded as one JSON document should still replay."""
+        path = tmp_path / "cassette.json"
+        interactions = [{"key": "k", "model": "m", "prompt": "p", "response": {}}]
+        path.write_text(json.dumps({"version": 1, "interactions": interactions}, indent=2))
+
+        assert len(Cassette(path)) == 1
+
+
+class TestCassetteRecordReplay:
+    """Tests for recording a run and replaying it without the model."""
+
+    @pytest.mark.asyncio
+    async def test_replay_returns_recorded_spec(self, tmp_path: Path) -> None:
+        """A replayed generation should match the recording without model calls."""
+        path = tmp_path / "cassette.json"
+        calls: list[int] = []
+        recording = Cassette(path)
+        recorded = await SpecGenerator(model=recording.record(_spec_model(calls))).generate(
+            "A counter"
+        )
+        assert recording.recorded == 1
+        assert len(calls) == 1
+
+        replaying = Cassette(path)
+        replayed = await SpecGenerator(model=replaying.replay()).generate("A counter")
+
+        assert replayed == recorded
+        assert replaying.hits == 1
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_file_is_readable(self, tmp_path: Path) -> None:
+        """Cassette files should list the prompt and model of each response."""
+        path = tmp_path / "cassette.json"
+        cassette = Cassette(path)
+        await SpecGenerator(model=cassette.record(_spec_model([]))).generate("A counter")
+
+        header, interaction = map(json.loads, path.read_text().splitlines())
+        assert header == {"version": CASSETTE_VERSION}
+        assert interaction["model"] == "recorded-model"
+        assert interaction["prompt"].endswith("A counter")
+
+    @pytest.mark.asyncio
+    async def test_responses_are_appended(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Only the first response should write the whole file."""
+        path = tmp_path / "cassette.json"
+        path.write_text("an old cassette\n")
+        cassette = Cassette(path, mode="record")
+        saves: list[int] = []
+        save = cassette.save
+
+        def counting_save() -> None:
+            saves.append(1)
+            save()
+
+        monkeypatch.setattr(cassette, "save", counting_save)
+        generator = SpecGenerator(model=cassette.record(_spec_model([])))
+
+        for description in ("A counter", "A timer", "A clock"):
+            await generator.generate(description)
+
+        assert len(saves) == 1
+        assert len(path.read_text().splitlines()) == 4
+        assert len(Cassette(path)) == 3
+
+    @pytest.mark.asyncio
+    async def test_replay_keeps_recorded_usage(self, tmp_path: Path) -> None:
+        """Replayed responses should report the recorded token usage."""
+        path = tmp_path / "cassette.json"
+        cassette = Cassette(path)
+        recording = SpecGenerator(model=cassette.record(TestModel()))
+        result = await recording.agent.run("Create a CLI specification for: A counter")
+
+        replayed = await SpecGenerator(model=Cassette(path).replay()).agent.run(
+            "Create a CLI specification for: A counter"
+        )
+
+        assert replayed.usage().input_tokens == result.usage().input_tokens
+        assert replayed.usage().output_tokens == result.usage().output_tokens
+
+    @pytest.mark.asyncio
+    async def test_streamed_recording_replays(self, tmp_path: Path) -> None:
+        """Streamed runs should be recorded and replay both streamed and not."""
+        path = tmp_path / "cassette.json"
+        recording = Cassette(path)
+        recorded = await _stream(SpecGenerator(model=recording.record(TestModel())), "A timer")
+
+        generator = SpecGenerator(model=Cassette(path).replay())
+
+        assert await _stream(generator, "A timer") == recorded
+        assert await generator.generate("A timer") == recorded
+
+    @pytest.mark.asyncio
+    async def test_fanout_run_replays(self, tmp_path: Path) -> None:
+        """Every call of a fan-out run should be recorded and replayed."""
+        path = tmp_path / "cassette.json"
+        recording = Cassette(path)
+        recorded = await SpecGenerator(
+            model=recording.record(TestModel()), fanout=True
+        ).generate("A counter")
+        assert recording.recorded == 1 + len(recorded.commands)
+
+        replaying = Cassette(path)
+        replayed = await SpecGenerator(model=replaying.replay(), fanout=True).generate(
+            "A counter"
+        )
+
+        assert replayed == recorded
+        assert replaying.hits == recording.recorded
+
+    @pytest.mark.asyncio
+    async def test_unrecorded_request_raises(self, tmp_path: Path) -> None:
+        """Requests that were never recorded should fail loudly."""
+        path = tmp_path / "cassette.json"
+        await SpecGenerator(model=Cassette(path).record(TestModel())).generate("A counter")
+
+        generator = SpecGenerator(model=Cassette(path).replay())
+
+        with pytest.raises(CassetteMissError, match="A timer"):
+            await generator.generate("A timer")
+
+
+class TestRequestKey:
+    """Tests for the request key."""
+
+    @pytest.mark.asyncio
+    async def test_key_ignores_timestamps(self) -> None:
+        """Identical requests made at different times should share a key."""
+        seen: list[str] = []
+
+        async def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+            seen.append(request_key(messages))
+            args = {"name": "counter", "description": "Count things"}
+            return ModelResponse(parts=[ToolCallPart(info.output_tools[0].name, args)])
+
+        generator = SpecGenerator(model=FunctionModel(respond), coalesce=False)
+        await generator.generate("A counter")
+        await generator.generate("A counter")
+        await generator.generate("A timer")
+
+        assert seen[0] == seen[1]
+        assert seen[0] != seen[2]
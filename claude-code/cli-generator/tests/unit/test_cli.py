@@ -1,6 +1,10 @@
 """Unit tests for CLI interface."""
 
 import json
+import os
+import subprocess
+import sys
+import sqlite3
 import tempfile
 from pathlib import Path
 
@@ -9,7 +13,8 @@ from click.testing import CliRunner
 from pydantic_ai.models.test import TestModel
 
 from cli_generator.cli import cli, spec_cmd, generate_cmd, build_cmd
-from cli_generator.models import CLISpec, CommandSpec
+from cli_generator.generators.code_generator import CodeGenerator
+from cli_generator.models import CLISpec, CommandSpec, OptionSpec
 
 
 class TestCLIGroup:
@@ -65,6 +70,11 @@ class TestSpecCommand:
         # With test mode, it should produce valid output
         assert result.exit_code == 0 or "Error" in result.output
 
+    def test_spec_fanout(self, runner: CliRunner) -> None:
+        """spec command should support two-phase --fanout generation."""
+        result = runner.invoke(cli, ["spec", "A file manager", "--fanout", "--test-mode"])
+        assert result.exit_code == 0
+
     def test_spec_with_save_option(self, runner: CliRunner) -> None:
         """spec command should support --save option."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -204,6 +214,393 @@ class TestBuildCommand:
         assert result.exit_code == 0
         assert "--output" in result.output or "-o" in result.output
 
+    def test_build_incremental(self, runner: CliRunner, tmp_path: Path) -> None:
+        """--incremental should skip an unchanged rebuild and report counts."""
+        spec_file = tmp_path / "spec.json"
+        spec_file.write_text(CLISpec(name="testcli", description="Test").model_dump_json())
+        args = ["build", str(spec_file), "-o", str(tmp_path / "out"), "--incremental"]
+
+        first = runner.invoke(cli, args)
+        second = runner.invoke(cli, args)
+
+        assert first.exit_code == 0
+        assert "Rendered 7, wrote 7, skipped 0 file(s)" in first.output
+        assert second.exit_code == 0
+        assert "Rendered 0, wrote 0, skipped 7 file(s)" in second.output
+        assert "unchanged" in second.output
+
+    def test_build_lazy_layout(self, runner: CliRunner, sample_spec_file: Path) -> None:
+        """--layout lazy should write one module per command."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result = runner.invoke(
+                cli, ["build", str(sample_spec_file), "--output", tmpdir, "--layout", "lazy"]
+            )
+
+            assert result.exit_code == 0
+            assert (Path(tmpdir) / "testcli" / "commands" / "hello.py").exists()
+            assert "command:hello" in result.output
+
+    def test_build_many_specs(self, runner: CliRunner, tmp_path: Path) -> None:
+        """A directory of specs should be built in parallel, one project per spec."""
+        specs = tmp_path / "specs"
+        specs.mkdir()
+        for name in ("alpha", "beta"):
+            spec = CLISpec(name=name, description=f"The {name} CLI")
+            (specs / f"{name}.json").write_text(spec.model_dump_json())
+
+        result = runner.invoke(
+            cli, ["build", str(specs), "--jobs", "2", "-o", str(tmp_path / "out")]
+        )
+
+        assert result.exit_code == 0
+        assert "Build Summary" in result.output
+        assert "Built 2 of 2 CLI(s)" in result.output
+        assert (tmp_path / "out" / "alpha" / "alpha" / "cli.py").exists()
+        assert (tmp_path / "out" / "beta" / "beta" / "cli.py").exists()
+
+    def test_build_many_specs_with_failure(self, runner: CliRunner, tmp_path: Path) -> None:
+        """A failing spec should be reported and make the build exit non-zero."""
+        (tmp_path / "good.json").write_text(
+            CLISpec(name="good", description="Good").model_dump_json()
+        )
+        (tmp_path / "bad.json").write_text("{")
+
+        result = runner.invoke(
+            cli, ["build", str(tmp_path / "*.json"), "-o", str(tmp_path / "out")]
+        )
+
+        assert result.exit_code == 1
+        assert "Built 1 of 2 CLI(s)" in result.output
+        assert (tmp_path / "out" / "good" / "good" / "cli.py").exists()
+
+    def test_build_rejects_invalid_jobs(self, runner: CliRunner, sample_spec_file: Path) -> None:
+        """--jobs must be at least 1."""
+        result = runner.invoke(cli, ["build", str(sample_spec_file), "--jobs", "0"])
+        assert result.exit_code != 0
+
+    def test_build_with_malformed_json(self, runner: CliRunner, tmp_path: Path) -> None:
+        """build should report a spec file that is not JSON."""
+        spec_file = tmp_path / "spec.json"
+        spec_file.write_text("{not json")
+
+        result = runner.invoke(cli, ["build", str(spec_file), "--no-cache"])
+
+        assert result.exit_code == 1
+        assert "Invalid JSON" in result.output
+
+    def test_build_without_trusted_cache(
+        self, runner: CliRunner, sample_spec_file: Path, tmp_path: Path
+    ) -> None:
+        """build --no-cache should validate the spec and still build it."""
+        result = runner.invoke(
+            cli, ["build", str(sample_spec_file), "-o", str(tmp_path), "--no-cache"]
+        )
+        assert result.exit_code == 0
+        assert (tmp_path / "testcli" / "cli.py").exists()
+
+    def test_build_with_previous(
+        self, runner: CliRunner, sample_spec_file: Path, tmp_path: Path
+    ) -> None:
+        """--previous should only render the commands that changed."""
+        runner.invoke(cli, ["build", str(sample_spec_file), "-o", str(tmp_path), "--incremental"])
+        spec = CLISpec.model_validate_json(sample_spec_file.read_text())
+        spec.commands.append(CommandSpec(name="bye", description="Say goodbye"))
+        new_spec_file = tmp_path / "new.json"
+        new_spec_file.write_text(spec.model_dump_json())
+
+        result = runner.invoke(
+            cli,
+            ["build", str(new_spec_file), "-o", str(tmp_path), "--previous", str(sample_spec_file)],
+        )
+
+        assert result.exit_code == 0
+        assert "1 command(s) added, 0 removed, 0 changed" in result.output
+        assert "Rendered 2 command section(s), kept 2" in result.output
+        assert "def bye(" in (tmp_path / "testcli" / "cli.py").read_text()
+
+    def test_build_previous_needs_single_spec(
+        self, runner: CliRunner, sample_spec_file: Path, tmp_path: Path
+    ) -> None:
+        """--previous should be rejected when building several specs."""
+        result = runner.invoke(
+            cli,
+            [
+                "build", str(sample_spec_file), str(sample_spec_file),
+                "-o", str(tmp_path), "--previous", str(sample_spec_file),
+            ],
+        )
+        assert result.exit_code == 1
+        assert "--previous needs a single spec file" in result.output
+
+
+class TestDiffCommand:
+    """Tests for the 'diff' command."""
+
+    @pytest.fixture
+    def runner(self) -> CliRunner:
+        """Create a CLI test runner."""
+        return CliRunner()
+
+    @pytest.fixture
+    def spec_files(self, tmp_path: Path) -> tuple[Path, Path]:
+        """Write two versions of a spec."""
+        old = CLISpec(
+            name="testcli",
+            description="A test CLI",
+            commands=[
+                CommandSpec(name="hello", description="Say hello"),
+                CommandSpec(name="bye", description="Say goodbye"),
+            ],
+        )
+        new = old.model_copy(
+            update={
+                "commands": [
+                    CommandSpec(name="hello", description="Say hello loudly"),
+                    CommandSpec(name="wave", description="Wave"),
+                ]
+            }
+        )
+        old_file, new_file = tmp_path / "old.json", tmp_path / "new.json"
+        old_file.write_text(old.model_dump_json())
+        new_file.write_text(new.model_dump_json())
+        return old_file, new_file
+
+    def test_diff_table(self, runner: CliRunner, spec_files: tuple[Path, Path]) -> None:
+        """diff should list added, removed and changed commands."""
+        result = runner.invoke(cli, ["diff", *map(str, spec_files)])
+
+        assert result.exit_code == 0
+        assert "wave" in result.output
+        assert "bye" in result.output
+        assert "1 command(s) added, 1 removed, 1 changed" in result.output
+
+    def test_diff_json(self, runner: CliRunner, spec_files: tuple[Path, Path]) -> None:
+        """diff --json should print the SpecDiff model."""
+        result = runner.invoke(cli, ["diff", *map(str, spec_files), "--json"])
+
+        assert result.exit_code == 0
+        data = json.loads(result.output)
+        assert data["commands"] == {"added": ["wave"], "removed": ["bye"], "changed": ["hello"]}
+        assert data["changed_commands"][0]["fields"] == ["description"]
+
+    def test_diff_reordered(self, runner: CliRunner, tmp_path: Path) -> None:
+        """A diff that only reorders commands should say so."""
+        commands = [
+            CommandSpec(name="hello", description="Say hello"),
+            CommandSpec(name="bye", description="Say goodbye"),
+        ]
+        old_file, new_file = tmp_path / "old.json", tmp_path / "new.json"
+        old_file.write_text(
+            CLISpec(name="testcli", description="CLI", commands=commands).model_dump_json()
+        )
+        new_file.write_text(
+            CLISpec(name="testcli", description="CLI", commands=commands[::-1]).model_dump_json()
+        )
+
+        result = runner.invoke(cli, ["diff", str(old_file), str(new_file)])
+
+        assert result.exit_code == 0
+        assert "commands reordered" in result.output
+
+    def test_diff_identical(self, runner: CliRunner, spec_files: tuple[Path, Path]) -> None:
+        """Diffing a spec with itself should report no changes."""
+        result = runner.invoke(cli, ["diff", str(spec_files[0]), str(spec_files[0])])
+
+        assert result.exit_code == 0
+        assert "equivalent" in result.output
+
+
+class TestSpecsCommands:
+    """Tests for the 'specs' registry commands."""
+
+    @pytest.fixture
+    def runner(self) -> CliRunner:
+        """Create a CLI test runner."""
+        return CliRunner()
+
+    @pytest.fixture
+    def registry_path(self, runner: CliRunner, tmp_path: Path) -> Path:
+        """Create a registry holding two versions of one spec."""
+        registry_path = tmp_path / "registry.sqlite3"
+        for version, description in enumerate(["Say hello", "Say hello twice"], 1):
+            spec = CLISpec(
+                name="greeter",
+                description="Greets",
+                dependencies=["rich>=13"],
+                commands=[
+                    CommandSpec(
+                        name="export",
+                        description=description,
+                        options=[OptionSpec(name="format", type="choice", choices=["a", "b"])],
+                    )
+                ],
+            )
+            spec_file = tmp_path / f"greeter-{version}.json"
+            spec_file.write_text(spec.model_dump_json())
+            result = runner.invoke(
+                cli, ["specs", "add", str(spec_file), "--registry", str(registry_path)]
+            )
+            assert result.exit_code == 0
+        return registry_path
+
+    def test_add_reports_versions(
+        self, runner: CliRunner, registry_path: Path, tmp_path: Path
+    ) -> None:
+        """Adding an unchanged spec again should keep its version."""
+        result = runner.invoke(
+            cli,
+            ["specs", "add", str(tmp_path / "greeter-2.json"), "--registry", str(registry_path)],
+        )
+        assert result.exit_code == 0
+        assert "unchanged" in result.output
+        assert "Added 0 new version(s) of 1 spec(s)" in result.output
+
+    def test_add_invalid_spec(self, runner: CliRunner, tmp_path: Path) -> None:
+        """An invalid spec file should be reported."""
+        spec_file = tmp_path / "bad.json"
+        spec_file.write_text("{")
+        result = runner.invoke(
+            cli, ["specs", "add", str(spec_file), "--registry", str(tmp_path / "r.sqlite3")]
+        )
+        assert result.exit_code == 1
+        assert "Invalid specification" in result.output
+
+    def test_list_json(self, runner: CliRunner, registry_path: Path) -> None:
+        """list should show the latest version of each CLI."""
+        result = runner.invoke(cli, ["specs", "list", "--json", "--registry", str(registry_path)])
+        assert result.exit_code == 0
+        assert [(e["name"], e["version"]) for e in json.loads(result.output)] == [("greeter", 2)]
+
+    def test_search(self, runner: CliRunner, registry_path: Path) -> None:
+        """search should find specs by command, option and type."""
+        args = ["specs", "search", "--registry", str(registry_path), "--json"]
+        found = runner.invoke(cli, [*args, "-c", "export", "-o", "--format", "--type", "choice"])
+        missing = runner.invoke(cli, [*args, "--dependency", "pyyaml"])
+
+        assert [entry["name"] for entry in json.loads(found.output)] == ["greeter"]
+        assert json.loads(missing.output) == []
+
+    def test_show_version_and_history(self, runner: CliRunner, registry_path: Path) -> None:
+        """show should print a given version, or every version with --history."""
+        shown = runner.invoke(
+            cli, ["specs", "show", "greeter@1", "--json", "--registry", str(registry_path)]
+        )
+        history = runner.invoke(
+            cli, ["specs", "show", "greeter", "--history", "--registry", str(registry_path)]
+        )
+
+        assert json.loads(shown.output)["commands"][0]["description"] == "Say hello"
+        assert "History of greeter" in history.output
+        assert "Say hello" not in history.output
+
+    def test_show_missing(self, runner: CliRunner, registry_path: Path) -> None:
+        """show should fail for an unknown CLI."""
+        result = runner.invoke(cli, ["specs", "show", "nope", "--registry", str(registry_path)])
+        assert result.exit_code == 1
+        assert "No spec 'nope'" in result.output
+
+    def test_build_registry_reference(
+        self, runner: CliRunner, registry_path: Path, tmp_path: Path
+    ) -> None:
+        """build should accept registry references, also for --previous."""
+        output = tmp_path / "out"
+        base = ["--registry", str(registry_path), "-o", str(output)]
+        first = runner.invoke(cli, ["build", "registry:greeter@1", "--incremental", *base])
+        second = runner.invoke(
+            cli, ["build", "registry:greeter", "--previous", "registry:greeter@1", *base]
+        )
+
+        assert first.exit_code == 0
+        assert second.exit_code == 0
+        assert "Say hello twice" in (output / "greeter" / "cli.py").read_text()
+
+    def test_build_missing_reference(
+        self, runner: CliRunner, registry_path: Path, tmp_path: Path
+    ) -> None:
+        """build should fail for an unknown registry reference."""
+        result = runner.invoke(
+            cli, ["build", "registry:greeter@9", "--registry", str(registry_path)]
+        )
+        assert result.exit_code == 1
+        assert "No spec 'greeter@9'" in result.output
+
+    @pytest.mark.parametrize(
+        "args",
+        [
+            ["specs", "list"],
+            ["specs", "search", "--command", "export"],
+            ["specs", "show", "greeter"],
+            ["build", "registry:greeter"],
+        ],
+    )
+    def test_registry_not_a_database(
+        self, runner: CliRunner, tmp_path: Path, args: list[str]
+    ) -> None:
+        """A --registry file that is not a SQLite database should be reported."""
+        registry_path = tmp_path / "notes.txt"
+        registry_path.write_text("not a database\n" * 100)
+
+        result = runner.invoke(cli, [*args, "--registry", str(registry_path)])
+
+        assert result.exit_code == 1
+        assert "Cannot use the spec registry" in result.output
+        assert not isinstance(result.exception, sqlite3.DatabaseError)
+
+    def test_add_to_foreign_database(self, runner: CliRunner, tmp_path: Path) -> None:
+        """specs add should refuse a SQLite database that is not a registry."""
+        registry_path = tmp_path / "other.sqlite3"
+        connection = sqlite3.connect(registry_path)
+        connection.execute("CREATE TABLE specs (legacy TEXT)")
+        connection.close()
+        spec_file = tmp_path / "spec.json"
+        spec_file.write_text(CLISpec(name="tool", description="A tool").model_dump_json())
+
+        result = runner.invoke(
+            cli, ["specs", "add", str(spec_file), "--registry", str(registry_path)]
+        )
+
+        assert result.exit_code == 1
+        assert "not a cli-gen spec registry" in " ".join(result.output.split())
+
+
+class TestVerifyCommand:
+    """Tests for the 'verify' command."""
+
+    @pytest.fixture
+    def runner(self) -> CliRunner:
+        """Create a CLI test runner."""
+        return CliRunner()
+
+    def test_verify_generated_cli(self, runner: CliRunner, tmp_path: Path) -> None:
+        """A generated CLI should pass verification."""
+        spec = CLISpec(
+            name="checked",
+            description="Checked CLI",
+            commands=[CommandSpec(name="run", description="Run it")],
+        )
+        CodeGenerator().generate(spec, tmp_path / "checked")
+
+        result = runner.invoke(cli, ["verify", str(tmp_path), "--no-cache"])
+
+        assert result.exit_code == 0
+        assert "Verified 1 of 1 CLI(s)" in result.output
+
+    def test_verify_failure(self, runner: CliRunner, tmp_path: Path) -> None:
+        """A broken CLI should fail verification with exit code 1."""
+        CodeGenerator().generate(CLISpec(name="broken", description="Broken"), tmp_path)
+        (tmp_path / "broken" / "cli.py").write_text("def (:\n")
+
+        result = runner.invoke(cli, ["verify", str(tmp_path), "--no-cache"])
+
+        assert result.exit_code == 1
+        assert "Verified 0 of 1 CLI(s)" in result.output
+
+    def test_verify_missing_directory(self, runner: CliRunner, tmp_path: Path) -> None:
+        """A missing directory should be reported."""
+        result = runner.invoke(cli, ["verify", str(tmp_path / "missing")])
+        assert result.exit_code == 1
+        assert "Directory not found" in result.output
+
 
 class TestErrorHandling:
     """Tests for error handling."""
@@ -223,3 +620,451 @@ class TestErrorHandling:
         # This is more of an integration test, but we can check the structure
         result = runner.invoke(cli, ["--help"])
         assert result.exit_code == 0
+
+
+class TestSpecCacheOptions:
+    """Tests for the spec cache options on 'spec' and 'generate'."""
+
+    @pytest.fixture
+    def runner(self) -> CliRunner:
+        """Create a CLI test runner."""
+        return CliRunner()
+
+    def test_spec_has_cache_options(self, runner: CliRunner) -> None:
+        """spec command should expose --cache-dir and --no-cache."""
+        result = runner.invoke(cli, ["spec", "--help"])
+        assert "--cache-dir" in result.output
+        assert "--no-cache" in result.output
+
+    def test_generate_has_cache_options(self, runner: CliRunner) -> None:
+        """generate command should expose --cache-dir and --no-cache."""
+        result = runner.invoke(cli, ["generate", "--help"])
+        assert "--cache-dir" in result.output
+        assert "--no-cache" in result.output
+
+    def test_spec_verbose_reports_hits(self, runner: CliRunner) -> None:
+        """A repeated spec call should report a cache hit in verbose mode."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            args = ["spec", "A counter CLI", "--test-mode", "--cache-dir", tmpdir, "-v"]
+            first = runner.invoke(cli, args)
+            second = runner.invoke(cli, args)
+
+            assert first.exit_code == 0
+            assert "0 hit(s), 1 miss(es)" in first.output
+            assert "1 hit(s), 0 miss(es)" in second.output
+            assert len(list(Path(tmpdir).glob("*.json"))) == 1
+
+    def test_spec_no_cache_skips_cache(self, runner: CliRunner) -> None:
+        """--no-cache should not write any cache entries."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result = runner.invoke(
+                cli,
+                ["spec", "A counter CLI", "--test-mode", "--cache-dir", tmpdir, "--no-cache", "-v"],
+            )
+
+            assert result.exit_code == 0
+            assert "Spec cache: disabled" in result.output
+            assert list(Path(tmpdir).iterdir()) == []
+
+
+class TestSpecBatchCommand:
+    """Tests for the 'spec-batch' command."""
+
+    @pytest.fixture
+    def runner(self) -> CliRunner:
+        """Create a CLI test runner."""
+        return CliRunner()
+
+    def test_spec_batch_has_help(self, runner: CliRunner) -> None:
+        """spec-batch command should document its options."""
+        result = runner.invoke(cli, ["spec-batch", "--help"])
+        assert result.exit_code == 0
+        assert "--concurrency" in result.output
+
+    def test_spec_batch_writes_jsonl(self, runner: CliRunner) -> None:
+        """spec-batch should write one JSON line per description."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output = Path(tmpdir) / "out.jsonl"
+            result = runner.invoke(
+                cli,
+                ["spec-batch", "-", "--output", str(output), "--test-mode"],
+                input="A counter CLI\nA timer CLI\n",
+            )
+
+            assert result.exit_code == 0
+            assert "specs/min" in result.output
+            lines = [json.loads(line) for line in output.read_text().splitlines()]
+            assert sorted(line["index"] for line in lines) == [0, 1]
+            for line in lines:
+                CLISpec.model_validate(line["spec"])
+
+    def test_spec_batch_empty_input(self, runner: CliRunner) -> None:
+        """spec-batch should fail on input without descriptions."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result = runner.invoke(
+                cli,
+                ["spec-batch", "-", "--output", str(Path(tmpdir) / "out.jsonl"), "--test-mode"],
+                input="\n",
+            )
+            assert result.exit_code != 0
+
+
+class TestAddCommand:
+    """Tests for the 'add' command."""
+
+    @pytest.fixture
+    def runner(self) -> CliRunner:
+        """Create a CLI test runner."""
+        return CliRunner()
+
+    def test_add_extends_spec_file(self, runner: CliRunner) -> None:
+        """add should append generated commands to the spec file."""
+        spec = CLISpec(
+            name="testcli",
+            description="A test CLI",
+            commands=[CommandSpec(name="hello", description="Say hello")],
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            spec_file = Path(tmpdir) / "spec.json"
+            spec_file.write_text(spec.model_dump_json())
+
+            result = runner.invoke(
+                cli, ["add", str(spec_file), "Say goodbye", "Wave", "--test-mode"]
+            )
+
+            assert result.exit_code == 0
+            updated = CLISpec.model_validate_json(spec_file.read_text())
+            assert len(updated.commands) == 3
+            assert updated.commands[0].name == "hello"
+
+    def test_add_requires_descriptions(self, runner: CliRunner) -> None:
+        """add should require at least one description."""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+            f.write(CLISpec(name="testcli", description="Test").model_dump_json())
+        result = runner.invoke(cli, ["add", f.name])
+        assert result.exit_code != 0
+
+
+class TestStreamingOutput:
+    """Tests for --stream on 'spec' and 'generate'."""
+
+    @pytest.fixture
+    def runner(self) -> CliRunner:
+        """Create a CLI test runner."""
+        return CliRunner()
+
+    def test_spec_stream(self, runner: CliRunner) -> None:
+        """spec --stream should render the spec summary."""
+        result = runner.invoke(cli, ["spec", "A counter CLI", "--stream", "--test-mode"])
+        assert result.exit_code == 0
+        assert "CLI Specification" in result.output
+
+    def test_generate_stream(self, runner: CliRunner) -> None:
+        """generate --stream should still generate the package."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result = runner.invoke(
+                cli,
+                ["generate", "A counter CLI", "--output", tmpdir, "--stream", "--test-mode"],
+            )
+            assert result.exit_code == 0
+            assert "CLI generated successfully" in result.output
+
+
+def _imported_modules(args: list[str]) -> set[str]:
+    """Run cli-gen in a fresh process and return the modules it imported.
+
+    Import times are measured by benchmarks/bench_cli_startup.py instead.
+    """
+    code = (
+        f"import sys; sys.argv = ['cli-gen', *{args!r}]\n"
+        "from cli_generator.cli import main\n"
+        "try:\n"
+        "    main()\n"
+        "finally:\n"
+        "    print('\\n'.join(sorted(sys.modules)), file=sys.stderr)\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env=os.environ.copy(),
+    )
+    assert proc.returncode == 0, proc.stderr
+    return set(proc.stderr.split())
+
+
+class TestHedgingOptions:
+    """Tests for --fallback-model and --hedge-delay."""
+
+    @pytest.fixture
+    def runner(self) -> CliRunner:
+        """Create a CLI test runner."""
+        return CliRunner()
+
+    @pytest.mark.parametrize("command", ["spec", "spec-batch", "generate"])
+    def test_commands_have_hedging_options(self, runner: CliRunner, command: str) -> None:
+        """Spec-generating commands should expose the hedging options."""
+        result = runner.invoke(cli, [command, "--help"])
+        assert "--fallback-model" in result.output
+        assert "--hedge-delay" in result.output
+
+    def test_spec_verbose_reports_hedging(self, runner: CliRunner) -> None:
+        """Verbose output should report hedge firing and win rates."""
+        result = runner.invoke(
+            cli,
+            ["spec", "A counter CLI", "--test-mode", "--no-stream", "-F", "fallback", "-v"],
+        )
+
+        assert result.exit_code == 0
+        assert "Hedging: fired on 0% of 1 request(s)" in result.output
+        assert "test: won 100%" in result.output
+
+    def test_negative_hedge_delay_rejected(self, runner: CliRunner) -> None:
+        """--hedge-delay should not accept negative values."""
+        result = runner.invoke(
+            cli, ["spec", "A counter CLI", "--test-mode", "--hedge-delay", "-1"]
+        )
+        assert result.exit_code != 0
+
+
+class TestExamplesOption:
+    """Tests for --examples."""
+
+    def test_spec_reports_example_library(self) -> None:
+        """Verbose output should report the size of the example library."""
+        specs_dir = Path(__file__).parents[2] / "specs"
+        result = CliRunner().invoke(
+            cli,
+            ["spec", "A password tool", "--test-mode", "--no-stream", "-e", str(specs_dir), "-v"],
+        )
+
+        assert result.exit_code == 0
+        assert "Example library: 1 spec(s)" in result.output
+
+    def test_missing_examples_path_rejected(self) -> None:
+        """A missing examples path should be a usage error."""
+        result = CliRunner().invoke(
+            cli, ["spec", "A password tool", "--test-mode", "-e", "/does/not/exist"]
+        )
+        assert result.exit_code == 2
+
+
+class TestInstrumentationOptions:
+    """Tests for --stats and --metrics-file."""
+
+    @pytest.fixture
+    def runner(self) -> CliRunner:
+        """Create a CLI test runner."""
+        return CliRunner()
+
+    def test_generate_stats(self, runner: CliRunner, tmp_path: Path) -> None:
+        """--stats should print model calls and a stage breakdown."""
+        result = runner.invoke(
+            cli,
+            [
+                "generate", "A counter CLI", "--test-mode", "--no-stream",
+                "--output", str(tmp_path), "--stats",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert "Model Calls" in result.output
+        assert "spec_generation" in result.output
+        assert "render" in result.output
+        assert "Totals: 1 call(s)" in result.output
+
+    def test_generate_metrics_file(self, runner: CliRunner, tmp_path: Path) -> None:
+        """--metrics-file should write calls and spans as JSON."""
+        metrics = tmp_path / "metrics.json"
+        result = runner.invoke(
+            cli,
+            [
+                "generate", "A counter CLI", "--test-mode", "--no-stream",
+                "--output", str(tmp_path / "out"), "--metrics-file", str(metrics),
+            ],
+        )
+
+        assert result.exit_code == 0
+        data = json.loads(metrics.read_text())
+        assert data["calls"][0]["cache"] == "disabled"
+        assert set(data["summary"]["stages"]) == {"spec_generation", "render", "write"}
+
+    def test_build_metrics_file(self, runner: CliRunner, tmp_path: Path) -> None:
+        """build should record spec loading, render and write spans."""
+        spec_file = tmp_path / "spec.json"
+        spec_file.write_text(CLISpec(name="testcli", description="Test").model_dump_json())
+        metrics = tmp_path / "metrics.json"
+
+        result = runner.invoke(
+            cli,
+            ["build", str(spec_file), "-o", str(tmp_path / "out"), "--metrics-file", str(metrics)],
+        )
+
+        assert result.exit_code == 0
+        data = json.loads(metrics.read_text())
+        assert data["calls"] == []
+        assert set(data["summary"]["stages"]) == {"load_spec", "render", "write"}
+
+
+class TestEngineOption:
+    """Tests for --engine and --local-threshold."""
+
+    FORMULAIC = "A CLI with list, add and delete commands for notes"
+
+    @pytest.fixture
+    def runner(self) -> CliRunner:
+        """Create a CLI test runner."""
+        return CliRunner()
+
+    def test_auto_engine_serves_locally(self, runner: CliRunner, tmp_path: Path) -> None:
+        """Formulaic descriptions should be served without a model call."""
+        output = tmp_path / "spec.json"
+        result = runner.invoke(
+            cli,
+            [
+                "spec", self.FORMULAIC, "--test-mode", "--no-stream", "--no-cache",
+                "--save", str(output),
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert "Served by the local engine" in result.output
+        assert CLISpec.model_validate_json(output.read_text()).name == "notes_cli"
+
+    def test_llm_engine_uses_model(self, runner: CliRunner, tmp_path: Path) -> None:
+        """--engine llm should always call the model."""
+        result = runner.invoke(
+            cli,
+            [
+                "spec", self.FORMULAIC, "--test-mode", "--no-stream", "--engine", "llm",
+                "--no-cache", "--save", str(tmp_path / "spec.json"),
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert "Served by" not in result.output
+
+    def test_threshold_reported(self, runner: CliRunner, tmp_path: Path) -> None:
+        """Falling back to the model should report the local confidence."""
+        result = runner.invoke(
+            cli,
+            [
+                "spec", self.FORMULAIC + " in folders", "--test-mode", "--no-stream",
+                "--local-threshold", "1", "--no-cache", "--save", str(tmp_path / "spec.json"),
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert "Served by the model" in result.output
+        assert "below 100%" in result.output
+
+    def test_local_engine_failure(self, runner: CliRunner) -> None:
+        """--engine local should fail on descriptions it cannot parse."""
+        result = runner.invoke(
+            cli, ["spec", "Convert images", "--test-mode", "--no-stream", "--engine", "local"]
+        )
+
+        assert result.exit_code != 0
+        assert "local engine cannot handle" in result.output
+
+    def test_spec_batch_reports_engines(self, runner: CliRunner, tmp_path: Path) -> None:
+        """spec-batch should count requests served by each engine."""
+        result = runner.invoke(
+            cli,
+            ["spec-batch", "-", "--output", str(tmp_path / "out.jsonl"), "--test-mode"],
+            input=f"{self.FORMULAIC}\nA counter CLI\n",
+        )
+
+        assert result.exit_code == 0
+        assert "Served locally" in result.output
+        assert "Served by model" in result.output
+
+
+class TestCassetteOption:
+    """Tests for --cassette and --cassette-mode."""
+
+    @pytest.fixture
+    def runner(self) -> CliRunner:
+        """Create a CLI test runner."""
+        return CliRunner()
+
+    def _generate(self, runner: CliRunner, cassette: Path, output: Path, *extra: str):
+        """Run generate with a cassette."""
+        return runner.invoke(
+            cli,
+            [
+                "generate", "A counter CLI", "--test-mode", "--no-stream",
+                "--engine", "llm", "--cassette", str(cassette), "--output", str(output),
+                *extra,
+            ],
+        )
+
+    def test_record_then_replay(self, runner: CliRunner, tmp_path: Path) -> None:
+        """A recorded run should replay to identical generated files."""
+        cassette = tmp_path / "cassette.json"
+
+        first = self._generate(runner, cassette, tmp_path / "first")
+        assert first.exit_code == 0
+        assert "Recorded 1 response(s)" in first.output
+
+        second = self._generate(runner, cassette, tmp_path / "second")
+        assert second.exit_code == 0
+        assert "Replayed 1 response(s)" in second.output
+        for name in ("cli.py", "pyproject.toml", "README.md"):
+            first_file = next((tmp_path / "first").rglob(name))
+            second_file = next((tmp_path / "second").rglob(name))
+            assert first_file.read_text() == second_file.read_text()
+
+    def test_replay_miss_fails(self, runner: CliRunner, tmp_path: Path) -> None:
+        """Replaying a description that was never recorded should fail."""
+        cassette = tmp_path / "cassette.json"
+        self._generate(runner, cassette, tmp_path / "first")
+
+        result = runner.invoke(
+            cli,
+            [
+                "spec", "A timer CLI", "--no-stream", "--engine", "llm",
+                "--cassette", str(cassette), "--cassette-mode", "replay",
+            ],
+        )
+
+        assert result.exit_code != 0
+        assert "No recorded response" in result.output
+
+    def test_record_mode_overwrites(self, runner: CliRunner, tmp_path: Path) -> None:
+        """--cassette-mode record should record even if the cassette exists."""
+        cassette = tmp_path / "cassette.json"
+        self._generate(runner, cassette, tmp_path / "first")
+
+        result = self._generate(
+            runner, cassette, tmp_path / "second", "--cassette-mode", "record"
+        )
+
+        assert result.exit_code == 0
+        assert "Recorded 1 response(s)" in result.output
+
+
+class TestStartupTime:
+    """Tests that local commands do not pay for the LLM stack at startup."""
+
+    def test_help_skips_heavy_imports(self) -> None:
+        """cli-gen --help should not import the LLM stack, its HTTP client or Jinja."""
+        modules = _imported_modules(["--help"])
+        packages = {m.split(".")[0] for m in modules}
+
+        assert "cli_generator.cli" in modules
+        assert not packages & {"pydantic_ai", "dotenv", "jinja2", "httpx"}
+        assert "rich.syntax" not in modules
+
+    def test_build_skips_llm_imports(self, tmp_path: Path) -> None:
+        """cli-gen build should not import pydantic_ai, dotenv or rich.syntax."""
+        spec_file = tmp_path / "spec.json"
+        spec_file.write_text(CLISpec(name="testcli", description="Test").model_dump_json())
+
+        modules = _imported_modules(["build", str(spec_file), "--output", str(tmp_path / "out")])
+
+        packages = {m.split(".")[0] for m in modules}
+
+        assert "cli_generator.generators.code_generator" in modules
+        assert not packages & {"pydantic_ai", "dotenv"}
+        assert "rich.syntax" not in modules
@@ -1,12 +1,34 @@
 """Unit tests for CodeGenerator."""
 
 import ast
+import importlib
+import shutil
+import subprocess
+import sys
 import tempfile
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import click
 import pytest
-
-from cli_generator.generators.code_generator import CodeGenerator
+from click.testing import CliRunner
+from jinja2 import ModuleLoader
+
+from cli_generator.generators import code_generator
+from cli_generator.generators.code_generator import (
+    MANIFEST_NAME,
+    BuildManifest,
+    CodeGenerator,
+    create_environment,
+    get_environment,
+    precompile_templates,
+    read_manifest,
+    sha256_hex,
+    write_manifest,
+    write_stream,
+)
+from cli_generator.instrumentation import Recorder
 from cli_generator.models import (
     ArgumentSpec,
     CLISpec,
@@ -24,6 +46,548 @@ class TestCodeGeneratorInit:
         assert gen is not None
 
 
+class TestCodeGeneratorInstrumentation:
+    """Tests for render and write spans."""
+
+    def test_records_render_and_write_spans(self, tmp_path: Path) -> None:
+        """Every generated file should get a render and a write span."""
+        recorder = Recorder()
+        spec = CLISpec(name="testcli", description="Test CLI")
+
+        CodeGenerator(recorder=recorder).generate(spec, tmp_path)
+
+        spans = [(span.name, span.detail) for span in recorder.spans]
+        for file_type in ("cli", "init", "pyproject", "readme"):
+            assert ("render", file_type) in spans
+            assert ("write", file_type) in spans
+
+
+class TestCodeGeneratorEnvironment:
+    """Tests for the shared environment and its template caches."""
+
+    SPEC = CLISpec(
+        name="testcli",
+        description="Test CLI",
+        commands=[CommandSpec(name="run", description="Run it")],
+    )
+
+    def _render(self, env) -> str:
+        """Render cli.py for the test spec."""
+        return env.get_template("_cli_head.py.j2").render(cli=self.SPEC, has_path_types=False)
+
+    def test_instances_share_environment(self) -> None:
+        """Every CodeGenerator should use the same environment."""
+        assert CodeGenerator().env is CodeGenerator().env
+        assert CodeGenerator().env is get_environment()
+
+    def test_compiled_template_is_reused(self) -> None:
+        """Templates should be compiled once per environment."""
+        env = get_environment()
+        assert env.get_template("_command.py.j2") is env.get_template("_command.py.j2")
+
+    def test_warm_up_compiles_every_template(self) -> None:
+        """warm_up() should compile the templates generate() renders."""
+        generator = CodeGenerator()
+        generator.env = create_environment()
+
+        generator.warm_up()
+
+        compiled = {name for _, name in generator.env.cache.keys()}
+        assert {"_cli_head.py.j2", "_command.py.j2", "completion.zsh.j2"} <= compiled
+        assert compiled == {path.name for path in code_generator.TEMPLATES_DIR.glob("*.j2")}
+
+    def test_bytecode_cache(self, tmp_path: Path) -> None:
+        """Compiled templates should be stored in the bytecode cache directory."""
+        cache = code_generator._bytecode_cache(tmp_path / "bytecode")
+        first = self._render(create_environment(bytecode_cache=cache))
+
+        assert list((tmp_path / "bytecode").iterdir())
+        assert self._render(create_environment(bytecode_cache=cache)) == first
+
+    def test_tests_do_not_write_user_cache(self) -> None:
+        """The test session should keep template bytecode out of ~/.cache."""
+        assert code_generator.TEMPLATE_CACHE_DIR != Path.home() / ".cache" / "cli-gen" / "templates"
+
+    def test_bytecode_cache_dir_is_injectable(self, tmp_path: Path) -> None:
+        """A generator should use the bytecode cache directory it is given."""
+        generator = CodeGenerator(bytecode_cache_dir=tmp_path / "bytecode")
+        generator.generate(self.SPEC, tmp_path / "out")
+
+        assert generator.env is get_environment(tmp_path / "bytecode")
+        assert list((tmp_path / "bytecode").iterdir())
+
+    def test_unusable_bytecode_cache_dir(self, tmp_path: Path) -> None:
+        """A bytecode cache directory that cannot be created should be skipped."""
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        assert code_generator._bytecode_cache(blocker / "cache") is None
+
+    def test_precompiled_templates(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Precompiled templates should render like the sources."""
+        target = tmp_path / "compiled"
+        monkeypatch.setattr(code_generator, "PRECOMPILED_DIR", target)
+        precompile_templates(target)
+
+        loader = code_generator._precompiled_loader()
+
+        assert isinstance(loader, ModuleLoader)
+        assert self._render(create_environment(loader)) == self._render(create_environment())
+
+    def test_stale_precompiled_templates_are_ignored(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Precompiled templates from other sources should not be used."""
+        target = tmp_path / "compiled"
+        monkeypatch.setattr(code_generator, "PRECOMPILED_DIR", target)
+        precompile_templates(target)
+        (target / code_generator.SOURCES_HASH_FILE).write_text("outdated")
+
+        assert code_generator._precompiled_loader() is None
+
+    def test_missing_precompiled_templates(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Without precompiled templates, the sources should be used."""
+        monkeypatch.setattr(code_generator, "PRECOMPILED_DIR", tmp_path / "missing")
+        assert code_generator._precompiled_loader() is None
+
+
+class TestCodeGeneratorIncremental:
+    """Tests for incremental builds with a content-hash manifest."""
+
+    SPEC = CLISpec(
+        name="testcli",
+        description="Test CLI",
+        commands=[CommandSpec(name="run", description="Run it")],
+    )
+
+    def test_first_build_writes_manifest(self, tmp_path: Path) -> None:
+        """An incremental build should record the spec and file hashes."""
+        gen = CodeGenerator()
+
+        gen.generate(self.SPEC, tmp_path, incremental=True)
+
+        manifest = read_manifest(tmp_path)
+        assert manifest is not None
+        assert set(manifest.files) == {
+            "cli",
+            "init",
+            "completion:bash",
+            "completion:zsh",
+            "completion:fish",
+            "pyproject",
+            "readme",
+        }
+        assert manifest.files["cli"].path == "testcli/cli.py"
+        assert (gen.last_build.rendered, gen.last_build.written) == (7, 7)
+
+    def test_unchanged_spec_skips_rendering(self, tmp_path: Path) -> None:
+        """Rebuilding the same spec should neither render nor write."""
+        gen = CodeGenerator(recorder=Recorder())
+        gen.generate(self.SPEC, tmp_path, incremental=True)
+        cli_path = tmp_path / "testcli" / "cli.py"
+        mtime = cli_path.stat().st_mtime_ns
+        gen.recorder = Recorder()
+
+        gen.generate(self.SPEC, tmp_path, incremental=True)
+
+        report = gen.last_build
+        assert (report.rendered, report.written, report.skipped) == (0, 0, 7)
+        assert set(report.files.values()) == {"unchanged"}
+        assert gen.recorder.spans == []
+        assert cli_path.stat().st_mtime_ns == mtime
+
+    def test_changed_spec_only_writes_changed_files(self, tmp_path: Path) -> None:
+        """Only files whose bytes change should be rewritten."""
+        gen = CodeGenerator()
+        gen.generate(self.SPEC, tmp_path, incremental=True)
+        init_path = tmp_path / "testcli" / "__init__.py"
+        mtime = init_path.stat().st_mtime_ns
+        changed = self.SPEC.model_copy(
+            update={"commands": [CommandSpec(name="stop", description="Stop it")]}
+        )
+
+        gen.generate(changed, tmp_path, incremental=True)
+
+        report = gen.last_build
+        assert report.rendered == 7
+        assert report.files == {
+            "cli": "written",
+            "init": "unchanged",
+            "completion:bash": "written",
+            "completion:zsh": "written",
+            "completion:fish": "written",
+            "pyproject": "unchanged",
+            "readme": "written",
+        }
+        assert (report.written, report.skipped) == (5, 2)
+        assert init_path.stat().st_mtime_ns == mtime
+        assert "def stop(" in (tmp_path / "testcli" / "cli.py").read_text()
+
+    def test_modified_file_is_restored(self, tmp_path: Path) -> None:
+        """A generated file edited on disk should be regenerated."""
+        gen = CodeGenerator()
+        gen.generate(self.SPEC, tmp_path, incremental=True)
+        readme = tmp_path / "README.md"
+        original = readme.read_text()
+        readme.write_text("edited")
+
+        gen.generate(self.SPEC, tmp_path, incremental=True)
+
+        assert readme.read_text() == original
+        assert gen.last_build.files["readme"] == "written"
+        assert gen.last_build.written == 1
+
+    def test_concurrent_manifest_writes(self, tmp_path: Path) -> None:
+        """Threads writing one directory's manifest should not share a temporary file."""
+        manifest = BuildManifest(spec_hash="spec", generator_hash="generator")
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: write_manifest(tmp_path, manifest), range(32)))
+
+        assert read_manifest(tmp_path) == manifest
+        assert [path.name for path in tmp_path.iterdir()] == [MANIFEST_NAME]
+
+    @pytest.mark.parametrize("incremental", [False, True])
+    def test_concurrent_builds(self, tmp_path: Path, incremental: bool) -> None:
+        """Threads building into one directory should not share temporary files."""
+
+        def build(_: int) -> None:
+            CodeGenerator().generate(self.SPEC, tmp_path, incremental=incremental)
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(build, range(16)))
+
+        assert not list(tmp_path.rglob("*.tmp"))
+        ast.parse((tmp_path / "testcli" / "cli.py").read_text())
+
+    def test_corrupt_manifest_triggers_full_build(self, tmp_path: Path) -> None:
+        """An unreadable manifest should be ignored."""
+        gen = CodeGenerator()
+        gen.generate(self.SPEC, tmp_path, incremental=True)
+        (tmp_path / MANIFEST_NAME).write_text("{not json")
+
+        gen.generate(self.SPEC, tmp_path, incremental=True)
+
+        assert gen.last_build.rendered == 7
+        assert read_manifest(tmp_path) is not None
+
+    def test_default_mode_always_writes(self, tmp_path: Path) -> None:
+        """Without incremental mode, every file is written and no manifest is kept."""
+        gen = CodeGenerator()
+        gen.generate(self.SPEC, tmp_path)
+        gen.generate(self.SPEC, tmp_path)
+
+        assert (gen.last_build.rendered, gen.last_build.written) == (7, 7)
+        assert not (tmp_path / MANIFEST_NAME).exists()
+
+
+class TestCodeGeneratorPrevious:
+    """Tests for builds that only render the commands changed since a previous spec."""
+
+    @staticmethod
+    def make_spec(count: int, **changes: str) -> CLISpec:
+        """Return a spec with count commands, with some descriptions replaced."""
+        return CLISpec(
+            name="difftool",
+            description="A diffed tool",
+            commands=[
+                CommandSpec(
+                    name=f"step-{index}",
+                    description=changes.get(f"step_{index}", f"Run step {index}"),
+                    arguments=[ArgumentSpec(name="target", type="path")],
+                    options=[OptionSpec(name="limit", type="int", default=index)],
+                )
+                for index in range(count)
+            ],
+            global_options=[OptionSpec(name="verbose", short="v", type="bool")],
+        )
+
+    @staticmethod
+    def read_tree(root: Path) -> dict[str, bytes]:
+        """Return every generated file's bytes, without the manifest."""
+        return {
+            path.relative_to(root).as_posix(): path.read_bytes()
+            for path in sorted(root.rglob("*"))
+            if path.is_file() and path.name != MANIFEST_NAME
+        }
+
+    @pytest.mark.parametrize("layout", ["single", "lazy"])
+    def test_matches_full_build(self, layout: str, tmp_path: Path) -> None:
+        """Splicing kept sections should give the same bytes as a full build."""
+        old = self.make_spec(5)
+        new = self.make_spec(6, step_2="Run the changed step")
+        new.commands.pop(0)
+        gen = CodeGenerator()
+        gen.generate(old, tmp_path / "diffed", incremental=True, layout=layout)
+
+        gen.generate(new, tmp_path / "diffed", previous=old, layout=layout)
+        report = gen.last_build
+        CodeGenerator().generate(new, tmp_path / "full", layout=layout)
+
+        assert self.read_tree(tmp_path / "diffed") == self.read_tree(tmp_path / "full")
+        # step-2 and step-5 in cli.py (or their modules) and README.md
+        assert report.sections_rendered == 4
+        assert report.sections_reused == 6
+        assert report.removed == (1 if layout == "lazy" else 0)
+
+    def test_reused_sections_are_read_from_disk(self, tmp_path: Path) -> None:
+        """Unchanged command sections should not be rendered again."""
+        old = self.make_spec(3)
+        new = self.make_spec(3, step_1="Changed")
+        gen = CodeGenerator()
+        gen.generate(old, tmp_path, incremental=True)
+        rendered = []
+        render_section = gen._stream_cli_section
+
+        def tracking(spec: CLISpec, command: CommandSpec) -> Iterator[str]:
+            rendered.append(command.name)
+            return render_section(spec, command)
+
+        gen._stream_cli_section = tracking  # type: ignore[method-assign]
+        gen.generate(new, tmp_path, previous=old)
+
+        assert rendered == ["step-1"]
+        assert "Changed" in (tmp_path / "difftool" / "cli.py").read_text()
+
+    def test_unchanged_lazy_modules_are_kept(self, tmp_path: Path) -> None:
+        """Modules of unchanged commands should be left alone in the lazy layout."""
+        old = self.make_spec(2)
+        new = self.make_spec(2, step_0="Changed")
+        gen = CodeGenerator()
+        gen.generate(old, tmp_path, incremental=True, layout="lazy")
+        kept = tmp_path / "difftool" / "commands" / "step_1.py"
+        mtime = kept.stat().st_mtime_ns
+
+        gen.generate(new, tmp_path, previous=old, layout="lazy")
+
+        assert gen.last_build.files["command:step-1"] == "unchanged"
+        assert gen.last_build.files["command:step-0"] == "written"
+        assert kept.stat().st_mtime_ns == mtime
+        assert read_manifest(tmp_path).files["command:step-1"].sha256 == sha256_hex(
+            kept.read_bytes()
+        )
+
+    def test_wrong_previous_falls_back_to_full_render(self, tmp_path: Path) -> None:
+        """A previous spec the manifest was not built from should be ignored."""
+        gen = CodeGenerator()
+        gen.generate(self.make_spec(3), tmp_path, incremental=True)
+        (tmp_path / "difftool" / "cli.py").write_text("edited")
+        new = self.make_spec(3, step_0="Changed")
+
+        gen.generate(new, tmp_path, previous=self.make_spec(2))
+
+        assert gen.last_build.sections_reused == 0
+        assert gen.last_build.sections_rendered == 6
+        assert "edited" not in (tmp_path / "difftool" / "cli.py").read_text()
+
+    def test_edited_file_is_rendered_in_full(self, tmp_path: Path) -> None:
+        """Sections of a file edited since the last build should not be trusted."""
+        old = self.make_spec(2)
+        gen = CodeGenerator()
+        gen.generate(old, tmp_path, incremental=True)
+        readme = tmp_path / "README.md"
+        readme.write_text(readme.read_text() + "edited")
+
+        gen.generate(self.make_spec(2, step_0="Changed"), tmp_path, previous=old)
+
+        # The cli.py section of step-1 is kept; README.md is rendered in full
+        assert gen.last_build.sections_reused == 1
+        assert "edited" not in readme.read_text()
+
+    def test_without_manifest_renders_everything(self, tmp_path: Path) -> None:
+        """Without the manifest of the previous build, every section is rendered."""
+        old = self.make_spec(2)
+        CodeGenerator().generate(old, tmp_path)
+        gen = CodeGenerator()
+
+        gen.generate(self.make_spec(2, step_0="Changed"), tmp_path, previous=old)
+
+        assert gen.last_build.sections_reused == 0
+        assert read_manifest(tmp_path) is not None
+
+
+class TestWriteStream:
+    """Tests for streaming generated files to disk."""
+
+    def test_writes_and_hashes_chunks(self, tmp_path: Path) -> None:
+        """Chunks should be written in order and hashed as one file."""
+        path = tmp_path / "out.txt"
+
+        content_hash, written = write_stream(path, iter(["first ", "second"]))
+
+        assert written
+        assert path.read_text() == "first second"
+        assert content_hash == sha256_hex(b"first second")
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_keeps_identical_file(self, tmp_path: Path) -> None:
+        """An identical file should be left alone when asked to keep it."""
+        path = tmp_path / "out.txt"
+        path.write_text("same")
+        mtime = path.stat().st_mtime_ns
+
+        _, written = write_stream(path, ["sa", "me"], keep_identical=True)
+
+        assert not written
+        assert path.stat().st_mtime_ns == mtime
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_failed_render_leaves_file_untouched(self, tmp_path: Path) -> None:
+        """An error while rendering should not leave a partial file behind."""
+        path = tmp_path / "out.txt"
+        path.write_text("original")
+
+        def chunks() -> Iterator[str]:
+            yield "partial"
+            raise RuntimeError("render failed")
+
+        with pytest.raises(RuntimeError):
+            write_stream(path, chunks())
+
+        assert path.read_text() == "original"
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_streamed_files_match_rendered_content(self, tmp_path: Path) -> None:
+        """Streaming should produce exactly the rendered content."""
+        spec = CLISpec(
+            name="streamtool",
+            description="Stream tool",
+            commands=[
+                CommandSpec(name=f"command-{index}", description=f"Step {index}")
+                for index in range(50)
+            ],
+            global_options=[OptionSpec(name="verbose", type="bool", help="Verbose")],
+        )
+        generator = CodeGenerator()
+
+        files = generator.generate(spec, tmp_path)
+
+        assert files["cli"].read_text() == generator._generate_cli(spec)
+        assert files["readme"].read_text() == generator._generate_readme(spec)
+
+
+class TestCodeGeneratorLazyLayout:
+    """Tests for the lazy, one-module-per-command layout."""
+
+    @pytest.fixture
+    def spec(self) -> CLISpec:
+        """Create a spec with global options and a keyword command."""
+        return CLISpec(
+            name="lazytool",
+            description="A lazily loaded tool",
+            commands=[
+                CommandSpec(
+                    name="convert",
+                    description="Convert files between formats",
+                    arguments=[ArgumentSpec(name="input_file", type="path")],
+                    options=[OptionSpec(name="indent", type="int", default=2)],
+                ),
+                CommandSpec(name="import", description="Import data"),
+                CommandSpec(name="dry-run", description="Show what would happen"),
+            ],
+            global_options=[OptionSpec(name="verbose", short="v", type="bool")],
+        )
+
+    @pytest.fixture
+    def lazy_cli(
+        self, spec: CLISpec, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> Iterator[click.Group]:
+        """Generate the lazy layout and import its group."""
+        CodeGenerator().generate(spec, tmp_path, layout="lazy")
+        monkeypatch.syspath_prepend(str(tmp_path))
+        yield importlib.import_module("lazytool.cli").cli
+        for name in [name for name in sys.modules if name.startswith("lazytool")]:
+            del sys.modules[name]
+
+    def test_generates_one_module_per_command(self, spec: CLISpec, tmp_path: Path) -> None:
+        """Each command should get its own module in the commands package."""
+        files = CodeGenerator().generate(spec, tmp_path, layout="lazy")
+
+        commands_dir = tmp_path / "lazytool" / "commands"
+        assert files["commands"] == commands_dir / "__init__.py"
+        assert files["command:convert"] == commands_dir / "convert.py"
+        assert files["command:import"] == commands_dir / "import_.py"
+        assert files["command:dry-run"] == commands_dir / "dry_run.py"
+        for path in files.values():
+            if path.suffix == ".py":
+                ast.parse(path.read_text())
+        assert "def convert(" not in files["cli"].read_text()
+        assert "from pathlib import Path" in files["command:convert"].read_text()
+        assert "from pathlib import Path" not in files["command:import"].read_text()
+
+    def test_help_does_not_import_commands(self, lazy_cli: click.Group) -> None:
+        """Top-level --help should list commands from cli.py alone."""
+        result = CliRunner().invoke(lazy_cli, ["--help"])
+
+        assert result.exit_code == 0
+        assert "convert  Convert files between formats" in result.output
+        assert "dry-run  Show what would happen" in result.output
+        assert not any(name.startswith("lazytool.commands.") for name in sys.modules)
+
+    def test_invoking_imports_only_that_command(self, lazy_cli: click.Group) -> None:
+        """Running a command should import its module and no other."""
+        result = CliRunner().invoke(lazy_cli, ["-v", "import"])
+
+        assert result.exit_code == 0
+        assert "import command called" in result.output
+        assert "lazytool.commands.import_" in sys.modules
+        assert "lazytool.commands.convert" not in sys.modules
+
+    def test_command_help_and_options(self, lazy_cli: click.Group, tmp_path: Path) -> None:
+        """Lazily loaded commands should keep their arguments and options."""
+        help_result = CliRunner().invoke(lazy_cli, ["convert", "--help"])
+        run_result = CliRunner().invoke(
+            lazy_cli, ["convert", str(tmp_path), "--indent", "4"]
+        )
+
+        assert help_result.exit_code == 0
+        assert "--indent INTEGER" in help_result.output
+        assert run_result.exit_code == 0
+        assert "convert command called" in run_result.output
+
+    def test_descriptions_with_quotes(self, spec: CLISpec, tmp_path: Path) -> None:
+        """Command modules should compile whatever quotes a description ends with."""
+        spec.commands[1].description = 'Import "things"'
+        files = CodeGenerator().generate(spec, tmp_path, layout="lazy")
+
+        source = files["command:import"].read_text()
+        assert ast.get_docstring(ast.parse(source)) == 'Import "things"'
+
+    def test_unknown_command(self, lazy_cli: click.Group) -> None:
+        """Unknown commands should still be rejected."""
+        result = CliRunner().invoke(lazy_cli, ["missing"])
+        assert result.exit_code != 0
+        assert "No such command" in result.output
+
+    def test_no_commands(self, tmp_path: Path) -> None:
+        """A spec without commands should still get a version command."""
+        spec = CLISpec(name="emptytool", description="Empty")
+        files = CodeGenerator().generate(spec, tmp_path, layout="lazy")
+
+        content = files["cli"].read_text()
+        ast.parse(content)
+        assert "def version()" in content
+
+    def test_switching_layout_rebuilds_incrementally(
+        self, spec: CLISpec, tmp_path: Path
+    ) -> None:
+        """An incremental build in another layout should not be skipped."""
+        generator = CodeGenerator()
+        generator.generate(spec, tmp_path, incremental=True)
+        generator.generate(spec, tmp_path, incremental=True, layout="lazy")
+
+        assert generator.last_build.rendered == 11
+        assert generator.last_build.files["cli"] == "written"
+        assert generator.last_build.files["readme"] == "unchanged"
+
+    def test_unknown_layout(self, spec: CLISpec, tmp_path: Path) -> None:
+        """Unknown layouts should raise ValueError."""
+        with pytest.raises(ValueError, match="layout must be one of"):
+            CodeGenerator().generate(spec, tmp_path, layout="flat")  # type: ignore[arg-type]
+
+
 class TestCodeGeneratorGenerate:
     """Tests for CodeGenerator.generate() method."""
 
@@ -202,6 +766,22 @@ class TestCodeGeneratorGenerate:
             assert "@click.option" in code
 
 
+    def test_keyword_command_name(self, generator: CodeGenerator) -> None:
+        """Commands named after Python keywords should still compile."""
+        spec = CLISpec(
+            name="datatool",
+            description="Data tool",
+            commands=[CommandSpec(name="import", description="Import data")],
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            files = generator.generate(spec, Path(tmpdir))
+            content = files["cli"].read_text()
+
+            ast.parse(content)
+            assert '@cli.command("import")' in content
+            assert "def import_(" in content
+
+
 class TestCodeGeneratorOptionTypes:
     """Tests for correct option type handling."""
 
@@ -341,6 +921,126 @@ class TestCodeGeneratorOptionTypes:
             assert "yaml" in code
 
 
+class TestCodeGeneratorCompletions:
+    """Tests for the generated shell completion scripts."""
+
+    @pytest.fixture
+    def spec(self) -> CLISpec:
+        """Create a spec with global options, choices and path arguments."""
+        return CLISpec(
+            name="imgconv",
+            description="Convert images",
+            commands=[
+                CommandSpec(
+                    name="convert",
+                    description="Convert an image's format",
+                    arguments=[ArgumentSpec(name="source", type="path")],
+                    options=[
+                        OptionSpec(
+                            name="format",
+                            short="f",
+                            type="choice",
+                            choices=["png", "jpeg"],
+                            help="Output format [default: png]",
+                        ),
+                        OptionSpec(name="quality", type="int"),
+                        OptionSpec(name="force", type="bool"),
+                    ],
+                ),
+                CommandSpec(name="list", description="List formats"),
+            ],
+            global_options=[
+                OptionSpec(name="config", short="c", type="path", help="Config file"),
+                OptionSpec(name="verbose", short="v", type="bool"),
+            ],
+        )
+
+    @pytest.fixture
+    def scripts(self, spec: CLISpec, tmp_path: Path) -> dict[str, Path]:
+        """Generate the project and return the completion scripts by shell."""
+        result = CodeGenerator().generate(spec, tmp_path)
+        return {shell: result[f"completion:{shell}"] for shell in ("bash", "zsh", "fish")}
+
+    def test_file_names(self, scripts: dict[str, Path], tmp_path: Path) -> None:
+        """Scripts should use the names each shell looks up."""
+        completions = tmp_path / "imgconv" / "completions"
+        assert scripts == {
+            "bash": completions / "imgconv.bash",
+            "zsh": completions / "_imgconv",
+            "fish": completions / "imgconv.fish",
+        }
+
+    def complete(self, script: Path, *words: str) -> list[str]:
+        """Run the bash completion function on words and return COMPREPLY."""
+        quoted = " ".join(f"'{word}'" for word in words)
+        command = (
+            f"source '{script}'; COMP_WORDS=(imgconv {quoted}); "
+            "COMP_CWORD=$((${#COMP_WORDS[@]} - 1)); _imgconv_completion; "
+            'printf "%s\\n" "${COMPREPLY[@]}"'
+        )
+        result = subprocess.run(
+            ["bash", "-c", command], capture_output=True, text=True, check=True
+        )
+        return result.stdout.split()
+
+    @pytest.mark.skipif(shutil.which("bash") is None, reason="bash is not installed")
+    @pytest.mark.parametrize(
+        ("words", "expected"),
+        [
+            (("",), ["convert", "list"]),
+            (("--",), ["--help", "--config", "--verbose", "--version"]),
+            (("-c", "cfg", "c"), ["convert"]),
+            (("convert", "--format", ""), ["png", "jpeg"]),
+            (("convert", "--format", "=", "j"), ["jpeg"]),
+            (("-v", "convert", "-f", "png", "--"), ["--help", "--format", "--quality", "--force"]),
+            (("convert", "--quality", ""), []),
+            (("list", "--"), ["--help"]),
+        ],
+    )
+    def test_bash_completes(
+        self, scripts: dict[str, Path], words: tuple[str, ...], expected: list[str]
+    ) -> None:
+        """bash should complete commands, options and choices from the script alone."""
+        assert self.complete(scripts["bash"], *words) == expected
+
+    @pytest.mark.parametrize("shell", ["bash", "zsh", "fish"])
+    def test_syntax(self, scripts: dict[str, Path], shell: str) -> None:
+        """Every script should parse in its shell."""
+        if shutil.which(shell) is None:
+            pytest.skip(f"{shell} is not installed")
+        subprocess.run([shell, "-n", str(scripts[shell])], check=True)
+
+    def test_zsh_script(self, scripts: dict[str, Path]) -> None:
+        """The zsh script should describe commands and complete option values."""
+        content = scripts["zsh"].read_text()
+
+        assert content.startswith("#compdef imgconv\n")
+        assert "'convert:Convert an image'\"'\"'s format'" in content
+        assert "'(-f --format)--format=[Output format \\[default: png\\]]:format:(png jpeg)'" in (
+            content
+        )
+        assert "'(-c --config)-c+[Config file]:config:_files'" in content
+        assert ":source:_files" in content
+
+    def test_fish_script(self, scripts: dict[str, Path]) -> None:
+        """The fish script should list commands and complete option values."""
+        content = scripts["fish"].read_text()
+
+        assert "-n __fish_use_subcommand -a convert -d 'Convert an image\\'s format'" in content
+        assert "-n '__fish_seen_subcommand_from convert' -s f -l format -x -a 'png jpeg'" in (
+            content
+        )
+        assert "-n __fish_use_subcommand -s c -l config -r -F -d 'Config file'" in content
+        assert "-n '__fish_seen_subcommand_from convert' -F" in content
+
+    def test_no_commands(self, tmp_path: Path) -> None:
+        """A CLI without commands should complete its built-in version command."""
+        result = CodeGenerator().generate(CLISpec(name="simple", description="S"), tmp_path)
+
+        assert "compgen -W version" in result["completion:bash"].read_text()
+        assert "-a version" in result["completion:fish"].read_text()
+
+
 class TestCodeGeneratorPyproject:
     """Tests for pyproject.toml generation."""
 
@@ -390,6 +1090,16 @@ class TestCodeGeneratorPyproject:
             assert "[project.scripts]" in content
             assert "mytool" in content
 
+    def test_pyproject_ships_completions(self, generator: CodeGenerator) -> None:
+        """The completion scripts should be installed as package data."""
+        spec = CLISpec(name="mytool", description="My tool")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result = generator.generate(spec, Path(tmpdir))
+            content = result["pyproject"].read_text()
+
+            assert '[tool.setuptools.package-data]\nmytool = ["completions/*"]' in content
+
 
 class TestCodeGeneratorReadme:
     """Tests for README.md generation."""
@@ -437,6 +1147,17 @@ class TestCodeGeneratorReadme:
             assert "convert" in content
             assert "validate" in content
 
+    def test_readme_has_completion_instructions(self, generator: CodeGenerator) -> None:
+        """Generated README.md should explain how to install the completion scripts."""
+        spec = CLISpec(name="mytool", description="My tool")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result = generator.generate(spec, Path(tmpdir))
+            content = result["readme"].read_text()
+
+            assert "## Shell Completion" in content
+            assert "mytool/completions/_mytool ~/.zfunc/_mytool" in content
+
 
 class TestCodeGeneratorNoCommands:
     """Tests for CLISpec with no commands (single-command CLI)."""
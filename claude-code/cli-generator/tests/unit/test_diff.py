@@ -0,0 +1,129 @@
+"""Unit tests for spec diffs."""
+
+import time
+
+from cli_generator.diff import diff_named, diff_specs
+from cli_generator.models import ArgumentSpec, CLISpec, CommandSpec, OptionSpec
+
+
+def make_spec(commands: list[CommandSpec], **kwargs: object) -> CLISpec:
+    """Return a spec with the given commands."""
+    return CLISpec.model_validate(
+        {"name": "tool", "description": "A tool", "commands": commands, **kwargs}
+    )
+
+
+class TestDiffNamed:
+    """Tests for diffing collections by name."""
+
+    def test_added_removed_changed(self) -> None:
+        """Items should be matched by name, not position."""
+        old = [OptionSpec(name="a"), OptionSpec(name="b"), OptionSpec(name="c", type="int")]
+        new = [OptionSpec(name="c"), OptionSpec(name="a"), OptionSpec(name="d")]
+
+        changes = diff_named(old, new)
+
+        assert changes.added == ["d"]
+        assert changes.removed == ["b"]
+        assert changes.changed == ["c"]
+        assert changes.summary() == "+d -b ~c"
+
+    def test_identical(self) -> None:
+        """Equal collections should give no changes."""
+        options = [OptionSpec(name="a")]
+        assert diff_named(options, list(options)).is_empty
+
+
+class TestDiffSpecs:
+    """Tests for diffing two specs."""
+
+    RUN = CommandSpec(
+        name="run",
+        description="Run it",
+        arguments=[ArgumentSpec(name="target")],
+        options=[OptionSpec(name="force", type="bool")],
+    )
+    STOP = CommandSpec(name="stop", description="Stop it")
+
+    def test_identical_specs(self) -> None:
+        """Equal specs should give an empty diff."""
+        spec_diff = diff_specs(make_spec([self.RUN]), make_spec([self.RUN]))
+        assert spec_diff.is_empty
+        assert spec_diff.affected_commands == set()
+
+    def test_added_and_removed_commands(self) -> None:
+        """Commands only in one spec should be added or removed."""
+        spec_diff = diff_specs(make_spec([self.RUN]), make_spec([self.STOP]))
+
+        assert spec_diff.commands.added == ["stop"]
+        assert spec_diff.commands.removed == ["run"]
+        assert spec_diff.affected_commands == {"stop"}
+
+    def test_changed_command_details(self) -> None:
+        """A changed command should report its fields, arguments and options."""
+        changed = self.RUN.model_copy(
+            update={
+                "description": "Run it now",
+                "arguments": [],
+                "options": [OptionSpec(name="force", type="int"), OptionSpec(name="dry-run")],
+            }
+        )
+
+        spec_diff = diff_specs(make_spec([self.RUN, self.STOP]), make_spec([changed, self.STOP]))
+
+        assert spec_diff.commands.changed == ["run"]
+        assert spec_diff.affected_commands == {"run"}
+        (command,) = spec_diff.changed_commands
+        assert command.fields == ["description"]
+        assert command.arguments.removed == ["target"]
+        assert command.options.added == ["dry-run"]
+        assert command.options.changed == ["force"]
+        assert command.summary() == "description; arguments: -target; options: +dry-run ~force"
+
+    def test_spec_fields_and_global_options(self) -> None:
+        """Spec-level changes should be reported apart from commands."""
+        old = make_spec([self.RUN])
+        new = make_spec(
+            [self.RUN], description="Another tool", global_options=[OptionSpec(name="verbose")]
+        )
+
+        spec_diff = diff_specs(old, new)
+
+        assert spec_diff.fields == ["description"]
+        assert spec_diff.global_options.added == ["verbose"]
+        assert spec_diff.commands.is_empty
+        assert not spec_diff.is_empty
+
+    def test_reordered_commands(self) -> None:
+        """Swapping commands should only mark the diff as reordered."""
+        spec_diff = diff_specs(make_spec([self.RUN, self.STOP]), make_spec([self.STOP, self.RUN]))
+
+        assert spec_diff.reordered
+        assert spec_diff.commands.is_empty
+        assert not spec_diff.is_empty
+        assert spec_diff.summary() == (
+            "0 command(s) added, 0 removed, 0 changed; commands reordered"
+        )
+
+    def test_large_specs_are_linear(self) -> None:
+        """Diffing thousands of commands should not compare every pair."""
+
+        def commands(count: int, changed: int) -> list[CommandSpec]:
+            return [
+                CommandSpec(
+                    name=f"command-{index}",
+                    description="Changed" if index == changed else f"Step {index}",
+                )
+                for index in range(count)
+            ]
+
+        old = make_spec(commands(20_000, changed=-1))
+        new = make_spec(commands(20_000, changed=123))
+
+        start = time.perf_counter()
+        spec_diff = diff_specs(old, new)
+        elapsed = time.perf_counter() - start
+
+        assert spec_diff.commands.changed == ["command-123"]
+        # A quadratic diff would take minutes
+        assert elapsed < 5
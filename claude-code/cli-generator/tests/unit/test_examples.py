@@ -0,0 +1,132 @@
+"""Unit tests for the few-shot example library."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from cli_generator.examples import ExampleLibrary, compact_example, tokenize
+from cli_generator.models import CLISpec, CommandSpec, OptionSpec
+
+SPECS_DIR = Path(__file__).parents[2] / "specs"
+
+
+def make_spec(name: str, description: str, commands: list[str]) -> CLISpec:
+    """Build a small spec with one command per name."""
+    return CLISpec(
+        name=name,
+        description=description,
+        commands=[
+            CommandSpec(name=command, description=f"{command.title()} things")
+            for command in commands
+        ],
+    )
+
+
+@pytest.fixture
+def library() -> ExampleLibrary:
+    """A library of three unrelated specs."""
+    return ExampleLibrary(
+        [
+            make_spec("passgen", "Generate secure random passwords", ["generate", "strength"]),
+            make_spec("todo", "Manage a todo list", ["add", "list", "done"]),
+            make_spec("md_convert", "Convert markdown files to HTML", ["convert"]),
+        ]
+    )
+
+
+class TestTokenize:
+    """Tests for tokenize()."""
+
+    def test_lowercases_and_drops_stop_words(self) -> None:
+        """Stop words should be removed and words lowercased."""
+        assert tokenize("A Tool for Passwords") == ["passwords"]
+
+    def test_adds_bigrams(self) -> None:
+        """Adjacent words should also form bigrams."""
+        assert tokenize("random passwords") == ["random", "passwords", "random passwords"]
+
+    def test_splits_identifiers(self) -> None:
+        """Underscored names should be split into words."""
+        assert tokenize("md_convert")[:2] == ["md", "convert"]
+
+
+class TestCompactExample:
+    """Tests for compact_example()."""
+
+    def test_trims_commands_and_options(self) -> None:
+        """Only the first commands and options should be kept."""
+        spec = make_spec("big", "A big CLI", ["one", "two", "three"])
+        spec.commands[0].options = [
+            OptionSpec(name=f"opt{i}", help="An option") for i in range(5)
+        ]
+
+        data = json.loads(compact_example(spec, max_commands=2, max_options=3))
+
+        assert [c["name"] for c in data["commands"]] == ["one", "two"]
+        assert len(data["commands"][0]["options"]) == 3
+
+    def test_omits_defaults(self) -> None:
+        """Default values should be left out to save tokens."""
+        data = json.loads(compact_example(make_spec("tool", "A tool", ["run"])))
+        assert "python_version" not in data
+        assert "arguments" not in data["commands"][0]
+
+
+class TestExampleLibrary:
+    """Tests for ExampleLibrary."""
+
+    def test_search_ranks_most_similar_first(self, library: ExampleLibrary) -> None:
+        """The spec sharing the most terms should rank first."""
+        results = library.search("A tool to generate strong passwords", k=2)
+        assert results[0].name == "passgen"
+
+    def test_search_skips_unrelated(self, library: ExampleLibrary) -> None:
+        """Specs sharing no terms with the description should not be returned."""
+        assert [s.name for s in library.search("markdown to html", k=3)] == ["md_convert"]
+        assert library.search("quantum chromodynamics", k=3) == []
+
+    def test_search_respects_k(self, library: ExampleLibrary) -> None:
+        """No more than k examples should be returned."""
+        assert len(library.search("generate list convert", k=1)) == 1
+
+    def test_add_deduplicates(self, library: ExampleLibrary) -> None:
+        """Adding an identical spec again should be a no-op."""
+        assert not library.add(library.specs[0])
+        assert len(library) == 3
+
+    def test_add_updates_index(self, library: ExampleLibrary) -> None:
+        """Specs added after a search should be searchable."""
+        library.search("passwords")
+        library.add(make_spec("weather", "Show the weather forecast", ["today"]))
+        assert library.search("weather forecast")[0].name == "weather"
+
+    def test_load_directory_skips_invalid(self, tmp_path: Path) -> None:
+        """Invalid JSON files should be skipped and counted."""
+        spec = make_spec("todo", "Manage a todo list", ["add"])
+        (tmp_path / "todo.json").write_text(spec.model_dump_json())
+        (tmp_path / "broken.json").write_text("{not json")
+
+        library = ExampleLibrary.from_paths([tmp_path])
+
+        assert len(library) == 1
+        assert library.skipped == 1
+
+    def test_loads_saved_specs(self) -> None:
+        """The specs shipped in specs/ should load as examples."""
+        library = ExampleLibrary.from_paths([SPECS_DIR])
+        assert library.search("password generator")[0].name == "passgen"
+
+    def test_instructions(self, library: ExampleLibrary) -> None:
+        """Instructions should contain the matching examples as JSON."""
+        text = library.instructions("convert markdown")
+        assert text is not None
+        assert text.startswith("## Examples of Similar CLIs")
+        assert '"name":"md_convert"' in text
+        assert library.instructions("quantum chromodynamics") is None
+
+    def test_instructions_budget_keeps_best_match(self, library: ExampleLibrary) -> None:
+        """A tiny budget should still include the single best example."""
+        text = library.instructions("generate passwords todo list", k=2, max_chars=10)
+        assert text is not None
+        assert text.count("```json") == 1
@@ -0,0 +1,146 @@
+"""Unit tests for hedged model requests."""
+
+import asyncio
+
+import pytest
+from pydantic_ai import Agent
+from pydantic_ai.messages import ModelMessage, ModelResponse, ToolCallPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_ai.models.test import TestModel
+
+from cli_generator.hedging import HedgeStats, model_name, run_hedged
+from cli_generator.models import CLISpec
+
+
+def slow_model(name: str, latency: float, calls: list[str], fail: bool = False) -> FunctionModel:
+    """A FunctionModel answering after a synthetic latency."""
+
+    async def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        calls.append(name)
+        await asyncio.sleep(latency)
+        if fail:
+            raise RuntimeError(f"{name} failed")
+        args = {"name": name, "description": f"Spec from {name}"}
+        return ModelResponse(parts=[ToolCallPart(info.output_tools[0].name, args)])
+
+    return FunctionModel(respond, model_name=name)
+
+
+@pytest.fixture
+def agent() -> Agent[None, CLISpec]:
+    """An agent producing CLISpecs, with models supplied per run."""
+    return Agent(output_type=CLISpec)
+
+
+class TestHedgeStats:
+    """Tests for HedgeStats rates."""
+
+    def test_rates_without_requests(self) -> None:
+        """Rates should be zero before any request."""
+        stats = HedgeStats()
+        assert stats.fire_rate == 0.0
+        assert stats.win_rate("primary") == 0.0
+
+    def test_rates(self) -> None:
+        """Rates should be fractions of all requests."""
+        stats = HedgeStats(requests=4, fired=1, wins={"primary": 3, "fallback": 1})
+        assert stats.fire_rate == 0.25
+        assert stats.win_rate("primary") == 0.75
+        assert stats.win_rate("fallback") == 0.25
+
+
+class TestModelName:
+    """Tests for model_name()."""
+
+    def test_string(self) -> None:
+        """Model strings should be used as-is."""
+        assert model_name("openai:gpt-4o-mini") == "openai:gpt-4o-mini"
+
+    def test_instance(self) -> None:
+        """Model instances should use their model name."""
+        assert model_name(TestModel()) == "test"
+
+
+class TestRunHedged:
+    """Tests for run_hedged()."""
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_does_not_hedge(self, agent: Agent[None, CLISpec]) -> None:
+        """A primary answering within the delay should not start a hedge."""
+        calls: list[str] = []
+        stats = HedgeStats()
+        models = [slow_model("primary", 0.0, calls), slow_model("fallback", 0.0, calls)]
+
+        result = await run_hedged(agent, "A tool", models, delay=0.5, stats=stats)
+
+        assert result.output.name == "primary"
+        assert calls == ["primary"]
+        assert stats.fired == 0
+        assert stats.wins == {"primary": 1}
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_loses_to_fallback(self, agent: Agent[None, CLISpec]) -> None:
+        """A slow primary should be raced and cancelled when the fallback wins."""
+        calls: list[str] = []
+        stats = HedgeStats()
+        models = [slow_model("primary", 5.0, calls), slow_model("fallback", 0.0, calls)]
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        result = await run_hedged(agent, "A tool", models, delay=0.05, stats=stats)
+
+        assert result.output.name == "fallback"
+        assert loop.time() - start < 1.0
+        assert calls == ["primary", "fallback"]
+        assert stats.fired == 1
+        assert stats.hedges == 1
+        assert stats.win_rate("fallback") == 1.0
+
+    @pytest.mark.asyncio
+    async def test_primary_can_win_after_hedge(self, agent: Agent[None, CLISpec]) -> None:
+        """The primary should still win if it finishes before the hedge."""
+        calls: list[str] = []
+        stats = HedgeStats()
+        models = [slow_model("primary", 0.1, calls), slow_model("fallback", 5.0, calls)]
+
+        result = await run_hedged(agent, "A tool", models, delay=0.02, stats=stats)
+
+        assert result.output.name == "primary"
+        assert stats.fired == 1
+        assert stats.wins == {"primary": 1}
+
+    @pytest.mark.asyncio
+    async def test_failure_hedges_immediately(self, agent: Agent[None, CLISpec]) -> None:
+        """A failing primary should start the fallback without waiting."""
+        calls: list[str] = []
+        models = [
+            slow_model("primary", 0.0, calls, fail=True),
+            slow_model("fallback", 0.0, calls),
+        ]
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        result = await run_hedged(agent, "A tool", models, delay=5.0)
+
+        assert result.output.name == "fallback"
+        assert loop.time() - start < 1.0
+
+    @pytest.mark.asyncio
+    async def test_all_failing_raises_first_error(self, agent: Agent[None, CLISpec]) -> None:
+        """When every model fails the first error should be raised."""
+        calls: list[str] = []
+        stats = HedgeStats()
+        models = [
+            slow_model("primary", 0.0, calls, fail=True),
+            slow_model("fallback", 0.0, calls, fail=True),
+        ]
+
+        with pytest.raises(RuntimeError, match="primary failed"):
+            await run_hedged(agent, "A tool", models, delay=5.0, stats=stats)
+        assert stats.failed == 1
+
+    @pytest.mark.asyncio
+    async def test_empty_models_raises(self, agent: Agent[None, CLISpec]) -> None:
+        """run_hedged should require at least one model."""
+        with pytest.raises(ValueError, match="models cannot be empty"):
+            await run_hedged(agent, "A tool", [], delay=1.0)
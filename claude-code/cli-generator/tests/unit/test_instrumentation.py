@@ -0,0 +1,132 @@
+"""Unit tests for call and span instrumentation."""
+
+import json
+from pathlib import Path
+
+import pytest
+from pydantic_ai import Agent
+from pydantic_ai.messages import ModelMessage, ModelResponse, ToolCallPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+from cli_generator.instrumentation import (
+    CallRecord,
+    Recorder,
+    Span,
+    count_retries,
+    timed,
+)
+from cli_generator.models import CLISpec
+
+
+class TestRecorder:
+    """Tests for Recorder."""
+
+    def test_record_calls_hook(self) -> None:
+        """Recorded calls should be stored and passed to the hook."""
+        seen: list[CallRecord | Span] = []
+        recorder = Recorder(hook=seen.append)
+        call = CallRecord(operation="spec", model="test", input_tokens=10)
+
+        recorder.record(call)
+
+        assert recorder.calls == [call]
+        assert seen == [call]
+
+    def test_span_records_duration(self) -> None:
+        """A span should be recorded with its name, detail and duration."""
+        seen: list[CallRecord | Span] = []
+        recorder = Recorder(hook=seen.append)
+
+        with recorder.span("render", "cli"):
+            pass
+
+        assert len(recorder.spans) == 1
+        span = recorder.spans[0]
+        assert (span.name, span.detail) == ("render", "cli")
+        assert span.duration >= 0
+        assert seen == [span]
+
+    def test_span_recorded_on_error(self) -> None:
+        """A span should be recorded even if the block raises."""
+        recorder = Recorder()
+        with pytest.raises(RuntimeError):
+            with recorder.span("write"):
+                raise RuntimeError("disk full")
+        assert [span.name for span in recorder.spans] == ["write"]
+
+    def test_summary_totals(self) -> None:
+        """The summary should add up tokens, retries, cache outcomes and stages."""
+        recorder = Recorder()
+        recorder.record(
+            CallRecord(
+                operation="spec", model="a", input_tokens=10, output_tokens=5,
+                requests=2, retries=1, cache="miss",
+            )
+        )
+        recorder.record(CallRecord(operation="spec", model="a", cache="hit"))
+        with recorder.span("render"):
+            pass
+        with recorder.span("render"):
+            pass
+
+        summary = recorder.summary()
+
+        assert summary["calls"] == 2
+        assert summary["input_tokens"] == 10
+        assert summary["output_tokens"] == 5
+        assert summary["requests"] == 2
+        assert summary["retries"] == 1
+        assert summary["cache"] == {"miss": 1, "hit": 1}
+        assert summary["stages"]["render"]["count"] == 2
+
+    def test_write_json(self, tmp_path: Path) -> None:
+        """write_json should write the summary, calls and spans."""
+        recorder = Recorder()
+        recorder.record(CallRecord(operation="spec", model="test"))
+        with recorder.span("write"):
+            pass
+        path = tmp_path / "metrics.json"
+
+        recorder.write_json(path)
+
+        data = json.loads(path.read_text())
+        assert data["summary"]["calls"] == 1
+        assert data["calls"][0]["operation"] == "spec"
+        assert data["spans"][0]["name"] == "write"
+
+
+class TestTimed:
+    """Tests for timed()."""
+
+    def test_without_recorder(self) -> None:
+        """timed() should be a no-op without a recorder."""
+        with timed(None, "render"):
+            pass
+
+    def test_with_recorder(self) -> None:
+        """timed() should record a span on the recorder."""
+        recorder = Recorder()
+        with timed(recorder, "render", "readme"):
+            pass
+        assert recorder.spans[0].detail == "readme"
+
+
+class TestCountRetries:
+    """Tests for count_retries()."""
+
+    @pytest.mark.asyncio
+    async def test_counts_validation_retries(self) -> None:
+        """Each invalid output sent back to the model should count as a retry."""
+        attempts: list[int] = []
+
+        async def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+            attempts.append(1)
+            name = "Bad Name" if len(attempts) == 1 else "good_name"
+            args = {"name": name, "description": "A tool"}
+            return ModelResponse(parts=[ToolCallPart(info.output_tools[0].name, args)])
+
+        agent = Agent(FunctionModel(respond), output_type=CLISpec)
+        result = await agent.run("A tool")
+
+        assert count_retries(result) == 1
+        assert result.usage().requests == 2
@@ -0,0 +1,161 @@
+"""Unit tests for the spec loader and its trusted cache."""
+
+import gc
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from cli_generator import loader
+from cli_generator.loader import (
+    cache_key,
+    decode_spec,
+    encode_spec,
+    load_spec,
+    load_spec_bytes,
+    parse_spec,
+    type_adapter,
+)
+from cli_generator.models import ArgumentSpec, CLISpec, CommandSpec, OptionSpec
+
+SPEC = CLISpec(
+    name="loaded",
+    description="A loaded CLI",
+    commands=[
+        CommandSpec(
+            name="convert",
+            description="Convert a file",
+            arguments=[ArgumentSpec(name="--input", type="path")],
+            options=[
+                OptionSpec(name="format", type="choice", choices=["json", "yaml"]),
+                OptionSpec(name="indent", short="-i", type="int", default=2),
+                OptionSpec(name="extra", default={"nested": [1, 2.5, None, True]}),
+            ],
+            examples=["loaded convert in.json"],
+        )
+    ],
+    global_options=[OptionSpec(name="verbose", short="v", type="bool")],
+    dependencies=["pyyaml"],
+)
+DATA = SPEC.model_dump_json().encode()
+
+
+class TestParseSpec:
+    """Tests for validating specs from JSON."""
+
+    def test_matches_model_validate(self) -> None:
+        """The fast path should give the same spec as the model's own validation."""
+        assert parse_spec(DATA) == CLISpec.model_validate(json.loads(DATA))
+
+    def test_runs_validators(self) -> None:
+        """Validators should run, e.g. for a short option that is too long."""
+        data = json.loads(DATA)
+        data["global_options"][0]["short"] = "vv"
+        with pytest.raises(ValidationError, match="single character"):
+            parse_spec(json.dumps(data))
+
+    def test_invalid_json(self) -> None:
+        """Malformed JSON should raise a JSONDecodeError."""
+        with pytest.raises(json.JSONDecodeError):
+            parse_spec(b"{not json")
+
+    def test_type_adapter_is_cached(self) -> None:
+        """The same TypeAdapter should be returned for a type."""
+        assert type_adapter(CLISpec) is type_adapter(CLISpec)
+
+    def test_restores_gc(self) -> None:
+        """The garbage collector should be enabled again after loading."""
+        parse_spec(DATA)
+        assert gc.isenabled()
+
+
+class TestBinaryFormat:
+    """Tests for the trusted cache's binary serialization."""
+
+    def test_round_trip(self) -> None:
+        """A decoded spec should equal and serialize like the original."""
+        spec = decode_spec(encode_spec(SPEC))
+
+        assert spec == SPEC
+        assert spec.model_dump_json() == SPEC.model_dump_json()
+        assert isinstance(spec.commands[0].options[0], OptionSpec)
+
+    def test_smaller_than_json(self) -> None:
+        """The binary form should be more compact than the JSON spec."""
+        assert len(encode_spec(SPEC)) < len(DATA)
+
+    @pytest.mark.parametrize("data", [b"", b"garbage", encode_spec(SPEC)[:-3]])
+    def test_corrupt_data(self, data: bytes) -> None:
+        """Data that is not a serialized spec should raise a ValueError."""
+        with pytest.raises(ValueError):
+            decode_spec(data)
+
+
+class TestLoadSpec:
+    """Tests for loading spec files through the trusted cache."""
+
+    def test_tests_do_not_write_user_cache(self) -> None:
+        """The test session should keep trusted specs out of ~/.cache."""
+        assert loader.TRUSTED_CACHE_DIR != Path.home() / ".cache" / "cli-gen" / "trusted"
+
+    def test_second_load_skips_validation(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A spec that passed before should be loaded without validating it."""
+        assert load_spec_bytes(DATA, tmp_path) == SPEC
+        assert (tmp_path / f"{cache_key(DATA)}.bin").exists()
+
+        def fail(data: bytes) -> CLISpec:
+            raise AssertionError("validated again")
+
+        monkeypatch.setattr(loader, "parse_spec", fail)
+        assert load_spec_bytes(DATA, tmp_path) == SPEC
+
+    def test_concurrent_loads(self, tmp_path: Path) -> None:
+        """Threads caching the same spec should not share a temporary file."""
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            specs = list(pool.map(lambda _: load_spec_bytes(DATA, tmp_path), range(32)))
+
+        assert specs == [SPEC] * 32
+        assert [path.name for path in tmp_path.iterdir()] == [f"{cache_key(DATA)}.bin"]
+
+    def test_changed_file_is_validated(self, tmp_path: Path) -> None:
+        """Different bytes should get their own cache entry."""
+        load_spec_bytes(DATA, tmp_path)
+        changed = SPEC.model_copy(update={"description": "Changed"})
+
+        spec = load_spec_bytes(changed.model_dump_json().encode(), tmp_path)
+
+        assert spec.description == "Changed"
+        assert len(list(tmp_path.glob("*.bin"))) == 2
+
+    def test_invalid_spec_is_not_cached(self, tmp_path: Path) -> None:
+        """Specs that fail validation should not be cached."""
+        with pytest.raises(ValidationError):
+            load_spec_bytes(b'{"name": "bad name", "description": "x"}', tmp_path)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_corrupt_entry_is_replaced(self, tmp_path: Path) -> None:
+        """An unreadable cache entry should be ignored and rewritten."""
+        entry = tmp_path / f"{cache_key(DATA)}.bin"
+        entry.parent.mkdir(exist_ok=True)
+        entry.write_bytes(b"garbage")
+
+        assert load_spec_bytes(DATA, tmp_path) == SPEC
+        assert decode_spec(entry.read_bytes()) == SPEC
+
+    def test_without_cache(self, tmp_path: Path) -> None:
+        """With no cache directory, specs are validated and nothing is written."""
+        path = tmp_path / "spec.json"
+        path.write_bytes(DATA)
+
+        assert load_spec(path, cache_dir=None) == SPEC
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_unusable_cache_dir(self, tmp_path: Path) -> None:
+        """A cache directory that cannot be created should not fail the load."""
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        assert load_spec_bytes(DATA, blocker / "cache") == SPEC
@@ -0,0 +1,167 @@
+"""Unit tests for the rule-based LocalSpecGenerator."""
+
+import ast
+from pathlib import Path
+
+import pytest
+
+from cli_generator.generators.code_generator import CodeGenerator
+from cli_generator.generators.local_generator import (
+    LocalSpecGenerator,
+    lemmatize,
+    pluralize,
+    singularize,
+)
+
+
+@pytest.fixture
+def local() -> LocalSpecGenerator:
+    """A synthesizer with the default threshold."""
+    return LocalSpecGenerator()
+
+
+class TestWordForms:
+    """Tests for the naive word form helpers."""
+
+    @pytest.mark.parametrize(
+        ("word", "expected"),
+        [("lists", "list"), ("adding", "add"), ("deletes", "delete"), ("removed", "remove"),
+         ("searches", "search"), ("creating", "create"), ("banana", "banana")],
+    )
+    def test_lemmatize(self, word: str, expected: str) -> None:
+        """Verb forms should map to their command verb."""
+        assert lemmatize(word) == expected
+
+    @pytest.mark.parametrize(
+        ("word", "expected"),
+        [("notes", "note"), ("entries", "entry"), ("boxes", "box"), ("glass", "glass")],
+    )
+    def test_singularize(self, word: str, expected: str) -> None:
+        """Plural nouns should become singular."""
+        assert singularize(word) == expected
+
+    @pytest.mark.parametrize(
+        ("word", "expected"),
+        [("note", "notes"), ("entry", "entries"), ("box", "boxes"), ("day", "days")],
+    )
+    def test_pluralize(self, word: str, expected: str) -> None:
+        """Singular nouns should become plural."""
+        assert pluralize(word) == expected
+
+
+class TestSynthesize:
+    """Tests for LocalSpecGenerator.synthesize()."""
+
+    def test_formulaic_description(self, local: LocalSpecGenerator) -> None:
+        """A verb list plus a subject should become one command per verb."""
+        result = local.synthesize("A CLI with list, add and delete commands for notes")
+
+        assert result.confidence == 1.0
+        assert local.accepts(result)
+        spec = result.spec
+        assert spec.name == "notes_cli"
+        assert [cmd.name for cmd in spec.commands] == ["list", "add", "delete"]
+        assert spec.commands[0].description == "List all notes"
+        assert [arg.name for arg in spec.commands[1].arguments] == ["note"]
+
+    def test_standard_options(self, local: LocalSpecGenerator) -> None:
+        """Standard options should follow the short name conventions."""
+        result = local.synthesize(
+            "A CLI to manage bookmarks: add, remove and export, with verbose output"
+        )
+
+        spec = result.spec
+        assert [(opt.name, opt.short) for opt in spec.global_options] == [("verbose", "v")]
+        remove = next(cmd for cmd in spec.commands if cmd.name == "remove")
+        assert [(opt.name, opt.short) for opt in remove.options] == [("force", "f")]
+        export = next(cmd for cmd in spec.commands if cmd.name == "export")
+        assert [(opt.name, opt.short) for opt in export.options] == [("output", "o")]
+
+    def test_global_option_not_repeated_on_commands(self, local: LocalSpecGenerator) -> None:
+        """A command should not redefine an option that is already global."""
+        result = local.synthesize("A tool for files with list and delete commands and a force flag")
+        delete = next(cmd for cmd in result.spec.commands if cmd.name == "delete")
+        assert delete.options == []
+
+    def test_container_subject(self, local: LocalSpecGenerator) -> None:
+        """Items of a "todo list" should be todos, not lists."""
+        result = local.synthesize("A todo list manager with add, list and done commands")
+
+        assert result.spec.name == "todo_list_cli"
+        assert result.spec.commands[0].description == "Add a new todo"
+
+    def test_unknown_details_lower_confidence(self, local: LocalSpecGenerator) -> None:
+        """Words the rules cannot explain should lower the confidence."""
+        result = local.synthesize(
+            "A CLI for photos with list and delete commands supporting EXIF metadata "
+            "and thumbnails in several sizes"
+        )
+
+        assert result.spec is not None
+        assert result.confidence < 0.9
+        assert not local.accepts(result)
+
+    def test_unknown_verb_is_not_silently_dropped(self, local: LocalSpecGenerator) -> None:
+        """An unrecognized command in the list should keep the result below threshold."""
+        result = local.synthesize("A file manager with list, copy, and shred commands")
+        assert not local.accepts(result)
+
+    def test_subject_ends_at_function_word(self, local: LocalSpecGenerator) -> None:
+        """Words after "without" should not become part of the subject."""
+        result = local.synthesize("A CLI for notes without color, with add and list commands")
+
+        assert result.spec.name == "notes_cli"
+        assert [arg.name for arg in result.spec.commands[0].arguments] == ["note"]
+        assert not local.accepts(result)
+
+    def test_subject_modifiers_lower_confidence(self, local: LocalSpecGenerator) -> None:
+        """Only the subject's head noun should count as explained."""
+        result = local.synthesize("A CLI to add, list and delete tasks for my team project")
+
+        assert result.spec is not None
+        assert not local.accepts(result)
+
+    def test_no_verbs(self, local: LocalSpecGenerator) -> None:
+        """Descriptions without command verbs should not produce a spec."""
+        result = local.synthesize("A CLI for counters")
+        assert result.spec is None
+        assert result.reason == "no command verbs found"
+
+    def test_no_subject(self, local: LocalSpecGenerator) -> None:
+        """Descriptions without a recognizable subject should not produce a spec."""
+        result = local.synthesize("Convert images between formats")
+        assert result.spec is None
+        assert result.reason == "no subject found"
+
+    def test_threshold(self) -> None:
+        """accepts() should compare the confidence against the threshold."""
+        result = LocalSpecGenerator().synthesize(
+            "A file manager with list, copy, and shred commands"
+        )
+        assert LocalSpecGenerator(threshold=0.5).accepts(result)
+        assert not LocalSpecGenerator(threshold=1.0).accepts(result)
+
+    def test_generated_code_compiles(self, local: LocalSpecGenerator, tmp_path: Path) -> None:
+        """Synthesized specs should render into valid Python."""
+        result = local.synthesize(
+            "CLI for contacts that can list, add, edit, import, export and delete "
+            "entries with a dry run flag"
+        )
+
+        files = CodeGenerator().generate(result.spec, tmp_path)
+
+        ast.parse(files["cli"].read_text())
+
+    @pytest.mark.parametrize("subject", ["classes", "imports", "globals"])
+    def test_keyword_subjects_compile(
+        self, local: LocalSpecGenerator, tmp_path: Path, subject: str
+    ) -> None:
+        """Subjects that are Python keywords should not name parameters."""
+        result = local.synthesize(f"A CLI with add and delete commands for {subject}")
+
+        assert local.accepts(result)
+        files = CodeGenerator().generate(result.spec, tmp_path)
+
+        for path in files.values():
+            if path.suffix == ".py":
+                compile(path.read_text(), str(path), "exec")
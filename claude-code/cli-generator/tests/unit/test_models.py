@@ -3,7 +3,13 @@
 import pytest
 from pydantic import ValidationError
 
-from cli_generator.models import ArgumentSpec, CLISpec, CommandSpec, OptionSpec
+from cli_generator.models import (
+    ArgumentSpec,
+    CLISpec,
+    CommandSpec,
+    OptionSpec,
+    SpecSkeleton,
+)
 
 
 class TestArgumentSpec:
@@ -323,3 +329,24 @@ class TestCLISpec:
                 ],
             )
         assert "duplicate" in str(exc_info.value).lower()
+
+
+class TestSpecSkeleton:
+    """Tests for SpecSkeleton model."""
+
+    def test_create_skeleton(self) -> None:
+        """Create a skeleton with command names."""
+        skeleton = SpecSkeleton(
+            name="files", description="Manage files", command_names=["list", "copy"]
+        )
+        assert skeleton.command_names == ["list", "copy"]
+
+    def test_invalid_name_rejected(self) -> None:
+        """Skeleton names must be valid package names."""
+        with pytest.raises(ValidationError, match="package name"):
+            SpecSkeleton(name="my-tool", description="Tool")
+
+    def test_duplicate_command_names_rejected(self) -> None:
+        """Skeletons must not list the same command twice."""
+        with pytest.raises(ValidationError, match="Duplicate command names"):
+            SpecSkeleton(name="tool", description="Tool", command_names=["a", "a"])
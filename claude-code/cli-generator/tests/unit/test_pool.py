@@ -0,0 +1,149 @@
+"""Unit tests for pooled HTTP clients, using a local stand-in model server."""
+
+import asyncio
+import json
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import httpx
+import pytest
+
+from cli_generator.generators.spec_generator import SpecGenerator
+from cli_generator.models import CLISpec
+from cli_generator.pool import create_http_client
+
+
+class StandInModelHandler(BaseHTTPRequestHandler):
+    """Minimal OpenAI-compatible chat completions endpoint."""
+
+    protocol_version = "HTTP/1.1"
+    server: "StandInModelServer"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Silence request logging."""
+
+    def do_POST(self) -> None:
+        """Answer every request with a final_result tool call."""
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests += 1
+        self.server.connections.add(self.client_address)
+        tool = body["tools"][0]["function"]["name"]
+        arguments = json.dumps({"name": "counter", "description": "Count things"})
+        response = json.dumps(
+            {
+                "id": "chatcmpl-1",
+                "object": "chat.completion",
+                "created": 0,
+                "model": body["model"],
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "tool_calls",
+                        "message": {
+                            "role": "assistant",
+                            "content": None,
+                            "tool_calls": [
+                                {
+                                    "id": "call_1",
+                                    "type": "function",
+                                    "function": {"name": tool, "arguments": arguments},
+                                }
+                            ],
+                        },
+                    }
+                ],
+                "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+
+class StandInModelServer(ThreadingHTTPServer):
+    """Threaded stand-in server recording requests and client connections."""
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        """Bind to a free local port."""
+        super().__init__(("127.0.0.1", 0), StandInModelHandler)
+        self.requests = 0
+        self.connections: set[tuple[str, int]] = set()
+
+
+@pytest.fixture
+def model_server(monkeypatch: pytest.MonkeyPatch) -> Iterator[StandInModelServer]:
+    """Run the stand-in server and point the OpenAI provider at it."""
+    pytest.importorskip("openai")
+    server = StandInModelServer()
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    monkeypatch.setenv("OPENAI_BASE_URL", f"http://{host}:{port}/v1")
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestCreateHttpClient:
+    """Tests for create_http_client()."""
+
+    def test_returns_async_client(self) -> None:
+        """create_http_client should return an httpx.AsyncClient."""
+        client = create_http_client(http2=False)
+        assert isinstance(client, httpx.AsyncClient)
+
+    def test_applies_timeout(self) -> None:
+        """The configured timeout should be used for reads."""
+        client = create_http_client(timeout=42.0, http2=False)
+        assert client.timeout.read == 42.0
+
+
+class TestSharedHttpClient:
+    """Tests for sharing one client between SpecGenerators."""
+
+    @pytest.mark.asyncio
+    async def test_generators_reuse_connection(self, model_server: StandInModelServer) -> None:
+        """Sequential generations from several generators should share a connection."""
+        async with create_http_client(http2=False) as client:
+            generators = [
+                SpecGenerator(model="openai:gpt-4o-mini", http_client=client)
+                for _ in range(3)
+            ]
+            for n, generator in enumerate(generators):
+                spec = await generator.generate(f"A counter number {n}")
+                assert isinstance(spec, CLISpec)
+
+        assert model_server.requests == 3
+        assert len(model_server.connections) == 1
+
+    @pytest.mark.asyncio
+    async def test_provider_built_on_first_call(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Creating a generator with a client should not need provider credentials."""
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        async with create_http_client(http2=False) as client:
+            generator = SpecGenerator(
+                model="openai:gpt-4o-mini", http_client=client, engine="local"
+            )
+            spec = await generator.generate("A file manager with list, copy, and shred commands")
+
+        assert isinstance(spec, CLISpec)
+        assert generator._pooled_models is None
+
+    @pytest.mark.asyncio
+    async def test_coalesces_identical_requests(self, model_server: StandInModelServer) -> None:
+        """Identical concurrent requests should reach the server once."""
+        async with create_http_client(http2=False) as client:
+            generator = SpecGenerator(model="openai:gpt-4o-mini", http_client=client)
+            specs = await asyncio.gather(
+                *(generator.generate("A counter") for _ in range(5))
+            )
+
+        assert model_server.requests == 1
+        assert all(spec == specs[0] for spec in specs)
@@ -0,0 +1,270 @@
+"""Unit tests for the spec registry."""
+
+import json
+import sqlite3
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from cli_generator.models import CLISpec, CommandSpec, OptionSpec
+from cli_generator import registry as registry_module
+from cli_generator.registry import Registry, RegistryError, dependency_name, parse_reference
+
+
+def make_spec(
+    name: str,
+    commands: dict[str, list[OptionSpec]],
+    description: str = "A tool",
+    dependencies: list[str] | None = None,
+    global_options: list[OptionSpec] | None = None,
+) -> CLISpec:
+    """Return a spec with the given commands and their options."""
+    return CLISpec(
+        name=name,
+        description=description,
+        commands=[
+            CommandSpec(name=command, description=f"Run {command}", options=options)
+            for command, options in commands.items()
+        ],
+        dependencies=dependencies or [],
+        global_options=global_options or [],
+    )
+
+
+FORMAT_CHOICE = OptionSpec(name="format", type="choice", choices=["json", "csv"])
+FORMAT_STR = OptionSpec(name="format")
+
+
+@pytest.fixture
+def registry(tmp_path: Path) -> Iterator[Registry]:
+    """Create a registry with a few specs."""
+    registry = Registry(tmp_path / "registry.sqlite3")
+    registry.add(make_spec("passgen", {"export": [FORMAT_CHOICE], "generate": []}))
+    registry.add(
+        make_spec("notes", {"export": [FORMAT_STR]}, "Take notes", dependencies=["PyYAML>=6.0"])
+    )
+    registry.add(
+        make_spec(
+            "imgconv",
+            {"convert": [FORMAT_CHOICE]},
+            "Convert images",
+            global_options=[OptionSpec(name="verbose", type="bool")],
+        )
+    )
+    yield registry
+    registry.close()
+
+
+class TestHelpers:
+    """Tests for reference and requirement parsing."""
+
+    @pytest.mark.parametrize(
+        ("reference", "expected"),
+        [
+            ("passgen", ("passgen", None)),
+            ("passgen@3", ("passgen", 3)),
+            ("registry:passgen@12", ("passgen", 12)),
+        ],
+    )
+    def test_parse_reference(self, reference: str, expected: tuple[str, int | None]) -> None:
+        """References should split into a name and an optional version."""
+        assert parse_reference(reference) == expected
+
+    @pytest.mark.parametrize("reference", ["passgen@latest", "passgen@0"])
+    def test_invalid_reference(self, reference: str) -> None:
+        """Versions must be positive integers."""
+        with pytest.raises(ValueError):
+            parse_reference(reference)
+
+    @pytest.mark.parametrize(
+        ("requirement", "name"),
+        [
+            ("PyYAML>=6.0", "pyyaml"),
+            ("rich[jupyter]", "rich"),
+            ("ruamel.yaml ; python_version>'3'", "ruamel-yaml"),
+        ],
+    )
+    def test_dependency_name(self, requirement: str, name: str) -> None:
+        """Requirements should be reduced to normalized project names."""
+        assert dependency_name(requirement) == name
+
+
+class TestRegistryVersions:
+    """Tests for adding specs and their version history."""
+
+    def test_add_and_get(self, registry: Registry) -> None:
+        """A spec added to the registry should come back unchanged."""
+        spec = registry.get("passgen")
+        assert spec == make_spec("passgen", {"export": [FORMAT_CHOICE], "generate": []})
+        assert registry.entry("passgen").version == 1
+        assert registry.entry("passgen").commands == 2
+
+    def test_new_versions(self, registry: Registry) -> None:
+        """Changed specs should become new versions; old ones stay available."""
+        changed = make_spec("passgen", {"export": [FORMAT_CHOICE]}, "Changed")
+
+        entry, added = registry.add(changed, source="passgen.json")
+
+        assert (entry.version, added, entry.source) == (2, True, "passgen.json")
+        assert registry.get("passgen") == changed
+        assert registry.get("passgen", 1).description == "A tool"
+        assert registry.resolve("registry:passgen@1").description == "A tool"
+        assert [entry.version for entry in registry.history("passgen")] == [1, 2]
+
+    def test_identical_spec_keeps_version(self, registry: Registry) -> None:
+        """Adding the latest version again should not create a new one."""
+        entry, added = registry.add(registry.get("notes"))
+
+        assert (entry.version, added) == (1, False)
+        assert len(registry.history("notes")) == 1
+
+    def test_missing_spec(self, registry: Registry) -> None:
+        """Unknown names and versions should raise KeyError."""
+        with pytest.raises(KeyError, match="nope"):
+            registry.get("nope")
+        with pytest.raises(KeyError, match="passgen@5"):
+            registry.entry("passgen", 5)
+
+    def test_entries_lists_latest_versions(self, registry: Registry) -> None:
+        """entries() should list each CLI once, by name."""
+        registry.add(make_spec("notes", {}, "Notes v2"))
+
+        entries = registry.entries()
+
+        assert [(entry.name, entry.version) for entry in entries] == [
+            ("imgconv", 1),
+            ("notes", 2),
+            ("passgen", 1),
+        ]
+
+    def test_add_files_is_atomic(self, registry: Registry, tmp_path: Path) -> None:
+        """If one file is invalid, none of the files should be added."""
+        good = tmp_path / "good.json"
+        good.write_text(make_spec("fresh", {}).model_dump_json())
+        bad = tmp_path / "bad.json"
+        bad.write_text(json.dumps({"name": "Bad Name", "description": "x"}))
+
+        with pytest.raises(ValueError):
+            registry.add_files([good, bad])
+
+        assert registry.history("fresh") == []
+
+    def test_persists(self, registry: Registry) -> None:
+        """Specs should still be there when the database is opened again."""
+        registry.close()
+        with Registry(registry.path) as reopened:
+            assert reopened.get("imgconv").description == "Convert images"
+
+    def test_foreign_database_is_refused(self, tmp_path: Path) -> None:
+        """A SQLite database that is not a registry should be left untouched."""
+        path = tmp_path / "other.sqlite3"
+        connection = sqlite3.connect(path)
+        with connection:
+            connection.execute("CREATE TABLE specs (id INTEGER PRIMARY KEY, legacy TEXT)")
+            connection.execute("INSERT INTO specs (legacy) VALUES ('keep me')")
+        connection.close()
+
+        with Registry(path) as registry, pytest.raises(RegistryError, match="not a cli-gen"):
+            registry.add(make_spec("fresh", {}))
+
+        connection = sqlite3.connect(path)
+        assert connection.execute("SELECT legacy FROM specs").fetchall() == [("keep me",)]
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+        connection.close()
+
+    def test_newer_schema_is_refused(self, tmp_path: Path) -> None:
+        """A registry of a newer schema version should not be opened."""
+        path = tmp_path / "newer.sqlite3"
+        connection = sqlite3.connect(path)
+        connection.execute(f"PRAGMA user_version = {registry_module.SCHEMA_VERSION + 1}")
+        connection.close()
+
+        with Registry(path) as registry, pytest.raises(RegistryError, match="schema version"):
+            registry.entries()
+
+    def test_older_schema_is_migrated(
+        self, registry: Registry, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Opening an older registry should migrate it and keep its specs."""
+        registry.close()
+        version = registry_module.SCHEMA_VERSION
+        monkeypatch.setattr(registry_module, "SCHEMA_VERSION", version + 1)
+        monkeypatch.setattr(
+            registry_module,
+            "_MIGRATIONS",
+            (*registry_module._MIGRATIONS, "ALTER TABLE specs ADD COLUMN note TEXT;"),
+        )
+
+        with Registry(registry.path) as migrated:
+            assert migrated.get("imgconv").description == "Convert images"
+            connection = migrated.connection
+            assert connection.execute("PRAGMA user_version").fetchone()[0] == version + 1
+            assert connection.execute("SELECT note FROM specs LIMIT 1").fetchone() == (None,)
+
+    def test_not_a_database(self, tmp_path: Path) -> None:
+        """A file that is not a SQLite database should raise DatabaseError."""
+        path = tmp_path / "notes.txt"
+        path.write_text("not a database\n" * 100)
+
+        with Registry(path) as registry, pytest.raises(sqlite3.DatabaseError):
+            registry.entries()
+        assert path.read_text() == "not a database\n" * 100
+
+
+class TestRegistrySearch:
+    """Tests for searching the registry."""
+
+    @staticmethod
+    def names(registry: Registry, **filters: object) -> list[str]:
+        """Return the names of the specs matching filters."""
+        return [entry.name for entry in registry.search(**filters)]
+
+    def test_command_option_and_type(self, registry: Registry) -> None:
+        """Option filters combined with a command should only match its options."""
+        found = self.names(registry, command="export", option="format", option_type="choice")
+        assert found == ["passgen"]
+        assert self.names(registry, command="export") == ["notes", "passgen"]
+        assert self.names(registry, option="format", option_type="choice") == [
+            "imgconv",
+            "passgen",
+        ]
+
+    def test_global_options(self, registry: Registry) -> None:
+        """Option filters without a command should match global options too."""
+        assert self.names(registry, option="verbose") == ["imgconv"]
+        assert self.names(registry, command="convert", option="verbose") == []
+
+    def test_dependency(self, registry: Registry) -> None:
+        """Dependencies should match by normalized project name."""
+        assert self.names(registry, dependency="pyyaml") == ["notes"]
+        assert self.names(registry, dependency="PyYAML<7") == ["notes"]
+
+    def test_name_and_text(self, registry: Registry) -> None:
+        """Name and description filters should match substrings."""
+        assert self.names(registry, name="conv") == ["imgconv"]
+        assert self.names(registry, text="NOTES") == ["notes"]
+
+    def test_versions_and_limit(self, registry: Registry) -> None:
+        """Old versions should only be searched when asked for."""
+        registry.add(make_spec("passgen", {"generate": []}))
+
+        assert self.names(registry, command="export") == ["notes"]
+        assert [
+            (entry.name, entry.version)
+            for entry in registry.search(command="export", all_versions=True)
+        ] == [("notes", 1), ("passgen", 1)]
+        assert len(registry.search(limit=2)) == 2
+
+    def test_queries_use_indexes(self, registry: Registry) -> None:
+        """Indexed filters should not scan the options or commands tables."""
+        statements: list[str] = []
+        registry.connection.set_trace_callback(statements.append)
+        registry.search(command="export", option="format", option_type="choice", dependency="x")
+        registry.connection.set_trace_callback(None)
+
+        plan = registry.connection.execute(f"EXPLAIN QUERY PLAN {statements[-1]}").fetchall()
+        details = " ".join(row[-1] for row in plan)
+        assert "SCAN options" not in details
+        assert "SCAN commands" not in details
+        assert "SCAN dependencies" not in details
@@ -0,0 +1,182 @@
+"""Unit tests for SpecRepairer."""
+
+import logging
+
+import pytest
+from pydantic import ValidationError
+
+from cli_generator.models import CLISpec, CommandSpec
+from cli_generator.validators import SpecRepairer
+
+
+class TestRepairOptions:
+    """Tests for option repairs."""
+
+    @pytest.fixture
+    def repairer(self) -> SpecRepairer:
+        """Create a SpecRepairer instance."""
+        return SpecRepairer()
+
+    def test_reassigns_duplicate_short(self, repairer: SpecRepairer) -> None:
+        """Conflicting short names should move to a free letter."""
+        data = {
+            "name": "copy",
+            "description": "Copy",
+            "options": [
+                {"name": "force", "short": "f"},
+                {"name": "follow", "short": "f"},
+            ],
+        }
+        result = repairer.repair_command(data)
+        assert [opt["short"] for opt in result["options"]] == ["f", "o"]
+        assert repairer.count == 1
+
+    def test_reassigned_short_avoids_later_declared_ones(self, repairer: SpecRepairer) -> None:
+        """A reassigned short should not take the short a later option declares."""
+        data = {
+            "name": "copy",
+            "description": "Copy",
+            "options": [
+                {"name": "force", "short": "f"},
+                {"name": "follow", "short": "f"},
+                {"name": "output", "short": "o"},
+            ],
+        }
+        result = repairer.repair_command(data)
+        assert [opt["short"] for opt in result["options"]] == ["f", "l", "o"]
+        assert repairer.count == 1
+        CommandSpec.model_validate(result)
+
+    def test_drops_duplicate_short_without_free_letter(self, repairer: SpecRepairer) -> None:
+        """A duplicate short with no free letters should be dropped."""
+        data = {
+            "name": "cmd",
+            "description": "Cmd",
+            "options": [{"name": "a", "short": "a"}, {"name": "A", "short": "a"}],
+        }
+        result = repairer.repair_command(data)
+        assert [opt["short"] for opt in result["options"]] == ["a", "A"]
+
+        data["options"].append({"name": "aa", "short": "a"})
+        result = SpecRepairer().repair_command(data)
+        assert result["options"][2]["short"] is None
+
+    def test_drops_multi_character_short(self, repairer: SpecRepairer) -> None:
+        """Short names longer than one character should be dropped."""
+        data = {"name": "cmd", "description": "Cmd", "options": [{"name": "verbose", "short": "vv"}]}
+        result = repairer.repair_command(data)
+        assert result["options"][0]["short"] is None
+        CommandSpec.model_validate(result)
+
+    def test_strips_dashes_before_checking(self, repairer: SpecRepairer) -> None:
+        """'-v' is a valid short name once the dash is removed."""
+        data = {"name": "cmd", "description": "Cmd", "options": [{"name": "verbose", "short": "-v"}]}
+        result = repairer.repair_command(data)
+        assert result["options"][0]["short"] == "v"
+        assert repairer.count == 0
+
+    def test_choice_without_choices_becomes_str(self, repairer: SpecRepairer) -> None:
+        """Choice options without choices should become string options."""
+        data = {"name": "cmd", "description": "Cmd", "options": [{"name": "mode", "type": "choice"}]}
+        result = repairer.repair_command(data)
+        assert result["options"][0]["type"] == "str"
+        CommandSpec.model_validate(result)
+
+    def test_valid_command_unchanged(self, repairer: SpecRepairer) -> None:
+        """Valid input should not be counted as repaired."""
+        data = {"name": "cmd", "description": "Cmd", "options": [{"name": "out", "short": "o"}]}
+        assert repairer.repair_command(data) == data
+        assert repairer.count == 0
+
+
+class TestRepairSpec:
+    """Tests for spec-level repairs."""
+
+    @pytest.mark.parametrize(
+        ("name", "expected"),
+        [
+            ("file-manager", "file_manager"),
+            ("My Tool", "my_tool"),
+            ("3d-print", "cli_3d_print"),
+            ("class", "class_cli"),
+            ("word_counter", "word_counter"),
+        ],
+    )
+    def test_normalizes_cli_name(self, name: str, expected: str) -> None:
+        """CLI names should become valid package names."""
+        result = SpecRepairer().repair_spec({"name": name, "description": "Tool"})
+        assert result["name"] == expected
+
+    def test_renames_duplicate_commands(self) -> None:
+        """Duplicate command names should get a numeric suffix."""
+        data = {
+            "name": "tool",
+            "description": "Tool",
+            "commands": [
+                {"name": "list", "description": "List"},
+                {"name": "list", "description": "List again"},
+            ],
+        }
+        result = SpecRepairer().repair_spec(data)
+        assert [cmd["name"] for cmd in result["commands"]] == ["list", "list_2"]
+
+    def test_repairs_global_options(self) -> None:
+        """Global options should get the same short name repairs."""
+        data = {
+            "name": "tool",
+            "description": "Tool",
+            "global_options": [
+                {"name": "verbose", "short": "v"},
+                {"name": "version-check", "short": "v"},
+            ],
+        }
+        result = SpecRepairer().repair_spec(data)
+        assert [opt["short"] for opt in result["global_options"]] == ["v", "e"]
+
+    def test_logs_repairs(self, caplog: pytest.LogCaptureFixture) -> None:
+        """Every repair should be logged."""
+        with caplog.at_level(logging.INFO, logger="cli_generator.validators.repair"):
+            SpecRepairer().repair_spec({"name": "my-tool", "description": "Tool"})
+        assert "renamed 'my-tool' to 'my_tool'" in caplog.text
+
+    def test_non_dict_input_unchanged(self) -> None:
+        """Non-dict input should be passed through."""
+        assert SpecRepairer().repair_spec("not a spec") == "not a spec"
+
+
+class TestValidationContext:
+    """Tests for applying repairs through the validation context."""
+
+    def test_repairs_applied_with_context(self) -> None:
+        """A repairer in the context should fix data before validation."""
+        repairer = SpecRepairer()
+        spec = CLISpec.model_validate(
+            {"name": "my-tool", "description": "Tool"},
+            context={"repairer": repairer},
+        )
+        assert spec.name == "my_tool"
+        assert repairer.count == 1
+
+    def test_silent_repairer(self) -> None:
+        """A repairer with record=False should repair without counting."""
+        repairer = SpecRepairer(record=False)
+        spec = CLISpec.model_validate(
+            {"name": "my-tool", "description": "Tool"},
+            context={"repairer": repairer},
+        )
+        assert spec.name == "my_tool"
+        assert (repairer.count, list(repairer.repairs)) == (0, [])
+
+    def test_record_saved(self) -> None:
+        """Only repairs that turn invalid output into valid output should count."""
+        repairer = SpecRepairer()
+
+        assert repairer.record_saved({"name": "my-tool", "description": "Tool"}, CLISpec) == 1
+        assert repairer.record_saved({"name": "my_tool", "description": "Tool"}, CLISpec) == 0
+        assert repairer.record_saved({"name": "my-tool"}, CLISpec) == 0
+        assert list(repairer.repairs) == ["cli: renamed 'my-tool' to 'my_tool'"]
+
+    def test_no_repairs_without_context(self) -> None:
+        """Plain validation should still reject invalid specs."""
+        with pytest.raises(ValidationError):
+            CLISpec.model_validate({"name": "my-tool", "description": "Tool"})
@@ -0,0 +1,278 @@
+"""Unit tests for the cli-gen serve generator service."""
+
+import socket
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+
+import httpx
+import pytest
+from pydantic_ai.models.test import TestModel
+
+from cli_generator import server as server_module
+from cli_generator.cache import SpecCache
+from cli_generator.models import CLISpec, CommandSpec
+from cli_generator.server import GeneratorService, Metrics, make_server
+
+
+class TestMetrics:
+    """Tests for request metrics."""
+
+    def test_counts_by_status(self) -> None:
+        """Requests should be counted per endpoint and status."""
+        metrics = Metrics()
+        metrics.observe("spec", 200, 0.02)
+        metrics.observe("spec", 200, 2.0)
+        metrics.observe("spec", 400, 0.001)
+
+        snapshot = metrics.snapshot()
+        assert snapshot["requests"]["spec"] == {"200": 2, "400": 1}
+
+    def test_latency_histogram_is_cumulative(self) -> None:
+        """Latency buckets should count every request at or below the bound."""
+        metrics = Metrics()
+        metrics.observe("build", 200, 0.02)
+        metrics.observe("build", 200, 2.0)
+
+        histogram = metrics.snapshot()["latency"]["build"]
+        assert histogram["buckets"]["0.01"] == 0
+        assert histogram["buckets"]["0.05"] == 1
+        assert histogram["buckets"]["5.0"] == 2
+        assert histogram["buckets"]["+Inf"] == 2
+        assert histogram["count"] == 2
+
+    def test_includes_cache_stats(self, tmp_path: Path) -> None:
+        """The snapshot should report cache hits and misses."""
+        cache = SpecCache(tmp_path)
+        cache.get("missing")
+        assert Metrics().snapshot(cache)["cache"] == {"hits": 0, "misses": 1}
+
+
+class TestGeneratorService:
+    """Tests for the HTTP API."""
+
+    @pytest.fixture
+    def service(self, tmp_path: Path) -> Iterator[GeneratorService]:
+        """Create a service backed by TestModel and a temporary cache."""
+        service = GeneratorService(
+            model=TestModel(), cache=SpecCache(tmp_path / "cache"), output_root=tmp_path
+        )
+        yield service
+        service.close()
+
+    @pytest.fixture
+    def client(self, service: GeneratorService) -> Iterator[httpx.Client]:
+        """Run the service on a free TCP port and return a client for it."""
+        server = make_server(service, port=0)
+        thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+        thread.start()
+        host, port = server.server_address[:2]
+        with httpx.Client(base_url=f"http://{host}:{port}") as client:
+            yield client
+        server.shutdown()
+        server.server_close()
+
+    def test_health(self, client: httpx.Client) -> None:
+        """GET /health should report ok."""
+        assert client.get("/health").json() == {"status": "ok"}
+
+    def test_spec(self, client: httpx.Client) -> None:
+        """POST /spec should return a valid spec."""
+        response = client.post("/spec", json={"description": "A counter"})
+        assert response.status_code == 200
+        CLISpec.model_validate(response.json()["spec"])
+
+    def test_generate(self, client: httpx.Client, tmp_path: Path) -> None:
+        """POST /generate should write the package."""
+        response = client.post(
+            "/generate", json={"description": "A counter", "output": str(tmp_path / "out")}
+        )
+        assert response.status_code == 200
+        assert Path(response.json()["files"]["cli"]).exists()
+
+    def test_build(self, client: httpx.Client, tmp_path: Path) -> None:
+        """POST /build should render a given spec."""
+        spec = CLISpec(
+            name="hello", description="Hello", commands=[CommandSpec(name="hi", description="Hi")]
+        )
+        response = client.post(
+            "/build",
+            json={"spec": spec.model_dump(mode="json"), "output": str(tmp_path)},
+        )
+        assert response.status_code == 200
+        assert (tmp_path / "hello" / "cli.py").exists()
+
+    def test_bad_requests(self, client: httpx.Client) -> None:
+        """Invalid payloads should return 400 and unknown paths 404."""
+        assert client.post("/spec", json={}).status_code == 400
+        assert client.post("/spec", content=b"not json").status_code == 400
+        assert client.post("/build", json={"spec": {}, "output": "x"}).status_code == 400
+        assert client.post("/nope", json={}).status_code == 404
+        assert client.get("/nope").status_code == 404
+
+    @pytest.mark.parametrize(
+        ("length", "status"), [("-1", 400), ("ten", 400), ("1073741824", 413)]
+    )
+    def test_content_length_is_checked(
+        self, service: GeneratorService, length: str, status: int
+    ) -> None:
+        """Bad or oversized lengths should be answered without reading the body."""
+        server = make_server(service, port=0)
+        thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+        thread.start()
+        try:
+            with socket.create_connection(server.server_address[:2], timeout=5) as client:
+                client.sendall(
+                    f"POST /spec HTTP/1.1\r\nHost: x\r\nContent-Length: {length}\r\n\r\n".encode()
+                )
+                response = client.makefile("rb").readline()
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert response.split()[1] == str(status).encode()
+
+    def test_output_must_be_inside_root(self, client: httpx.Client, tmp_path: Path) -> None:
+        """Outputs outside the output root should be rejected before writing."""
+        spec = CLISpec(name="hello", description="Hello")
+        outside = tmp_path.parent / f"{tmp_path.name}-outside"
+        (tmp_path / "link").symlink_to(tmp_path.parent)
+
+        for output in (str(outside), "../escape", "link/escape"):
+            response = client.post(
+                "/build", json={"spec": spec.model_dump(mode="json"), "output": output}
+            )
+            assert response.status_code == 400
+            assert "must be inside" in response.json()["error"]
+        assert not outside.exists()
+        assert not (tmp_path.parent / "escape").exists()
+
+    def test_relative_output(self, client: httpx.Client, tmp_path: Path) -> None:
+        """Relative outputs should be resolved under the output root."""
+        spec = CLISpec(name="hello", description="Hello")
+        response = client.post(
+            "/build", json={"spec": spec.model_dump(mode="json"), "output": "out"}
+        )
+        assert response.status_code == 200
+        assert (tmp_path / "out" / "hello" / "cli.py").exists()
+
+    def test_internal_key_error(
+        self, service: GeneratorService, client: httpx.Client, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A KeyError raised while generating should be a 500, not a 404."""
+
+        def fail(payload: dict[str, object]) -> CLISpec:
+            raise KeyError("missing")
+
+        monkeypatch.setattr(service, "_generate_spec", fail)
+        response = client.post("/spec", json={"description": "A counter"})
+
+        assert response.status_code == 500
+        assert service.metrics.snapshot()["requests"]["spec"] == {"500": 1}
+
+    def test_metrics(self, client: httpx.Client) -> None:
+        """GET /metrics should count requests and cache hits."""
+        client.post("/spec", json={"description": "A counter"})
+        client.post("/spec", json={"description": "A counter"})
+
+        metrics = client.get("/metrics").json()
+        assert metrics["requests"]["spec"]["200"] == 2
+        assert metrics["latency"]["spec"]["count"] == 2
+        assert metrics["cache"] == {"hits": 1, "misses": 1}
+
+    def test_starts_without_credentials(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """The service should start, and build specs, without a provider API key."""
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        service = GeneratorService(model="openai:gpt-4o-mini", output_root=tmp_path)
+        try:
+            spec = CLISpec(name="hello", description="Say hello")
+            files = service.handle(
+                "build", {"spec": spec.model_dump(mode="json"), "output": str(tmp_path)}
+            )
+        finally:
+            service.close()
+        assert "cli" in files["files"]
+
+    def test_reuses_generators(self, service: GeneratorService) -> None:
+        """The same warm generator should serve every request."""
+        assert service.spec_generator() is service.spec_generator()
+
+    def test_generators_are_bounded(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Client-chosen models should not grow the generator cache without bound."""
+        monkeypatch.setenv("OPENAI_API_KEY", "test")
+        monkeypatch.setattr(server_module, "MAX_GENERATORS", 2)
+        service = GeneratorService(model="openai:gpt-4o-mini", output_root=tmp_path)
+        try:
+            default = service.spec_generator()
+            service.spec_generator("openai:gpt-4o")
+            assert service.spec_generator() is default
+            service.spec_generator("openai:gpt-4.1")
+
+            assert list(service._generators) == ["openai:gpt-4o-mini", "openai:gpt-4.1"]
+        finally:
+            service.close()
+
+    def test_unix_socket(self, service: GeneratorService, tmp_path: Path) -> None:
+        """The service should also listen on a Unix socket."""
+        socket_path = str(tmp_path / "cli-gen.sock")
+        server = make_server(service, socket_path=socket_path)
+        thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+        thread.start()
+        try:
+            transport = httpx.HTTPTransport(uds=socket_path)
+            with httpx.Client(transport=transport, base_url="http://cli-gen") as client:
+                response = client.post("/spec", json={"description": "A counter"})
+            assert response.status_code == 200
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_replaces_stale_socket(self, service: GeneratorService, tmp_path: Path) -> None:
+        """A socket left behind by an earlier server should be replaced."""
+        socket_path = str(tmp_path / "cli-gen.sock")
+        stale = socket.socket(socket.AF_UNIX)
+        stale.bind(socket_path)
+        stale.close()
+
+        server = make_server(service, socket_path=socket_path)
+        server.server_close()
+
+        assert not Path(socket_path).exists()
+
+    def test_refuses_socket_in_use(self, service: GeneratorService, tmp_path: Path) -> None:
+        """The socket of a running server should not be taken over."""
+        socket_path = str(tmp_path / "cli-gen.sock")
+        running = make_server(service, socket_path=socket_path)
+        try:
+            with pytest.raises(FileExistsError, match="in use"):
+                make_server(service, socket_path=socket_path)
+            assert Path(socket_path).exists()
+        finally:
+            running.server_close()
+
+    def test_close_keeps_replaced_socket(
+        self, service: GeneratorService, tmp_path: Path
+    ) -> None:
+        """Closing should not remove a socket another server bound at the path since."""
+        socket_path = tmp_path / "cli-gen.sock"
+        server = make_server(service, socket_path=str(socket_path))
+        socket_path.unlink()
+        replacement = socket.socket(socket.AF_UNIX)
+        replacement.bind(str(socket_path))
+        try:
+            server.server_close()
+            assert socket_path.exists()
+        finally:
+            replacement.close()
+
+    def test_refuses_non_socket_path(self, service: GeneratorService, tmp_path: Path) -> None:
+        """A regular file at the socket path should be left alone."""
+        path = tmp_path / "regular.txt"
+        path.write_text("keep me")
+
+        with pytest.raises(FileExistsError, match="not a socket"):
+            make_server(service, socket_path=str(path))
+        assert path.read_text() == "keep me"
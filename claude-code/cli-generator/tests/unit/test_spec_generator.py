@@ -1,11 +1,39 @@
 """Unit tests for SpecGenerator."""
 
+import asyncio
+import importlib
+import json
+import sys
+from collections.abc import AsyncIterator
+from pathlib import Path
+
 import pytest
+from click.testing import CliRunner
 from pydantic_ai.models.test import TestModel
-from pydantic_ai.models.function import FunctionModel, AgentInfo
-from pydantic_ai.messages import ModelMessage, ModelResponse, TextPart
+from pydantic_ai.models.function import (
+    AgentInfo,
+    DeltaToolCall,
+    DeltaToolCalls,
+    FunctionModel,
+)
+from pydantic_ai.messages import (
+    ModelMessage,
+    ModelResponse,
+    TextPart,
+    ToolCallPart,
+    UserPromptPart,
+)
 
-from cli_generator.generators.spec_generator import SpecGenerator
+from cli_generator.cache import SpecCache
+from cli_generator.examples import ExampleLibrary
+from cli_generator.generators.code_generator import CodeGenerator
+from cli_generator.generators.spec_generator import (
+    BASE_SYSTEM_PROMPT,
+    STATIC_EXAMPLE,
+    SYSTEM_PROMPT,
+    SpecGenerator,
+)
+from cli_generator.instrumentation import Recorder
 from cli_generator.models import CLISpec, CommandSpec, OptionSpec, ArgumentSpec
 
 
@@ -205,3 +233,822 @@ class TestSpecGeneratorValidation:
 
         assert result.description
         assert len(result.description) > 0
+
+
+class TestSpecGeneratorCache:
+    """Tests for spec caching in SpecGenerator.generate()."""
+
+    @pytest.mark.asyncio
+    async def test_second_call_is_served_from_cache(self, tmp_path: Path) -> None:
+        """Repeated descriptions should only call the model once."""
+        calls = 0
+
+        def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+            nonlocal calls
+            calls += 1
+            return ModelResponse(
+                parts=[
+                    ToolCallPart(
+                        info.output_tools[0].name,
+                        {"name": "counter", "description": "Count things"},
+                    )
+                ]
+            )
+
+        cache = SpecCache(tmp_path)
+        generator = SpecGenerator(model=FunctionModel(respond), cache=cache)
+
+        first = await generator.generate("A counter tool")
+        second = await generator.generate("a  counter TOOL")
+
+        assert first == second
+        assert calls == 1
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_no_cache_by_default(self) -> None:
+        """SpecGenerator should not cache unless a cache is given."""
+        generator = SpecGenerator(model=TestModel())
+        assert generator.cache is None
+        assert isinstance(await generator.generate("A counter"), CLISpec)
+
+
+def _last_prompt(messages: list[ModelMessage]) -> str:
+    """Return the text of the most recent user prompt."""
+    for message in reversed(messages):
+        for part in message.parts:
+            if isinstance(part, UserPromptPart):
+                return str(part.content)
+    return ""
+
+
+class TestSpecGeneratorFanout:
+    """Tests for two-phase (skeleton + per-command) generation."""
+
+    @pytest.mark.asyncio
+    async def test_fanout_with_test_model(self) -> None:
+        """Fan-out mode should return a valid CLISpec."""
+        generator = SpecGenerator(model=TestModel(), fanout=True)
+        result = await generator.generate("A file manager")
+        assert isinstance(result, CLISpec)
+
+    @pytest.mark.asyncio
+    async def test_fanout_merges_commands_concurrently(self) -> None:
+        """Each skeleton command should be generated in its own request."""
+        active = 0
+        peak = 0
+
+        async def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+            nonlocal active, peak
+            prompt = _last_prompt(messages)
+            tool = info.output_tools[0].name
+            if prompt.startswith("Outline"):
+                args = {
+                    "name": "files",
+                    "description": "Manage files",
+                    "command_names": ["list", "copy", "delete"],
+                }
+            else:
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+                args = {"name": "anything", "description": prompt.split('"')[1]}
+            return ModelResponse(parts=[ToolCallPart(tool, args)])
+
+        generator = SpecGenerator(model=FunctionModel(respond), fanout=True)
+        result = await generator.generate("A file manager")
+
+        assert [cmd.name for cmd in result.commands] == ["list", "copy", "delete"]
+        assert [cmd.description for cmd in result.commands] == ["list", "copy", "delete"]
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_fanout_retries_only_failing_command(self) -> None:
+        """A command that fails validation should be retried on its own."""
+        calls: dict[str, int] = {}
+
+        def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+            prompt = _last_prompt(messages)
+            tool = info.output_tools[0].name
+            if prompt.startswith("Outline"):
+                args = {
+                    "name": "files",
+                    "description": "Manage files",
+                    "command_names": ["list", "copy"],
+                }
+                return ModelResponse(parts=[ToolCallPart(tool, args)])
+
+            name = prompt.split('"')[1]
+            calls[name] = calls.get(name, 0) + 1
+            options = [{"name": "force", "short": "f"}]
+            # 'copy' produces duplicate short options until its third request
+            if name == "copy" and calls[name] < 3:
+                options.append({"name": "follow", "short": "f"})
+            args = {"name": name, "description": f"{name} files", "options": options}
+            return ModelResponse(parts=[ToolCallPart(tool, args)])
+
+        # Disable local repairs so the duplicate reaches validation
+        generator = SpecGenerator(model=FunctionModel(respond), fanout=True, repair=False)
+        result = await generator.generate("A file manager")
+
+        assert calls["list"] == 1
+        assert calls["copy"] == 3
+        assert len(result.commands) == 2
+
+    @pytest.mark.asyncio
+    async def test_fanout_gives_up_after_retries(self) -> None:
+        """A command that never validates should eventually raise."""
+
+        def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+            tool = info.output_tools[0].name
+            if _last_prompt(messages).startswith("Outline"):
+                args = {"name": "files", "description": "Files", "command_names": ["bad"]}
+            else:
+                args = {
+                    "name": "bad",
+                    "description": "Bad",
+                    "options": [{"name": "a", "short": "x"}, {"name": "b", "short": "x"}],
+                }
+            return ModelResponse(parts=[ToolCallPart(tool, args)])
+
+        generator = SpecGenerator(
+            model=FunctionModel(respond), fanout=True, command_retries=1, repair=False
+        )
+        with pytest.raises(Exception, match="retries"):
+            await generator.generate("A file manager")
+
+
+class TestSpecGeneratorAddCommands:
+    """Tests for SpecGenerator.add_commands() method."""
+
+    @pytest.fixture
+    def base_spec(self) -> CLISpec:
+        """Create a base CLISpec with a global -v option."""
+        return CLISpec(
+            name="mytool",
+            description="A test tool",
+            commands=[CommandSpec(name="list", description="List items")],
+            global_options=[OptionSpec(name="verbose", short="v", type="bool")],
+        )
+
+    @pytest.mark.asyncio
+    async def test_adds_all_commands(self, base_spec: CLISpec) -> None:
+        """add_commands should add one command per description."""
+        generator = SpecGenerator(model=TestModel())
+        result = await generator.add_commands(base_spec, ["Add items", "Remove items"])
+
+        assert len(result.commands) == 3
+        assert result.commands[0].name == "list"
+
+    @pytest.mark.asyncio
+    async def test_requests_run_concurrently(self, base_spec: CLISpec) -> None:
+        """All command requests should be in flight at the same time."""
+        active = 0
+        peak = 0
+
+        async def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            name = _last_prompt(messages).split("New command request: ")[1].split()[0]
+            return ModelResponse(
+                parts=[
+                    ToolCallPart(
+                        info.output_tools[0].name,
+                        {"name": name.lower(), "description": name},
+                    )
+                ]
+            )
+
+        generator = SpecGenerator(model=FunctionModel(respond))
+        result = await generator.add_commands(base_spec, ["Add", "Remove", "Show"])
+
+        assert peak == 3
+        assert [cmd.name for cmd in result.commands] == ["list", "add", "remove", "show"]
+
+    @pytest.mark.asyncio
+    async def test_resolves_conflicts_locally(
+        self, base_spec: CLISpec, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Clashing names should be fixed without retries; per-command shorts are kept."""
+        calls = 0
+
+        def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+            nonlocal calls
+            calls += 1
+            args = {
+                "name": "list",
+                "description": "Another list",
+                "options": [
+                    {"name": "verbose-items", "short": "v"},
+                    {"name": "output", "short": "o"},
+                ],
+            }
+            return ModelResponse(parts=[ToolCallPart(info.output_tools[0].name, args)])
+
+        generator = SpecGenerator(model=FunctionModel(respond))
+        result = await generator.add_commands(base_spec, ["List again", "And again"])
+
+        assert calls == 2
+        assert [cmd.name for cmd in result.commands] == ["list", "list_2", "list_3"]
+        for cmd in result.commands[1:]:
+            assert [opt.short for opt in cmd.options] == ["v", "o"]
+
+        # click scopes shorts per command: the global and command -v both work
+        CodeGenerator().generate(result, tmp_path)
+        monkeypatch.syspath_prepend(str(tmp_path))
+        try:
+            cli = importlib.import_module("mytool.cli").cli
+            invoked = CliRunner().invoke(cli, ["-v", "list-2", "-v", "items", "-o", "out"])
+        finally:
+            for name in [name for name in sys.modules if name.startswith("mytool")]:
+                del sys.modules[name]
+        assert invoked.exit_code == 0, invoked.output
+
+    @pytest.mark.asyncio
+    async def test_empty_descriptions_raise(self, base_spec: CLISpec) -> None:
+        """Empty input should raise ValueError."""
+        generator = SpecGenerator(model=TestModel())
+        with pytest.raises(ValueError, match="descriptions"):
+            await generator.add_commands(base_spec, [])
+        with pytest.raises(ValueError, match="description"):
+            await generator.add_commands(base_spec, ["Add", " "])
+
+
+class TestSpecGeneratorStream:
+    """Tests for SpecGenerator.generate_stream()."""
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_partial_specs(self) -> None:
+        """Streaming should yield growing specs ending with the full spec."""
+        spec_json = CLISpec(
+            name="files",
+            description="Manage files",
+            commands=[
+                CommandSpec(name="list", description="List files"),
+                CommandSpec(name="copy", description="Copy files"),
+                CommandSpec(name="delete", description="Delete files"),
+            ],
+        ).model_dump_json()
+
+        async def stream(
+            messages: list[ModelMessage], info: AgentInfo
+        ) -> AsyncIterator[DeltaToolCalls]:
+            tool = info.output_tools[0].name
+            for start in range(0, len(spec_json), 20):
+                yield {
+                    0: DeltaToolCall(
+                        name=tool if start == 0 else None,
+                        json_args=spec_json[start : start + 20],
+                    )
+                }
+
+        generator = SpecGenerator(model=FunctionModel(stream_function=stream))
+        specs = [
+            spec
+            async for spec in generator.generate_stream("A file manager", debounce_by=None)
+        ]
+
+        assert len(specs) > 1
+        command_counts = [len(spec.commands) for spec in specs]
+        assert command_counts == sorted(command_counts)
+        assert [cmd.name for cmd in specs[-1].commands] == ["list", "copy", "delete"]
+
+    @pytest.mark.asyncio
+    async def test_stream_with_test_model(self) -> None:
+        """Streaming should work with TestModel."""
+        generator = SpecGenerator(model=TestModel())
+        specs = [spec async for spec in generator.generate_stream("A counter")]
+        assert isinstance(specs[-1], CLISpec)
+
+    @pytest.mark.asyncio
+    async def test_stream_fanout_yields_per_command(self) -> None:
+        """Fan-out streaming should yield once per completed command."""
+
+        def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+            prompt = _last_prompt(messages)
+            tool = info.output_tools[0].name
+            if prompt.startswith("Outline"):
+                args = {"name": "files", "description": "Files", "command_names": ["a", "b"]}
+            else:
+                args = {"name": "x", "description": "Command"}
+            return ModelResponse(parts=[ToolCallPart(tool, args)])
+
+        generator = SpecGenerator(model=FunctionModel(respond), fanout=True)
+        specs = [spec async for spec in generator.generate_stream("A file manager")]
+
+        assert [len(spec.commands) for spec in specs] == [0, 1, 2]
+        assert [cmd.name for cmd in specs[-1].commands] == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_stream_uses_cache(self, tmp_path: Path) -> None:
+        """A streamed result should be cached and served on the next call."""
+        generator = SpecGenerator(model=TestModel(), cache=SpecCache(tmp_path))
+        first = [spec async for spec in generator.generate_stream("A counter")]
+        second = [spec async for spec in generator.generate_stream("A counter")]
+
+        assert second == [first[-1]]
+        assert generator.cache.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_stream_empty_description_raises(self) -> None:
+        """Empty description should raise ValueError."""
+        generator = SpecGenerator(model=TestModel())
+        with pytest.raises(ValueError, match="description"):
+            async for _ in generator.generate_stream(""):
+                pass
+
+
+class TestSpecGeneratorRepair:
+    """Tests for local repair of invalid model output."""
+
+    @pytest.mark.asyncio
+    async def test_repairs_avoid_retries(self) -> None:
+        """Fixable output should validate on the first request."""
+        calls = 0
+
+        def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+            nonlocal calls
+            calls += 1
+            args = {
+                "name": "file-manager",
+                "description": "Manage files",
+                "commands": [
+                    {
+                        "name": "copy",
+                        "description": "Copy files",
+                        "options": [
+                            {"name": "force", "short": "f"},
+                            {"name": "follow", "short": "f"},
+                            {"name": "mode", "type": "choice"},
+                        ],
+                    }
+                ],
+            }
+            return ModelResponse(parts=[ToolCallPart(info.output_tools[0].name, args)])
+
+        generator = SpecGenerator(model=FunctionModel(respond))
+        result = await generator.generate("A file manager")
+
+        assert calls == 1
+        assert result.name == "file_manager"
+        assert [opt.short for opt in result.commands[0].options] == ["f", "o", None]
+        assert result.commands[0].options[2].type == "str"
+        assert generator.repairer is not None
+        assert generator.repairer.count == 3
+
+    @pytest.mark.asyncio
+    async def test_streamed_repairs_counted_once(self) -> None:
+        """Partial validations of a stream should not record repairs."""
+        spec_json = json.dumps(
+            {
+                "name": "My Tool",
+                "description": "Manage files",
+                "commands": [
+                    {
+                        "name": "copy",
+                        "description": "Copy files",
+                        "options": [{"name": "force", "short": "ff"}],
+                    }
+                ],
+            }
+        )
+
+        async def stream(
+            messages: list[ModelMessage], info: AgentInfo
+        ) -> AsyncIterator[DeltaToolCalls]:
+            tool = info.output_tools[0].name
+            for start in range(0, len(spec_json), 5):
+                yield {
+                    0: DeltaToolCall(
+                        name=tool if start == 0 else None,
+                        json_args=spec_json[start : start + 5],
+                    )
+                }
+
+        generator = SpecGenerator(model=FunctionModel(stream_function=stream))
+        specs = [spec async for spec in generator.generate_stream("A tool", debounce_by=None)]
+
+        assert specs[-1].name == "my_tool"
+        assert generator.repairer is not None
+        assert generator.repairer.count == 2
+        assert list(generator.repairer.repairs) == [
+            "cli: renamed 'My Tool' to 'my_tool'",
+            "command 'copy': dropped invalid short 'ff' of 'force'",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_valid_output_records_no_repairs(self) -> None:
+        """Output that validates without repairs should not be counted."""
+        generator = SpecGenerator(model=TestModel())
+        await generator.generate("A counter")
+        await generator.generate("A timer")
+
+        assert generator.repairer is not None
+        assert generator.repairer.count == 0
+
+    @pytest.mark.asyncio
+    async def test_repair_can_be_disabled(self) -> None:
+        """With repair=False there should be no repairer."""
+        generator = SpecGenerator(model=TestModel(), repair=False)
+        assert generator.repairer is None
+        assert isinstance(await generator.generate("A counter"), CLISpec)
+
+
+class TestSpecGeneratorCoalescing:
+    """Tests for single-flight coalescing of identical requests."""
+
+    @pytest.fixture
+    def counting_model(self) -> tuple[FunctionModel, list[str]]:
+        """A slow FunctionModel recording each prompt it receives."""
+        prompts: list[str] = []
+
+        async def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+            prompts.append(_last_prompt(messages))
+            await asyncio.sleep(0.02)
+            args = {"name": "tool", "description": "A tool"}
+            return ModelResponse(parts=[ToolCallPart(info.output_tools[0].name, args)])
+
+        return FunctionModel(respond), prompts
+
+    @pytest.mark.asyncio
+    async def test_identical_requests_share_one_call(
+        self, counting_model: tuple[FunctionModel, list[str]]
+    ) -> None:
+        """Concurrent identical descriptions should make one model call."""
+        model, prompts = counting_model
+        generator = SpecGenerator(model=model)
+
+        results = await asyncio.gather(
+            generator.generate("A counter"),
+            generator.generate("a  COUNTER"),
+            generator.generate("A timer"),
+        )
+
+        assert len(prompts) == 2
+        assert results[0] == results[1]
+        assert generator._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_coalescing_can_be_disabled(
+        self, counting_model: tuple[FunctionModel, list[str]]
+    ) -> None:
+        """With coalesce=False every call should reach the model."""
+        model, prompts = counting_model
+        generator = SpecGenerator(model=model, coalesce=False)
+
+        await asyncio.gather(*(generator.generate("A counter") for _ in range(3)))
+
+        assert len(prompts) == 3
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(
+        self, counting_model: tuple[FunctionModel, list[str]]
+    ) -> None:
+        """Cancelling one waiter should leave the shared request running."""
+        model, prompts = counting_model
+        generator = SpecGenerator(model=model)
+
+        first = asyncio.create_task(generator.generate("A counter"))
+        second = asyncio.create_task(generator.generate("A counter"))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert isinstance(await second, CLISpec)
+        assert len(prompts) == 1
+
+
+class TestSpecGeneratorHedging:
+    """Tests for racing fallback models against a slow primary model."""
+
+    @staticmethod
+    def _model(name: str, latency: float) -> FunctionModel:
+        """A FunctionModel returning a spec named after it, after a delay."""
+
+        async def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+            await asyncio.sleep(latency)
+            args = {"name": name, "description": "A tool"}
+            return ModelResponse(parts=[ToolCallPart(info.output_tools[0].name, args)])
+
+        return FunctionModel(respond, model_name=name)
+
+    def test_single_model_does_not_hedge(self) -> None:
+        """A single model should leave hedging disabled."""
+        generator = SpecGenerator(model=TestModel())
+        assert generator.hedge_stats is None
+
+    def test_model_list(self) -> None:
+        """The first model of a list should be the primary model."""
+        generator = SpecGenerator(model=["openai:gpt-4o-mini", "anthropic:claude-3-5-haiku-latest"])
+        assert generator.model == "openai:gpt-4o-mini"
+        assert generator.model_names == [
+            "openai:gpt-4o-mini",
+            "anthropic:claude-3-5-haiku-latest",
+        ]
+        assert generator.hedge_stats is not None
+
+    def test_empty_model_list_raises(self) -> None:
+        """An empty model list should be rejected."""
+        with pytest.raises(ValueError, match="model cannot be empty"):
+            SpecGenerator(model=[])
+
+    @pytest.mark.asyncio
+    async def test_generate_uses_fastest_model(self) -> None:
+        """generate() should return the fallback's spec when the primary is slow."""
+        generator = SpecGenerator(
+            model=[self._model("primary", 5.0), self._model("fallback", 0.0)],
+            hedge_delay=0.05,
+        )
+
+        spec = await generator.generate("A tool")
+
+        assert spec.name == "fallback"
+        assert generator.hedge_stats.fire_rate == 1.0
+        assert generator.hedge_stats.win_rate("fallback") == 1.0
+
+    @pytest.mark.asyncio
+    async def test_fanout_commands_are_hedged(self) -> None:
+        """Each fan-out request should be hedged on its own."""
+        generator = SpecGenerator(
+            model=[TestModel(), TestModel()], fanout=True, hedge_delay=1.0
+        )
+
+        spec = await generator.generate("A tool")
+
+        assert isinstance(spec, CLISpec)
+        assert generator.hedge_stats.requests == 1 + len(spec.commands)
+        assert generator.hedge_stats.fired == 0
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_winner(self) -> None:
+        """generate_stream() should yield only the winning spec when hedging."""
+        generator = SpecGenerator(
+            model=[self._model("primary", 5.0), self._model("fallback", 0.0)],
+            hedge_delay=0.05,
+        )
+
+        specs = [spec async for spec in generator.generate_stream("A tool")]
+
+        assert [spec.name for spec in specs] == ["fallback"]
+
+
+class TestSpecGeneratorExamples:
+    """Tests for retrieved few-shot examples."""
+
+    @pytest.fixture
+    def library(self) -> ExampleLibrary:
+        """A library with a single password generator spec."""
+        spec = CLISpec(
+            name="passgen",
+            description="Generate secure passwords",
+            commands=[CommandSpec(name="generate", description="Generate a password")],
+        )
+        return ExampleLibrary([spec])
+
+    def test_default_prompt_is_static(self) -> None:
+        """Without a library the static prompt with its example should be used."""
+        gen = SpecGenerator(model=TestModel())
+        assert gen.get_system_prompt() == SYSTEM_PROMPT
+        assert gen.get_examples("A password tool") is None
+
+    def test_library_uses_slimmer_prompt(self, library: ExampleLibrary) -> None:
+        """With a library the base prompt should be shorter than the static one."""
+        gen = SpecGenerator(model=TestModel(), examples=library)
+        assert gen.get_system_prompt() == BASE_SYSTEM_PROMPT
+        assert len(BASE_SYSTEM_PROMPT) < len(SYSTEM_PROMPT)
+
+    def test_unmatched_description_falls_back_to_static_example(
+        self, library: ExampleLibrary
+    ) -> None:
+        """A description with no similar examples should get the static example."""
+        gen = SpecGenerator(model=TestModel(), examples=library)
+        assert gen.get_examples("quantum chromodynamics") == STATIC_EXAMPLE
+
+    @pytest.mark.asyncio
+    async def test_examples_are_sent_as_instructions(self, library: ExampleLibrary) -> None:
+        """The retrieved examples should reach the model with the request."""
+        seen: list[str] = []
+
+        async def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+            seen.append(messages[-1].instructions or "")
+            args = {"name": "tool", "description": "A tool"}
+            return ModelResponse(parts=[ToolCallPart(info.output_tools[0].name, args)])
+
+        gen = SpecGenerator(model=FunctionModel(respond), examples=library)
+        await gen.generate("A secure password generator")
+
+        assert '"name":"passgen"' in seen[0]
+
+
+class TestSpecGeneratorInstrumentation:
+    """Tests for per-call records on the generator's recorder."""
+
+    @pytest.mark.asyncio
+    async def test_records_model_call(self) -> None:
+        """A generation should record model, tokens, time and cache outcome."""
+        recorder = Recorder()
+        gen = SpecGenerator(model=TestModel(), recorder=recorder)
+
+        await gen.generate("A counter")
+
+        [call] = recorder.calls
+        assert call.operation == "spec"
+        assert call.model == "test"
+        assert call.input_tokens > 0
+        assert call.output_tokens > 0
+        assert call.requests == 1
+        assert call.retries == 0
+        assert call.wall_time > 0
+        assert call.cache == "disabled"
+
+    @pytest.mark.asyncio
+    async def test_records_cache_hits(self, tmp_path: Path) -> None:
+        """A cached generation should be recorded as a hit without tokens."""
+        recorder = Recorder()
+        gen = SpecGenerator(
+            model=TestModel(), cache=SpecCache(tmp_path), recorder=recorder
+        )
+
+        await gen.generate("A counter")
+        await gen.generate("A counter")
+
+        assert [call.cache for call in recorder.calls] == ["miss", "hit"]
+        assert recorder.calls[1].input_tokens == 0
+
+    @pytest.mark.asyncio
+    async def test_records_retries(self) -> None:
+        """Output validation retries should be counted."""
+        attempts: list[int] = []
+
+        async def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+            attempts.append(1)
+            name = "Bad Name" if len(attempts) == 1 else "good_name"
+            args = {"name": name, "description": "A tool"}
+            return ModelResponse(parts=[ToolCallPart(info.output_tools[0].name, args)])
+
+        recorder = Recorder()
+        gen = SpecGenerator(model=FunctionModel(respond), repair=False, recorder=recorder)
+
+        await gen.generate("A tool")
+
+        assert recorder.calls[0].retries == 1
+        assert recorder.calls[0].requests == 2
+
+    @pytest.mark.asyncio
+    async def test_records_coalesced_callers(self) -> None:
+        """Callers sharing an in-flight request should be recorded as coalesced."""
+        recorder = Recorder()
+        gen = SpecGenerator(model=TestModel(), recorder=recorder)
+
+        await asyncio.gather(gen.generate("A counter"), gen.generate("A counter"))
+
+        assert sorted(call.cache for call in recorder.calls) == ["coalesced", "disabled"]
+
+    @pytest.mark.asyncio
+    async def test_records_fanout_operations(self) -> None:
+        """Fan-out should record the skeleton and each command separately."""
+        recorder = Recorder()
+        gen = SpecGenerator(model=TestModel(), fanout=True, recorder=recorder)
+
+        spec = await gen.generate("A counter")
+
+        operations = [call.operation for call in recorder.calls]
+        assert operations[0] == "skeleton"
+        assert operations.count("command") == len(spec.commands)
+
+    @pytest.mark.asyncio
+    async def test_records_streamed_generation(self) -> None:
+        """A streamed generation should be recorded once it completes."""
+        recorder = Recorder()
+        gen = SpecGenerator(model=TestModel(), recorder=recorder)
+
+        async for _ in gen.generate_stream("A counter"):
+            pass
+
+        [call] = recorder.calls
+        assert call.operation == "spec"
+        assert call.input_tokens > 0
+
+    @pytest.mark.asyncio
+    async def test_add_commands_are_not_cacheable(self) -> None:
+        """Added commands should be recorded without a cache outcome."""
+        recorder = Recorder()
+        gen = SpecGenerator(model=TestModel(), recorder=recorder)
+        spec = CLISpec(name="tool", description="A tool")
+
+        await gen.add_commands(spec, ["List items", "Delete items"])
+
+        assert [call.operation for call in recorder.calls] == ["add_command"] * 2
+        assert all(call.cache is None for call in recorder.calls)
+
+
+class TestSpecGeneratorEngine:
+    """Tests for the local engine fast path."""
+
+    FORMULAIC = "A CLI with list, add and delete commands for notes"
+    FREEFORM = "Convert images between formats with resize options"
+
+    @staticmethod
+    def _counting_model(calls: list[str]) -> FunctionModel:
+        """A model that records each call and returns a minimal spec."""
+
+        async def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+            calls.append(_last_prompt(messages))
+            args = {"name": "model_cli", "description": "From the model"}
+            return ModelResponse(parts=[ToolCallPart(info.output_tools[0].name, args)])
+
+        return FunctionModel(respond)
+
+    def test_invalid_engine_raises(self) -> None:
+        """Unknown engines should be rejected."""
+        with pytest.raises(ValueError, match="engine must be one of"):
+            SpecGenerator(model=TestModel(), engine="rules")  # type: ignore[arg-type]
+
+    @pytest.mark.asyncio
+    async def test_auto_serves_formulaic_descriptions_locally(self) -> None:
+        """The auto engine should not call the model for formulaic descriptions."""
+        calls: list[str] = []
+        recorder = Recorder()
+        gen = SpecGenerator(model=self._counting_model(calls), engine="auto", recorder=recorder)
+
+        spec = await gen.generate(self.FORMULAIC)
+
+        assert calls == []
+        assert spec.name == "notes_cli"
+        assert gen.engine_counts == {"llm": 0, "local": 1}
+        assert gen.last_synthesis is not None
+        assert gen.last_synthesis.confidence == 1.0
+        [call] = recorder.calls
+        assert call.engine == "local"
+        assert call.model == "local"
+        assert call.input_tokens == 0
+
+    @pytest.mark.asyncio
+    async def test_auto_falls_back_to_model(self) -> None:
+        """The auto engine should call the model below the threshold."""
+        calls: list[str] = []
+        gen = SpecGenerator(model=self._counting_model(calls), engine="auto")
+
+        spec = await gen.generate(self.FREEFORM)
+
+        assert len(calls) == 1
+        assert spec.name == "model_cli"
+        assert gen.engine_counts == {"llm": 1, "local": 0}
+
+    @pytest.mark.asyncio
+    async def test_threshold_is_configurable(self) -> None:
+        """A stricter threshold should send imperfect matches to the model."""
+        calls: list[str] = []
+        gen = SpecGenerator(
+            model=self._counting_model(calls), engine="auto", local_threshold=1.0
+        )
+
+        await gen.generate("A simple CLI with list and add commands for notes in folders")
+
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_llm_engine_ignores_rules(self) -> None:
+        """The default engine should always call the model."""
+        calls: list[str] = []
+        gen = SpecGenerator(model=self._counting_model(calls))
+
+        await gen.generate(self.FORMULAIC)
+
+        assert len(calls) == 1
+        assert gen.last_synthesis is None
+
+    @pytest.mark.asyncio
+    async def test_local_engine_uses_low_confidence_specs(self) -> None:
+        """The local engine should use any synthesized spec."""
+        calls: list[str] = []
+        gen = SpecGenerator(model=self._counting_model(calls), engine="local")
+
+        spec = await gen.generate("A file manager with list, copy, and shred commands")
+
+        assert calls == []
+        assert [cmd.name for cmd in spec.commands] == ["list", "copy"]
+
+    @pytest.mark.asyncio
+    async def test_local_engine_rejects_unparseable_descriptions(self) -> None:
+        """The local engine should fail when no spec can be synthesized."""
+        gen = SpecGenerator(model=TestModel(), engine="local")
+
+        with pytest.raises(ValueError, match="no subject found"):
+            await gen.generate(self.FREEFORM)
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_local_spec(self) -> None:
+        """Streaming should yield the local spec once without a model call."""
+        calls: list[str] = []
+        gen = SpecGenerator(model=self._counting_model(calls), engine="auto")
+
+        specs = [spec async for spec in gen.generate_stream(self.FORMULAIC)]
+
+        assert calls == []
+        assert len(specs) == 1
+        assert specs[0].name == "notes_cli"
@@ -0,0 +1,204 @@
+"""Unit tests for in-process verification of generated CLIs."""
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from cli_generator import verify
+from cli_generator.generators.code_generator import CodeGenerator
+from cli_generator.models import CLISpec, CommandSpec, OptionSpec
+from cli_generator.verify import (
+    VerifyResult,
+    content_hash,
+    expand_output_dirs,
+    verify_output,
+    verify_outputs,
+)
+
+
+def _generate(output_dir: Path, name: str = "verifytool", commands: int = 2, **kwargs) -> Path:
+    """Generate a small CLI into output_dir and return it."""
+    spec = CLISpec(
+        name=name,
+        description="A tool to verify",
+        commands=[
+            CommandSpec(
+                name=f"step-{index}",
+                description=f"Run step {index}",
+                options=[OptionSpec(name="force", type="bool")],
+            )
+            for index in range(commands)
+        ],
+    )
+    CodeGenerator().generate(spec, output_dir, **kwargs)
+    return output_dir
+
+
+class TestVerifyOutput:
+    """Tests for verify_output()."""
+
+    def test_generated_cli_passes(self, tmp_path: Path) -> None:
+        """A freshly generated CLI should pass every check."""
+        result = verify_output(_generate(tmp_path))
+
+        assert result.ok, result.errors
+        assert result.package == "verifytool"
+        assert result.modules == 2
+        assert result.commands == 2
+
+    def test_lazy_layout_passes(self, tmp_path: Path) -> None:
+        """Every command module of the lazy layout should be checked."""
+        result = verify_output(_generate(tmp_path, commands=3, layout="lazy"))
+
+        assert result.ok, result.errors
+        assert result.modules == 6
+        assert result.commands == 3
+
+    def test_syntax_error(self, tmp_path: Path) -> None:
+        """Modules that do not compile should be reported with their line."""
+        output_dir = _generate(tmp_path)
+        (output_dir / "verifytool" / "broken.py").write_text("x = 1\ndef (:\n")
+
+        result = verify_output(output_dir)
+
+        assert not result.ok
+        assert result.errors[0].startswith("verifytool/broken.py:2:")
+
+    def test_import_error(self, tmp_path: Path) -> None:
+        """A CLI module that fails to import should be reported."""
+        output_dir = _generate(tmp_path)
+        cli_path = output_dir / "verifytool" / "cli.py"
+        cli_path.write_text("import missing_dependency_xyz\n" + cli_path.read_text())
+
+        result = verify_output(output_dir)
+
+        assert not result.ok
+        assert "Importing verifytool.cli failed" in result.errors[0]
+        assert "missing_dependency_xyz" in result.errors[0]
+
+    def test_failing_command_help(self, tmp_path: Path) -> None:
+        """A command that fails to load should fail its --help check."""
+        output_dir = _generate(tmp_path, layout="lazy")
+        (output_dir / "verifytool" / "commands" / "step_1.py").write_text(
+            "raise RuntimeError('boom')\n"
+        )
+
+        result = verify_output(output_dir)
+
+        assert result.commands == 2
+        assert len(result.errors) == 1
+        assert "'verifytool step-1 --help' exited with 1" in result.errors[0]
+        assert "boom" in result.errors[0]
+
+    def test_missing_pyproject(self, tmp_path: Path) -> None:
+        """Directories that are not generated projects should fail."""
+        result = verify_output(tmp_path)
+        assert not result.ok
+        assert "No console script" in result.errors[0]
+
+    def test_import_state_is_restored(self, tmp_path: Path) -> None:
+        """Verification should leave sys.path and sys.modules as it found them."""
+        path = list(sys.path)
+
+        verify_output(_generate(tmp_path))
+
+        assert sys.path == path
+        assert not any(name.startswith("verifytool") for name in sys.modules)
+        assert not list(tmp_path.rglob("__pycache__"))
+
+    def test_projects_sharing_a_package_name(self, tmp_path: Path) -> None:
+        """Each project should be imported from its own directory."""
+        first = verify_output(_generate(tmp_path / "first", commands=1))
+        second = verify_output(_generate(tmp_path / "second", commands=3))
+
+        assert (first.commands, second.commands) == (1, 3)
+
+
+class TestVerifyOutputs:
+    """Tests for verify_outputs()."""
+
+    def test_passes_are_cached(self, tmp_path: Path) -> None:
+        """An unchanged project should be skipped on the next run."""
+        output_dir = _generate(tmp_path / "out")
+        cache_dir = tmp_path / "cache"
+        results: list[VerifyResult] = []
+
+        first = verify_outputs([output_dir], cache_dir=cache_dir)
+        second = verify_outputs([output_dir], cache_dir=cache_dir, on_result=results.append)
+
+        assert (first.passed, first.cached) == (1, 0)
+        assert (second.passed, second.cached) == (1, 1)
+        assert results[0].cached
+        assert results[0].commands == 2
+
+    def test_changed_project_is_verified_again(self, tmp_path: Path) -> None:
+        """Changing a file should invalidate the cached pass."""
+        output_dir = _generate(tmp_path / "out")
+        cache_dir = tmp_path / "cache"
+        verify_outputs([output_dir], cache_dir=cache_dir)
+        before = content_hash(output_dir)
+
+        cli_path = output_dir / "verifytool" / "cli.py"
+        cli_path.write_text(cli_path.read_text().replace("def main", "def (main"))
+        stats = verify_outputs([output_dir], cache_dir=cache_dir)
+
+        assert content_hash(output_dir) != before
+        assert (stats.failed, stats.cached) == (1, 0)
+
+    def test_concurrent_cache_writes(self, tmp_path: Path) -> None:
+        """Threads caching the same pass should not share a temporary file."""
+        result = VerifyResult(path=str(tmp_path), package="verifytool", modules=3)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: verify._write_cached(tmp_path, "key", result), range(32)))
+
+        assert verify._read_cached(tmp_path, "key") == result
+        assert [path.name for path in tmp_path.iterdir()] == ["key.json"]
+
+    def test_failures_are_not_cached(self, tmp_path: Path) -> None:
+        """A failing project should be checked again every time."""
+        cache_dir = tmp_path / "cache"
+        verify_outputs([tmp_path], cache_dir=cache_dir)
+        stats = verify_outputs([tmp_path], cache_dir=cache_dir)
+        assert (stats.failed, stats.cached) == (1, 0)
+
+    def test_process_pool(self, tmp_path: Path) -> None:
+        """Several jobs should verify every project."""
+        dirs = [_generate(tmp_path / f"cli_{index}", f"tool_{index}") for index in range(4)]
+        dirs.append(tmp_path)  # not a project
+        results: list[VerifyResult] = []
+
+        stats = verify_outputs(dirs, jobs=2, cache_dir=None, on_result=results.append)
+
+        assert (stats.passed, stats.failed) == (4, 1)
+        assert {result.package for result in results if result.ok} == {
+            f"tool_{index}" for index in range(4)
+        }
+
+    def test_invalid_jobs(self) -> None:
+        """jobs must be positive."""
+        with pytest.raises(ValueError, match="jobs must be at least 1"):
+            verify_outputs([], jobs=0)
+
+
+class TestExpandOutputDirs:
+    """Tests for expand_output_dirs()."""
+
+    def test_project_and_parent_directories(self, tmp_path: Path) -> None:
+        """A parent directory should expand to the projects inside it."""
+        first = _generate(tmp_path / "clis" / "first", "first")
+        second = _generate(tmp_path / "clis" / "second", "second")
+
+        assert expand_output_dirs([str(first)]) == [first]
+        assert expand_output_dirs([str(tmp_path / "clis")]) == [first, second]
+
+    def test_missing_directory(self, tmp_path: Path) -> None:
+        """Missing directories should raise FileNotFoundError."""
+        with pytest.raises(FileNotFoundError, match="Directory not found"):
+            expand_output_dirs([str(tmp_path / "missing")])
+
+    def test_directory_without_projects(self, tmp_path: Path) -> None:
+        """Directories without any project should raise FileNotFoundError."""
+        with pytest.raises(FileNotFoundError, match="No generated project"):
+            expand_output_dirs([str(tmp_path)])